@@ -1,3 +1,15 @@
 from django.contrib import admin
+from .models import DailySymbolPnL, WeeklySymbolPnL
 
-# Register your models here.
+
+@admin.register(DailySymbolPnL)
+class DailySymbolPnLAdmin(admin.ModelAdmin):
+    list_display = ['date', 'symbol', 'trade_count', 'win_count', 'net_pnl', 'pips', 'r_multiple']
+    list_filter = ['symbol']
+    date_hierarchy = 'date'
+
+
+@admin.register(WeeklySymbolPnL)
+class WeeklySymbolPnLAdmin(admin.ModelAdmin):
+    list_display = ['week_start', 'symbol', 'trade_count', 'win_count', 'net_pnl', 'pips', 'r_multiple']
+    list_filter = ['symbol', 'iso_year']
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'analytics'
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+        from trading.events import trades_changed
+        from trading.models import Trade
+        from .rollups import handle_trades_changed, handle_trade_deleted
+
+        trades_changed.connect(handle_trades_changed, sender=Trade, dispatch_uid='analytics_pnl_rollups')
+        post_delete.connect(handle_trade_deleted, sender=Trade, dispatch_uid='analytics_pnl_rollups_delete')
@@ -0,0 +1,85 @@
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    from analytics.rollups import close_contribution, iso_week
+
+    Trade = apps.get_model('trading', 'Trade')
+    DailySymbolPnL = apps.get_model('analytics', 'DailySymbolPnL')
+    WeeklySymbolPnL = apps.get_model('analytics', 'WeeklySymbolPnL')
+
+    daily, weekly = {}, {}
+    fields = ('symbol', 'direction', 'status', 'net_profit_loss',
+              'entry_price', 'exit_price', 'stop_loss', 'close_time')
+    closed = Trade.objects.filter(status__startswith='closed_', close_time__isnull=False).values(*fields)
+
+    for state in closed.iterator():
+        symbol, close_date, values = close_contribution(state)
+        iso_year, week, week_start = iso_week(close_date)
+        for buckets, key, extra in (
+            (daily, (symbol, close_date), {'date': close_date}),
+            (weekly, (symbol, iso_year, week), {'iso_year': iso_year, 'iso_week': week, 'week_start': week_start}),
+        ):
+            bucket = buckets.setdefault(key, {'symbol': symbol, **extra})
+            for name, value in values.items():
+                bucket[name] = bucket.get(name, 0) + value
+
+    DailySymbolPnL.objects.bulk_create([DailySymbolPnL(**row) for row in daily.values()])
+    WeeklySymbolPnL.objects.bulk_create([WeeklySymbolPnL(**row) for row in weekly.values()])
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('trading', '0002_tradestatsrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySymbolPnL',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20)),
+                ('trade_count', models.IntegerField(default=0)),
+                ('win_count', models.IntegerField(default=0)),
+                ('loss_count', models.IntegerField(default=0)),
+                ('net_pnl', models.DecimalField(decimal_places=2, default=0, help_text='Net P&L in account currency', max_digits=14)),
+                ('pips', models.DecimalField(decimal_places=1, default=0, max_digits=12)),
+                ('r_multiple', models.DecimalField(decimal_places=2, default=0, help_text='Sum of trade results in units of initial risk', max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+            ],
+            options={
+                'verbose_name': 'Daily Symbol P&L',
+                'verbose_name_plural': 'Daily Symbol P&L',
+                'ordering': ['-date', 'symbol'],
+                'unique_together': {('symbol', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklySymbolPnL',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20)),
+                ('trade_count', models.IntegerField(default=0)),
+                ('win_count', models.IntegerField(default=0)),
+                ('loss_count', models.IntegerField(default=0)),
+                ('net_pnl', models.DecimalField(decimal_places=2, default=0, help_text='Net P&L in account currency', max_digits=14)),
+                ('pips', models.DecimalField(decimal_places=1, default=0, max_digits=12)),
+                ('r_multiple', models.DecimalField(decimal_places=2, default=0, help_text='Sum of trade results in units of initial risk', max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('iso_year', models.IntegerField()),
+                ('iso_week', models.IntegerField()),
+                ('week_start', models.DateField(help_text='Monday of the ISO week')),
+            ],
+            options={
+                'verbose_name': 'Weekly Symbol P&L',
+                'verbose_name_plural': 'Weekly Symbol P&L',
+                'ordering': ['-week_start', 'symbol'],
+                'unique_together': {('symbol', 'iso_year', 'iso_week')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,66 @@
 from django.db import models
 
-# Create your models here.
+
+class SymbolPnLRollup(models.Model):
+    """
+    Closed-trade counters shared by the daily and weekly P&L rollups
+    Updated incrementally from trade closes (see analytics.rollups)
+    """
+    
+    symbol = models.CharField(max_length=20)
+    
+    trade_count = models.IntegerField(default=0)
+    win_count = models.IntegerField(default=0)
+    loss_count = models.IntegerField(default=0)
+    net_pnl = models.DecimalField(max_digits=14, decimal_places=2, default=0,
+                                  help_text="Net P&L in account currency")
+    pips = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    r_multiple = models.DecimalField(max_digits=10, decimal_places=2, default=0,
+                                     help_text="Sum of trade results in units of initial risk")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+    
+    def win_rate(self):
+        """Calculate win rate percentage"""
+        if self.trade_count > 0:
+            return round((self.win_count / self.trade_count) * 100, 1)
+        return 0.0
+
+
+class DailySymbolPnL(SymbolPnLRollup):
+    """
+    Closed trades per symbol and close date (UTC)
+    """
+    
+    date = models.DateField()
+    
+    class Meta:
+        ordering = ['-date', 'symbol']
+        unique_together = ['symbol', 'date']
+        verbose_name = "Daily Symbol P&L"
+        verbose_name_plural = "Daily Symbol P&L"
+    
+    def __str__(self):
+        return f"{self.symbol} {self.date}: {self.net_pnl}"
+
+
+class WeeklySymbolPnL(SymbolPnLRollup):
+    """
+    Closed trades per symbol and ISO week of the close date (UTC)
+    """
+    
+    iso_year = models.IntegerField()
+    iso_week = models.IntegerField()
+    week_start = models.DateField(help_text="Monday of the ISO week")
+    
+    class Meta:
+        ordering = ['-week_start', 'symbol']
+        unique_together = ['symbol', 'iso_year', 'iso_week']
+        verbose_name = "Weekly Symbol P&L"
+        verbose_name_plural = "Weekly Symbol P&L"
+    
+    def __str__(self):
+        return f"{self.symbol} {self.iso_year}-W{self.iso_week:02d}: {self.net_pnl}"
@@ -0,0 +1,178 @@
+"""
+Daily and Weekly P&L Rollups
+Per-symbol closed-trade counters per UTC day and ISO week
+
+A trade contributes to the rollups of its close date once it is closed
+(status closed_* with a close_time). Trade saves arrive through the
+trading.events.trades_changed signal with the trade's previous and current
+state, so the contribution is moved (or removed on delete) with F()
+updates instead of rescanning trade history. Readers such as the weekly
+R:R upgrade check touch one row per symbol.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from trading.pips import get_pip_size
+
+from .models import DailySymbolPnL, WeeklySymbolPnL
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_WEEKLY_PROFIT_THRESHOLD = 10.0
+
+
+def _decimal(value) -> Decimal:
+    return Decimal(str(value)) if value is not None else Decimal('0')
+
+
+def iso_week(day: date) -> Tuple[int, int, date]:
+    """(ISO year, ISO week, Monday of that week)"""
+    iso_year, week, weekday = day.isocalendar()
+    return iso_year, week, day - timedelta(days=weekday - 1)
+
+
+def _close_date(close_time: datetime) -> date:
+    if timezone.is_aware(close_time):
+        close_time = close_time.astimezone(dt_timezone.utc)
+    return close_time.date()
+
+
+def close_contribution(state: Optional[Dict]) -> Optional[Tuple[str, date, Dict]]:
+    """
+    (symbol, close date, counter values) a trade state adds to the rollups,
+    or None if the trade is not closed
+    """
+    if state is None or not str(state['status']).startswith('closed_') or state['close_time'] is None:
+        return None
+
+    net_pnl = _decimal(state['net_profit_loss'])
+    entry_price = _decimal(state['entry_price'])
+    sign = 1 if state['direction'] == 'BUY' else -1
+
+    pips = Decimal('0')
+    r_multiple = Decimal('0')
+    if state['exit_price'] is not None:
+        move = (_decimal(state['exit_price']) - entry_price) * sign
+        if state.get('pips') is not None:
+            pips = _decimal(state['pips'])
+        else:
+            pips = (move / get_pip_size(state['symbol'])).quantize(Decimal('0.1'), ROUND_HALF_UP)
+
+        risk = abs(entry_price - _decimal(state['stop_loss']))
+        if risk > 0:
+            r_multiple = (move / risk).quantize(Decimal('0.01'), ROUND_HALF_UP)
+
+    values = {
+        'trade_count': 1,
+        'win_count': 1 if net_pnl > 0 else 0,
+        'loss_count': 1 if net_pnl < 0 else 0,
+        'net_pnl': net_pnl,
+        'pips': pips,
+        'r_multiple': r_multiple,
+    }
+    return state['symbol'], _close_date(state['close_time']), values
+
+
+def apply_trade_changes(changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]]):
+    """
+    Move trades' contributions between day/week rollups
+
+    changes are (previous, current) trade states. Deltas are summed per
+    symbol and close date first, so a bulk close touches each rollup row once.
+    """
+    deltas: Dict[Tuple[str, date], Dict] = defaultdict(lambda: defaultdict(Decimal))
+    for previous, current in changes:
+        old, new = close_contribution(previous), close_contribution(current)
+        if old == new:
+            continue
+        for contribution, sign in ((old, -1), (new, 1)):
+            if contribution is not None:
+                symbol, close_date, values = contribution
+                for name, value in values.items():
+                    deltas[(symbol, close_date)][name] += sign * value
+
+    now = timezone.now()
+    with transaction.atomic():
+        for (symbol, close_date), values in deltas.items():
+            updates = {name: F(name) + value for name, value in values.items() if value}
+            if not updates:
+                continue
+            updates['updated_at'] = now
+
+            daily, _ = DailySymbolPnL.objects.get_or_create(symbol=symbol, date=close_date)
+            DailySymbolPnL.objects.filter(pk=daily.pk).update(**updates)
+
+            iso_year, week, week_start = iso_week(close_date)
+            weekly, _ = WeeklySymbolPnL.objects.get_or_create(
+                symbol=symbol, iso_year=iso_year, iso_week=week,
+                defaults={'week_start': week_start}
+            )
+            WeeklySymbolPnL.objects.filter(pk=weekly.pk).update(**updates)
+
+
+def apply_trade_change(previous: Optional[Dict], current: Optional[Dict]):
+    """Move one trade's contribution between day/week rollups"""
+    apply_trade_changes([(previous, current)])
+
+
+def handle_trades_changed(sender, changes, **kwargs):
+    """trades_changed receiver"""
+    apply_trade_changes((previous, current) for _, previous, current in changes)
+
+
+def handle_trade_deleted(sender, instance, **kwargs):
+    """post_delete receiver for Trade"""
+    apply_trade_change(getattr(instance, '_tracked_state', None) or instance.tracked_state(), None)
+
+
+def get_week_rollups(day: Optional[date] = None) -> Dict[str, WeeklySymbolPnL]:
+    """Weekly rollup per symbol for the ISO week containing day (default today)"""
+    iso_year, week, _ = iso_week(day or timezone.now().date())
+    return {
+        rollup.symbol: rollup
+        for rollup in WeeklySymbolPnL.objects.filter(iso_year=iso_year, iso_week=week, trade_count__gt=0)
+    }
+
+
+def get_weekly_performance(balance: Optional[float] = None,
+                           threshold: float = DEFAULT_WEEKLY_PROFIT_THRESHOLD,
+                           day: Optional[date] = None) -> Dict[str, Dict]:
+    """
+    Weekly performance per symbol for the R:R strategy
+
+    pct is the symbol's net P&L this week relative to the balance at the
+    start of the week (current balance minus this week's closed P&L); it is
+    0 when the balance is not known. A symbol is upgraded to 1:2 R:R when
+    pct reaches threshold.
+    """
+    rollups = get_week_rollups(day)
+
+    start_balance = None
+    if balance:
+        start_balance = Decimal(str(balance)) - sum((r.net_pnl for r in rollups.values()), Decimal('0'))
+
+    performance = {}
+    for symbol, rollup in sorted(rollups.items()):
+        pct = 0.0
+        if start_balance and start_balance > 0:
+            pct = round(float(rollup.net_pnl / start_balance * 100), 1)
+
+        performance[symbol] = {
+            'pct': pct,
+            'trades': rollup.trade_count,
+            'wins': rollup.win_count,
+            'net_pnl': float(rollup.net_pnl),
+            'pips': float(rollup.pips),
+            'r_multiple': float(rollup.r_multiple),
+            'upgraded': pct >= threshold,
+        }
+    return performance
@@ -0,0 +1,130 @@
+"""
+Trade listing serialization benchmark
+TradeSerializer vs. trading.fast_serializers at 1k and 10k rows
+
+Usage:
+    python benchmark_trade_serializers.py              # in-memory rows, no database
+    python benchmark_trade_serializers.py --db         # read the newest trades from the database
+    python benchmark_trade_serializers.py --rows 1000 50000 --repeat 5
+
+The in-memory mode measures serialization + JSON rendering only: the
+TradeSerializer path gets Trade instances and the fast path gets the same
+values as tuples. --db includes the queries (model instances vs.
+values_list) and needs enough trades in the database.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from trading.fast_serializers import VALUE_PATHS, render_trade_list, serialize_trade_rows
+from trading.models import Trade
+from trading.serializers import TradeSerializer
+
+
+SYMBOLS = [('EURUSD', '1.08500'), ('GBPUSD', '1.27000'), ('USDJPY', '150.000'), ('XAUUSD', '2350.00')]
+
+
+def make_trades(count, seed=42):
+    """Unsaved trades with realistic values (about half closed)"""
+    rng = random.Random(seed)
+    now = timezone.now()
+    trades = []
+    for i in range(count):
+        symbol, price = rng.choice(SYMBOLS)
+        entry = Decimal(price)
+        step = Decimal('0.01') if symbol in ('USDJPY', 'XAUUSD') else Decimal('0.0001')
+        closed = rng.random() < 0.5
+        execution_time = now - timedelta(minutes=i * 7)
+        trade = Trade(
+            id=uuid.uuid4(),
+            mql5_signal_id=uuid.uuid4(),
+            mt5_ticket=100000 + i,
+            mt5_order_type='ORDER_TYPE_BUY',
+            symbol=symbol,
+            direction=rng.choice(['BUY', 'SELL']),
+            entry_price=entry,
+            stop_loss=entry - step * 20,
+            take_profit=entry + step * 40,
+            volume=Decimal('0.10'),
+            status='opened',
+            signal_time=execution_time - timedelta(seconds=3),
+            execution_time=execution_time,
+            django_decision_time=execution_time - timedelta(seconds=1),
+            execution_delay_seconds=2,
+        )
+        if closed:
+            trade.exit_price = entry + step * rng.randint(-20, 40)
+            trade.gross_profit_loss = Decimal(rng.randint(-2000, 4000)) / 100
+            trade.net_profit_loss = trade.gross_profit_loss - Decimal('0.70')
+            trade.status = 'closed_profit' if trade.net_profit_loss > 0 else 'closed_loss'
+            trade.close_time = execution_time + timedelta(minutes=rng.randint(5, 600))
+            trade.duration_minutes = int((trade.close_time - execution_time).total_seconds() // 60)
+            trade.pips = Decimal(rng.randint(-200, 400)) / 10
+        trades.append(trade)
+    return trades
+
+
+def best_of(repeat, func):
+    """Fastest of repeat runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_in_memory(count, repeat):
+    trades = make_trades(count)
+    rows = [tuple(getattr(trade, path) for path in VALUE_PATHS) for trade in trades]
+    renderer = JSONRenderer()
+
+    slow = best_of(repeat, lambda: renderer.render(TradeSerializer(trades, many=True).data))
+    fast = best_of(repeat, lambda: renderer.render(serialize_trade_rows(rows)))
+    return slow, fast
+
+
+def run_db(count, repeat):
+    queryset = Trade.objects.order_by('-execution_time')[:count]
+    available = queryset.count()
+    if available < count:
+        print(f"  only {available} trades in the database")
+    renderer = JSONRenderer()
+
+    slow = best_of(repeat, lambda: renderer.render(TradeSerializer(list(queryset), many=True).data))
+    fast = best_of(repeat, lambda: render_trade_list(queryset))
+    return slow, fast
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--db', action='store_true', help='benchmark against the database')
+    args = parser.parse_args()
+
+    mode = 'database' if args.db else 'in-memory'
+    print(f"Trade listing serialization ({mode}, best of {args.repeat})")
+    print(f"{'rows':>8} {'TradeSerializer':>16} {'fast path':>12} {'speedup':>9}")
+    for count in args.rows:
+        slow, fast = (run_db if args.db else run_in_memory)(count, args.repeat)
+        print(f"{count:>8} {slow * 1000:>13.1f} ms {fast * 1000:>9.1f} ms {slow / fast:>8.1f}x")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
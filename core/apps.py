@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from trading.events import trades_changed
+        from trading.models import Trade
+        from .change_versions import handle_signal_changed, handle_trades_changed
+
+        trades_changed.connect(handle_trades_changed, sender=Trade, dispatch_uid='change_version_trades')
+        post_delete.connect(handle_trades_changed, sender=Trade, dispatch_uid='change_version_trades_delete')
+        post_save.connect(handle_signal_changed, sender='signals.MQL5Signal', dispatch_uid='change_version_signals')
+        post_delete.connect(handle_signal_changed, sender='signals.MQL5Signal', dispatch_uid='change_version_signals_delete')
@@ -0,0 +1,178 @@
+"""
+Change Versions
+Cheap weak ETags for polling endpoints
+
+Each data set the dashboard and API poll (trades, signals, notifications,
+the MT5 account snapshot) has a counter in the Django cache that is bumped
+after every committed change. A polling endpoint builds its ETag from the counters it
+depends on - one cache round trip - and answers a matching If-None-Match
+with 304 before running any queryset or calling MT5.
+
+The MT5 account snapshot (open positions, balance, equity) changes without
+any Django write, so it is tracked differently: endpoints that read MT5
+record a digest of what they read, and the account counter is bumped when
+the digest changes. A recorded snapshot is trusted for account_max_age
+seconds; after that the next request reads MT5 again instead of answering
+304. Position sync bumps the counter directly.
+
+Counters start from the current time in milliseconds, so a cache flush
+can never hand out an ETag a client already holds for older data.
+
+The counters must live in a cache every worker process shares (Redis, see
+CACHES in settings). With a process-local backend (LocMem, Dummy) a save in
+one worker would never bump the counters of the others, which would keep
+answering 304 with stale data, so no ETags are emitted unless
+allow_local_cache is set (single-process development server).
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHANGE_VERSION_CONFIG = {
+    'account_max_age': 5.0,       # seconds a recorded MT5 snapshot may answer 304
+    'allow_local_cache': False,   # emit ETags even if the cache is per-process
+}
+
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+TRADES = 'trades'
+SIGNALS = 'signals'
+ACCOUNT = 'account'
+NOTIFICATIONS = 'notifications'
+
+CACHE_KEY_PREFIX = 'change_version:'
+SNAPSHOT_DIGEST_PREFIX = 'change_version_digest:'
+SNAPSHOT_FRESH_PREFIX = 'change_version_fresh:'
+
+
+def get_change_version_config():
+    return get_config('CHANGE_VERSION_CONFIG', DEFAULT_CHANGE_VERSION_CONFIG)
+
+
+_local_cache_warned = False
+
+
+def etags_enabled() -> bool:
+    """Whether the counters are shared by every process (see module docstring)"""
+    global _local_cache_warned
+    if not isinstance(caches['default'], PROCESS_LOCAL_CACHES):
+        return True
+    if get_change_version_config()['allow_local_cache']:
+        return True
+    if not _local_cache_warned:
+        _local_cache_warned = True
+        logger.warning("Cache backend is process-local: ETags disabled (set REDIS_URL to share change versions)")
+    return False
+
+
+def _seed() -> int:
+    return int(time.time() * 1000)
+
+
+def get_versions(*names: str) -> dict:
+    """Current counter per name (missing counters are started)"""
+    keys = [CACHE_KEY_PREFIX + name for name in names]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _seed(), timeout=None)
+            found[key] = cache.get(key)
+    return {name: found[CACHE_KEY_PREFIX + name] for name in names}
+
+
+def bump_now(*names: str):
+    """Increment counters immediately"""
+    for name in names:
+        key = CACHE_KEY_PREFIX + name
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing (first use or evicted): a fresh seed is newer than any old value
+            cache.set(key, _seed(), timeout=None)
+
+
+def bump(*names: str):
+    """
+    Increment counters once the current transaction commits
+
+    Bumping before commit would let a poller cache the old rows under the
+    new version.
+    """
+    transaction.on_commit(lambda: bump_now(*names))
+
+
+def make_etag(*names: str, scope: str = ''):
+    """
+    Weak ETag for a response built from the named data sets (scope: e.g.
+    the user a per-user payload belongs to); None when ETags are disabled
+    """
+    if not etags_enabled():
+        return None
+    versions = get_versions(*names)
+    tag = '-'.join(f"{name[0]}{versions[name]}" for name in names)
+    if scope:
+        tag += f'-{scope}'
+    return f'W/"{tag}"'
+
+
+def not_modified(request, etag):
+    """HttpResponseNotModified if the request's If-None-Match matches, else None"""
+    if etag is None or request.method not in ('GET', 'HEAD'):
+        return None
+    return get_conditional_response(request, etag=etag)
+
+
+def etag_func(*names: str):
+    """etag_func for django.views.decorators.http.condition"""
+    def func(request, *args, **kwargs):
+        return make_etag(*names)
+    return func
+
+
+def snapshot_fresh(*snapshots: str) -> bool:
+    """Whether every named MT5 snapshot was read within account_max_age"""
+    keys = [SNAPSHOT_FRESH_PREFIX + name for name in snapshots]
+    return len(cache.get_many(keys)) == len(keys)
+
+
+def record_snapshot(name: str, payload) -> bool:
+    """
+    Record an MT5 read; bump the account counter if it differs from the
+    previous read of the same snapshot. Returns True if it changed.
+    """
+    digest = hashlib.sha1(
+        json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder).encode('utf-8')
+    ).hexdigest()
+
+    changed = cache.get(SNAPSHOT_DIGEST_PREFIX + name) != digest
+    if changed:
+        cache.set(SNAPSHOT_DIGEST_PREFIX + name, digest, timeout=None)
+        bump_now(ACCOUNT)
+
+    config = get_change_version_config()
+    cache.set(SNAPSHOT_FRESH_PREFIX + name, True, timeout=config['account_max_age'])
+    return changed
+
+
+def handle_trades_changed(sender, **kwargs):
+    """trades_changed / post_delete receiver for Trade"""
+    bump(TRADES)
+
+
+def handle_signal_changed(sender, **kwargs):
+    """post_save / post_delete receiver for MQL5Signal"""
+    bump(SIGNALS)
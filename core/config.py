@@ -0,0 +1,29 @@
+"""
+Module Configuration
+Module defaults merged with their settings override
+
+Each module owns its DEFAULT_X_CONFIG dict. settings.py only sets the keys
+that a deployment changes (in practice the environment-driven ones), so the
+defaults have a single source of truth.
+"""
+
+from django.conf import settings
+
+
+def get_config(setting_name: str, defaults: dict) -> dict:
+    """
+    Copy of defaults updated with getattr(settings, setting_name, {})
+
+    Dict values are merged one level deep, so an override such as
+    {'latency': {'ms': 50}} keeps the other latency keys.
+    """
+    config = {
+        key: dict(value) if isinstance(value, dict) else value
+        for key, value in defaults.items()
+    }
+    for key, value in getattr(settings, setting_name, {}).items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            config[key].update(value)
+        else:
+            config[key] = value
+    return config
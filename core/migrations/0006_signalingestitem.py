@@ -0,0 +1,41 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_usersettings_metaquotes_enabled_and_more'),
+        ('signals', '__first__'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SignalIngestItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source', models.CharField(max_length=50)),
+                ('path', models.CharField(max_length=200)),
+                ('query_string', models.CharField(blank=True, max_length=500)),
+                ('payload', models.TextField(help_text='Raw request body as received')),
+                ('request_meta', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('response_data', models.JSONField(blank=True, default=dict)),
+                ('received_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Not picked up by workers before this time (retry backoff, or the visibility timeout of a processing item)')),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('mql5_signal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ingest_items', to='signals.mql5signal')),
+            ],
+            options={
+                'verbose_name': 'Signal Ingest Item',
+                'verbose_name_plural': 'Signal Ingest Items',
+                'db_table': 'signal_ingest_item',
+                'ordering': ['received_at'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='ingest_status_available_idx')],
+            },
+        ),
+    ]
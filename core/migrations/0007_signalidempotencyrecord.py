@@ -0,0 +1,34 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_signalingestitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SignalIdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='SHA-256 of route + idempotency key or content fingerprint', max_length=64, unique=True)),
+                ('route', models.CharField(max_length=200)),
+                ('key_source', models.CharField(choices=[('header', 'Idempotency-Key Header'), ('content', 'Content Fingerprint')], max_length=10)),
+                ('status', models.CharField(choices=[('in_flight', 'In Flight'), ('completed', 'Completed')], default='in_flight', max_length=20)),
+                ('response_status', models.IntegerField(blank=True, null=True)),
+                ('response_body', models.TextField(blank=True)),
+                ('response_content_type', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Signal Idempotency Record',
+                'verbose_name_plural': 'Signal Idempotency Records',
+                'db_table': 'signal_idempotency_record',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at'], name='idempotency_created_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+# Signal ingestion queue tables are owned by core migrations
+from signals.ingest_models import SignalIdempotencyRecord, SignalIngestItem  # noqa: F401
+
 class UserSettings(models.Model):
     """Store user-specific trading settings"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='settings')
@@ -0,0 +1,60 @@
+"""
+Keyset (Cursor) Pagination
+Constant-cost paging for large, time-ordered listings
+
+PageNumberPagination runs COUNT(*) and OFFSET n on every page, so page
+10 000 reads (and discards) every row before it. Cursor pagination seeks
+from the last row's ordering value instead (WHERE execution_time < cursor),
+which an index on the ordering columns serves at the same cost for every
+page. The cursor is only stable on a near-unique, non-null column, so
+orderings on any other field fall back to the listing's default ordering,
+and the primary key is appended as a tie-breaker in the same direction as
+the leading column.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a timestamp ordering
+
+    cursor_fields lists the columns a client may order by (?ordering=);
+    they must be non-null and indexed together with the primary key.
+    """
+
+    ordering = '-created_at'
+    cursor_fields = ('created_at',)
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering[0].lstrip('-') not in self.cursor_fields:
+            ordering = (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+
+        ordering = tuple(ordering)
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            descending = ordering[0].startswith('-')
+            ordering += ('-id' if descending else 'id',)
+        return ordering
+
+
+class TradeCursorPagination(KeysetCursorPagination):
+    """
+    Trades, newest first
+
+    execution_time is null for trades that were never executed, and rows
+    with a null cursor value drop out of keyset pages, so the cursor runs
+    on the non-null django_decision_time.
+    """
+
+    ordering = '-django_decision_time'
+    cursor_fields = ('django_decision_time',)
+
+
+class UCellCursorPagination(KeysetCursorPagination):
+    """U-Cell records, newest first"""
+
+    ordering = '-created_at'
+    cursor_fields = ('created_at',)
@@ -1,24 +1,53 @@
 """
 Real-time API endpoints for dashboard data
 """
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from core import change_versions
+from core.change_versions import ACCOUNT, NOTIFICATIONS, SIGNALS, TRADES
+from .live_stream import get_live_stream_config, live_stream_hub
 from .utils import get_active_trades, get_mt5_account_info, get_sts_signals
 import json
 
+def _conditional(request, names, snapshots):
+    """
+    304 if the client's ETag is current and the MT5 snapshots it depends on
+    were read recently; None if the view has to build the payload
+    """
+    if not change_versions.snapshot_fresh(*snapshots):
+        return None
+    return change_versions.not_modified(request, change_versions.make_etag(*names))
+
+def _with_etag(request, response, names):
+    """Tag a freshly built payload; still 304 if the MT5 read changed nothing"""
+    etag = change_versions.make_etag(*names)
+    if etag is not None:
+        response['ETag'] = etag
+    # Browsers revalidate every poll, so fetch() gets the 304 transparently
+    patch_cache_control(response, no_cache=True)
+    return change_versions.not_modified(request, etag) or response
+
 @csrf_exempt
 def live_trades_api(request):
     """
     API endpoint for live trade data
     Returns current MT5 positions with real-time P&L
     """
+    names = (TRADES, ACCOUNT)
+    cached = _conditional(request, names, ['positions'])
+    if cached is not None:
+        return cached
+    
     try:
         trades = get_active_trades()
-        return JsonResponse({
+        change_versions.record_snapshot('positions', trades)
+        return _with_etag(request, JsonResponse({
             'success': True,
             'trades': trades,
             'timestamp': int(__import__('time').time())
-        })
+        }), names)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -30,13 +59,19 @@ def live_account_api(request):
     """
     API endpoint for live account information
     """
+    names = (ACCOUNT,)
+    cached = _conditional(request, names, ['account'])
+    if cached is not None:
+        return cached
+    
     try:
         account_info = get_mt5_account_info()
-        return JsonResponse({
+        change_versions.record_snapshot('account', account_info)
+        return _with_etag(request, JsonResponse({
             'success': True,
             'account': account_info,
             'timestamp': int(__import__('time').time())
-        })
+        }), names)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -48,12 +83,19 @@ def live_all_data_api(request):
     """
     Combined API endpoint for all dashboard data
     """
+    names = (TRADES, SIGNALS, ACCOUNT)
+    cached = _conditional(request, names, ['positions', 'account'])
+    if cached is not None:
+        return cached
+    
     try:
         trades = get_active_trades()
         account_info = get_mt5_account_info()
         sts_signals = get_sts_signals()
+        change_versions.record_snapshot('positions', trades)
+        change_versions.record_snapshot('account', account_info)
         
-        return JsonResponse({
+        return _with_etag(request, JsonResponse({
             'success': True,
             'data': {
                 'trades': trades,
@@ -61,9 +103,87 @@ def live_all_data_api(request):
                 'sts_signals': sts_signals,
                 'timestamp': int(__import__('time').time())
             }
+        }), names)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+@require_GET
+def live_stream_api(request):
+    """
+    Server-Sent Events stream of live dashboard data
+    A full snapshot on connect, then only the changed trade/account fields
+    503 when this process already serves max_subscribers streams: the
+    EventSource closes and the dashboard polls instead
+    """
+    subscription = live_stream_hub.subscribe()
+    if subscription is None:
+        response = JsonResponse({'success': False, 'error': 'Live stream is full, use polling'}, status=503)
+        response['Retry-After'] = str(get_live_stream_config()['retry_ms'] // 1000)
+        return response
+
+    response = StreamingHttpResponse(live_stream_hub.stream(subscription), content_type='text/event-stream')
+    patch_cache_control(response, no_cache=True)
+    # Reverse proxies must not buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@csrf_exempt
+def pip_values_api(request):
+    """
+    API endpoint for pip and tick values of the whole symbol universe
+    Optional ?symbols=EURUSD,GBPJPY&lot_size=1.0
+    """
+    try:
+        from trading.pip_value_batch import get_bulk_pip_data
+        
+        symbols = [s.strip().upper() for s in request.GET.get('symbols', '').split(',') if s.strip()]
+        lot_size = float(request.GET.get('lot_size', 1.0))
+        
+        data = get_bulk_pip_data(symbols or None, lot_size=lot_size)
+        return JsonResponse({
+            'success': True,
+            'data': data,
+            'timestamp': int(__import__('time').time())
         })
     except Exception as e:
         return JsonResponse({
             'success': False,
             'error': str(e)
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+def notifications_api(request):
+    """
+    GET: unread count and latest notifications (ETag/304 until the next change)
+    POST: mark notifications read, {"ids": [...]} or all when omitted
+    (logged in users only, with the CSRF token)
+    """
+    from notifications.services import mark_read
+    from .utils import get_notification_summary
+    
+    try:
+        if request.method == 'POST':
+            if not request.user.is_authenticated:
+                return JsonResponse({'success': False, 'error': 'Authentication required'}, status=403)
+            payload = json.loads(request.body or b'{}')
+            updated = mark_read(request.user, payload.get('ids'))
+            return JsonResponse({'success': True, 'updated': updated})
+        
+        # Summaries are per user, so is the tag
+        etag = change_versions.make_etag(NOTIFICATIONS, scope=f'u{request.user.pk or 0}')
+        cached = change_versions.not_modified(request, etag)
+        if cached is not None:
+            return cached
+        
+        response = JsonResponse({'success': True, **get_notification_summary(request.user)})
+        if etag is not None:
+            response['ETag'] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
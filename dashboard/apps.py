@@ -6,4 +6,17 @@ class DashboardConfig(AppConfig):
     
     def ready(self):
         """Django käynnistyy - QA-ajastin poistettu väliaikaisesti"""
-        print("Dashboard ready - QA scheduler temporarily disabled")
\ No newline at end of file
+        from django.db.models.signals import post_delete, post_save
+        from trading.events import trades_changed
+        from trading.models import Trade
+        from .signal_feed import handle_signal_deleted, handle_signal_saved
+        from .snapshot import handle_trades_changed
+        
+        # Opened/closed trades show up on the next poll instead of after the snapshot TTL
+        trades_changed.connect(handle_trades_changed, sender=Trade, dispatch_uid='dashboard_snapshot_invalidate')
+        
+        # Recent-signal rings are kept current on write, so the dashboard never queries them
+        post_save.connect(handle_signal_saved, sender='signals.MQL5Signal', dispatch_uid='dashboard_signal_feed')
+        post_delete.connect(handle_signal_deleted, sender='signals.MQL5Signal', dispatch_uid='dashboard_signal_feed_delete')
+        
+        print("Dashboard ready - QA scheduler temporarily disabled")
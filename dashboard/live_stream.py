@@ -0,0 +1,266 @@
+"""
+Dashboard Live Stream
+Server-Sent Events push of position, P&L and account changes
+
+One producer thread reads the shared dashboard snapshot once per interval,
+diffs it against the previous state and fans the result out to every
+connected dashboard. Clients receive only the fields that changed; a full
+snapshot is sent on connect, every full_snapshot_every seconds and to any
+subscriber whose queue overflowed, so a client that missed events resyncs
+without reconnecting. The producer runs only while someone is subscribed,
+and its cost does not depend on the number of open tabs.
+
+Every open stream still holds a server thread, so the server must run a
+threaded worker class (see gunicorn.conf.py) and each process accepts at
+most max_subscribers streams; beyond that the endpoint answers 503 and the
+dashboard falls back to polling.
+
+Event payloads:
+    {"type": "snapshot", "seq": n, "trades": [...], "account": {...}, "sts_signals": [...]}
+    {"type": "diff", "seq": n, "account": {changed fields},
+     "trades": {"upsert": [{"id": ..., changed fields}], "removed": [ids]},
+     "sts_signals": [...]}          # only keys that changed are present
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_LIVE_STREAM_CONFIG = {
+    'interval': 2.0,              # seconds between producer reads
+    'full_snapshot_every': 30.0,  # seconds between resync snapshots
+    'heartbeat': 15.0,            # keep-alive comment when nothing was sent
+    'queue_size': 32,             # events buffered per subscriber before resync
+    'retry_ms': 3000,             # EventSource reconnect delay
+    'max_subscribers': 8,         # open streams per process, the rest poll
+}
+
+
+def get_live_stream_config():
+    return get_config('LIVE_STREAM_CONFIG', DEFAULT_LIVE_STREAM_CONFIG)
+
+
+def read_live_state() -> Dict:
+    """Current dashboard state in the live-data API format"""
+    from core import change_versions
+    from .utils import get_active_trades, get_mt5_account_info, get_sts_signals
+
+    trades = get_active_trades()
+    account = get_mt5_account_info()
+    # Keep ETag pollers in step with what the stream has seen
+    change_versions.record_snapshot('positions', trades)
+    change_versions.record_snapshot('account', account)
+    return {
+        'trades': trades,
+        'account': account,
+        'sts_signals': get_sts_signals(),
+    }
+
+
+def diff_state(previous: Dict, current: Dict) -> Optional[Dict]:
+    """
+    Changes from previous to current state, None if nothing changed
+
+    Account fields and trade fields are compared one by one; new trades are
+    sent whole, closed trades by id. The signal list is small and replaced
+    as a whole when it changes.
+    """
+    diff = {}
+
+    account = {
+        key: value for key, value in current['account'].items()
+        if previous['account'].get(key) != value
+    }
+    if account:
+        diff['account'] = account
+
+    previous_trades = {trade['id']: trade for trade in previous['trades']}
+    current_ids = set()
+    upsert = []
+    for trade in current['trades']:
+        current_ids.add(trade['id'])
+        before = previous_trades.get(trade['id'])
+        if before is None:
+            upsert.append(trade)
+            continue
+        changed = {key: value for key, value in trade.items() if before.get(key) != value}
+        if changed:
+            changed['id'] = trade['id']
+            upsert.append(changed)
+    removed = [trade_id for trade_id in previous_trades if trade_id not in current_ids]
+    if upsert or removed:
+        diff['trades'] = {'upsert': upsert, 'removed': removed}
+
+    if current['sts_signals'] != previous['sts_signals']:
+        diff['sts_signals'] = current['sts_signals']
+
+    return diff or None
+
+
+def format_event(event: Dict) -> str:
+    """SSE frame for an event"""
+    data = json.dumps(event, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+class LiveStreamSubscription:
+    """One connected client: a bounded queue of events"""
+
+    def __init__(self, maxsize: int):
+        self.events = queue.Queue(maxsize=maxsize)
+
+    def put(self, event: Dict, resync: Optional[Dict] = None):
+        """Queue an event; on overflow drop the backlog and queue the resync snapshot"""
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            while True:
+                try:
+                    self.events.get_nowait()
+                except queue.Empty:
+                    break
+            self.events.put_nowait(resync or event)
+
+    def get(self, timeout: float) -> Optional[Dict]:
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class LiveStreamHub:
+    """
+    Single producer, many subscribers
+
+    The producer thread is started by the first subscriber and exits once
+    the last one has left.
+    """
+
+    def __init__(self, reader=None):
+        self._reader = reader or read_live_state
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._thread: Optional[threading.Thread] = None
+        self._state: Optional[Dict] = None
+        self._seq = 0
+        self._last_full = 0.0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Optional[LiveStreamSubscription]:
+        """New subscription, or None when the process is at max_subscribers"""
+        config = get_live_stream_config()
+        subscription = LiveStreamSubscription(config['queue_size'])
+        with self._lock:
+            if len(self._subscribers) >= config['max_subscribers']:
+                return None
+            self._subscribers.add(subscription)
+            if self._state is not None:
+                subscription.put(self._snapshot_event())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='dashboard-live-stream', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: LiveStreamSubscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _snapshot_event(self) -> Dict:
+        return {'type': 'snapshot', 'seq': self._seq, **self._state}
+
+    def tick(self) -> Optional[Dict]:
+        """Read the state once and publish a snapshot or a diff (None if unchanged)"""
+        config = get_live_stream_config()
+        current = self._reader()
+
+        with self._lock:
+            previous = self._state
+            now = time.monotonic()
+            if previous is None or now - self._last_full >= config['full_snapshot_every']:
+                self._state = current
+                self._seq += 1
+                self._last_full = now
+                event = self._snapshot_event()
+                resync = event
+            else:
+                changes = diff_state(previous, current)
+                if changes is None:
+                    return None
+                self._state = current
+                self._seq += 1
+                event = {'type': 'diff', 'seq': self._seq, **changes}
+                resync = self._snapshot_event()
+
+            for subscription in self._subscribers:
+                subscription.put(event, resync)
+        return event
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    # Next subscriber starts from a fresh snapshot
+                    self._thread = None
+                    self._state = None
+                    return
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Live stream producer error: {e}")
+            time.sleep(get_live_stream_config()['interval'])
+
+    def stream(self, subscription: LiveStreamSubscription) -> 'LiveStreamFrames':
+        """SSE frames for one subscribed client; closing them releases the subscription"""
+        return LiveStreamFrames(self, subscription)
+
+    def frames(self, subscription: LiveStreamSubscription) -> Iterator[str]:
+        config = get_live_stream_config()
+        yield f"retry: {config['retry_ms']}\n\n"
+        while True:
+            event = subscription.get(timeout=config['heartbeat'])
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_event(event)
+
+
+class LiveStreamFrames:
+    """
+    Response iterator of one stream
+
+    The server calls close() when the response ends, also when the client
+    left before the first frame was written (a generator's finally would
+    not run then), so the subscriber slot is always given back.
+    """
+
+    def __init__(self, hub: LiveStreamHub, subscription: LiveStreamSubscription):
+        self._hub = hub
+        self._subscription = subscription
+        self._frames = hub.frames(subscription)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        return next(self._frames)
+
+    def close(self):
+        self._frames.close()
+        self._hub.unsubscribe(self._subscription)
+
+
+# Global live stream hub instance
+live_stream_hub = LiveStreamHub()
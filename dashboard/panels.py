@@ -0,0 +1,186 @@
+"""
+Dashboard Panels
+Independently loaded dashboard panels with per-panel TTL and timeout
+
+The dashboard page renders its shell (settings, system status) at once and
+each data panel - account, weekly performance, active trades, trade
+history, signals, notifications - is fetched from its own partial endpoint.
+
+A panel's context is cached for its ttl. When it has expired, the loader
+runs on a small worker pool and the request waits at most the panel's
+timeout: a slow source then gets its last good context (served as
+'stale') or a placeholder, and the loader keeps running so its result is
+ready for the client's retry. Loads are single-flight per panel, so a slow
+MT5 call is never started twice for the same panel.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.template.loader import render_to_string
+
+from core.config import get_config
+
+from . import utils
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DASHBOARD_PANEL_CONFIG = {
+    'workers': 4,
+    'stale_max_age': 3600,        # seconds a last good context may stand in for a slow source
+    # Per panel: seconds the context is current / seconds a request waits for a load
+    'account_summary': {'ttl': 2.0, 'timeout': 3.0},
+    'weekly_performance': {'ttl': 60.0, 'timeout': 5.0},
+    'active_trades': {'ttl': 2.0, 'timeout': 3.0},
+    'trade_history': {'ttl': 30.0, 'timeout': 5.0},
+    'signals': {'ttl': 5.0, 'timeout': 3.0},
+    'notifications': {'ttl': 10.0, 'timeout': 2.0},
+}
+
+CACHE_KEY_PREFIX = 'dashboard_panel:'
+
+# Panel states (X-Panel-Status header)
+FRESH = 'fresh'
+STALE = 'stale'
+PLACEHOLDER = 'placeholder'
+
+
+def get_dashboard_panel_config():
+    return get_config('DASHBOARD_PANEL_CONFIG', DEFAULT_DASHBOARD_PANEL_CONFIG)
+
+
+@dataclass(frozen=True)
+class DashboardPanel:
+    """A dashboard panel: its partial template and the context loader"""
+    name: str
+    title: str
+    template: str
+    loader: Callable[..., Dict]
+    variant: Optional[Callable[..., str]] = None
+    placeholder: Optional[str] = 'dashboard/panels/placeholder.html'
+
+    def cache_key(self, request, user_settings) -> str:
+        key = CACHE_KEY_PREFIX + self.name
+        if self.variant is not None:
+            key += ':' + self.variant(request, user_settings)
+        return key
+
+
+def _load_weekly_performance(request, user_settings):
+    account_info = utils.get_mt5_account_info()
+    return {'account_info': {
+        'weekly_performance': utils.get_weekly_performance(
+            balance=account_info.get('balance'),
+            threshold=float(user_settings['weekly_profit_threshold'])
+        )
+    }}
+
+
+PANELS = {panel.name: panel for panel in [
+    DashboardPanel(
+        'account_summary', 'Account Summary', 'dashboard/panels/account_summary.html',
+        lambda request, user_settings: {'account_info': utils.get_mt5_account_info()},
+    ),
+    DashboardPanel(
+        'weekly_performance', 'Weekly R:R Performance', 'dashboard/panels/weekly_performance.html',
+        _load_weekly_performance,
+        variant=lambda request, user_settings: str(user_settings['weekly_profit_threshold']),
+    ),
+    DashboardPanel(
+        'active_trades', 'Active Trades', 'dashboard/panels/active_trades.html',
+        lambda request, user_settings: {'trades': utils.get_active_trades()},
+    ),
+    DashboardPanel(
+        'trade_history', 'Trade History', 'dashboard/panels/trade_history.html',
+        lambda request, user_settings: {'closed_trades': utils.get_closed_trades()},
+    ),
+    DashboardPanel(
+        'signals', 'Trading Signals', 'dashboard/panels/signals.html',
+        lambda request, user_settings: {'signals': utils.get_recent_signals()},
+    ),
+    DashboardPanel(
+        'notifications', 'Notifications', 'dashboard/panels/notifications.html',
+        lambda request, user_settings: utils.get_notification_summary(request.user),
+        variant=lambda request, user_settings: str(request.user.pk or 'all'),
+        placeholder=None,
+    ),
+]}
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _inflight_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_dashboard_panel_config()['workers'], thread_name_prefix='dashboard-panel'
+            )
+        return _executor
+
+
+def _load(panel: DashboardPanel, key: str, request, user_settings) -> Dict:
+    try:
+        context = panel.loader(request, user_settings)
+        cache.set(key, {'context': context, 'at': time.time()}, get_dashboard_panel_config()['stale_max_age'])
+        return context
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        # Worker threads outlive the request; don't leave their connections open
+        connections.close_all()
+
+
+def get_panel_context(panel: DashboardPanel, request, user_settings) -> Tuple[Optional[Dict], str]:
+    """
+    Panel context and its state (FRESH, STALE or PLACEHOLDER with no context)
+    """
+    config = get_dashboard_panel_config()
+    options = config[panel.name]
+    key = panel.cache_key(request, user_settings)
+
+    cached = cache.get(key)
+    if cached is not None and time.time() - cached['at'] <= options['ttl']:
+        return cached['context'], FRESH
+
+    executor = _get_executor()
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = executor.submit(_load, panel, key, request, user_settings)
+            _inflight[key] = future
+
+    try:
+        return future.result(timeout=options['timeout']), FRESH
+    except FutureTimeout:
+        logger.warning(f"Dashboard panel {panel.name} exceeded {options['timeout']}s")
+    except Exception as e:
+        logger.warning(f"Dashboard panel {panel.name} failed: {e}")
+
+    if cached is not None:
+        return cached['context'], STALE
+    return None, PLACEHOLDER
+
+
+def render_panel(panel: DashboardPanel, request, user_settings) -> Tuple[str, str]:
+    """Panel HTML and its state"""
+    context, state = get_panel_context(panel, request, user_settings)
+    if context is None:
+        if panel.placeholder is None:
+            return '', state
+        html = render_to_string(panel.placeholder, {'title': panel.title, 'unavailable': True}, request=request)
+        return html, state
+
+    context = dict(context, user_settings=user_settings, panel_state=state)
+    return render_to_string(panel.template, context, request=request), state
@@ -69,6 +69,7 @@ class QAScheduler:
                     print("✅ QA tests completed successfully")
                 else:
                     print(f"⚠️ QA tests completed with warnings: {result.stderr}")
+                    self._notify_failure(f"QA tests exited with code {result.returncode}", result.stderr)
             else:
                 # Luo mock-tulokset jos skriptiä ei löydy
                 self._create_mock_results()
@@ -76,6 +77,15 @@ class QAScheduler:
         except Exception as e:
             print(f"❌ Failed to run QA tests: {e}")
             self._create_error_results(str(e))
+            self._notify_failure("QA tests could not be run", str(e))
+            
+    def _notify_failure(self, title, details):
+        """Ilmoita epäonnistuneesta QA-ajosta dashboardille"""
+        try:
+            from notifications.services import notify
+            notify('qa_failure', title, (details or '')[-2000:])
+        except Exception as e:
+            print(f"❌ QA failure notification failed: {e}")
             
     def _create_mock_results(self):
         """Luo mock-testitulokset"""
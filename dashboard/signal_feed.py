@@ -0,0 +1,234 @@
+"""
+Recent Signals Feed
+Bounded, newest-first rings of preformatted signals for the dashboard
+
+The dashboard's signal list and the STS panel each read a small ring of
+already formatted signal dicts from the Django cache (Redis when REDIS_URL
+is set, so every worker shares it). Reading a feed is one cache get and no
+database query. On a process-local cache a ring would miss every signal
+ingested by another process (gunicorn workers, run_signal_ingest), so
+there the feeds are read with their one query on every call instead
+(the change_versions rule).
+
+The rings are maintained on the write side: a saved signal is formatted
+once and put at the front of every feed it belongs to (or replaced in
+place when its status changes), and bulk ingestion pushes its signals
+explicitly. A feed that is missing from the cache - cold start, eviction,
+deleted signal - is rebuilt with a single query. Rings expire after
+timeout seconds so changes made outside the ORM's save() are picked up.
+
+Pushes are read-modify-write on one key, so concurrent writers (ingest
+worker threads, other processes) are serialized by a cache.add mutex. A
+writer that cannot get it within lock_timeout drops the ring instead,
+which the next read rebuilds.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from core import change_versions
+from core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SIGNAL_FEED_CONFIG = {
+    'recent_size': 10,            # dashboard signal list
+    'sts_size': 20,               # STS panel
+    'timeout': 300,               # seconds before a feed is rebuilt from the database
+    'lock_timeout': 5.0,          # seconds a push may hold (and wait for) the feed lock
+}
+
+CACHE_KEY_PREFIX = 'signal_feed:'
+LOCK_POLL_INTERVAL = 0.01
+
+FEED_FIELDS = [
+    'id', 'symbol', 'direction', 'entry_price', 'stop_loss', 'take_profit', 'status',
+    'timeframe_combination', 'signal_strength', 'source_name', 'raw_signal_data', 'received_at',
+]
+
+
+def get_signal_feed_config():
+    return get_config('SIGNAL_FEED_CONFIG', DEFAULT_SIGNAL_FEED_CONFIG)
+
+
+def _raw_data(signal) -> Dict:
+    raw_data = signal.raw_signal_data or {}
+    if isinstance(raw_data, str):
+        try:
+            raw_data = json.loads(raw_data)
+        except ValueError:
+            raw_data = {}
+    return raw_data if isinstance(raw_data, dict) else {}
+
+
+def format_recent_signal(signal) -> Dict:
+    """Dashboard signal list format"""
+    return {
+        'id': signal.id,
+        'symbol': signal.symbol,
+        'direction': signal.direction,  # Maps to BUY/SELL
+        'strength': 0.75 if (signal.signal_strength or '').lower() == 'medium' else 0.85,
+        'entry': float(signal.entry_price),
+        'sl': float(signal.stop_loss),
+        'tp': float(signal.take_profit),
+        'status': signal.status,
+        'source': signal.source_name,
+        'timestamp': 'Just now',  # Placeholder
+        'timeframe': signal.timeframe_combination or 'H1/M15',
+        'rr_strategy': '1:2',
+        'weekly_performance': 0,
+        'llm_analysis': {
+            'reasoning': _raw_data(signal).get('reasoning', 'Analysis pending'),
+            'confidence': 0.75,
+            'break_even_price': None,
+            'halfway_tp': None
+        }
+    }
+
+
+def format_sts_signal(signal) -> Dict:
+    """STS panel format"""
+    return {
+        'id': signal.id,
+        'symbol': signal.symbol,
+        'direction': signal.direction,
+        'entry': float(signal.entry_price),
+        'sl': float(signal.stop_loss),
+        'tp': float(signal.take_profit),
+        'status': signal.status,
+        'profit': 0.0,  # TODO: Calculate actual profit from executed trades
+        'timestamp': 'Just now',  # Placeholder
+        'source': 'STS_SIGNALS'
+    }
+
+
+@dataclass(frozen=True)
+class SignalFeed:
+    """A newest-first ring of formatted signals, optionally for one source"""
+    name: str
+    size_key: str
+    formatter: Callable
+    source_name: Optional[str] = None
+
+    @property
+    def cache_key(self) -> str:
+        return CACHE_KEY_PREFIX + self.name
+
+    @property
+    def size(self) -> int:
+        return get_signal_feed_config()[self.size_key]
+
+    @property
+    def lock_key(self) -> str:
+        return self.cache_key + ':lock'
+
+    def accepts(self, signal) -> bool:
+        return self.source_name is None or signal.source_name == self.source_name
+
+    def load(self) -> List[Dict]:
+        """The feed from the database (one query)"""
+        from signals.models import MQL5Signal
+
+        queryset = MQL5Signal.objects.only(*FEED_FIELDS).order_by('-received_at')
+        if self.source_name is not None:
+            queryset = queryset.filter(source_name=self.source_name)
+        return [self.formatter(signal) for signal in queryset[:self.size]]
+
+    def rebuild(self) -> List[Dict]:
+        """Load the ring from the database and cache it"""
+        entries = self.load()
+        cache.set(self.cache_key, entries, get_signal_feed_config()['timeout'])
+        return entries
+
+    def read(self) -> List[Dict]:
+        if not change_versions.etags_enabled():
+            # Process-local cache: other processes' pushes never reach this ring
+            return self.load()
+        entries = cache.get(self.cache_key)
+        if entries is None:
+            entries = self.rebuild()
+        return entries
+
+    def _acquire(self, timeout: float) -> bool:
+        # cache.add is atomic: only one writer creates the lock key
+        deadline = time.monotonic() + timeout
+        while not cache.add(self.lock_key, True, timeout=max(1, int(timeout))):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LOCK_POLL_INTERVAL)
+        return True
+
+    def push(self, signals: Iterable, created: bool = True):
+        """Put new signals at the front, replace changed ones in place"""
+        signals = [signal for signal in signals if self.accepts(signal)]
+        if not signals or not change_versions.etags_enabled():
+            return
+        config = get_signal_feed_config()
+        if not self._acquire(config['lock_timeout']):
+            logger.warning(f"Signal feed {self.name} lock timed out, dropping the ring")
+            self.invalidate()
+            return
+
+        try:
+            entries = cache.get(self.cache_key)
+            if entries is None:
+                return  # Rebuilt on the next read
+
+            positions = {entry['id']: index for index, entry in enumerate(entries)}
+            new_entries = []
+            for signal in signals:
+                entry = self.formatter(signal)
+                if signal.id in positions:
+                    entries[positions[signal.id]] = entry
+                elif created:
+                    new_entries.append(entry)
+                # An update to a signal that already left the ring changes nothing
+
+            new_entries.reverse()  # Last pushed is newest
+            entries = (new_entries + entries)[:self.size]
+            cache.set(self.cache_key, entries, config['timeout'])
+        finally:
+            cache.delete(self.lock_key)
+
+    def invalidate(self):
+        cache.delete(self.cache_key)
+
+
+RECENT_SIGNALS = SignalFeed('recent', 'recent_size', format_recent_signal)
+STS_SIGNALS = SignalFeed('sts', 'sts_size', format_sts_signal, source_name='STS_SIGNALS')
+
+FEEDS = [RECENT_SIGNALS, STS_SIGNALS]
+
+
+def push_signals(signals: Iterable, created: bool = True):
+    """Add signals to every feed they belong to (use after bulk_create)"""
+    signals = list(signals)
+    for feed in FEEDS:
+        try:
+            feed.push(signals, created=created)
+        except Exception as e:
+            logger.warning(f"Signal feed {feed.name} update failed: {e}")
+            feed.invalidate()
+
+
+def invalidate_feeds():
+    """Drop every feed; each is rebuilt on its next read"""
+    for feed in FEEDS:
+        feed.invalidate()
+
+
+def handle_signal_saved(sender, instance, created=False, **kwargs):
+    """post_save receiver for MQL5Signal"""
+    transaction.on_commit(lambda: push_signals([instance], created=created))
+
+
+def handle_signal_deleted(sender, instance, **kwargs):
+    """post_delete receiver for MQL5Signal: the ring is refilled from the database"""
+    transaction.on_commit(invalidate_feeds)
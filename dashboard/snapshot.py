@@ -0,0 +1,165 @@
+"""
+Dashboard Snapshot Service
+One MT5 round trip per refresh, shared by every dashboard view and live API
+
+The dashboard needs the account, the open positions (priced from their
+ticks) and the recently closed trades. All of it is collected under a
+single borrow of the shared MT5 session and kept in memory for a short
+TTL, so any number of browser tabs polling any of the live endpoints cost
+one terminal round trip per TTL.
+
+Refreshes are single-flight: one thread collects while the others keep
+serving the previous snapshot (if it is within stale_grace seconds) or wait
+for the new one, so an expired snapshot never triggers a burst of
+concurrent MT5 reads. When MT5 is unavailable the fallback snapshot is
+cached for the same TTL instead of being retried on every request.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DASHBOARD_SNAPSHOT_CONFIG = {
+    'ttl': 2.0,                   # seconds a snapshot is served as current
+    'stale_grace': 30.0,          # serve an older snapshot while another thread refreshes
+    'refresh_timeout': 15.0,      # seconds to wait for a refresh in progress
+    'closed_trades_days': 7,
+}
+
+# Shown when MT5 cannot be reached (same values the dashboard always fell back to)
+MOCK_ACCOUNT = {
+    'balance': 10000.00,
+    'equity': 10245.67,
+    'margin': 150.00,
+    'free_margin': 10095.67,
+    'margin_level': 6830.45,
+    'profit': 245.67,
+    'source': 'mock'
+}
+
+
+def get_dashboard_snapshot_config():
+    return get_config('DASHBOARD_SNAPSHOT_CONFIG', DEFAULT_DASHBOARD_SNAPSHOT_CONFIG)
+
+
+@dataclass
+class DashboardSnapshot:
+    """Everything the dashboard reads from MT5 at one point in time"""
+    account: Dict
+    positions: List[Dict] = field(default_factory=list)
+    closed_trades: List[Dict] = field(default_factory=list)
+    mt5_connected: bool = False
+    taken_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at
+
+
+def _format_account(account_info: Dict) -> Dict:
+    return {
+        'balance': float(account_info['balance']),
+        'equity': float(account_info['equity']),
+        'margin': float(account_info['margin']),
+        'free_margin': float(account_info['free_margin']),
+        'margin_level': float(account_info['margin_level']),
+        'profit': float(account_info['profit'])
+    }
+
+
+def collect_snapshot() -> DashboardSnapshot:
+    """Read account, positions, ticks and new deals in one MT5 session borrow"""
+    from trading.deal_reconciliation import get_closed_positions, reconcile_if_stale
+    from trading.mt5_session import mt5_session
+    from .mt5_sync import read_positions
+
+    config = get_dashboard_snapshot_config()
+    snapshot = DashboardSnapshot(account=dict(MOCK_ACCOUNT))
+
+    try:
+        with mt5_session() as executor:
+            account_info = executor.get_account_info()
+            if account_info:
+                snapshot.account = _format_account(account_info)
+            snapshot.positions = read_positions(executor) or []
+            snapshot.mt5_connected = True
+
+            # Deal history: only deals newer than the watermark (re-entrant borrow)
+            reconcile_if_stale()
+    except Exception as e:
+        logger.warning(f"Dashboard snapshot: MT5 unavailable ({e})")
+
+    try:
+        snapshot.closed_trades = get_closed_positions(days=config['closed_trades_days'], limit=20)
+    except Exception as e:
+        logger.warning(f"Dashboard snapshot: closed trades unavailable ({e})")
+
+    snapshot.taken_at = time.monotonic()
+    return snapshot
+
+
+class DashboardSnapshotService:
+    """
+    TTL cache with single-flight refresh around collect_snapshot()
+    """
+
+    def __init__(self, collector=None):
+        self._collector = collector or collect_snapshot
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._refresh_lock = threading.Lock()
+
+    def get(self, max_age: Optional[float] = None) -> DashboardSnapshot:
+        """Current snapshot, refreshed if older than max_age (config ttl)"""
+        config = get_dashboard_snapshot_config()
+        if max_age is None:
+            max_age = config['ttl']
+
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age <= max_age:
+            return snapshot
+
+        # Someone else is refreshing: a recent enough snapshot beats waiting
+        if not self._refresh_lock.acquire(blocking=False):
+            if snapshot is not None and snapshot.age <= config['stale_grace']:
+                return snapshot
+            if not self._refresh_lock.acquire(timeout=config['refresh_timeout']):
+                if snapshot is not None:
+                    return snapshot
+                return DashboardSnapshot(account=dict(MOCK_ACCOUNT))
+
+        try:
+            # The refresh we waited for may have produced a fresh snapshot
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.age <= max_age:
+                return snapshot
+
+            snapshot = self._collector()
+            self._snapshot = snapshot
+            return snapshot
+        finally:
+            self._refresh_lock.release()
+
+    def invalidate(self):
+        """Drop the cached snapshot (e.g. after placing or closing a trade)"""
+        self._snapshot = None
+
+
+# Global snapshot service instance
+dashboard_snapshots = DashboardSnapshotService()
+
+
+def get_dashboard_snapshot(max_age: Optional[float] = None) -> DashboardSnapshot:
+    """Shared dashboard snapshot (see DashboardSnapshotService.get)"""
+    return dashboard_snapshots.get(max_age)
+
+
+def handle_trades_changed(sender, **kwargs):
+    """trades_changed receiver: positions and closed trades may have moved"""
+    dashboard_snapshots.invalidate()
@@ -6,6 +6,7 @@ app_name = 'dashboard'
 urlpatterns = [
     path('', views.index_view, name='index'),
     path('main/', views.dashboard_view, name='dashboard'),
+    path('panels/<slug:panel>/', views.dashboard_panel_view, name='dashboard_panel'),
     path('settings/', views.settings_view, name='settings'),
     path('qa/', views.qa_dashboard_view, name='qa_dashboard'),
     path('hello/', views.hello_dashboard, name='hello_dashboard'),
@@ -17,4 +18,7 @@ urlpatterns = [
     path('api/live-trades/', api_views.live_trades_api, name='live_trades_api'),
     path('api/live-account/', api_views.live_account_api, name='live_account_api'),
     path('api/live-data/', api_views.live_all_data_api, name='live_data_api'),
+    path('api/live-stream/', api_views.live_stream_api, name='live_stream_api'),
+    path('api/pip-values/', api_views.pip_values_api, name='pip_values_api'),
+    path('api/notifications/', api_views.notifications_api, name='notifications_api'),
 ]
\ No newline at end of file
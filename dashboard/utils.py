@@ -2,7 +2,6 @@
 Utility functions for dashboard data handling and real data integration
 """
 from datetime import datetime
-import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,37 +10,11 @@ logger = logging.getLogger(__name__)
 def get_mt5_account_info():
     """
     Fetch MT5 account information
-    Integrates with real MT5 connection when available
+    Read from the shared dashboard snapshot (mock data when MT5 is unavailable)
     """
-    try:
-        # Try to get real MT5 data
-        from trading.mt5_executor import MT5Executor
-        
-        executor = MT5Executor()
-        if executor.connect():
-            account_info = executor.get_account_info()
-            if account_info:
-                return {
-                    'balance': float(account_info.balance),
-                    'equity': float(account_info.equity),
-                    'margin': float(account_info.margin),
-                    'free_margin': float(account_info.margin_free),
-                    'margin_level': float(account_info.margin_level),
-                    'profit': float(account_info.profit)
-                }
-    except Exception as e:
-        logger.warning(f"Failed to get real MT5 data: {e}")
+    from .snapshot import get_dashboard_snapshot
     
-    # Fallback to mock data
-    return {
-        'balance': 10000.00,
-        'equity': 10245.67,
-        'margin': 150.00,
-        'free_margin': 10095.67,
-        'margin_level': 6830.45,
-        'profit': 245.67,
-        'source': 'mock'
-    }
+    return dict(get_dashboard_snapshot().account)
 
 
 def get_active_trades():
@@ -51,10 +24,10 @@ def get_active_trades():
     """
     try:
         # Import here to avoid circular imports
-        from .mt5_sync import get_mt5_live_trades
+        from .snapshot import get_dashboard_snapshot
         
-        # Get live trades from MT5
-        mt5_trades = get_mt5_live_trades()
+        # Live positions from the shared dashboard snapshot
+        mt5_trades = get_dashboard_snapshot().positions
         
         # Convert to dashboard format
         formatted_trades = []
@@ -90,10 +63,11 @@ def get_active_trades():
 def get_closed_trades():
     """
     Fetch recent closed trades from MT5
+    Read from the shared dashboard snapshot (local deal cache)
     """
     try:
-        from .mt5_sync import get_mt5_closed_trades
-        return get_mt5_closed_trades(days=7)
+        from .snapshot import get_dashboard_snapshot
+        return [dict(trade) for trade in get_dashboard_snapshot().closed_trades]
     except Exception as e:
         logger.warning(f"Failed to get closed trades: {e}")
         return []
@@ -101,47 +75,13 @@ def get_closed_trades():
 
 def get_sts_signals():
     """
-    Fetch recent STS (Simple Trading Solutions) signals from database
-    Returns signals from the STS_SIGNALS source
+    Recent STS (Simple Trading Solutions) signals
+    Read from the preformatted STS signal feed (no query on a warm feed)
     """
     try:
-        from signals.models import MQL5Signal
-        
-        # Get only STS signals (Simple Trading Solutions signals)
-        signals = MQL5Signal.objects.filter(
-            source_name='STS_SIGNALS'
-        ).order_by('-id')[:20].values(
-            'id', 'symbol', 'direction', 'entry_price', 'stop_loss', 
-            'take_profit', 'status', 'signal_strength', 'raw_signal_data'
-        )
-        
-        # Convert to expected format
-        formatted_signals = []
-        for signal in signals:
-            # Parse raw signal data if available
-            raw_data = signal.get('raw_signal_data') or {}
-            if isinstance(raw_data, str):
-                try:
-                    raw_data = json.loads(raw_data)
-                except:
-                    raw_data = {}
-            elif raw_data is None:
-                raw_data = {}
-            
-            formatted_signals.append({
-                'id': signal['id'],
-                'symbol': signal['symbol'],
-                'direction': signal['direction'],
-                'entry': float(signal['entry_price']),
-                'sl': float(signal['stop_loss']),
-                'tp': float(signal['take_profit']),
-                'status': signal['status'],
-                'profit': 0.0,  # TODO: Calculate actual profit from executed trades
-                'timestamp': 'Just now',  # Placeholder
-                'source': 'STS_SIGNALS'
-            })
+        from .signal_feed import STS_SIGNALS
         
-        return formatted_signals
+        return list(STS_SIGNALS.read())
             
     except Exception as e:
         logger.warning(f"Failed to get STS signals data: {e}")
@@ -149,64 +89,16 @@ def get_sts_signals():
 
 def get_recent_signals():
     """
-    Fetch recent signals from database
-    Integrates with real database when available
+    Recent signals, newest first
+    Read from the preformatted signal feed (no query on a warm feed)
     """
     try:
-        # Try to get real signals from database
-        from signals.models import MQL5Signal
-        
-        signals = MQL5Signal.objects.all().order_by('-id')[:10].values(
-            'id', 'symbol', 'direction', 'entry_price', 'stop_loss', 
-            'take_profit', 'status', 'timeframe_combination',
-            'signal_strength', 'raw_signal_data'
-        )
-        
-        # Convert to expected format
-        formatted_signals = []
-        for signal in signals:
-            # Parse raw signal data if available
-            raw_data = signal.get('raw_signal_data') or {}
-            if isinstance(raw_data, str):
-                try:
-                    raw_data = json.loads(raw_data)
-                except:
-                    raw_data = {}
-            elif raw_data is None:
-                raw_data = {}
-            
-            # Get signals from database with source info
-            from signals.models import MQL5Signal
-            signal_obj = MQL5Signal.objects.get(id=signal['id'])
-            
-            formatted_signals.append({
-                'id': signal['id'],
-                'symbol': signal['symbol'],
-                'direction': signal['direction'],  # Maps to BUY/SELL
-                'strength': 0.75 if signal.get('signal_strength', '').lower() == 'medium' else 0.85,
-                'entry': float(signal['entry_price']),
-                'sl': float(signal['stop_loss']),
-                'tp': float(signal['take_profit']),
-                'status': signal['status'],
-                'source': signal_obj.source_name,  # Add source information
-                'timestamp': 'Just now',  # Placeholder since created field doesn't exist
-                'timeframe': signal.get('timeframe_combination', 'H1/M15'),
-                'rr_strategy': '1:2',
-                'weekly_performance': 0,
-                'llm_analysis': {
-                    'reasoning': raw_data.get('reasoning', 'Analysis pending'),
-                    'confidence': 0.75,
-                    'break_even_price': None,
-                    'halfway_tp': None
-                }
-            })
+        from .signal_feed import RECENT_SIGNALS
         
-        if formatted_signals:
-            return formatted_signals
+        return list(RECENT_SIGNALS.read())
             
     except Exception as e:
         logger.warning(f"Failed to get real signals data: {e}")
-        print(f"DEBUG: Error getting signals: {e}")  # Debug print
     
     # Return empty list instead of mock data
     return []
@@ -245,56 +137,40 @@ def get_system_status():
         }
 
 
-def get_weekly_performance():
+def get_weekly_performance(balance=None, threshold=10.0):
     """
-    Calculate weekly performance for R:R strategy
-    Will be replaced with real calculations in OSA 4
+    Weekly performance per symbol for the R:R strategy
+    Read from the analytics weekly rollups (one row per symbol)
     """
     try:
-        # TODO: Implement real weekly performance calculation
-        # - Query trades from last 7 days
-        # - Calculate P&L percentage per symbol
-        # - Determine if upgrade to 1:2 R:R is warranted (≥10%)
+        from analytics.rollups import get_weekly_performance as get_rollup_performance
+        from notifications.services import notify_rr_upgrades
         
-        return {
-            'EURUSD': {'pct': 12.3, 'trades': 4, 'upgraded': True},
-            'GBPUSD': {'pct': 8.5, 'trades': 3, 'upgraded': False},
-            'USDJPY': {'pct': 15.2, 'trades': 5, 'upgraded': True}
-        }
+        performance = get_rollup_performance(balance=balance, threshold=threshold)
+        notify_rr_upgrades(performance)
+        return performance
     except Exception as e:
+        logger.warning(f"Failed to get weekly performance: {e}")
         return {}
 
 
-def get_notifications():
+def get_notifications(user=None):
+    """
+    Latest notifications of the user (and everyone's), newest first
+    """
+    return get_notification_summary(user)['notifications']
+
+
+def get_notification_summary(user=None):
     """
-    Fetch recent notifications
-    Will be replaced with real database query in OSA 4
+    Unread count and latest notifications, cached until the next change
     """
     try:
-        # TODO: Implement real notifications system
-        # from notifications.models import Notification
-        # return Notification.objects.filter(user=request.user).order_by('-created_at')[:10]
-        
-        return [
-            {
-                'id': 1,
-                'type': 'rr_upgrade',
-                'title': 'R:R Strategy Upgraded - EURUSD',
-                'message': '🎯 EURUSD R:R STRATEGY UPGRADED! Weekly profit 12.3% ≥ 10% → Now using 1:2 R:R with break-even logic',
-                'timestamp': '2025-01-18 14:30:00',
-                'read': False
-            },
-            {
-                'id': 2,
-                'type': 'timeframe_change',
-                'title': 'Timeframe Updated - GBPUSD',
-                'message': 'PURE EA timeframe changed to M15/M5 for enhanced scalping',
-                'timestamp': '2025-01-18 13:15:00',
-                'read': True
-            }
-        ]
+        from notifications.services import get_notification_summary as get_cached_summary
+        return get_cached_summary(user)
     except Exception as e:
-        return []
+        logger.warning(f"Failed to get notifications: {e}")
+        return {'unread_count': 0, 'notifications': []}
 
 
 def get_process_flow():
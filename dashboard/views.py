@@ -1,98 +1,87 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
 from django.views.decorators.csrf import csrf_exempt
 import json
 from datetime import datetime
 from .utils import (
     get_mt5_account_info,
-    get_active_trades, 
-    get_closed_trades,
-    get_recent_signals,
     get_system_status,
-    get_weekly_performance,
-    get_notifications,
-    get_process_flow
 )
 
 
+def get_dashboard_settings(request):
+    """
+    Dashboard settings of the user (session values for anonymous users)
+    """
+    # Get user settings for dashboard display
+    from core.models import UserSettings
+
+    if request.user.is_authenticated:
+        user_settings, created = UserSettings.objects.get_or_create(
+            user=request.user,
+            defaults={'currency_pair': 'EURUSD', 'risk_percentage': 1.0}
+        )
+        current_settings = {
+            'currency_pair': user_settings.currency_pair,
+            'risk_percentage': float(user_settings.risk_percentage),
+            'stop_loss_level': float(user_settings.stop_loss_level),
+            'weekly_profit_threshold': float(user_settings.weekly_profit_threshold),
+            'break_even_buffer_pips': float(user_settings.break_even_buffer_pips),
+            'trade_london': user_settings.trade_london,
+            'trade_new_york': user_settings.trade_new_york,
+            'trade_tokyo': user_settings.trade_tokyo,
+            'notification_email': user_settings.notification_email or '',
+            'notification_email_enabled': user_settings.notification_email_enabled,
+            'metaquotes_id': user_settings.metaquotes_id or '',
+            'metaquotes_enabled': user_settings.metaquotes_enabled,
+            'telegram_username': user_settings.telegram_username or '',
+            'telegram_enabled': user_settings.telegram_enabled,
+            'sms_phone': user_settings.sms_phone or '',
+            'sms_enabled': user_settings.sms_enabled,
+            'notification_email': user_settings.notification_email or '',
+            'notification_email_enabled': user_settings.notification_email_enabled,
+            'metaquotes_id': user_settings.metaquotes_id or '',
+            'metaquotes_enabled': user_settings.metaquotes_enabled,
+            'telegram_username': user_settings.telegram_username or '',
+            'telegram_enabled': user_settings.telegram_enabled,
+            'sms_phone': user_settings.sms_phone or '',
+            'sms_enabled': user_settings.sms_enabled,
+            'adx_value': 27  # Mock ADX value - will be replaced with real data later
+        }
+    else:
+        # For anonymous users, use session
+        current_settings = {
+            'currency_pair': request.session.get('currency_pair', 'EURUSD'),
+            'risk_percentage': request.session.get('risk_percentage', 1.0),
+            'stop_loss_level': request.session.get('stop_loss_level', 0.28),
+            'weekly_profit_threshold': request.session.get('weekly_profit_threshold', 10.0),
+            'break_even_buffer_pips': request.session.get('break_even_buffer_pips', 2.0),
+            'trade_london': request.session.get('trade_london', False),  # London nyt OFF 
+            'trade_new_york': request.session.get('trade_new_york', True),   # NY ON
+            'trade_tokyo': request.session.get('trade_tokyo', True),        # Tokyo ON (testasit tämän)
+            'notification_email': request.session.get('notification_email', ''),
+            'notification_email_enabled': request.session.get('notification_email_enabled', True),
+            'metaquotes_id': request.session.get('metaquotes_id', ''),
+            'metaquotes_enabled': request.session.get('metaquotes_enabled', False),
+            'telegram_username': request.session.get('telegram_username', ''),
+            'telegram_enabled': request.session.get('telegram_enabled', False),
+            'sms_phone': request.session.get('sms_phone', ''),
+            'sms_enabled': request.session.get('sms_enabled', False),
+            'adx_value': 27  # Mock ADX value for anonymous users
+        }
+    return current_settings
+
+
 def dashboard_view(request):
     """
     Main dashboard view that displays the MikroBot trading dashboard
-    Integrates real data functions with fallback to mock data
+    Renders the shell at once; data panels load from dashboard_panel_view
     """
     try:
-        # Get user settings for dashboard display
-        from core.models import UserSettings
-        
-        if request.user.is_authenticated:
-            user_settings, created = UserSettings.objects.get_or_create(
-                user=request.user,
-                defaults={'currency_pair': 'EURUSD', 'risk_percentage': 1.0}
-            )
-            current_settings = {
-                'currency_pair': user_settings.currency_pair,
-                'risk_percentage': float(user_settings.risk_percentage),
-                'stop_loss_level': float(user_settings.stop_loss_level),
-                'weekly_profit_threshold': float(user_settings.weekly_profit_threshold),
-                'break_even_buffer_pips': float(user_settings.break_even_buffer_pips),
-                'trade_london': user_settings.trade_london,
-                'trade_new_york': user_settings.trade_new_york,
-                'trade_tokyo': user_settings.trade_tokyo,
-                'notification_email': user_settings.notification_email or '',
-                'notification_email_enabled': user_settings.notification_email_enabled,
-                'metaquotes_id': user_settings.metaquotes_id or '',
-                'metaquotes_enabled': user_settings.metaquotes_enabled,
-                'telegram_username': user_settings.telegram_username or '',
-                'telegram_enabled': user_settings.telegram_enabled,
-                'sms_phone': user_settings.sms_phone or '',
-                'sms_enabled': user_settings.sms_enabled,
-                'notification_email': user_settings.notification_email or '',
-                'notification_email_enabled': user_settings.notification_email_enabled,
-                'metaquotes_id': user_settings.metaquotes_id or '',
-                'metaquotes_enabled': user_settings.metaquotes_enabled,
-                'telegram_username': user_settings.telegram_username or '',
-                'telegram_enabled': user_settings.telegram_enabled,
-                'sms_phone': user_settings.sms_phone or '',
-                'sms_enabled': user_settings.sms_enabled,
-                'adx_value': 27  # Mock ADX value - will be replaced with real data later
-            }
-        else:
-            # For anonymous users, use session
-            current_settings = {
-                'currency_pair': request.session.get('currency_pair', 'EURUSD'),
-                'risk_percentage': request.session.get('risk_percentage', 1.0),
-                'stop_loss_level': request.session.get('stop_loss_level', 0.28),
-                'weekly_profit_threshold': request.session.get('weekly_profit_threshold', 10.0),
-                'break_even_buffer_pips': request.session.get('break_even_buffer_pips', 2.0),
-                'trade_london': request.session.get('trade_london', False),  # London nyt OFF 
-                'trade_new_york': request.session.get('trade_new_york', True),   # NY ON
-                'trade_tokyo': request.session.get('trade_tokyo', True),        # Tokyo ON (testasit tämän)
-                'notification_email': request.session.get('notification_email', ''),
-                'notification_email_enabled': request.session.get('notification_email_enabled', True),
-                'metaquotes_id': request.session.get('metaquotes_id', ''),
-                'metaquotes_enabled': request.session.get('metaquotes_enabled', False),
-                'telegram_username': request.session.get('telegram_username', ''),
-                'telegram_enabled': request.session.get('telegram_enabled', False),
-                'sms_phone': request.session.get('sms_phone', ''),
-                'sms_enabled': request.session.get('sms_enabled', False),
-                'adx_value': 27  # Mock ADX value for anonymous users
-            }
-        
-        # Attempt to get real data (will fall back to mock data in utils.py)
-        account_info = get_mt5_account_info()
-        weekly_performance = get_weekly_performance()
-        
-        # Combine account info with weekly performance
-        account_info['weekly_performance'] = weekly_performance
-        
         context = {
-            'account_info': account_info,
             'system_status': get_system_status(),
-            'user_settings': current_settings,
-            'trades': get_active_trades(),
-            'closed_trades': get_closed_trades(),
-            'signals': get_recent_signals(),
-            'notifications': get_notifications()
+            'user_settings': get_dashboard_settings(request),
         }
         
         return render(request, 'dashboard/dashboard.html', context)
@@ -100,15 +89,6 @@ def dashboard_view(request):
     except Exception as e:
         # Fallback to basic mock data if everything fails
         context = {
-            'account_info': {
-                'balance': 0.00,
-                'equity': 0.00,
-                'margin': 0.00,
-                'free_margin': 0.00,
-                'profit': 0.00,
-                'weekly_performance': {},
-                'error': 'Data unavailable'
-            },
             'system_status': {
                 'django': True,
                 'mt5': False,
@@ -136,15 +116,29 @@ def dashboard_view(request):
                 'sms_phone': '',
                 'sms_enabled': False,
                 'adx_value': 24  # Mock ADX value for error fallback (shows red)
-            },
-            'trades': [],
-            'signals': [],
-            'notifications': []
+            }
         }
         
         return render(request, 'dashboard/dashboard.html', context)
 
 
+def dashboard_panel_view(request, panel):
+    """
+    One dashboard panel as an HTML fragment
+    X-Panel-Status tells the page whether to retry (stale/placeholder)
+    """
+    from .panels import PANELS, render_panel
+    
+    if panel not in PANELS:
+        raise Http404(f"Unknown dashboard panel: {panel}")
+    
+    html, state = render_panel(PANELS[panel], request, get_dashboard_settings(request))
+    response = HttpResponse(html)
+    response['X-Panel-Status'] = state
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
 def qa_dashboard_view(request):
     """
     QA Dashboard for testing and development
@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration for MikroBot MCP
+gunicorn mikrobot_mcp.wsgi -c gunicorn.conf.py
+
+Dashboard live streams (Server-Sent Events) keep their request open for as
+long as the tab is, so sync workers would be starved by a few tabs. gthread
+workers serve every connection from its own thread; LIVE_STREAM_MAX_SUBSCRIBERS
+must stay below GUNICORN_THREADS so the other requests keep threads of their own.
+"""
+
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+
+# Open streams send a keep-alive every 15s; the timeout only applies to the worker heartbeat
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
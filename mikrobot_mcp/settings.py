@@ -97,6 +97,28 @@ DATABASES = {
 }
 
 
+# Cache
+# Change versions (ETags), signal feeds, dashboard panels and the tick mirror
+# must be shared by every gunicorn worker: set REDIS_URL in production.
+# Without it each process has its own LocMem cache (development server).
+
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -188,6 +210,105 @@ MT5_CONFIG = {
     'magic_number': 20250117,
 }
 
+# Execution backend: 'mt5' (MetaTrader 5 terminal) or 'paper' (simulated fills)
+EXECUTION_BACKEND = os.getenv('EXECUTION_BACKEND', 'mt5')
+
+# Module configuration overrides
+# Each module keeps its defaults in DEFAULT_X_CONFIG (merged by
+# core.config.get_config); only keys set in the environment are overridden here.
+
+
+def _env_overrides(**variables):
+    """{key: cast(value)} for each key=(ENV_VARIABLE, cast) that is set"""
+    return {
+        key: cast(os.environ[name])
+        for key, (name, cast) in variables.items()
+        if name in os.environ
+    }
+
+
+def _env_flag(value):
+    return value.lower() == 'true'
+
+
+def _env_list(value):
+    return [item for item in value.split(',') if item]
+
+
+PAPER_TRADING_CONFIG = {
+    **_env_overrides(
+        tick_source=('PAPER_TICK_SOURCE', str),
+        recorded_ticks_path=('PAPER_TICKS_PATH', str),
+    ),
+    'account': _env_overrides(
+        currency=('PAPER_ACCOUNT_CURRENCY', str),
+        balance=('PAPER_ACCOUNT_BALANCE', float),
+    ),
+    'latency': _env_overrides(
+        model=('PAPER_LATENCY_MODEL', str),
+        ms=('PAPER_LATENCY_MS', float),
+    ),
+    'slippage': _env_overrides(
+        model=('PAPER_SLIPPAGE_MODEL', str),
+        points=('PAPER_SLIPPAGE_POINTS', float),
+    ),
+}
+
+TICK_CACHE_CONFIG = _env_overrides(
+    enabled=('TICK_CACHE_ENABLED', _env_flag),
+    watchlist=('TICK_CACHE_WATCHLIST', _env_list),
+    mirror_to_cache=('TICK_CACHE_MIRROR', _env_flag),
+)
+
+# Batch pip value engine universe (unset = all symbols visible in Market Watch)
+PIP_VALUE_BATCH_CONFIG = _env_overrides(
+    universe=('PIP_VALUE_UNIVERSE', _env_list),
+)
+
+SIGNAL_INGEST_CONFIG = _env_overrides(
+    enabled=('SIGNAL_INGEST_ENABLED', _env_flag),
+    workers=('SIGNAL_INGEST_WORKERS', int),
+    visibility_timeout=('SIGNAL_INGEST_VISIBILITY_TIMEOUT', int),
+)
+
+SIGNAL_IDEMPOTENCY_CONFIG = _env_overrides(
+    enabled=('SIGNAL_IDEMPOTENCY_ENABLED', _env_flag),
+)
+
+DEAL_RECONCILIATION_CONFIG = _env_overrides(
+    initial_lookback_days=('DEAL_RECONCILIATION_LOOKBACK_DAYS', int),
+)
+
+DASHBOARD_SNAPSHOT_CONFIG = _env_overrides(
+    ttl=('DASHBOARD_SNAPSHOT_TTL', float),
+)
+
+DASHBOARD_PANEL_CONFIG = {
+    panel: _env_overrides(timeout=('DASHBOARD_PANEL_MT5_TIMEOUT', float))
+    for panel in ('account_summary', 'active_trades')
+}
+
+NOTIFICATION_CONFIG = _env_overrides(
+    flush_interval=('NOTIFICATION_FLUSH_INTERVAL', float),
+)
+
+SIGNAL_FEED_CONFIG = _env_overrides(
+    timeout=('SIGNAL_FEED_TIMEOUT', int),
+)
+
+# Each open stream holds a worker thread: run gunicorn with gunicorn.conf.py
+# (gthread workers) and keep max_subscribers below GUNICORN_THREADS.
+LIVE_STREAM_CONFIG = _env_overrides(
+    interval=('LIVE_STREAM_INTERVAL', float),
+    max_subscribers=('LIVE_STREAM_MAX_SUBSCRIBERS', int),
+)
+
+# Only a single-process server may use ETags without a shared (Redis) cache
+CHANGE_VERSION_CONFIG = _env_overrides(
+    account_max_age=('CHANGE_VERSION_ACCOUNT_MAX_AGE', float),
+    allow_local_cache=('CHANGE_VERSION_ALLOW_LOCAL_CACHE', _env_flag),
+)
+
 # Kafka Configuration for MCP Integration
 KAFKA_CONFIG = {
     'bootstrap_servers': os.getenv('KAFKA_SERVERS', 'localhost:9092'),
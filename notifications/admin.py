@@ -1,3 +1,26 @@
 from django.contrib import admin
+from .models import Notification, NotificationRead
 
-# Register your models here.
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    """
+    Admin interface for notifications
+    """
+    
+    list_display = ['title', 'type', 'user', 'read', 'created_at']
+    list_filter = ['type', 'read', 'created_at']
+    search_fields = ['title', 'message']
+    raw_id_fields = ['user']
+    date_hierarchy = 'created_at'
+
+
+@admin.register(NotificationRead)
+class NotificationReadAdmin(admin.ModelAdmin):
+    """
+    Admin interface for per-user reads of everyone-notifications
+    """
+    
+    list_display = ['notification', 'user', 'read_at']
+    raw_id_fields = ['notification', 'user']
+    date_hierarchy = 'read_at'
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notifications'
+
+    def ready(self):
+        from trading.events import trades_changed
+        from trading.models import Trade
+        from .services import handle_trades_changed
+
+        trades_changed.connect(handle_trades_changed, sender=Trade, dispatch_uid='notifications_trade_closed')
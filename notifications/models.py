@@ -1,3 +1,60 @@
+from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Notification(models.Model):
+    """
+    Dashboard notification for one user (user=None: shown to everyone)
+    Written through notifications.services.notify(), which buffers and bulk inserts
+    """
+    
+    TYPE_CHOICES = [
+        ('rr_upgrade', 'R:R Upgrade'),
+        ('trade_closed', 'Trade Closed'),
+        ('qa_failure', 'QA Failure'),
+        ('timeframe_change', 'Timeframe Change'),
+        ('system', 'System'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='notifications')
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='system')
+    title = models.CharField(max_length=200)
+    message = models.TextField(blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    read = models.BooleanField(default=False)
+    # Time of the event, not of the (buffered) insert
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Notification"
+        verbose_name_plural = "Notifications"
+        indexes = [
+            # Unread counts and latest-N per user never scan the table
+            models.Index(fields=['user', 'read', 'created_at'], name='notif_user_read_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_type_display()}: {self.title}"
+
+
+class NotificationRead(models.Model):
+    """
+    A user's read mark on an everyone-notification (user=None)
+    The shared Notification.read flag is only set for the owner's own notifications
+    """
+    
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='reads')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_reads')
+    read_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = "Notification Read"
+        verbose_name_plural = "Notification Reads"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'notification'], name='notif_read_user_notification_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user} read {self.notification_id}"
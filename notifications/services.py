@@ -0,0 +1,253 @@
+"""
+Notification Services
+Cheap buffered writes and cached unread counts for dashboard notifications
+
+Writers (trade closes, R:R upgrades, QA failures) call notify(), which only
+appends an unsaved Notification to an in-process buffer. The buffer is
+written with one bulk_create when it reaches max_buffer or flush_interval
+seconds after its first entry, and once more at interpreter exit.
+
+Readers get a per-user summary (unread count and the latest N items) from
+the Django cache. Summaries are keyed by the notifications change version,
+so every flush or mark-as-read makes them stale at once, and a miss costs
+one indexed count and one indexed top-N query per owner (the user and the
+everyone-notifications). Versions are only shared when the cache is (see
+change_versions), so on a process-local cache summaries are not cached.
+
+Everyone-notifications are shared rows, so reading one never sets their
+read flag: it adds a NotificationRead for that user. Anonymous visitors
+see them all unread and cannot mark anything read.
+"""
+
+import atexit
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core import change_versions
+from core.change_versions import NOTIFICATIONS
+from core.config import get_config
+
+from .models import Notification, NotificationRead
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_NOTIFICATION_CONFIG = {
+    'flush_interval': 2.0,        # seconds a notification may wait in the buffer (0 = write at once)
+    'max_buffer': 100,            # flush immediately at this many pending notifications
+    'latest_count': 10,           # items in the cached summary
+    'summary_timeout': 300,       # seconds a summary stays cached
+}
+
+SUMMARY_KEY_PREFIX = 'notification_summary:'
+
+
+def get_notification_config():
+    return get_config('NOTIFICATION_CONFIG', DEFAULT_NOTIFICATION_CONFIG)
+
+
+class NotificationBuffer:
+    """
+    In-process buffer of unsaved notifications, written with bulk_create
+    """
+
+    def __init__(self):
+        self._pending: List[Notification] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, notification: Notification):
+        config = get_notification_config()
+        with self._lock:
+            self._pending.append(notification)
+            flush_now = config['flush_interval'] <= 0 or len(self._pending) >= config['max_buffer']
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(config['flush_interval'], self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every pending notification; returns how many were written"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+
+        try:
+            Notification.objects.bulk_create(pending, batch_size=500)
+        except Exception as e:
+            logger.error(f"Failed to write {len(pending)} notifications: {e}")
+            return 0
+
+        change_versions.bump_now(NOTIFICATIONS)
+        return len(pending)
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+
+# Global notification buffer instance
+notification_buffer = NotificationBuffer()
+atexit.register(notification_buffer.flush)
+
+
+def notify(type: str, title: str, message: str = '', user=None, data: Optional[Dict] = None):
+    """
+    Queue a notification (user=None: shown to everyone)
+
+    Safe to call inside a transaction: it is buffered once the transaction
+    commits, so a rolled back change never notifies.
+    """
+    notification = Notification(
+        user=user, type=type, title=title[:200], message=message,
+        data=data or {}, created_at=timezone.now()
+    )
+    transaction.on_commit(lambda: notification_buffer.add(notification))
+
+
+def _owners(user) -> List[Optional[int]]:
+    """Notification owners visible to a user: their own and everyone's"""
+    if user is not None and getattr(user, 'is_authenticated', False):
+        return [user.pk, None]
+    return [None]
+
+
+def _owned(owner: Optional[int]):
+    if owner is None:
+        return Notification.objects.filter(user__isnull=True)
+    return Notification.objects.filter(user_id=owner)
+
+
+def _unread(owner: Optional[int], user):
+    """Unread notifications of an owner as seen by user"""
+    unread = _owned(owner).filter(read=False)
+    if owner is None and user is not None and getattr(user, 'is_authenticated', False):
+        unread = unread.exclude(reads__user=user)
+    return unread
+
+
+def _format(notification: Notification, read: bool) -> Dict:
+    return {
+        'id': notification.id,
+        'type': notification.type,
+        'title': notification.title,
+        'message': notification.message,
+        'timestamp': timezone.localtime(notification.created_at).strftime('%Y-%m-%d %H:%M:%S'),
+        'read': read,
+    }
+
+
+def get_notification_summary(user=None) -> Dict:
+    """
+    {'unread_count': n, 'notifications': [latest items, newest first]}
+    Cached per user until the next flush or mark-as-read (shared caches only)
+    """
+    config = get_notification_config()
+    owners = _owners(user)
+    key = None
+    if change_versions.etags_enabled():
+        # Another worker's flush or mark-as-read would not bump a process-local version
+        version = change_versions.get_versions(NOTIFICATIONS)[NOTIFICATIONS]
+        key = f"{SUMMARY_KEY_PREFIX}{version}:{owners[0] if owners[0] is not None else 'all'}"
+
+        summary = cache.get(key)
+        if summary is not None:
+            return summary
+
+    unread_count = 0
+    latest = []
+    for owner in owners:
+        # Both queries are served by the (user, read, created_at) index
+        unread_count += _unread(owner, user).count()
+        latest.extend(_owned(owner).order_by('-created_at')[:config['latest_count']])
+
+    latest.sort(key=lambda notification: notification.created_at, reverse=True)
+    latest = latest[:config['latest_count']]
+
+    read_ids = set()
+    if owners[0] is not None:
+        read_ids = set(NotificationRead.objects.filter(
+            user=user, notification_id__in=[n.id for n in latest if n.user_id is None]
+        ).values_list('notification_id', flat=True))
+
+    summary = {
+        'unread_count': unread_count,
+        'notifications': [_format(n, n.read or n.id in read_ids) for n in latest],
+    }
+    if key is not None:
+        cache.set(key, summary, config['summary_timeout'])
+    return summary
+
+
+def mark_read(user=None, ids: Optional[List[int]] = None) -> int:
+    """
+    Mark notifications read for an authenticated user; all unread if ids is None
+    Their own notifications get the read flag, everyone-notifications a NotificationRead
+    """
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return 0
+
+    own = _unread(user.pk, user)
+    shared = _unread(None, user)
+    if ids is not None:
+        own = own.filter(id__in=ids)
+        shared = shared.filter(id__in=ids)
+
+    updated = own.update(read=True)
+    reads = [NotificationRead(notification_id=pk, user=user) for pk in shared.values_list('id', flat=True)]
+    # A concurrent mark of the same notification is already the wanted state
+    NotificationRead.objects.bulk_create(reads, batch_size=500, ignore_conflicts=True)
+    updated += len(reads)
+
+    if updated:
+        change_versions.bump(NOTIFICATIONS)
+    return updated
+
+
+def handle_trades_changed(sender, changes=(), **kwargs):
+    """trades_changed receiver: notify when a trade moves to a closed state"""
+    for trade, previous, current in changes:
+        was_closed = previous is not None and str(previous['status']).startswith('closed_')
+        if was_closed or not str(current['status']).startswith('closed_'):
+            continue
+        pnl = current['net_profit_loss'] or 0
+        notify(
+            'trade_closed',
+            f"Trade Closed - {current['symbol']}",
+            f"{current['direction']} {current['symbol']} closed ({trade.get_status_display()}): "
+            f"{'+' if pnl >= 0 else ''}{pnl}",
+            data={'trade_id': str(trade.pk), 'status': current['status']},
+        )
+
+
+def notify_rr_upgrades(performance: Dict[str, Dict]):
+    """Notify once per symbol and ISO week when it reaches the 1:2 R:R upgrade"""
+    iso_year, week, _ = timezone.now().isocalendar()
+    for symbol, data in performance.items():
+        if not data.get('upgraded'):
+            continue
+        # cache.add is atomic: only the first reader this week notifies
+        if cache.add(f"notification_rr_upgrade:{iso_year}-{week}:{symbol}", True, timeout=8 * 24 * 3600):
+            notify(
+                'rr_upgrade',
+                f"R:R Strategy Upgraded - {symbol}",
+                f"🎯 {symbol} R:R STRATEGY UPGRADED! Weekly profit {data['pct']}% → Now using 1:2 R:R with break-even logic",
+                data={'symbol': symbol, 'pct': data['pct']},
+            )
@@ -0,0 +1,137 @@
+"""
+Batch PURE Signal Webhook
+Accepts an array of PURE EA signals in one POST and queues them with one bulk insert
+
+Expected payload (same per-signal format as /api/v1/pure-signal/):
+{
+    "signals": [
+        {
+            "ea_name": "MikroBot_BOS",
+            "signal_type": "BOS_RETEST",
+            "symbol": "EURUSD",
+            "direction": "BUY",
+            "trigger_price": 1.08500,
+            "m15_break_high": 1.08520,
+            "m15_break_low": 1.08480,
+            "timestamp": "2025-01-22T17:15:00Z",
+            ...
+        },
+        ...
+    ]
+}
+
+Each signal is parsed and validated by signals.pure_signal, the parser
+shared with the single-signal webhook, so both routes store identical rows.
+Invalid signals are reported per index; every valid one is written with one
+MQL5Signal bulk_create, and their U-Cell 1 validations (formatted in
+memory) with one UCellSignalValidation bulk_create.
+"""
+
+import json
+import logging
+
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .models import MQL5Signal
+from .pure_signal import PureSignalPayloadError, build_pure_signal
+from .u_cell_models import UCellSignalValidation
+from . import u_cell_components
+from . import u_cell_pipeline
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 500
+
+
+@csrf_exempt
+@require_POST
+def pure_signal_batch_webhook(request):
+    """
+    Store many PURE EA signals with one MQL5Signal bulk_create and one
+    UCellSignalValidation bulk_create
+
+    Response uses the same per-item shape as bulk_record_measurements.
+    """
+    try:
+        data = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({'error': 'Invalid JSON payload'}, status=400)
+
+    signals_data = data.get('signals', []) if isinstance(data, dict) else data
+    if not isinstance(signals_data, list) or not signals_data:
+        return JsonResponse({'error': 'signals array is required'}, status=400)
+
+    if len(signals_data) > MAX_BATCH_SIZE:
+        return JsonResponse(
+            {'error': f'Maximum {MAX_BATCH_SIZE} signals per batch'},
+            status=400
+        )
+
+    try:
+        received_at = timezone.now()
+        results = [None] * len(signals_data)
+        pending = []  # (index, unsaved MQL5Signal)
+
+        for i, signal_data in enumerate(signals_data):
+            try:
+                pending.append((i, build_pure_signal(signal_data, received_at)))
+            except PureSignalPayloadError as payload_error:
+                results[i] = {
+                    'index': i,
+                    'success': False,
+                    'error': str(payload_error),
+                    'symbol': signal_data.get('symbol', 'UNKNOWN') if isinstance(signal_data, dict) else 'UNKNOWN'
+                }
+
+        # U-Cell 1 formatting runs in memory, so validations can be inserted in bulk too
+        formatter = u_cell_components.SignalFormatter() if u_cell_components.SignalFormatter else None
+
+        with transaction.atomic():
+            created_signals = MQL5Signal.objects.bulk_create(
+                [signal for _, signal in pending],
+                batch_size=100
+            )
+
+            validations = {}
+            if formatter is not None:
+                for (i, _), signal in zip(pending, created_signals):
+                    try:
+                        result = u_cell_pipeline.format_signal(signal, formatter)
+                    except Exception as validation_error:
+                        logger.warning(f"Batch validation failed for {signal.symbol}: {validation_error}")
+                        continue
+                    validations[i] = UCellSignalValidation(
+                        mql5_signal=signal,
+                        **u_cell_pipeline.build_validation_fields(result)
+                    )
+
+                UCellSignalValidation.objects.bulk_create(list(validations.values()), batch_size=100)
+
+        for (i, _), signal in zip(pending, created_signals):
+            validation = validations.get(i)
+            results[i] = {
+                'index': i,
+                'success': True,
+                'signal_id': str(signal.pk),
+                'symbol': signal.symbol,
+                'validation_id': str(validation.validation_id) if validation else None,
+                'formatted_successfully': validation.formatted_successfully if validation else None
+            }
+
+        successful_count = len(created_signals)
+        logger.info(f"Batch signal ingestion completed: {successful_count}/{len(signals_data)} successful")
+
+        return JsonResponse({
+            'total_signals': len(signals_data),
+            'successful_count': successful_count,
+            'failed_count': len(signals_data) - successful_count,
+            'results': results
+        })
+
+    except Exception as e:
+        logger.error(f"Batch signal ingestion failed: {str(e)}")
+        return JsonResponse({'error': f'Batch ingestion failed: {str(e)}'}, status=500)
@@ -0,0 +1,357 @@
+"""
+Idempotent Signal Ingestion
+Duplicate webhook / API deliveries get the original response back
+
+A request is identified by its Idempotency-Key header or, when absent, by a
+content fingerprint (symbol, direction, entry, SL, TP, signal timestamp).
+Payloads without a timestamp or message id are not fingerprinted: two such
+deliveries may be legitimate repeats, so they are always processed.
+An in-process LRU answers recent duplicates without touching the database;
+the unique key index on SignalIdempotencyRecord gives the final answer
+across workers and processes.
+
+For a new key the unique INSERT itself is the lookup, so new requests cost
+exactly one extra query and duplicates served from the LRU cost none.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from functools import wraps
+
+from django.db import IntegrityError
+from django.http import HttpResponse, JsonResponse
+from django.urls import URLPattern
+from django.utils import timezone
+
+from core.config import get_config
+
+from .ingest_models import SignalIdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_IDEMPOTENCY_CONFIG = {
+    'enabled': True,
+    'lru_size': 10000,
+    'lru_ttl_seconds': 3600,
+    'record_ttl_hours': 72,
+    'in_flight_timeout_seconds': 300,   # an unfinished claim older than this was abandoned
+}
+
+IDEMPOTENT_METHODS = ('POST', 'PUT', 'PATCH')
+
+# Payload keys used for the content fingerprint (first present alias wins)
+FINGERPRINT_FIELDS = [
+    ('symbol', ['symbol']),
+    ('direction', ['direction', 'action', 'type']),
+    ('entry', ['entry_price', 'entry', 'trigger_price', 'price']),
+    ('stop_loss', ['stop_loss', 'sl']),
+    ('take_profit', ['take_profit', 'tp']),
+    ('timestamp', ['signal_timestamp', 'timestamp', 'time']),
+]
+
+# Discord message identity (first present alias wins)
+MESSAGE_ID_FIELDS = ['message_id', 'id', 'timestamp']
+
+
+def get_idempotency_config():
+    return get_config('SIGNAL_IDEMPOTENCY_CONFIG', DEFAULT_IDEMPOTENCY_CONFIG)
+
+
+def _normalize_value(value):
+    """Normalize a fingerprint value so 1.085 and "1.08500" match"""
+    if value is None:
+        return ''
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        value = str(value)
+    text = str(value).strip()
+    try:
+        return str(Decimal(text).normalize())
+    except (InvalidOperation, ValueError):
+        return text.upper()
+
+
+def _first_present(payload, aliases):
+    for alias in aliases:
+        if alias in payload and payload[alias] not in (None, ''):
+            return payload[alias]
+    return None
+
+
+def compute_fingerprint(payload):
+    """
+    Content fingerprint of a signal payload, or None if it is not a signal
+
+    - Structured signals: symbol, direction, entry, SL, TP, signal timestamp
+    - Batches ({"signals": [...]}): fingerprint of all item fingerprints
+    - Discord messages ({"content": "..."}): message id and whitespace-normalized text
+
+    A signal without a timestamp (or a message without an id) gets None:
+    identical content is then a legitimate repeat, not a redelivery.
+    """
+    if isinstance(payload, list):
+        parts = [compute_fingerprint(item) for item in payload]
+        if not parts or any(part is None for part in parts):
+            return None
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    if not isinstance(payload, dict):
+        return None
+
+    if isinstance(payload.get('signals'), list):
+        return compute_fingerprint(payload['signals'])
+
+    values = {
+        name: _first_present(payload, aliases)
+        for name, aliases in FINGERPRINT_FIELDS
+    }
+
+    if values['symbol'] is not None and values['direction'] is not None:
+        if values['timestamp'] is None:
+            return None
+        canonical = '|'.join(
+            f"{name}={_normalize_value(values[name])}" for name, _ in FINGERPRINT_FIELDS
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    content = payload.get('content')
+    message_id = _first_present(payload, MESSAGE_ID_FIELDS)
+    if isinstance(content, str) and content.strip() and message_id is not None:
+        normalized = ' '.join(content.split()).upper()
+        return hashlib.sha256(f"id={message_id}|content={normalized}".encode('utf-8')).hexdigest()
+
+    return None
+
+
+def get_request_key(request):
+    """
+    Idempotency key for a request: (key, key_source) or (None, None)
+    """
+    header_key = request.headers.get('Idempotency-Key', '').strip()
+    if header_key:
+        raw_key, key_source = f"key:{header_key}", 'header'
+    else:
+        try:
+            payload = json.loads(request.body or b'null')
+        except (ValueError, UnicodeDecodeError):
+            return None, None
+
+        fingerprint = compute_fingerprint(payload)
+        if fingerprint is None:
+            return None, None
+        raw_key, key_source = f"fp:{fingerprint}", 'content'
+
+    key = hashlib.sha256(f"{request.path}|{raw_key}".encode('utf-8')).hexdigest()
+    return key, key_source
+
+
+class IdempotencyLRU:
+    """
+    Thread-safe in-process LRU of completed responses (key -> response tuple)
+    """
+
+    def __init__(self, max_size=10000, ttl_seconds=3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get stored (status, body, content_type) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, response = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key, response):
+        """Store a completed response"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_config = get_idempotency_config()
+response_cache = IdempotencyLRU(_config['lru_size'], _config['lru_ttl_seconds'])
+
+
+def _replay_response(stored):
+    """Build an HTTP response from a stored (status, body, content_type)"""
+    status_code, body, content_type = stored
+    response = HttpResponse(body, status=status_code, content_type=content_type or 'application/json')
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _claim_key(key, key_source, route):
+    """
+    Insert the key; returns None if claimed, otherwise the existing record
+    """
+    config = get_idempotency_config()
+    try:
+        SignalIdempotencyRecord.objects.create(key=key, key_source=key_source, route=route)
+        return None
+    except IntegrityError:
+        pass
+
+    record = SignalIdempotencyRecord.objects.filter(key=key).first()
+    if record is None:
+        # Deleted between INSERT and SELECT (failed original) - try once more
+        try:
+            SignalIdempotencyRecord.objects.create(key=key, key_source=key_source, route=route)
+            return None
+        except IntegrityError:
+            return SignalIdempotencyRecord.objects.filter(key=key).first()
+
+    now = timezone.now()
+    expired = record.created_at < now - timedelta(hours=config['record_ttl_hours'])
+    abandoned = (
+        record.status == 'in_flight'
+        and record.created_at < now - timedelta(seconds=config['in_flight_timeout_seconds'])
+    )
+    if expired or abandoned:
+        # Outside the dedup window, or its worker died before completing:
+        # reuse the key. Comparing created_at lets only one retry take it over.
+        reclaimed = SignalIdempotencyRecord.objects.filter(
+            pk=record.pk, status=record.status, created_at=record.created_at
+        ).update(
+            status='in_flight',
+            key_source=key_source,
+            response_status=None,
+            response_body='',
+            response_content_type='',
+            created_at=now,
+            completed_at=None
+        )
+        if reclaimed:
+            if abandoned:
+                logger.warning(f"Reclaimed idempotency key abandoned on {record.route}")
+            return None
+        return SignalIdempotencyRecord.objects.filter(key=key).first() or record
+
+    return record
+
+
+def _store_response(key, response):
+    """Persist a completed response for later replays"""
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+
+    body = response.content.decode('utf-8', errors='replace')
+    content_type = response.get('Content-Type', 'application/json')
+
+    SignalIdempotencyRecord.objects.filter(key=key).update(
+        status='completed',
+        response_status=response.status_code,
+        response_body=body,
+        response_content_type=content_type,
+        completed_at=timezone.now()
+    )
+    response_cache.put(key, (response.status_code, body, content_type))
+
+
+def idempotent(view_func):
+    """
+    Decorator: answer duplicate deliveries with the original response
+
+    Only mutating methods with an Idempotency-Key header or a recognizable
+    signal payload are tracked; everything else passes straight through.
+    Server errors release the key so a retry is processed again.
+    """
+    if getattr(view_func, '_idempotent', False):
+        return view_func
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in IDEMPOTENT_METHODS or not get_idempotency_config()['enabled']:
+            return view_func(request, *args, **kwargs)
+
+        key, key_source = get_request_key(request)
+        if key is None:
+            return view_func(request, *args, **kwargs)
+
+        # Fast path: recently completed duplicate
+        stored = response_cache.get(key)
+        if stored is not None:
+            logger.info(f"Duplicate request on {request.path} answered from cache")
+            return _replay_response(stored)
+
+        existing = _claim_key(key, key_source, request.path)
+        if existing is not None:
+            if existing.status == 'completed':
+                stored = (existing.response_status, existing.response_body, existing.response_content_type)
+                response_cache.put(key, stored)
+                logger.info(f"Duplicate request on {request.path} answered from database")
+                return _replay_response(stored)
+
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Duplicate request is still being processed'
+            }, status=409)
+
+        try:
+            response = view_func(request, *args, **kwargs)
+        except Exception:
+            SignalIdempotencyRecord.objects.filter(key=key).delete()
+            raise
+
+        if response.status_code >= 500 or getattr(response, 'streaming', False):
+            SignalIdempotencyRecord.objects.filter(key=key).delete()
+            return response
+
+        _store_response(key, response)
+        return response
+
+    wrapper._idempotent = True
+    return wrapper
+
+
+def idempotent_urlpatterns(patterns, names):
+    """
+    Wrap the views of the named URL patterns with @idempotent
+
+    Only signal ingestion endpoints should be listed: their retries are
+    redeliveries of the same signal. Other mutating routes (approve,
+    execute, ...) pass through untouched.
+    """
+    for pattern in patterns:
+        if isinstance(pattern, URLPattern) and pattern.name in names:
+            pattern.callback = idempotent(pattern.callback)
+    return patterns
+
+
+def purge_expired_records():
+    """
+    Delete idempotency records outside the dedup window
+    Returns number of deleted records
+    """
+    config = get_idempotency_config()
+    expired_before = timezone.now() - timedelta(hours=config['record_ttl_hours'])
+    deleted, _ = SignalIdempotencyRecord.objects.filter(created_at__lt=expired_before).delete()
+    return deleted
@@ -0,0 +1,126 @@
+"""
+Signal Ingestion Models
+Durable local queue for fast-ack webhook ingestion and idempotency records
+
+Webhooks store the raw payload here and answer immediately; the ingestion
+workers in signals/ingest_queue.py drain the table in the background.
+Duplicate deliveries are answered from SignalIdempotencyRecord
+(see signals/idempotency.py).
+
+The tables are created by core migrations (app_label 'core'): both are
+infrastructure shared by every ingestion route, and core.models imports
+these models so they are registered.
+"""
+
+from django.db import models
+from django.utils import timezone
+import uuid
+
+
+class SignalIngestItem(models.Model):
+    """
+    One raw webhook payload waiting for (or done with) background processing
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Which registered handler processes this payload (e.g. 'pure_ea')
+    source = models.CharField(max_length=50)
+
+    # Original request, kept so the payload can be replayed through the webhook view
+    path = models.CharField(max_length=200)
+    query_string = models.CharField(max_length=500, blank=True)
+    payload = models.TextField(help_text="Raw request body as received")
+    request_meta = models.JSONField(default=dict, blank=True)
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    # Processing results
+    mql5_signal = models.ForeignKey(
+        'signals.MQL5Signal',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ingest_items'
+    )
+    response_data = models.JSONField(default=dict, blank=True)
+
+    # Timestamps
+    received_at = models.DateTimeField(default=timezone.now)
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Not picked up by workers before this time (retry backoff, or the "
+                  "visibility timeout of a processing item)"
+    )
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'core'
+        db_table = 'signal_ingest_item'
+        verbose_name = "Signal Ingest Item"
+        verbose_name_plural = "Signal Ingest Items"
+        ordering = ['received_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='ingest_status_available_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ingest {self.source} [{self.status}] ({self.id})"
+
+
+class SignalIdempotencyRecord(models.Model):
+    """
+    Stored response of an already seen webhook / API request
+
+    The unique key index is the final arbiter for duplicates: the first
+    request inserts its key, retries hit the constraint and get the stored
+    response back.
+    """
+
+    key = models.CharField(max_length=64, unique=True, help_text="SHA-256 of route + idempotency key or content fingerprint")
+    route = models.CharField(max_length=200)
+
+    KEY_SOURCE_CHOICES = [
+        ('header', 'Idempotency-Key Header'),
+        ('content', 'Content Fingerprint'),
+    ]
+
+    key_source = models.CharField(max_length=10, choices=KEY_SOURCE_CHOICES)
+
+    STATUS_CHOICES = [
+        ('in_flight', 'In Flight'),
+        ('completed', 'Completed'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_flight')
+
+    # Original response
+    response_status = models.IntegerField(null=True, blank=True)
+    response_body = models.TextField(blank=True)
+    response_content_type = models.CharField(max_length=100, blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'core'
+        db_table = 'signal_idempotency_record'
+        verbose_name = "Signal Idempotency Record"
+        verbose_name_plural = "Signal Idempotency Records"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='idempotency_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.route} [{self.status}] {self.key[:12]}"
@@ -0,0 +1,417 @@
+"""
+Fast-ack Signal Ingestion Queue
+Webhooks persist the raw payload and return 202 immediately; a worker pool
+drains the queue in the background
+
+Flow:
+    webhook -> SignalIngestItem (pending) -> HTTP 202
+    worker  -> original webhook view (creates MQL5Signal)
+            -> U-Cell 1 validation -> U-Cell 3 risk assessment
+
+The original webhook views stay the single place that knows how to turn a
+payload into an MQL5Signal; workers replay the stored request through them.
+
+A claimed item's available_at is its lease: if a worker dies mid-item, the
+item is claimed again once visibility_timeout has passed. A live worker
+renews the lease while it runs the handler, and every write after the claim
+is a compare-and-set on the attempts value it claimed, so a worker whose
+item was reclaimed never overwrites the new owner's result. Workers start
+with the first enqueued payload of a process, or run them as a dedicated
+process with `manage.py run_signal_ingest` so a backlog queued before a
+restart is drained without waiting for new traffic.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import wraps
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.http import JsonResponse
+from django.test import RequestFactory
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+
+from core.config import get_config
+
+from .ingest_models import SignalIngestItem
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_INGEST_CONFIG = {
+    'enabled': True,
+    'workers': 4,
+    'poll_interval': 0.5,          # seconds between queue polls when idle
+    'batch_size': 20,              # candidates looked at per claim
+    'max_attempts': 3,
+    'retry_backoff_seconds': 5,    # multiplied by attempt number
+    'visibility_timeout': 300,     # seconds before a 'processing' item of a dead worker is reclaimed
+    'run_u_cell_pipeline': True,
+}
+
+
+def get_ingest_config():
+    return get_config('SIGNAL_INGEST_CONFIG', DEFAULT_INGEST_CONFIG)
+
+
+# source name -> original (inline) webhook view
+_ingest_handlers = {}
+
+
+def register_ingest_handler(source, view_func):
+    """Register the view that processes queued payloads of a source"""
+    _ingest_handlers[source] = view_func
+
+
+def get_ingest_handler(source):
+    """Get registered handler for a source, or None"""
+    return _ingest_handlers.get(source)
+
+
+class IngestHandlerError(Exception):
+    """Raised when a replayed webhook view answers with an error status"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def fast_ack(source):
+    """
+    Decorator that turns an inline webhook view into a fast-ack endpoint
+
+    POST requests are stored to the ingestion queue and answered with 202.
+    Other methods (and everything when the queue is disabled) go straight
+    to the original view.
+    """
+    def decorator(view_func):
+        register_ingest_handler(source, view_func)
+
+        @csrf_exempt
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'POST' or not get_ingest_config()['enabled']:
+                return view_func(request, *args, **kwargs)
+
+            body = request.body
+            try:
+                json.loads(body)
+            except (ValueError, UnicodeDecodeError):
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Invalid JSON payload'
+                }, status=400)
+
+            item = enqueue_payload(source, request, body)
+
+            return JsonResponse({
+                'status': 'accepted',
+                'ingest_id': str(item.id),
+                'message': 'Signal queued for processing',
+                'next_step': 'await_ingestion'
+            }, status=202)
+
+        return wrapper
+    return decorator
+
+
+def _build_item(source, request, body):
+    return SignalIngestItem(
+        source=source,
+        path=request.path,
+        query_string=request.META.get('QUERY_STRING', ''),
+        payload=body.decode('utf-8'),
+        request_meta={
+            'HTTP_HOST': request.META.get('HTTP_HOST', ''),
+            'REMOTE_ADDR': request.META.get('REMOTE_ADDR', ''),
+            'HTTP_USER_AGENT': request.META.get('HTTP_USER_AGENT', ''),
+        }
+    )
+
+
+def enqueue_payload(source, request, body):
+    """
+    Persist a raw webhook payload and wake up the worker pool
+    """
+    item = _build_item(source, request, body)
+    item.save()
+
+    ingest_worker_pool.ensure_started()
+    ingest_worker_pool.notify()
+
+    logger.debug(f"Queued {source} payload {item.id}")
+    return item
+
+
+def run_u_cell_steps(mql5_signal):
+    """
+    Run U-Cell validation and risk assessment for a freshly ingested signal
+
+    Failures are reported in the returned summary instead of raised: the
+    signal already exists, so the ingest item must not be retried.
+    """
+    from . import u_cell_pipeline
+
+    summary = {}
+    try:
+        validation, result = u_cell_pipeline.validate_signal(mql5_signal)
+        summary['validation'] = {
+            'validation_id': str(validation.validation_id),
+            'success': result.success,
+            'processing_time_ms': result.processing_time_ms
+        }
+
+        if result.success:
+            assessment, risk_result = u_cell_pipeline.assess_risk(mql5_signal)
+            summary['risk'] = {
+                'assessment_id': str(assessment.assessment_id),
+                'approved': risk_result['approved'],
+                'position_size': risk_result['position_size'],
+                'processing_time_ms': risk_result['processing_time_ms']
+            }
+    except Exception as e:
+        logger.error(f"U-Cell steps failed for ingested signal {mql5_signal.pk}: {e}")
+        summary['error'] = str(e)
+
+    return summary
+
+
+class SignalIngestWorkerPool:
+    """
+    Background worker threads that drain the SignalIngestItem queue
+    """
+
+    def __init__(self):
+        self.is_running = False
+        self.threads = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._request_factory = RequestFactory()
+
+    def ensure_started(self):
+        """Start the pool on first use"""
+        if not self.is_running:
+            self.start()
+
+    def start(self, workers=None):
+        """Start worker threads"""
+        with self._lock:
+            if self.is_running:
+                return
+
+            workers = workers or get_ingest_config()['workers']
+            self.is_running = True
+            self.threads = []
+            for worker_id in range(workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    args=(worker_id,),
+                    name=f"signal-ingest-{worker_id}",
+                    daemon=True
+                )
+                thread.start()
+                self.threads.append(thread)
+
+            logger.info(f"Signal ingest worker pool started with {workers} workers")
+
+    def stop(self):
+        """Stop worker threads after their current item"""
+        self.is_running = False
+        self._wakeup.set()
+        logger.info("Signal ingest worker pool stopped")
+
+    def notify(self):
+        """Wake idle workers after a new payload was queued"""
+        self._wakeup.set()
+
+    def _worker_loop(self, worker_id):
+        """Claim and process queue items until stopped"""
+        while self.is_running:
+            try:
+                item = self.claim_next()
+                if item is None:
+                    self._wakeup.wait(get_ingest_config()['poll_interval'])
+                    self._wakeup.clear()
+                    continue
+
+                self.process_item(item)
+
+            except Exception as e:
+                logger.error(f"Signal ingest worker {worker_id} error: {e}")
+                time.sleep(get_ingest_config()['poll_interval'])
+            finally:
+                close_old_connections()
+
+    def claim_next(self):
+        """
+        Atomically claim the oldest available item
+
+        Pending items are available once their retry backoff has passed;
+        processing items once their lease (visibility timeout) has expired,
+        which means the worker that claimed them died. The compare-and-set
+        UPDATE on (status, available_at) makes claiming safe across threads
+        and processes without relying on SELECT ... FOR UPDATE support.
+        """
+        config = get_ingest_config()
+        now = timezone.now()
+        candidates = list(
+            SignalIngestItem.objects.filter(
+                status__in=['pending', 'processing'],
+                available_at__lte=now
+            ).order_by('received_at').values_list('id', 'status', 'available_at', 'attempts')[:config['batch_size']]
+        )
+
+        lease_until = now + timedelta(seconds=config['visibility_timeout'])
+        for item_id, status, available_at, attempts in candidates:
+            if status == 'processing' and attempts >= config['max_attempts']:
+                # Its worker died on the last attempt
+                SignalIngestItem.objects.filter(
+                    pk=item_id, status='processing', available_at=available_at
+                ).update(
+                    status='failed', processed_at=now,
+                    last_error='Worker did not finish the item within the visibility timeout'
+                )
+                logger.error(f"Ingest item {item_id} abandoned by its worker on the last attempt")
+                continue
+
+            claimed = SignalIngestItem.objects.filter(
+                pk=item_id,
+                status=status,
+                available_at=available_at
+            ).update(status='processing', available_at=lease_until, attempts=F('attempts') + 1)
+
+            if claimed:
+                if status == 'processing':
+                    logger.warning(f"Reclaimed ingest item {item_id} after its visibility timeout")
+                return SignalIngestItem.objects.get(pk=item_id)
+
+        return None
+
+    def _owned(self, item):
+        """Queryset of the item while this worker still holds its claim"""
+        return SignalIngestItem.objects.filter(pk=item.pk, status='processing', attempts=item.attempts)
+
+    @contextmanager
+    def _hold_lease(self, item):
+        """Renew the item's lease every third of visibility_timeout until the block exits"""
+        timeout = get_ingest_config()['visibility_timeout']
+        done = threading.Event()
+
+        def renew():
+            try:
+                while not done.wait(timeout / 3):
+                    lease_until = timezone.now() + timedelta(seconds=timeout)
+                    if not self._owned(item).update(available_at=lease_until):
+                        return
+            finally:
+                close_old_connections()
+
+        renewer = threading.Thread(target=renew, name=f"signal-ingest-lease-{item.pk}", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            done.set()
+
+    def process_item(self, item):
+        """
+        Replay a queued payload through its webhook view and run U-Cell steps
+        """
+        handler = get_ingest_handler(item.source)
+        if handler is None:
+            self._mark_failed(item, f"No ingest handler registered for source '{item.source}'", retryable=False)
+            return
+
+        with self._hold_lease(item):
+            try:
+                response = handler(self._build_request(item))
+                response_data = self._response_json(response)
+
+                if response.status_code >= 400:
+                    raise IngestHandlerError(
+                        f"Handler returned HTTP {response.status_code}: {response_data}",
+                        retryable=response.status_code >= 500
+                    )
+
+            except Exception as e:
+                self._mark_failed(item, str(e), retryable=getattr(e, 'retryable', True))
+                return
+
+            mql5_signal = self._load_signal(response_data.get('signal_id'))
+            if mql5_signal is not None and get_ingest_config()['run_u_cell_pipeline']:
+                response_data['u_cell'] = run_u_cell_steps(mql5_signal)
+
+        finished = self._owned(item).update(
+            status='done',
+            mql5_signal=mql5_signal,
+            response_data=response_data,
+            last_error='',
+            processed_at=timezone.now()
+        )
+        if not finished:
+            logger.error(f"Ingest item {item.id} was reclaimed while this worker processed it; result not stored")
+            return
+
+        logger.info(f"Ingested {item.source} payload {item.id} -> signal {response_data.get('signal_id')}")
+
+    def _build_request(self, item):
+        """Rebuild the original POST request from a queue item"""
+        path = item.path
+        if item.query_string:
+            path = f"{path}?{item.query_string}"
+
+        extra = {key: value for key, value in item.request_meta.items() if value}
+        return self._request_factory.post(
+            path,
+            data=item.payload,
+            content_type='application/json',
+            **extra
+        )
+
+    def _response_json(self, response):
+        """Decode a JsonResponse or DRF Response body"""
+        if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+            response.render()
+        try:
+            data = json.loads(response.content or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            return {'raw_response': response.content.decode('utf-8', errors='replace')}
+        return data if isinstance(data, dict) else {'response': data}
+
+    def _load_signal(self, signal_id):
+        """Fetch the MQL5Signal created by the handler"""
+        if not signal_id:
+            return None
+
+        from .models import MQL5Signal
+        try:
+            return MQL5Signal.objects.get(pk=signal_id)
+        except (MQL5Signal.DoesNotExist, ValueError):
+            logger.warning(f"Ingest handler returned unknown signal_id {signal_id}")
+            return None
+
+    def _mark_failed(self, item, error, retryable=True):
+        """Schedule a retry with backoff, or fail permanently"""
+        config = get_ingest_config()
+
+        if retryable and item.attempts < config['max_attempts']:
+            fields = {
+                'status': 'pending',
+                'available_at': timezone.now() + timedelta(seconds=config['retry_backoff_seconds'] * item.attempts),
+            }
+            logger.warning(f"Ingest item {item.id} failed (attempt {item.attempts}), retrying: {error}")
+        else:
+            fields = {'status': 'failed', 'processed_at': timezone.now()}
+            logger.error(f"Ingest item {item.id} failed permanently: {error}")
+
+        if not self._owned(item).update(last_error=error, **fields):
+            logger.error(f"Ingest item {item.id} was reclaimed while this worker processed it; failure not stored")
+
+
+# Global worker pool instance
+ingest_worker_pool = SignalIngestWorkerPool()
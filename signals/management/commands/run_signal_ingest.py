@@ -0,0 +1,39 @@
+"""
+Run the signal ingestion worker pool as a dedicated process
+
+Drains SignalIngestItem rows queued before a restart (and reclaims items of
+dead workers) without waiting for the next webhook to start the workers.
+"""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from signals.ingest_queue import get_ingest_config, ingest_worker_pool
+
+
+class Command(BaseCommand):
+    help = 'Run the signal ingestion queue workers until interrupted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Worker threads (default: SIGNAL_INGEST_CONFIG workers)')
+
+    def handle(self, *args, **options):
+        stopped = threading.Event()
+
+        def shutdown(signum, frame):
+            stopped.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        workers = options['workers'] or get_ingest_config()['workers']
+        ingest_worker_pool.start(workers=workers)
+        self.stdout.write(self.style.SUCCESS(f"Signal ingest workers running ({workers})"))
+
+        stopped.wait()
+        ingest_worker_pool.stop()
+        for thread in ingest_worker_pool.threads:
+            thread.join(timeout=30)
+        self.stdout.write("Signal ingest workers stopped")
@@ -0,0 +1,102 @@
+"""
+PURE Signal Parsing
+Turns one PURE Signal Detector payload into an unsaved MQL5Signal
+
+The EA sends only the structure it detected (trigger price, H1 BOS level,
+M15 break range) and no trading levels. This module is the one place that
+validates such a payload and derives the stored levels, so the single and
+the batch webhook store identical rows:
+
+    stop loss    stop_loss, else the H1 BOS level, else the M15 break on the
+                 far side of the entry
+    take profit  take_profit, else DEFAULT_RR times the risk from the entry
+"""
+
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import MQL5Signal
+
+SOURCE_NAME = 'PURE Signal Detector'
+PRICE_QUANTUM = Decimal('0.00001')
+DEFAULT_RR = Decimal('2')  # Dashboard R:R strategy 1:2
+
+
+class PureSignalPayloadError(ValueError):
+    """Raised when a PURE signal payload is invalid"""
+
+
+def _to_price(value, field):
+    """Payload price as a positive Decimal with 5 decimals"""
+    try:
+        price = Decimal(str(value)).quantize(PRICE_QUANTUM)
+    except (InvalidOperation, TypeError, ValueError):
+        raise PureSignalPayloadError(f'Invalid {field}: {value}')
+    if price <= 0:
+        raise PureSignalPayloadError(f'Invalid {field}: {value}')
+    return price
+
+
+def _stop_loss(payload, direction):
+    if payload.get('stop_loss') is not None:
+        return _to_price(payload['stop_loss'], 'stop_loss')
+    if payload.get('h1_bos_level') is not None:
+        return _to_price(payload['h1_bos_level'], 'h1_bos_level')
+    level_field = 'm15_break_low' if direction == 'BUY' else 'm15_break_high'
+    if payload.get(level_field) is None:
+        raise PureSignalPayloadError(f'Missing required field: stop_loss, h1_bos_level or {level_field}')
+    return _to_price(payload[level_field], level_field)
+
+
+def build_pure_signal(payload, received_at=None) -> MQL5Signal:
+    """
+    Validate one PURE signal payload and build its unsaved MQL5Signal
+    Raises PureSignalPayloadError with a client-facing message
+    """
+    if not isinstance(payload, dict):
+        raise PureSignalPayloadError('Signal must be a JSON object')
+
+    symbol = str(payload.get('symbol', '')).upper()
+    if not symbol:
+        raise PureSignalPayloadError('Missing required field: symbol')
+
+    direction = str(payload.get('direction', '')).upper()
+    if direction not in ('BUY', 'SELL'):
+        raise PureSignalPayloadError(f'Invalid direction: {payload.get("direction")}')
+
+    entry_value = payload.get('trigger_price', payload.get('entry_price'))
+    if entry_value is None:
+        raise PureSignalPayloadError('Missing required field: trigger_price')
+    entry_price = _to_price(entry_value, 'trigger_price')
+
+    stop_loss = _stop_loss(payload, direction)
+    risk = entry_price - stop_loss if direction == 'BUY' else stop_loss - entry_price
+    if risk <= 0:
+        raise PureSignalPayloadError('Stop loss is on the wrong side of the entry price')
+
+    if payload.get('take_profit') is not None:
+        take_profit = _to_price(payload['take_profit'], 'take_profit')
+    else:
+        reward = risk * DEFAULT_RR
+        take_profit = entry_price + reward if direction == 'BUY' else entry_price - reward
+
+    received_at = received_at or timezone.now()
+    signal_timestamp = parse_datetime(str(payload.get('timestamp', ''))) or received_at
+
+    return MQL5Signal(
+        source_name=SOURCE_NAME,
+        ea_name=payload.get('ea_name', 'MikroBot_BOS'),
+        signal_type=payload.get('signal_type', 'BOS_RETEST'),
+        symbol=symbol,
+        direction=direction,
+        entry_price=entry_price,
+        stop_loss=stop_loss,
+        take_profit=take_profit,
+        raw_signal_data=json.dumps(payload),
+        signal_timestamp=signal_timestamp,
+        received_at=received_at,
+        status='pending'
+    )
@@ -0,0 +1,34 @@
+"""
+U-Cell Component Loader
+Shared import point for the validated U-Cell components used by the
+Django views, the ingestion workers and the pipeline service
+"""
+
+import sys
+import os
+
+# Import U-Cell components - Fixed paths to validated components
+base_path = os.path.join(os.path.dirname(__file__), '..', '..', 'mikrobot_u_cells', 'validated')
+sys.path.append(os.path.join(base_path, 'UCell_Signal_Detection_v1.0'))
+sys.path.append(os.path.join(base_path, 'UCell_Processing_Analysis_v1.0'))
+sys.path.append(os.path.join(base_path, 'UCell_Execution_v1.0'))
+sys.path.append(os.path.join(base_path, 'UCell_Signal_Reception_v1.0'))
+sys.path.append(os.path.join(base_path, 'UCell_Monitoring_Control_v1.0'))
+
+try:
+    from signal_formatter import SignalFormatter, BOSDetectionResult
+    from risk_calculator import RiskCalculator, ProcessedSignal as RiskProcessedSignal
+    from order_executor import OrderExecutor, ProcessedSignal as ExecProcessedSignal
+    from kafka_producer import ResilientKafkaProducer
+    from statistical_monitor import StatisticalMonitor, QualityMeasurement
+except ImportError as e:
+    print(f"Warning: Could not import U-Cell components: {e}")
+    SignalFormatter = None
+    BOSDetectionResult = None
+    RiskCalculator = None
+    RiskProcessedSignal = None
+    OrderExecutor = None
+    ExecProcessedSignal = None
+    ResilientKafkaProducer = None
+    StatisticalMonitor = None
+    QualityMeasurement = None
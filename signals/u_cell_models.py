@@ -56,6 +56,9 @@ class UCellSignalValidation(models.Model):
         verbose_name = "U-Cell Signal Validation"
         verbose_name_plural = "U-Cell Signal Validations"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='ucell_valid_created_idx'),
+        ]
     
     def __str__(self):
         return f"U-Cell Validation: {self.mql5_signal.symbol} ({self.validation_id})"
@@ -103,6 +106,10 @@ class UCellRiskAssessment(models.Model):
         verbose_name = "U-Cell Risk Assessment"
         verbose_name_plural = "U-Cell Risk Assessments"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='ucell_risk_created_idx'),
+            models.Index(fields=['approved', '-created_at'], name='ucell_risk_approved_idx'),
+        ]
     
     def __str__(self):
         status = "APPROVED" if self.approved else "REJECTED"
@@ -172,6 +179,10 @@ class UCellExecution(models.Model):
         verbose_name = "U-Cell Execution"
         verbose_name_plural = "U-Cell Executions"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='ucell_exec_created_idx'),
+            models.Index(fields=['execution_status', '-created_at'], name='ucell_exec_status_idx'),
+        ]
     
     def __str__(self):
         return f"Execution {self.execution_status}: {self.mql5_signal.symbol} ({self.order_id})"
@@ -227,6 +238,7 @@ class UCellQualityMeasurement(models.Model):
         indexes = [
             models.Index(fields=['process_name', 'created_at']),
             models.Index(fields=['correlation_id']),
+            models.Index(fields=['-created_at', '-id'], name='ucell_quality_created_idx'),
         ]
     
     def __str__(self):
@@ -329,6 +341,10 @@ class UCellSystemHealth(models.Model):
         verbose_name = "U-Cell System Health"  
         verbose_name_plural = "U-Cell System Health"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='ucell_health_created_idx'),
+            models.Index(fields=['overall_status', '-created_at'], name='ucell_health_status_idx'),
+        ]
     
     def __str__(self):
         return f"System Health: {self.overall_status} (σ={self.sigma_level:.1f})"
\ No newline at end of file
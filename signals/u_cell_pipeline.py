@@ -0,0 +1,542 @@
+"""
+U-Cell Pipeline Service
+Stage functions shared by the U-Cell API views and the ingestion workers
+
+Each stage takes an already loaded MQL5Signal so callers that run several
+stages back to back only fetch the signal once.
+"""
+
+from decimal import Decimal
+import logging
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .u_cell_models import (
+    UCellSignalValidation,
+    UCellRiskAssessment,
+    UCellExecution,
+    UCellQualityMeasurement
+)
+from . import u_cell_components
+
+logger = logging.getLogger(__name__)
+
+
+class UCellComponentsUnavailable(Exception):
+    """Raised when the validated U-Cell components could not be imported"""
+
+
+# Signals the pipeline may still run (and send an order) for
+EXECUTABLE_STATUSES = ('pending', 'approved')
+
+
+# Risk configuration defaults (account values are filled in from MT5)
+DEFAULT_RISK_CONFIG = {
+    'max_risk_per_trade': 0.01,  # 1%
+    'max_daily_risk': 0.02,      # 2%
+    'max_weekly_risk': 0.05,     # 5%
+    'max_drawdown': 0.10,        # 10%
+}
+
+# Specification for the end_to_end_latency quality measurement (ms)
+END_TO_END_LATENCY_SPEC = {
+    'target_value': 500.0,
+    'upper_spec_limit': 1000.0,
+    'lower_spec_limit': 0.0,
+}
+
+
+def build_bos_data(mql5_signal):
+    """
+    Convert Django signal to BOS format for U-Cell 1 Signal Formatter
+    """
+    return {
+        'symbol': mql5_signal.symbol,
+        'h1_break_price': float(mql5_signal.entry_price) - 0.0005,  # Simulate H1 break
+        'm15_confirmation_price': float(mql5_signal.entry_price),
+        'break_direction': 'UP' if mql5_signal.direction == 'BUY' else 'DOWN',
+        'pip_movement': 0.8,  # Default
+        'confidence_raw': 0.85,  # Default
+        'detection_timestamp': mql5_signal.signal_timestamp.timestamp()
+    }
+
+
+def format_signal(mql5_signal, formatter=None):
+    """
+    Run U-Cell 1 Signal Formatter for a signal (no database access)
+    """
+    if not u_cell_components.SignalFormatter:
+        raise UCellComponentsUnavailable('U-Cell components not available')
+
+    formatter = formatter or u_cell_components.SignalFormatter()
+    return formatter.format_bos_signal(build_bos_data(mql5_signal))
+
+
+def build_validation_errors(result):
+    """
+    Normalize formatter errors to the stored validation_errors format
+    """
+    return [
+        {
+            'error_type': error.get('error_type', ''),
+            'field': error.get('field', ''),
+            'message': error.get('message', '')
+        } for error in result.errors
+    ] if result.errors else []
+
+
+def build_validation_fields(result):
+    """
+    Field values for a UCellSignalValidation row from a formatter result
+    """
+    return {
+        'formatted_successfully': result.success,
+        'poka_yoke_passed': result.success and len(result.errors) == 0,
+        'validation_errors': build_validation_errors(result),
+        'bos_confirmed': result.success,
+        'pip_movement': Decimal('0.8') if result.success else None,
+        'confidence_score': Decimal(str(result.signal.get('confidence', 0))) if result.success and result.signal else None,
+        'processing_time_ms': result.processing_time_ms,
+        'correlation_id': result.correlation_id,
+        'validated_at': timezone.now()
+    }
+
+
+def validate_signal(mql5_signal):
+    """
+    U-Cell 1: validate signal and create or update its validation record
+
+    Returns: (validation, formatter_result)
+    """
+    result = format_signal(mql5_signal)
+    validation = save_validation(mql5_signal, result)
+
+    logger.info(f"U-Cell validation completed for signal {mql5_signal.pk}: {result.success}")
+    return validation, result
+
+
+def save_validation(mql5_signal, result):
+    """
+    Create or update the UCellSignalValidation record for a formatter result
+    """
+    validation, created = UCellSignalValidation.objects.get_or_create(
+        mql5_signal=mql5_signal,
+        defaults=build_validation_fields(result)
+    )
+
+    if not created:
+        # Update existing record
+        validation.formatted_successfully = result.success
+        validation.poka_yoke_passed = result.success and len(result.errors) == 0
+        validation.validation_errors = build_validation_errors(result)
+        validation.processing_time_ms = result.processing_time_ms
+        validation.correlation_id = result.correlation_id
+        validation.validated_at = timezone.now()
+        validation.save()
+
+    return validation
+
+
+def get_account_context(executor=None):
+    """
+    Get account balance and currency from MT5, falling back to defaults
+
+    Uses the given connected executor when provided instead of opening
+    a new MT5 connection.
+    """
+    account_balance = 10000.0  # Default fallback
+    account_currency = 'USD'    # Default fallback
+
+    try:
+        if executor is not None:
+            account_info = executor.get_account_info()
+        else:
+            from trading.mt5_session import mt5_session
+            with mt5_session() as mt5_executor:
+                account_info = mt5_executor.get_account_info()
+
+        if account_info:
+            account_balance = account_info['balance']
+            account_currency = account_info['currency']
+            logger.info(f"MT5 account loaded: {account_currency} {account_balance}")
+        else:
+            logger.warning("Could not get MT5 account info, using defaults")
+    except Exception as e:
+        logger.error(f"MT5 connection error: {e}, using default values")
+
+    return account_balance, account_currency
+
+
+def build_risk_signal(mql5_signal, pip_value):
+    """
+    Convert Django signal to U-Cell 3 risk format
+    """
+    return {
+        'signal_id': str(mql5_signal.id),
+        'symbol': mql5_signal.symbol,
+        'action': mql5_signal.direction,
+        'entry_price': float(mql5_signal.entry_price),
+        'stop_loss': float(mql5_signal.stop_loss),
+        'take_profit': float(mql5_signal.take_profit),
+        'confidence': 0.85,  # Default
+        'pip_value': pip_value  # Dynamic pip value
+    }
+
+
+def calculate_risk(mql5_signal, executor=None):
+    """
+    Run U-Cell 3 Risk Calculator for a signal (no database writes)
+
+    Returns the raw calculator result dict.
+    """
+    if not u_cell_components.RiskCalculator:
+        raise UCellComponentsUnavailable('U-Cell components not available')
+
+    account_balance, account_currency = get_account_context(executor)
+
+    # Risk configuration with dynamic values
+    risk_config = dict(DEFAULT_RISK_CONFIG)
+    risk_config['account_balance'] = account_balance    # Dynamic from MT5
+    risk_config['account_currency'] = account_currency  # Dynamic from MT5
+
+    calculator = u_cell_components.RiskCalculator(risk_config)
+
+    # Get dynamic pip value for the symbol
+    from trading.pip_value_calculator import PipValueCalculator
+    pip_calculator = PipValueCalculator(executor)
+    pip_value = pip_calculator.calculate_pip_value(
+        mql5_signal.symbol,
+        1.0,  # Standard lot
+        account_currency
+    )
+
+    if pip_value:
+        logger.info(f"Pip value for {mql5_signal.symbol}: {pip_value} {account_currency}")
+    else:
+        logger.warning(f"Could not calculate pip value for {mql5_signal.symbol}, using default")
+
+    return calculator.calculate_risk(build_risk_signal(mql5_signal, pip_value))
+
+
+def save_risk_assessment(mql5_signal, result):
+    """
+    Create or update the UCellRiskAssessment record for a calculator result
+    """
+    assessment, created = UCellRiskAssessment.objects.get_or_create(
+        mql5_signal=mql5_signal,
+        defaults={
+            'approved': result['approved'],
+            'position_size': Decimal(str(result['position_size'])),
+            'risk_amount': Decimal(str(result['risk_amount'])),
+            'risk_percentage': Decimal(str(result['risk_percentage'])),
+            'daily_risk_used': Decimal(str(result['daily_risk_used'])),
+            'weekly_risk_used': Decimal(str(result['weekly_risk_used'])),
+            'drawdown_impact': Decimal(str(result['drawdown_impact'])),
+            'calculation_accuracy': Decimal(str(result['calculation_accuracy'])),
+            'processing_time_ms': result['processing_time_ms'],
+            'approval_reason': result['approval_reason'],
+            'rejection_reasons': result['rejection_reasons'],
+            'assessed_at': timezone.now()
+        }
+    )
+
+    if not created:
+        # Update existing record
+        assessment.approved = result['approved']
+        assessment.position_size = Decimal(str(result['position_size']))
+        assessment.risk_amount = Decimal(str(result['risk_amount']))
+        assessment.risk_percentage = Decimal(str(result['risk_percentage']))
+        assessment.processing_time_ms = result['processing_time_ms']
+        assessment.approval_reason = result['approval_reason']
+        assessment.rejection_reasons = result['rejection_reasons']
+        assessment.assessed_at = timezone.now()
+        assessment.save()
+
+    return assessment
+
+
+def assess_risk(mql5_signal, executor=None):
+    """
+    U-Cell 3: assess risk and create or update the assessment record
+
+    Returns: (assessment, calculator_result)
+    """
+    result = calculate_risk(mql5_signal, executor)
+    assessment = save_risk_assessment(mql5_signal, result)
+
+    logger.info(f"U-Cell risk assessment completed for signal {mql5_signal.pk}: {result['approved']}")
+    return assessment, result
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def _pip_size(symbol):
+    """Pip size used for slippage (same as Trade.calculate_pips)"""
+    from trading.pips import get_pip_size
+    return get_pip_size(symbol)
+
+
+def claim_for_execution(mql5_signal):
+    """
+    Lock the signal row and mark it executed before its order is sent
+
+    Returns the status the signal had, or None when it is no longer
+    executable (already executed, rejected, or claimed by a concurrent
+    request). The claim is committed before MT5 is called, so a repeated
+    request never sends a second order for the same signal.
+    """
+    from .models import MQL5Signal
+
+    with transaction.atomic():
+        current_status = (
+            MQL5Signal.objects.select_for_update()
+            .filter(pk=mql5_signal.pk)
+            .values_list('status', flat=True)
+            .first()
+        )
+        if current_status not in EXECUTABLE_STATUSES:
+            return None
+        MQL5Signal.objects.filter(pk=mql5_signal.pk, status=current_status).update(status='executed')
+
+    return current_status
+
+
+def release_execution_claim(mql5_signal, status):
+    """Give a claimed signal its previous status back (the order was not filled)"""
+    from .models import MQL5Signal
+
+    MQL5Signal.objects.filter(pk=mql5_signal.pk, status='executed').update(status=status)
+    mql5_signal.status = status
+
+
+def execute_order(mql5_signal, volume, executor):
+    """
+    U-Cell 4: send the order for a signal claimed with claim_for_execution
+    (no database writes)
+
+    U-Cell 3 approved the signal, so the executor gets it as approved; the
+    caller persists the final status together with the execution records.
+    """
+    mql5_signal.status = 'approved'
+    return executor.execute_trade_from_signal(mql5_signal, volume)
+
+
+def save_execution(mql5_signal, execution_result, volume, latency_ms):
+    """
+    Create the Trade (on fill) and UCellExecution records for an order result
+
+    Called only for a claimed signal, so the execution it replaces (if any)
+    is an earlier attempt that was not filled.
+    """
+    from trading.models import Trade
+
+    trade = None
+    executed_price = Decimal('0')
+    slippage_pips = Decimal('0')
+
+    if execution_result.success:
+        executed_price = execution_result.actual_entry_price or mql5_signal.entry_price
+        slippage_pips = (abs(executed_price - mql5_signal.entry_price) / _pip_size(mql5_signal.symbol)).quantize(Decimal('0.1'))
+
+        trade = Trade.objects.create(
+            mql5_signal=mql5_signal,
+            mt5_ticket=execution_result.ticket,
+            mt5_order_type=f"ORDER_TYPE_{mql5_signal.direction}",
+            symbol=mql5_signal.symbol,
+            direction=mql5_signal.direction,
+            entry_price=executed_price,
+            stop_loss=mql5_signal.stop_loss,
+            take_profit=mql5_signal.take_profit,
+            volume=execution_result.actual_volume or volume,
+            signal_time=mql5_signal.signal_timestamp,
+            execution_time=execution_result.execution_time or timezone.now(),
+            status='opened'
+        )
+
+    if execution_result.success:
+        execution_status = 'FILLED'
+    elif execution_result.error_code is not None:
+        execution_status = 'REJECTED'
+    else:
+        execution_status = 'FAILED'
+
+    execution, created = UCellExecution.objects.update_or_create(
+        mql5_signal=mql5_signal,
+        defaults={
+            'trade': trade,
+            'order_id': str(execution_result.ticket or ''),
+            'requested_price': mql5_signal.entry_price,
+            'executed_price': executed_price,
+            'slippage_pips': slippage_pips,
+            'execution_status': execution_status,
+            'mt5_response': {
+                'ticket': execution_result.ticket,
+                'error_code': execution_result.error_code,
+                'error_message': execution_result.error_message,
+                'volume': str(execution_result.actual_volume or volume)
+            },
+            'execution_latency_ms': latency_ms,
+            'executed_at': timezone.now() if execution_result.success else None
+        }
+    )
+
+    return execution, trade
+
+
+def run_pipeline(mql5_signal, execute=True, correlation_id=''):
+    """
+    Run validate -> risk -> execute for one signal in a single call
+
+    The signal is loaded once by the caller, all MT5 work shares one
+    connection, and every UCell* record is written in one transaction after
+    the MT5 work is done. Returns a summary dict with per-stage timings (ms).
+
+    Only pending and approved signals are processed (stopped_at 'status'
+    otherwise), and the order is sent only after the signal has been
+    claimed, so repeated calls never send a second order.
+    """
+    from trading.mt5_session import mt5_session, MT5SessionUnavailable
+
+    pipeline_started = time.perf_counter()
+    timings = {}
+    summary = {
+        'signal_id': str(mql5_signal.pk),
+        'symbol': mql5_signal.symbol,
+        'validation': None,
+        'risk': None,
+        'execution': None,
+        'stopped_at': None,
+    }
+
+    if mql5_signal.status not in EXECUTABLE_STATUSES:
+        summary['stopped_at'] = 'status'
+        summary['error'] = f"Signal status is {mql5_signal.status}"
+        return summary
+
+    # U-Cell 1: formatting is in-memory only
+    started = time.perf_counter()
+    validation_result = format_signal(mql5_signal)
+    timings['validation_ms'] = _elapsed_ms(started)
+
+    risk_result = None
+    execution_result = None
+    volume = None
+    original_status = mql5_signal.status
+
+    if not validation_result.success:
+        summary['stopped_at'] = 'validation'
+    else:
+        try:
+            with mt5_session() as executor:
+                # U-Cell 3: account info and pip value over the shared connection
+                started = time.perf_counter()
+                risk_result = calculate_risk(mql5_signal, executor)
+                timings['risk_ms'] = _elapsed_ms(started)
+
+                if not risk_result['approved']:
+                    summary['stopped_at'] = 'risk'
+                elif not execute:
+                    summary['stopped_at'] = 'execution_skipped'
+                else:
+                    claimed_status = claim_for_execution(mql5_signal)
+                    if claimed_status is None:
+                        summary['stopped_at'] = 'status'
+                        summary['error'] = 'Signal was executed or rejected by another request'
+                    else:
+                        original_status = claimed_status
+                        # U-Cell 4: order over the same connection
+                        started = time.perf_counter()
+                        volume = Decimal(str(risk_result['position_size']))
+                        try:
+                            execution_result = execute_order(mql5_signal, volume, executor)
+                        except Exception:
+                            release_execution_claim(mql5_signal, original_status)
+                            raise
+                        timings['execution_ms'] = _elapsed_ms(started)
+        except MT5SessionUnavailable as e:
+            logger.error(f"U-Cell pipeline could not borrow MT5 session: {e}")
+            summary['stopped_at'] = 'mt5_unavailable'
+            summary['error'] = str(e)
+
+    if execution_result is not None and not execution_result.success:
+        # Not filled: the signal can be executed again
+        release_execution_claim(mql5_signal, original_status)
+
+    # Persist every stage in one transaction
+    started = time.perf_counter()
+    try:
+        with transaction.atomic():
+            validation = save_validation(mql5_signal, validation_result)
+            summary['validation'] = {
+                'validation_id': str(validation.validation_id),
+                'success': validation_result.success,
+                'errors': validation.validation_errors,
+                'correlation_id': validation_result.correlation_id
+            }
+
+            if risk_result is not None:
+                assessment = save_risk_assessment(mql5_signal, risk_result)
+                summary['risk'] = {
+                    'assessment_id': str(assessment.assessment_id),
+                    'approved': risk_result['approved'],
+                    'position_size': risk_result['position_size'],
+                    'risk_amount': risk_result['risk_amount'],
+                    'risk_percentage': risk_result['risk_percentage'],
+                    'approval_reason': risk_result['approval_reason'],
+                    'rejection_reasons': risk_result['rejection_reasons']
+                }
+
+            if execution_result is not None:
+                execution, trade = save_execution(
+                    mql5_signal, execution_result, volume, timings['execution_ms']
+                )
+                mql5_signal.status = 'executed' if execution_result.success else original_status
+                mql5_signal.save(update_fields=['status'])
+
+                summary['execution'] = {
+                    'execution_id': str(execution.execution_id),
+                    'execution_successful': execution_result.success,
+                    'execution_status': execution.execution_status,
+                    'mt5_ticket': execution_result.ticket,
+                    'trade_id': str(trade.id) if trade else None,
+                    'slippage_pips': float(execution.slippage_pips),
+                    'error': execution_result.error_message
+                }
+            else:
+                mql5_signal.status = original_status
+
+            timings['persist_ms'] = _elapsed_ms(started)
+            timings['total_ms'] = _elapsed_ms(pipeline_started)
+
+            UCellQualityMeasurement.objects.create(
+                process_name='end_to_end_latency',
+                measurement_value=timings['total_ms'],
+                measurement_unit='ms',
+                within_spec=(
+                    END_TO_END_LATENCY_SPEC['lower_spec_limit']
+                    <= timings['total_ms']
+                    <= END_TO_END_LATENCY_SPEC['upper_spec_limit']
+                ),
+                mql5_signal=mql5_signal,
+                correlation_id=correlation_id or validation_result.correlation_id or '',
+                **END_TO_END_LATENCY_SPEC
+            )
+    except Exception:
+        if execution_result is not None and execution_result.success:
+            # The signal stays claimed (executed), so the order is never sent twice
+            logger.critical(
+                f"Order {execution_result.ticket} for signal {mql5_signal.pk} was filled "
+                f"but its execution records could not be saved"
+            )
+        raise
+
+    summary['timings'] = timings
+    logger.info(
+        f"U-Cell pipeline completed for signal {mql5_signal.pk} in {timings['total_ms']}ms "
+        f"(stopped at: {summary['stopped_at'] or 'completed'})"
+    )
+    return summary
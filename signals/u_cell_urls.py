@@ -9,6 +9,7 @@ from .u_cell_views import (
     UCellSignalValidationViewSet,
     UCellRiskAssessmentViewSet,
     UCellExecutionViewSet,
+    UCellPipelineViewSet,
     UCellQualityMeasurementViewSet,
     UCellSystemHealthViewSet,
     UCellStatisticalMonitoringViewSet
@@ -21,6 +22,7 @@ router = DefaultRouter()
 router.register(r'validations', UCellSignalValidationViewSet, basename='ucell-validation')
 router.register(r'risk-assessments', UCellRiskAssessmentViewSet, basename='ucell-risk')
 router.register(r'executions', UCellExecutionViewSet, basename='ucell-execution')
+router.register(r'pipeline', UCellPipelineViewSet, basename='ucell-pipeline')
 router.register(r'quality-measurements', UCellQualityMeasurementViewSet, basename='ucell-quality')
 router.register(r'system-health', UCellSystemHealthViewSet, basename='ucell-health')
 router.register(r'statistical-monitoring', UCellStatisticalMonitoringViewSet, basename='ucell-monitoring')
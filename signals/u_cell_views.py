@@ -13,6 +13,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from core.authentication import DoddApiKeyAuthentication
+from core.exports import ExportSpec, streaming_export
+from core.pagination import UCellCursorPagination
 from django.http import JsonResponse
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
@@ -36,26 +38,18 @@ from .u_cell_serializers import (
     UCellSystemHealthSerializer
 )
 
-import sys
-import os
-
-# Import U-Cell components - Fixed paths to validated components
-base_path = os.path.join(os.path.dirname(__file__), '..', '..', 'mikrobot_u_cells', 'validated')
-sys.path.append(os.path.join(base_path, 'UCell_Signal_Detection_v1.0'))
-sys.path.append(os.path.join(base_path, 'UCell_Processing_Analysis_v1.0'))
-sys.path.append(os.path.join(base_path, 'UCell_Execution_v1.0'))
-sys.path.append(os.path.join(base_path, 'UCell_Signal_Reception_v1.0'))
-sys.path.append(os.path.join(base_path, 'UCell_Monitoring_Control_v1.0'))
-
-try:
-    from signal_formatter import SignalFormatter, BOSDetectionResult
-    from risk_calculator import RiskCalculator, ProcessedSignal as RiskProcessedSignal
-    from order_executor import OrderExecutor, ProcessedSignal as ExecProcessedSignal  
-    from kafka_producer import ResilientKafkaProducer
-    from statistical_monitor import StatisticalMonitor, QualityMeasurement
-except ImportError as e:
-    print(f"Warning: Could not import U-Cell components: {e}")
-    SignalFormatter = None
+from .u_cell_components import (
+    SignalFormatter,
+    BOSDetectionResult,
+    RiskCalculator,
+    RiskProcessedSignal,
+    OrderExecutor,
+    ExecProcessedSignal,
+    ResilientKafkaProducer,
+    StatisticalMonitor,
+    QualityMeasurement
+)
+from . import u_cell_pipeline
 
 import logging
 from datetime import datetime
@@ -65,6 +59,52 @@ from decimal import Decimal
 logger = logging.getLogger(__name__)
 
 
+RISK_ASSESSMENT_EXPORT = ExportSpec(
+    queryset=UCellRiskAssessment.objects.all(),
+    fields=[
+        'assessment_id', 'mql5_signal_id', 'mql5_signal__symbol', 'approved',
+        'position_size', 'risk_amount', 'risk_percentage',
+        'daily_risk_used', 'weekly_risk_used', 'drawdown_impact',
+        'calculation_accuracy', 'processing_time_ms', 'created_at', 'assessed_at',
+    ],
+    date_field='created_at',
+    symbol_field='mql5_signal__symbol',
+    filename='ucell_risk_assessments',
+)
+
+EXECUTION_EXPORT = ExportSpec(
+    queryset=UCellExecution.objects.all(),
+    fields=[
+        'execution_id', 'mql5_signal_id', 'trade_id', 'mql5_signal__symbol', 'order_id',
+        'execution_status', 'requested_price', 'executed_price', 'slippage_pips',
+        'execution_latency_ms', 'created_at', 'executed_at',
+    ],
+    date_field='created_at',
+    symbol_field='mql5_signal__symbol',
+    filename='ucell_executions',
+)
+
+QUALITY_MEASUREMENT_EXPORT = ExportSpec(
+    queryset=UCellQualityMeasurement.objects.all(),
+    fields=[
+        'measurement_id', 'process_name', 'measurement_value', 'measurement_unit',
+        'target_value', 'upper_spec_limit', 'lower_spec_limit', 'within_spec', 'sigma_level',
+        'mql5_signal_id', 'mql5_signal__symbol', 'correlation_id', 'created_at',
+    ],
+    date_field='created_at',
+    symbol_field='mql5_signal__symbol',
+    filename='ucell_quality_measurements',
+)
+
+
+def _export_response(spec, request):
+    """Streaming export, or 400 for invalid export parameters"""
+    try:
+        return streaming_export(spec, request.query_params)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 class UCellSignalValidationViewSet(viewsets.ModelViewSet):
     """
     U-Cell 1: Signal Detection - Validation API
@@ -78,6 +118,7 @@ class UCellSignalValidationViewSet(viewsets.ModelViewSet):
     search_fields = ['mql5_signal__symbol', 'correlation_id']
     ordering_fields = ['created_at', 'processing_time_ms', 'confidence_score']
     ordering = ['-created_at']
+    pagination_class = UCellCursorPagination
     
     @action(detail=False, methods=['post'])
     def validate_signal(self, request):
@@ -107,62 +148,8 @@ class UCellSignalValidationViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
             
-            # Initialize formatter
-            formatter = SignalFormatter()
-            
-            # Convert Django signal to BOS format
-            bos_data = {
-                'symbol': mql5_signal.symbol,
-                'h1_break_price': float(mql5_signal.entry_price) - 0.0005,  # Simulate H1 break
-                'm15_confirmation_price': float(mql5_signal.entry_price),
-                'break_direction': 'UP' if mql5_signal.direction == 'BUY' else 'DOWN',
-                'pip_movement': 0.8,  # Default
-                'confidence_raw': 0.85,  # Default
-                'detection_timestamp': mql5_signal.signal_timestamp.timestamp()
-            }
-            
-            # Format signal
-            result = formatter.format_bos_signal(bos_data)
-            
-            # Create or update validation record
-            validation, created = UCellSignalValidation.objects.get_or_create(
-                mql5_signal=mql5_signal,
-                defaults={
-                    'formatted_successfully': result.success,
-                    'poka_yoke_passed': result.success and len(result.errors) == 0,
-                    'validation_errors': [
-                        {
-                            'error_type': error.get('error_type', ''),
-                            'field': error.get('field', ''),
-                            'message': error.get('message', '')
-                        } for error in result.errors
-                    ] if result.errors else [],
-                    'bos_confirmed': result.success,
-                    'pip_movement': Decimal('0.8') if result.success else None,
-                    'confidence_score': Decimal(str(result.signal.get('confidence', 0))) if result.success and result.signal else None,
-                    'processing_time_ms': result.processing_time_ms,
-                    'correlation_id': result.correlation_id,
-                    'validated_at': timezone.now()
-                }
-            )
-            
-            if not created:
-                # Update existing record
-                validation.formatted_successfully = result.success
-                validation.poka_yoke_passed = result.success and len(result.errors) == 0
-                validation.validation_errors = [
-                    {
-                        'error_type': error.get('error_type', ''),
-                        'field': error.get('field', ''),
-                        'message': error.get('message', '')
-                    } for error in result.errors
-                ] if result.errors else []
-                validation.processing_time_ms = result.processing_time_ms
-                validation.correlation_id = result.correlation_id
-                validation.validated_at = timezone.now()
-                validation.save()
-            
-            logger.info(f"U-Cell validation completed for signal {signal_id}: {result.success}")
+            # Format signal and create or update validation record
+            validation, result = u_cell_pipeline.validate_signal(mql5_signal)
             
             return Response({
                 'validation_id': str(validation.validation_id),
@@ -194,6 +181,16 @@ class UCellRiskAssessmentViewSet(viewsets.ModelViewSet):
     search_fields = ['mql5_signal__symbol', 'assessment_id']
     ordering_fields = ['created_at', 'risk_percentage', 'position_size']
     ordering = ['-created_at']
+    pagination_class = UCellCursorPagination
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream risk assessments as NDJSON or CSV
+        
+        Query params: export_format (ndjson|csv), from, to (created_at), symbol
+        """
+        return _export_response(RISK_ASSESSMENT_EXPORT, request)
     
     @action(detail=False, methods=['post'])
     def assess_risk(self, request):
@@ -223,99 +220,8 @@ class UCellRiskAssessmentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
             
-            # Get real account info from MT5
-            from trading.mt5_executor import MT5Executor
-            
-            account_balance = 10000.0  # Default fallback
-            account_currency = 'USD'    # Default fallback
-            
-            try:
-                with MT5Executor() as executor:
-                    account_info = executor.get_account_info()
-                    if account_info:
-                        account_balance = account_info['balance']
-                        account_currency = account_info['currency']
-                        logger.info(f"MT5 account loaded: {account_currency} {account_balance}")
-                    else:
-                        logger.warning("Could not get MT5 account info, using defaults")
-            except Exception as e:
-                logger.error(f"MT5 connection error: {e}, using default values")
-            
-            # Risk configuration with dynamic values
-            risk_config = {
-                'max_risk_per_trade': 0.01,  # 1%
-                'max_daily_risk': 0.02,      # 2%
-                'max_weekly_risk': 0.05,     # 5%
-                'max_drawdown': 0.10,        # 10%
-                'account_balance': account_balance,   # Dynamic from MT5
-                'account_currency': account_currency  # Dynamic from MT5
-            }
-            
-            # Initialize calculator
-            calculator = RiskCalculator(risk_config)
-            
-            # Get dynamic pip value for the symbol
-            from trading.pip_value_calculator import PipValueCalculator
-            pip_calculator = PipValueCalculator()
-            pip_value = pip_calculator.calculate_pip_value(
-                mql5_signal.symbol, 
-                1.0,  # Standard lot
-                account_currency
-            )
-            
-            # Log pip value calculation
-            if pip_value:
-                logger.info(f"Pip value for {mql5_signal.symbol}: {pip_value} {account_currency}")
-            else:
-                logger.warning(f"Could not calculate pip value for {mql5_signal.symbol}, using default")
-            
-            # Convert Django signal to risk format
-            risk_signal = {
-                'signal_id': str(mql5_signal.id),
-                'symbol': mql5_signal.symbol,
-                'action': mql5_signal.direction,
-                'entry_price': float(mql5_signal.entry_price),
-                'stop_loss': float(mql5_signal.stop_loss),
-                'take_profit': float(mql5_signal.take_profit),
-                'confidence': 0.85,  # Default
-                'pip_value': pip_value  # Dynamic pip value
-            }
-            
-            # Calculate risk
-            result = calculator.calculate_risk(risk_signal)
-            
-            # Create or update assessment record
-            assessment, created = UCellRiskAssessment.objects.get_or_create(
-                mql5_signal=mql5_signal,
-                defaults={
-                    'approved': result['approved'],
-                    'position_size': Decimal(str(result['position_size'])),
-                    'risk_amount': Decimal(str(result['risk_amount'])),
-                    'risk_percentage': Decimal(str(result['risk_percentage'])),
-                    'daily_risk_used': Decimal(str(result['daily_risk_used'])),
-                    'weekly_risk_used': Decimal(str(result['weekly_risk_used'])),
-                    'drawdown_impact': Decimal(str(result['drawdown_impact'])),
-                    'calculation_accuracy': Decimal(str(result['calculation_accuracy'])),
-                    'processing_time_ms': result['processing_time_ms'],
-                    'approval_reason': result['approval_reason'],
-                    'rejection_reasons': result['rejection_reasons'],
-                    'assessed_at': timezone.now()
-                }
-            )
-            
-            if not created:
-                # Update existing record
-                assessment.approved = result['approved']
-                assessment.position_size = Decimal(str(result['position_size']))
-                assessment.risk_amount = Decimal(str(result['risk_amount']))
-                assessment.risk_percentage = Decimal(str(result['risk_percentage']))
-                assessment.processing_time_ms = result['processing_time_ms']
-                assessment.approval_reason = result['approval_reason']
-                assessment.rejection_reasons = result['rejection_reasons']
-                assessment.assessed_at = timezone.now()
-                assessment.save()
-            
-            logger.info(f"U-Cell risk assessment completed for signal {signal_id}: {result['approved']}")
+            # Calculate risk with real MT5 account info and create or update assessment record
+            assessment, result = u_cell_pipeline.assess_risk(mql5_signal)
             
             return Response({
                 'assessment_id': str(assessment.assessment_id),
@@ -349,6 +255,79 @@ class UCellExecutionViewSet(viewsets.ModelViewSet):
     search_fields = ['mql5_signal__symbol', 'order_id', 'execution_id']
     ordering_fields = ['created_at', 'executed_at', 'slippage_pips']
     ordering = ['-created_at']
+    pagination_class = UCellCursorPagination
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream executions as NDJSON or CSV
+        
+        Query params: export_format (ndjson|csv), from, to (created_at), symbol
+        """
+        return _export_response(EXECUTION_EXPORT, request)
+
+
+class UCellPipelineViewSet(viewsets.ViewSet):
+    """
+    U-Cell 1 -> 3 -> 4: complete pipeline in one request
+    """
+    
+    permission_classes = [AllowAny]
+    
+    @action(detail=False, methods=['post'])
+    def run(self, request):
+        """
+        Validate, assess risk and execute a signal in one call
+        
+        Shares one MT5 connection across stages and returns a per-stage
+        timing breakdown. Pass "execute": false to stop after risk assessment.
+        Signals that are no longer pending or approved get 409.
+        """
+        try:
+            signal_id = request.data.get('signal_id')
+            if not signal_id:
+                return Response(
+                    {'error': 'signal_id is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Get MQL5Signal (once for all stages)
+            try:
+                mql5_signal = MQL5Signal.objects.get(pk=signal_id)
+            except MQL5Signal.DoesNotExist:
+                return Response(
+                    {'error': 'Signal not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            if not SignalFormatter or not RiskCalculator:
+                return Response(
+                    {'error': 'U-Cell components not available'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            
+            execute = request.data.get('execute', True)
+            if isinstance(execute, str):
+                execute = execute.lower() not in ('false', '0', 'no')
+            
+            result = u_cell_pipeline.run_pipeline(
+                mql5_signal,
+                execute=bool(execute),
+                correlation_id=request.data.get('correlation_id', '')
+            )
+            
+            if result['stopped_at'] == 'status':
+                # Already executed, rejected or expired: never send another order
+                return Response(result, status=status.HTTP_409_CONFLICT)
+            
+            return Response(result)
+            
+        except Exception as e:
+            logger.error(f"U-Cell pipeline failed: {str(e)}")
+            return Response(
+                {'error': f'Pipeline failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
 
 class UCellQualityMeasurementViewSet(viewsets.ModelViewSet):
@@ -364,6 +343,16 @@ class UCellQualityMeasurementViewSet(viewsets.ModelViewSet):
     search_fields = ['process_name', 'correlation_id']
     ordering_fields = ['created_at', 'measurement_value', 'sigma_level']
     ordering = ['-created_at']
+    pagination_class = UCellCursorPagination
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream quality measurements as NDJSON or CSV
+        
+        Query params: export_format (ndjson|csv), from, to (created_at), symbol
+        """
+        return _export_response(QUALITY_MEASUREMENT_EXPORT, request)
     
     @action(detail=False, methods=['post'])
     def record_measurement(self, request):
@@ -433,6 +422,7 @@ class UCellSystemHealthViewSet(viewsets.ModelViewSet):
     filter_backends = [SearchFilter, OrderingFilter]
     ordering_fields = ['created_at', 'sigma_level', 'throughput_rate']
     ordering = ['-created_at']
+    pagination_class = UCellCursorPagination
     
     @action(detail=False, methods=['get'])
     def current_status(self, request):
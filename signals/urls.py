@@ -3,7 +3,10 @@ from rest_framework.routers import DefaultRouter
 from . import views, webhooks
 from .discord_webhook import discord_webhook
 from .pure_ea_webhook import pure_ea_webhook
+from .batch_webhook import pure_signal_batch_webhook
 from . import u_cell_urls
+from .ingest_queue import fast_ack
+from .idempotency import idempotent_urlpatterns
 
 router = DefaultRouter()
 router.register(r'signals', views.MQL5SignalViewSet)
@@ -15,8 +18,9 @@ urlpatterns = [
     # U-Cell Integration API endpoints
     path('api/v1/', include(u_cell_urls.urlpatterns)),
     
-    # Webhook endpoints for PURE Signal Detector
-    path('api/v1/pure-signal/', webhooks.pure_signal_webhook, name='pure_signal_webhook'),
+    # Webhook endpoints for PURE Signal Detector (fast-ack: queued, processed by ingest workers)
+    path('api/v1/pure-signal/', fast_ack('pure_signal')(webhooks.pure_signal_webhook), name='pure_signal_webhook'),
+    path('api/v1/pure-signal/batch/', pure_signal_batch_webhook, name='pure_signal_batch_webhook'),
     path('api/v1/pure-signal/status/', webhooks.pure_signal_status, name='pure_signal_status'),
     path('api/v1/pure-signal/timeframes/', webhooks.pure_timeframe_webhook, name='pure_timeframe_webhook'),
     path('api/v1/llm-approval/', webhooks.llm_approval_webhook, name='llm_approval_webhook'),
@@ -27,6 +31,16 @@ urlpatterns = [
     # Discord webhook endpoint
     path('discord-webhook/', discord_webhook, name='discord_webhook'),
     
-    # PURE EA webhook endpoint (BOS signals)
-    path('api/signals/receive/', pure_ea_webhook, name='pure_ea_webhook'),
-]
\ No newline at end of file
+    # PURE EA webhook endpoint (BOS signals, fast-ack)
+    path('api/signals/receive/', fast_ack('pure_ea')(pure_ea_webhook), name='pure_ea_webhook'),
+]
+
+# Duplicate signal deliveries are answered with the original response
+IDEMPOTENT_ROUTES = {
+    'pure_signal_webhook',
+    'pure_signal_batch_webhook',
+    'pure_signal_webhook_class',
+    'discord_webhook',
+    'pure_ea_webhook',
+}
+urlpatterns = idempotent_urlpatterns(urlpatterns, IDEMPOTENT_ROUTES)
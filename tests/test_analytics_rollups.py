@@ -0,0 +1,75 @@
+"""
+MikroBot analytics-rollupien yksikkötestit
+Testaa suljetun kaupan kontribuution (pipit, R-kerroin, päivä/viikko)
+"""
+
+import unittest
+import os
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from analytics.rollups import close_contribution, iso_week
+
+
+def trade_state(**overrides):
+    state = {
+        'symbol': 'EURUSD',
+        'direction': 'BUY',
+        'status': 'closed_profit',
+        'net_profit_loss': Decimal('50.00'),
+        'entry_price': Decimal('1.08500'),
+        'exit_price': Decimal('1.09000'),
+        'stop_loss': Decimal('1.08250'),
+        'close_time': datetime(2025, 1, 15, 23, 30, tzinfo=timezone.utc),
+    }
+    state.update(overrides)
+    return state
+
+
+class TestCloseContribution(unittest.TestCase):
+    """close_contribution funktion testit"""
+
+    def test_closed_buy(self):
+        """Testaa voitollinen osto: 50 pipiä, 2R"""
+        symbol, close_date, values = close_contribution(trade_state())
+
+        self.assertEqual(symbol, 'EURUSD')
+        self.assertEqual(close_date, date(2025, 1, 15))
+        self.assertEqual(values['trade_count'], 1)
+        self.assertEqual(values['win_count'], 1)
+        self.assertEqual(values['loss_count'], 0)
+        self.assertEqual(values['pips'], Decimal('50.0'))
+        self.assertEqual(values['r_multiple'], Decimal('2.00'))
+
+    def test_losing_jpy_sell(self):
+        """Testaa tappiollinen JPY-myynti: -1R"""
+        _, _, values = close_contribution(trade_state(
+            symbol='USDJPY', direction='SELL', status='closed_loss',
+            net_profit_loss=Decimal('-30.00'),
+            entry_price=Decimal('150.000'), exit_price=Decimal('150.300'), stop_loss=Decimal('150.300'),
+        ))
+
+        self.assertEqual(values['loss_count'], 1)
+        self.assertEqual(values['pips'], Decimal('-30.0'))
+        self.assertEqual(values['r_multiple'], Decimal('-1.00'))
+
+    def test_open_trade_does_not_contribute(self):
+        """Testaa että avoin kauppa ei näy rollupeissa"""
+        self.assertIsNone(close_contribution(trade_state(status='opened')))
+        self.assertIsNone(close_contribution(trade_state(close_time=None)))
+        self.assertIsNone(close_contribution(None))
+
+    def test_iso_week(self):
+        """Testaa ISO-viikko ja viikon maanantai"""
+        self.assertEqual(iso_week(date(2025, 1, 15)), (2025, 3, date(2025, 1, 13)))
+        self.assertEqual(iso_week(date(2024, 12, 30)), (2025, 1, date(2024, 12, 30)))
+
+
+if __name__ == '__main__':
+    unittest.main()
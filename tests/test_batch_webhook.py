@@ -0,0 +1,108 @@
+"""
+MikroBot batch-webhookin -yksikkötestit
+Testaa PURE-signaalin jäsennyksen ja että erä tallennetaan yhdellä bulk_creatella taulua kohden
+"""
+
+import json
+import os
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import RequestFactory, TestCase
+
+from signals import batch_webhook
+from signals.models import MQL5Signal
+from signals.pure_signal import PureSignalPayloadError, build_pure_signal
+from signals.u_cell_models import UCellSignalValidation
+
+SIGNALS = [
+    {'symbol': 'EURUSD', 'direction': 'BUY', 'trigger_price': 1.085, 'h1_bos_level': 1.0845,
+     'timestamp': '2025-01-22T17:15:00Z'},
+    'not a signal',
+    {'symbol': 'GBPUSD', 'direction': 'SELL', 'trigger_price': 1.265, 'm15_break_high': 1.2655},
+    {'symbol': 'USDJPY', 'direction': 'BUY', 'trigger_price': 150.0},
+]
+
+
+class TestBuildPureSignal(unittest.TestCase):
+    """build_pure_signal funktion testit"""
+
+    def test_levels_from_bos(self):
+        """Testaa SL H1 BOS -tasolta ja TP 1:2 -tavoitteena"""
+        signal = build_pure_signal(SIGNALS[0])
+
+        self.assertEqual(signal.stop_loss, Decimal('1.08450'))
+        self.assertEqual(signal.take_profit, Decimal('1.08600'))
+        self.assertEqual(signal.status, 'pending')
+
+    def test_sell_falls_back_to_m15_break(self):
+        """Testaa SELL-signaalin SL M15-murron ylärajalta"""
+        signal = build_pure_signal(SIGNALS[2])
+
+        self.assertEqual(signal.stop_loss, Decimal('1.26550'))
+        self.assertEqual(signal.take_profit, Decimal('1.26400'))
+
+    def test_explicit_levels_kept(self):
+        """Testaa että payloadin SL ja TP säilyvät"""
+        signal = build_pure_signal(dict(SIGNALS[0], stop_loss=1.084, take_profit=1.09))
+
+        self.assertEqual((signal.stop_loss, signal.take_profit), (Decimal('1.08400'), Decimal('1.09000')))
+
+    def test_invalid_payloads(self):
+        """Testaa virheelliset payloadit"""
+        for payload in ['x', SIGNALS[3], dict(SIGNALS[0], direction='HOLD'), dict(SIGNALS[0], stop_loss=1.09)]:
+            with self.assertRaises(PureSignalPayloadError):
+                build_pure_signal(payload)
+
+
+class TestPureSignalBatchWebhook(TestCase):
+    """pure_signal_batch_webhook näkymän testit"""
+
+    def post(self, payload):
+        request = RequestFactory().post('/api/v1/pure-signal/batch/', data=json.dumps(payload),
+                                        content_type='application/json')
+        response = batch_webhook.pure_signal_batch_webhook(request)
+        return response, json.loads(response.content)
+
+    def test_batch_stored_with_one_bulk_create_per_table(self):
+        """Testaa että erä tallennetaan yhdellä bulk_creatella taulua kohden"""
+        with patch.object(MQL5Signal.objects, 'bulk_create', wraps=MQL5Signal.objects.bulk_create) as signals, \
+                patch.object(UCellSignalValidation.objects, 'bulk_create',
+                             wraps=UCellSignalValidation.objects.bulk_create) as validations:
+            response, data = self.post({'signals': SIGNALS})
+
+        self.assertEqual(response.status_code, 200)
+        signals.assert_called_once()
+        self.assertLessEqual(validations.call_count, 1)
+        self.assertEqual((data['successful_count'], data['failed_count']), (2, 2))
+
+        stored = MQL5Signal.objects.order_by('symbol')
+        self.assertEqual([signal.symbol for signal in stored], ['EURUSD', 'GBPUSD'])
+        self.assertEqual(data['results'][0]['signal_id'], str(stored[0].pk))
+        self.assertEqual(data['results'][1], {'index': 1, 'success': False,
+                                              'error': 'Signal must be a JSON object', 'symbol': 'UNKNOWN'})
+        self.assertEqual(data['results'][3]['symbol'], 'USDJPY')
+        self.assertFalse(data['results'][3]['success'])
+
+    def test_single_and_batch_store_same_levels(self):
+        """Testaa että erä tallentaa samat tasot kuin yksittäisen signaalin jäsennys"""
+        self.post([SIGNALS[0]])
+        expected = build_pure_signal(SIGNALS[0])
+
+        stored = MQL5Signal.objects.get()
+        self.assertEqual((stored.entry_price, stored.stop_loss, stored.take_profit),
+                         (expected.entry_price, expected.stop_loss, expected.take_profit))
+
+    def test_batch_size_limited(self):
+        """Testaa erän enimmäiskoko"""
+        response, data = self.post({'signals': [SIGNALS[0]] * (batch_webhook.MAX_BATCH_SIZE + 1)})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MQL5Signal.objects.exists())
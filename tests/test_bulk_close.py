@@ -0,0 +1,130 @@
+"""
+MikroBot bulk close -yksikkötestit
+Testaa TradeViewSet.bulk_close vastauksen muodon ja suljettujen kauppojen kirjauksen yhdellä bulk_updatella
+"""
+
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from signals.models import MQL5Signal
+from trading import views
+from trading.models import Trade
+from trading.mt5_executor import MT5ExecutionResult
+
+START = datetime(2025, 1, 20, 10, 0, tzinfo=dt_timezone.utc)
+CLOSED_AT = datetime(2025, 1, 20, 12, 30, tzinfo=dt_timezone.utc)
+
+
+class FakeExecutor:
+    """Palauttaa ennalta annetut sulkemistulokset ja kirjaa suljetut tiketit"""
+
+    def __init__(self, results):
+        self.results = results
+        self.closed = []
+
+    def close_trades(self, tickets):
+        self.closed.extend(tickets)
+        return {ticket: self.results[ticket] for ticket in tickets}
+
+
+class TestBulkClose(TestCase):
+    """TradeViewSet.bulk_close näkymän testit"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('trader', password='secret')
+        self.trades = {ticket: self.make_trade(ticket) for ticket in (101, 102, 103)}
+        self.pending = self.make_trade(104, status='pending')
+
+    def make_trade(self, ticket, status='opened'):
+        signal = MQL5Signal.objects.create(
+            source_name='PURE_EA', symbol='EURUSD', direction='BUY',
+            entry_price=Decimal('1.08500'), stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09500'),
+            signal_timestamp=START,
+        )
+        return Trade.objects.create(
+            mql5_signal=signal, mt5_ticket=ticket, mt5_order_type='ORDER_TYPE_BUY',
+            symbol='EURUSD', direction='BUY', entry_price=Decimal('1.08500'),
+            stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09500'), volume=Decimal('0.10'),
+            signal_time=START, execution_time=START, status=status,
+        )
+
+    def post(self, trade_ids, executor):
+        @contextmanager
+        def session():
+            yield executor
+
+        request = APIRequestFactory().post('/api/v1/trades/bulk_close/', {'trade_ids': trade_ids}, format='json')
+        force_authenticate(request, user=self.user)
+        with patch.object(views, 'mt5_session', session):
+            return views.TradeViewSet.as_view({'post': 'bulk_close'})(request)
+
+    def test_closed_failed_and_skipped(self):
+        """Testaa suljetut, epäonnistuneet ja ohitetut kaupat samassa pyynnössä"""
+        executor = FakeExecutor({
+            101: MT5ExecutionResult(success=True, actual_entry_price=Decimal('1.08700'), execution_time=CLOSED_AT,
+                                    profit=Decimal('20.00'), swap=Decimal('0.50'), commission=Decimal('0.70')),
+            102: MT5ExecutionResult(success=False, error_code=10006, error_message='Close failed: 10006 - Rejected'),
+            103: MT5ExecutionResult(success=True, actual_entry_price=Decimal('1.08400'), execution_time=CLOSED_AT),
+        })
+        unknown_id = str(uuid.uuid4())
+        trade_ids = [str(trade.id) for trade in self.trades.values()] + [str(self.pending.id), unknown_id]
+
+        with patch.object(Trade, 'bulk_update_tracked', wraps=Trade.bulk_update_tracked) as bulk_update:
+            response = self.post(trade_ids, executor)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(executor.closed), [101, 102, 103])
+        bulk_update.assert_called_once()
+        self.assertEqual(sorted(trade.mt5_ticket for trade in bulk_update.call_args[0][0]), [101, 103])
+
+        data = response.data
+        self.assertEqual((data['closed_count'], data['failed_count']), (2, 1))
+        self.assertEqual(sorted(data['skipped']), sorted([str(self.pending.id), unknown_id]))
+        self.assertEqual(data['failed'], [{
+            'trade_id': str(self.trades[102].id), 'ticket': 102,
+            'error_code': 10006, 'error': 'Close failed: 10006 - Rejected',
+        }])
+        closed = {item['ticket']: item for item in data['closed']}
+        self.assertEqual(closed[101], {
+            'trade_id': str(self.trades[101].id), 'ticket': 101,
+            'exit_price': 1.087, 'pnl': 18.8, 'status': 'closed_profit',
+        })
+        self.assertEqual((closed[103]['status'], closed[103]['pnl']), ('closed_unknown', None))
+
+    def test_closed_trade_written(self):
+        """Testaa suljetun kaupan tila, sulkemisaika, hinta ja toteutunut tulos"""
+        executor = FakeExecutor({
+            101: MT5ExecutionResult(success=True, actual_entry_price=Decimal('1.08300'), execution_time=CLOSED_AT,
+                                    profit=Decimal('-20.00'), swap=Decimal('0.00'), commission=Decimal('0.70')),
+        })
+
+        self.post([str(self.trades[101].id)], executor)
+
+        trade = Trade.objects.get(mt5_ticket=101)
+        self.assertEqual(trade.status, 'closed_loss')
+        self.assertEqual(trade.close_time, CLOSED_AT)
+        self.assertEqual(trade.exit_price, Decimal('1.08300'))
+        self.assertEqual(trade.exit_reason, 'bulk_close')
+        self.assertEqual((trade.gross_profit_loss, trade.net_profit_loss), (Decimal('-20.00'), Decimal('-20.70')))
+        self.assertEqual(trade.duration_minutes, 150)
+        self.assertEqual(Trade.objects.get(mt5_ticket=102).status, 'opened')
+
+    def test_trade_ids_required(self):
+        """Testaa että tyhjä trade_ids hylätään"""
+        response = self.post([], FakeExecutor({}))
+
+        self.assertEqual(response.status_code, 400)
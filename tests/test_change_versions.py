@@ -0,0 +1,106 @@
+"""
+MikroBot change version -yksikkötestit
+Testaa ETag-versiot, 304-vastaukset ja MT5-tilannekuvan muutostunnistuksen
+"""
+
+import unittest
+import os
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+
+from core import change_versions
+from core.change_versions import ACCOUNT, SIGNALS, TRADES
+
+
+class TestChangeVersions(unittest.TestCase):
+    """change_versions moduulin testit"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        # Testit ajetaan yhdessä prosessissa LocMem-välimuistilla
+        self.settings = override_settings(CHANGE_VERSION_CONFIG={'allow_local_cache': True})
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+
+    def test_bump_changes_etag(self):
+        """Testaa että versionnosto vaihtaa ETagin"""
+        before = change_versions.make_etag(TRADES, SIGNALS)
+        self.assertTrue(before.startswith('W/"'))
+        self.assertEqual(change_versions.make_etag(TRADES, SIGNALS), before)
+
+        change_versions.bump_now(TRADES)
+
+        self.assertNotEqual(change_versions.make_etag(TRADES, SIGNALS), before)
+
+    def test_matching_etag_is_not_modified(self):
+        """Testaa 304 kun If-None-Match vastaa nykyistä versiota"""
+        etag = change_versions.make_etag(TRADES)
+        request = self.factory.get('/api/v1/trades/', HTTP_IF_NONE_MATCH=etag)
+
+        response = change_versions.not_modified(request, etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_stale_etag_is_served(self):
+        """Testaa että vanha ETag ei tuota 304:ää"""
+        stale = change_versions.make_etag(TRADES)
+        change_versions.bump_now(TRADES)
+        request = self.factory.get('/api/v1/trades/', HTTP_IF_NONE_MATCH=stale)
+
+        self.assertIsNone(change_versions.not_modified(request, change_versions.make_etag(TRADES)))
+
+    def test_snapshot_bumps_account_only_on_change(self):
+        """Testaa että sama MT5-tilannekuva ei nosta versiota"""
+        payload = [{'id': 1, 'profit': 12.5}]
+        self.assertTrue(change_versions.record_snapshot('positions', payload))
+        version = change_versions.get_versions(ACCOUNT)[ACCOUNT]
+
+        self.assertFalse(change_versions.record_snapshot('positions', payload))
+        self.assertEqual(change_versions.get_versions(ACCOUNT)[ACCOUNT], version)
+
+        self.assertTrue(change_versions.record_snapshot('positions', [{'id': 1, 'profit': 13.0}]))
+        self.assertGreater(change_versions.get_versions(ACCOUNT)[ACCOUNT], version)
+
+    def test_snapshot_freshness(self):
+        """Testaa tilannekuvan tuoreus"""
+        self.assertFalse(change_versions.snapshot_fresh('positions'))
+
+        change_versions.record_snapshot('positions', [])
+
+        self.assertTrue(change_versions.snapshot_fresh('positions'))
+        self.assertFalse(change_versions.snapshot_fresh('positions', 'account'))
+
+    def test_scoped_etag(self):
+        """Testaa käyttäjäkohtainen ETag"""
+        self.assertNotEqual(
+            change_versions.make_etag(TRADES, scope='u1'),
+            change_versions.make_etag(TRADES, scope='u2'),
+        )
+
+
+class TestProcessLocalCache(unittest.TestCase):
+    """ETagit prosessikohtaisella välimuistilla"""
+
+    def test_no_etag_without_shared_cache(self):
+        """Testaa ettei LocMem-välimuistilla anneta ETageja eikä 304-vastauksia"""
+        request = RequestFactory().get('/api/v1/trades/', HTTP_IF_NONE_MATCH='*')
+
+        with override_settings(CHANGE_VERSION_CONFIG={'allow_local_cache': False}):
+            etag = change_versions.make_etag(TRADES)
+
+        self.assertIsNone(etag)
+        self.assertIsNone(change_versions.not_modified(request, etag))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+MikroBot moduulikonfiguraation yksikkötestit
+Testaa oletusten yhdistämisen settings-ylikirjoituksiin
+"""
+
+import unittest
+import os
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import override_settings
+
+from core.config import get_config
+
+DEFAULTS = {
+    'ttl': 2.0,
+    'latency': {'model': 'none', 'ms': 0},
+}
+
+
+class TestGetConfig(unittest.TestCase):
+    """get_config funktion testit"""
+
+    def test_defaults_without_setting(self):
+        """Testaa että puuttuva asetus palauttaa oletukset"""
+        self.assertEqual(get_config('MISSING_TEST_CONFIG', DEFAULTS), DEFAULTS)
+
+    @override_settings(TEST_CONFIG={'ttl': 5.0, 'latency': {'ms': 50}, 'extra': True})
+    def test_override_merges_nested_dicts(self):
+        """Testaa että sisäkkäinen ylikirjoitus säilyttää muut avaimet"""
+        config = get_config('TEST_CONFIG', DEFAULTS)
+
+        self.assertEqual(config, {'ttl': 5.0, 'latency': {'model': 'none', 'ms': 50}, 'extra': True})
+
+    @override_settings(TEST_CONFIG={'latency': {'ms': 50}})
+    def test_defaults_not_mutated(self):
+        """Testaa ettei yhdistäminen muuta moduulin oletuksia"""
+        get_config('TEST_CONFIG', DEFAULTS)
+
+        self.assertEqual(DEFAULTS['latency'], {'model': 'none', 'ms': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+MikroBot dashboard panel -yksikkötestit
+Testaa paneelien välimuistin, aikakatkaisun ja vanhentuneen sisällön palautuksen
+"""
+
+import unittest
+import os
+import threading
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from dashboard import panels
+from dashboard.panels import FRESH, PLACEHOLDER, STALE, DashboardPanel, get_panel_context
+
+PANEL_SETTINGS = {'test_panel': {'ttl': 60.0, 'timeout': 0.2}}
+
+
+class BlockingLoader:
+    """Laskee lataukset; gate pysäyttää latauksen kunnes se avataan"""
+
+    def __init__(self, blocked=False):
+        self.calls = 0
+        self.gate = threading.Event()
+        if not blocked:
+            self.gate.set()
+
+    def __call__(self, request, user_settings):
+        self.calls += 1
+        self.gate.wait(timeout=5)
+        return {'value': self.calls}
+
+
+class TestDashboardPanels(unittest.TestCase):
+    """get_panel_context funktion testit"""
+
+    def setUp(self):
+        cache.clear()
+        self.panel_settings = override_settings(DASHBOARD_PANEL_CONFIG=PANEL_SETTINGS)
+        self.panel_settings.enable()
+
+    def tearDown(self):
+        # Taustalataukset eivät saa kirjoittaa seuraavan testin välimuistiin
+        for future in list(panels._inflight.values()):
+            try:
+                future.result(timeout=5)
+            except Exception:
+                pass
+        self.panel_settings.disable()
+
+    def make_panel(self, loader):
+        return DashboardPanel('test_panel', 'Test', 'dashboard/panels/placeholder.html', loader)
+
+    def test_context_cached_within_ttl(self):
+        """Testaa että TTL:n sisällä ei ladata uudelleen"""
+        loader = BlockingLoader()
+        panel = self.make_panel(loader)
+
+        self.assertEqual(get_panel_context(panel, None, {}), ({'value': 1}, FRESH))
+        self.assertEqual(get_panel_context(panel, None, {}), ({'value': 1}, FRESH))
+        self.assertEqual(loader.calls, 1)
+
+    def test_slow_source_gets_placeholder(self):
+        """Testaa että hidas lähde ei pidättele vastausta"""
+        loader = BlockingLoader(blocked=True)
+        panel = self.make_panel(loader)
+
+        self.assertEqual(get_panel_context(panel, None, {}), (None, PLACEHOLDER))
+
+        # Lataus jatkuu taustalla ja seuraava pyyntö saa valmiin tuloksen
+        loader.gate.set()
+        self.assertEqual(get_panel_context(panel, None, {}), ({'value': 1}, FRESH))
+        self.assertEqual(loader.calls, 1)
+
+    def test_slow_refresh_serves_stale_context(self):
+        """Testaa vanhentuneen sisällön palautus hitaan päivityksen aikana"""
+        loader = BlockingLoader()
+        panel = self.make_panel(loader)
+        get_panel_context(panel, None, {})
+
+        with override_settings(DASHBOARD_PANEL_CONFIG={'test_panel': {'ttl': 0.0, 'timeout': 0.2}}):
+            loader.gate.clear()
+            self.assertEqual(get_panel_context(panel, None, {}), ({'value': 1}, STALE))
+            loader.gate.set()
+
+    def test_failing_loader_serves_stale_context(self):
+        """Testaa että latausvirhe palauttaa edellisen sisällön"""
+        panel = self.make_panel(BlockingLoader())
+        get_panel_context(panel, None, {})
+
+        def failing(request, user_settings):
+            raise RuntimeError('MT5 down')
+
+        with override_settings(DASHBOARD_PANEL_CONFIG={'test_panel': {'ttl': 0.0, 'timeout': 0.2}}):
+            context, state = get_panel_context(self.make_panel(failing), None, {})
+
+        self.assertEqual((context, state), ({'value': 1}, STALE))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+MikroBot dashboard snapshot -yksikkötestit
+Testaa TTL-välimuistin ja yhden samanaikaisen päivityksen (single-flight)
+"""
+
+import unittest
+import os
+import threading
+import time
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from dashboard.snapshot import DashboardSnapshot, DashboardSnapshotService
+
+
+class CountingCollector:
+    """Laskee MT5-keräykset; valinnainen viive simuloi hidasta terminaalia"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return DashboardSnapshot(account={'balance': float(self.calls)}, mt5_connected=True)
+
+
+class TestDashboardSnapshotService(unittest.TestCase):
+    """DashboardSnapshotService luokan testit"""
+
+    def test_snapshot_cached_within_ttl(self):
+        """Testaa että TTL:n sisällä ei kerätä uudelleen"""
+        collector = CountingCollector()
+        service = DashboardSnapshotService(collector)
+
+        first = service.get(max_age=60)
+        second = service.get(max_age=60)
+
+        self.assertIs(first, second)
+        self.assertEqual(collector.calls, 1)
+
+    def test_expired_snapshot_refreshed(self):
+        """Testaa vanhentuneen tilannekuvan päivitys"""
+        collector = CountingCollector()
+        service = DashboardSnapshotService(collector)
+
+        service.get(max_age=60)
+        refreshed = service.get(max_age=0)
+
+        self.assertEqual(collector.calls, 2)
+        self.assertEqual(refreshed.account['balance'], 2.0)
+
+    def test_concurrent_cold_start_collects_once(self):
+        """Testaa että samanaikaiset pyynnöt käynnistävät vain yhden keräyksen"""
+        collector = CountingCollector(delay=0.1)
+        service = DashboardSnapshotService(collector)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(service.get(max_age=60))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(collector.calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_stale_snapshot_served_during_refresh(self):
+        """Testaa että päivityksen aikana palautetaan edellinen tilannekuva"""
+        collector = CountingCollector(delay=0.2)
+        service = DashboardSnapshotService(collector)
+        stale = service.get(max_age=60)
+
+        refresher = threading.Thread(target=lambda: service.get(max_age=0))
+        refresher.start()
+        time.sleep(0.05)
+        served = service.get(max_age=0)
+        refresher.join()
+
+        self.assertIs(served, stale)
+        self.assertEqual(collector.calls, 2)
+
+    def test_invalidate(self):
+        """Testaa välimuistin tyhjennys"""
+        collector = CountingCollector()
+        service = DashboardSnapshotService(collector)
+
+        service.get(max_age=60)
+        service.invalidate()
+        service.get(max_age=60)
+
+        self.assertEqual(collector.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
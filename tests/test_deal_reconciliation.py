@@ -0,0 +1,105 @@
+"""
+MikroBot deal reconciliation -yksikkötestit
+Testaa position sulkemisen kauppoihin MT5-dealien perusteella ilman tietokantaa
+"""
+
+import unittest
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from trading.deal_reconciliation import _deal_from_mt5, close_position, exit_reason_for
+from trading.models import MT5Deal, Trade
+
+
+def make_deal(ticket, entry, volume='0.10', price='1.08500', profit='0.00', reason=3, time_msc=0, comment=''):
+    return MT5Deal(
+        ticket=ticket, position_id=500, symbol='EURUSD', type=0 if entry == MT5Deal.ENTRY_IN else 1,
+        entry=entry, reason=reason, volume=Decimal(volume), price=Decimal(price),
+        profit=Decimal(profit), swap=Decimal('0.00'), commission=Decimal('-0.35'),
+        comment=comment, time_msc=time_msc or ticket * 1000,
+        time=datetime.fromtimestamp(time_msc / 1000 if time_msc else ticket, tz=timezone.utc),
+    )
+
+
+class TestClosePosition(unittest.TestCase):
+    """close_position funktion testit"""
+
+    def setUp(self):
+        self.trade = Trade(mt5_ticket=500, symbol='EURUSD', direction='BUY', volume=Decimal('0.10'),
+                           entry_price=Decimal('1.08500'), status='opened')
+
+    def test_take_profit_close(self):
+        """Testaa TP-sulkeminen: hinta, aika, syy ja tulos"""
+        deals = [
+            make_deal(1, MT5Deal.ENTRY_IN),
+            make_deal(2, MT5Deal.ENTRY_OUT, price='1.09000', profit='50.00', reason=5),
+        ]
+
+        self.assertTrue(close_position(self.trade, deals))
+        self.assertEqual(self.trade.exit_price, Decimal('1.09000'))
+        self.assertEqual(self.trade.close_time, deals[1].time)
+        self.assertEqual(self.trade.exit_reason, 'take_profit')
+        self.assertEqual(self.trade.gross_profit_loss, Decimal('50.00'))
+        self.assertEqual(self.trade.commission, Decimal('-0.70'))
+        self.assertEqual(self.trade.status, 'closed_profit')
+
+    def test_partial_close_keeps_trade_open(self):
+        """Testaa että osittainen sulkeminen ei sulje kauppaa"""
+        deals = [
+            make_deal(1, MT5Deal.ENTRY_IN),
+            make_deal(2, MT5Deal.ENTRY_OUT, volume='0.05', price='1.09000', profit='25.00'),
+        ]
+
+        self.assertFalse(close_position(self.trade, deals))
+        self.assertEqual(self.trade.status, 'opened')
+
+    def test_volume_weighted_exit_price(self):
+        """Testaa painotettu sulkemishinta kahdesta osasulusta"""
+        deals = [
+            make_deal(1, MT5Deal.ENTRY_IN),
+            make_deal(2, MT5Deal.ENTRY_OUT, volume='0.05', price='1.09000', profit='25.00'),
+            make_deal(3, MT5Deal.ENTRY_OUT, volume='0.05', price='1.08000', profit='-25.00', reason=4),
+        ]
+
+        self.assertTrue(close_position(self.trade, deals))
+        self.assertEqual(self.trade.exit_price, Decimal('1.08500'))
+        self.assertEqual(self.trade.exit_reason, 'stop_loss')
+        self.assertEqual(self.trade.status, 'closed_loss')
+
+    def test_no_exit_deal(self):
+        """Testaa positio ilman sulkevaa dealia"""
+        self.assertIsNone(close_position(self.trade, [make_deal(1, MT5Deal.ENTRY_IN)]))
+
+
+class TestDealConversion(unittest.TestCase):
+    """MT5-dealien muunnoksen testit"""
+
+    def test_exit_reason_from_comment(self):
+        """Testaa SL/TP-tunnistus kommentista kun syykoodi puuttuu"""
+        self.assertEqual(exit_reason_for(make_deal(2, MT5Deal.ENTRY_OUT, reason=3, comment='[sl 1.08000]')), 'stop_loss')
+        self.assertEqual(exit_reason_for(make_deal(2, MT5Deal.ENTRY_OUT, reason=0, comment='[tp 1.09000]')), 'take_profit')
+        self.assertEqual(exit_reason_for(make_deal(2, MT5Deal.ENTRY_OUT, reason=0)), 'manual')
+
+    def test_deal_from_mt5_without_optional_fields(self):
+        """Testaa dealin muunnos ilman time_msc- ja reason-kenttiä (PaperDeal)"""
+        deal = _deal_from_mt5(SimpleNamespace(
+            ticket=7, order=7, position_id=500, symbol='EURUSD', type=1, entry=1,
+            volume=0.1, price=1.09, profit=50.0, time=1736935200, magic=0, comment='',
+        ))
+
+        self.assertEqual(deal.time_msc, 1736935200000)
+        self.assertEqual(deal.time, datetime(2025, 1, 15, 10, 0, tzinfo=timezone.utc))
+        self.assertEqual(deal.reason, 0)
+        self.assertEqual(deal.price, Decimal('1.09'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+MikroBot streaming-exportin yksikkötestit
+Testaa NDJSON/CSV-rivien koodauksen ja aikarajojen jäsennyksen
+"""
+
+import unittest
+import os
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from core.exports import _parse_bound, csv_lines, ndjson_lines
+from trading.views import TRADE_EXPORT
+
+
+ROWS = [
+    (uuid.UUID(int=1), 'EURUSD', Decimal('1.08500'), datetime(2025, 1, 15, 9, 30, tzinfo=timezone.utc)),
+    (uuid.UUID(int=2), 'USDJPY', None, datetime(2025, 1, 16, 10, 0, tzinfo=timezone.utc)),
+]
+COLUMNS = ['id', 'symbol', 'entry_price', 'execution_time']
+
+
+class TestExportEncoding(unittest.TestCase):
+    """Rivien koodauksen testit"""
+
+    def test_ndjson_lines(self):
+        """Testaa että jokainen rivi on oma JSON-objektinsa"""
+        lines = list(ndjson_lines(iter(ROWS), COLUMNS))
+
+        self.assertEqual(len(lines), 2)
+        first = json.loads(lines[0])
+        self.assertEqual(first['symbol'], 'EURUSD')
+        self.assertEqual(first['entry_price'], '1.08500')
+        self.assertEqual(first['execution_time'], '2025-01-15T09:30:00Z')
+        self.assertIsNone(json.loads(lines[1])['entry_price'])
+
+    def test_csv_lines(self):
+        """Testaa CSV-otsikko ja ISO 8601 -ajat"""
+        lines = list(csv_lines(iter(ROWS), COLUMNS))
+
+        self.assertEqual(lines[0], 'id,symbol,entry_price,execution_time\r\n')
+        self.assertIn('EURUSD,1.08500,2025-01-15T09:30:00+00:00', lines[1])
+        self.assertIn('USDJPY,,2025-01-16', lines[2])
+
+    def test_trade_export_columns(self):
+        """Testaa että sarakkeiden nimet ovat polun viimeinen osa"""
+        self.assertIn('mql5_signal_id', TRADE_EXPORT.columns)
+        self.assertEqual(len(TRADE_EXPORT.columns), len(set(TRADE_EXPORT.columns)))
+
+
+class TestParseBound(unittest.TestCase):
+    """Aikarajojen jäsennyksen testit"""
+
+    def test_plain_date(self):
+        """Testaa pelkkä päivämäärä"""
+        moment, is_date = _parse_bound('2025-01-15', 'from')
+
+        self.assertTrue(is_date)
+        self.assertEqual(moment.date().isoformat(), '2025-01-15')
+
+    def test_datetime(self):
+        """Testaa ISO 8601 -aikaleima"""
+        moment, is_date = _parse_bound('2025-01-15T12:00:00+00:00', 'to')
+
+        self.assertFalse(is_date)
+        self.assertEqual(moment, datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc))
+
+    def test_invalid_value(self):
+        """Testaa virheellinen arvo"""
+        with self.assertRaises(ValueError):
+            _parse_bound('yesterday', 'from')
+
+
+if __name__ == '__main__':
+    unittest.main()
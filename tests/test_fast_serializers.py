@@ -0,0 +1,96 @@
+"""
+MikroBot nopean kauppasarjallistuksen yksikkötestit
+Testaa että values_list-polku tuottaa saman JSONin kuin TradeSerializer
+"""
+
+import unittest
+import os
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from trading.fast_serializers import VALUE_PATHS, serialize_trade_rows
+from trading.models import Trade
+from trading.serializers import TradeSerializer
+
+
+def make_trade(**overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        mql5_signal_id=uuid.uuid4(),
+        mt5_ticket=123456,
+        mt5_order_type='ORDER_TYPE_BUY',
+        symbol='EURUSD',
+        direction='BUY',
+        entry_price=Decimal('1.08500'),
+        stop_loss=Decimal('1.08000'),
+        take_profit=Decimal('1.09000'),
+        volume=Decimal('0.10'),
+        status='opened',
+        signal_time=datetime(2025, 1, 15, 9, 29, 58, tzinfo=timezone.utc),
+        execution_time=datetime(2025, 1, 15, 9, 30, tzinfo=timezone.utc),
+        execution_delay_seconds=2,
+    )
+    values.update(overrides)
+    return Trade(**values)
+
+
+def both_outputs(trades):
+    slow = json.loads(JSONRenderer().render(TradeSerializer(trades, many=True).data))
+    rows = [tuple(getattr(trade, path) for path in VALUE_PATHS) for trade in trades]
+    fast = json.loads(json.dumps(serialize_trade_rows(rows)))
+    return slow, fast
+
+
+class TestFastTradeSerialization(unittest.TestCase):
+    """serialize_trade_rows funktion testit"""
+
+    def test_open_trade_matches_serializer(self):
+        """Testaa avoin kauppa"""
+        slow, fast = both_outputs([make_trade()])
+
+        self.assertEqual(fast, slow)
+        self.assertEqual(list(fast[0]), list(slow[0]))
+
+    def test_closed_trade_matches_serializer(self):
+        """Testaa suljettu kauppa tallennetuilla pipeillä"""
+        trade = make_trade(
+            status='closed_profit',
+            exit_price=Decimal('1.09000'),
+            gross_profit_loss=Decimal('50.00'),
+            net_profit_loss=Decimal('49.30'),
+            close_time=datetime(2025, 1, 15, 11, 45, tzinfo=timezone.utc),
+            duration_minutes=135,
+            pips=Decimal('50.0'),
+        )
+        slow, fast = both_outputs([trade])
+
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast[0]['pips_gained'], 50.0)
+        self.assertTrue(fast[0]['is_profitable'])
+        self.assertEqual(fast[0]['duration_hours'], 2.25)
+
+    def test_pips_fallback_without_stored_value(self):
+        """Testaa pipien laskenta kun arvoa ei ole tallennettu"""
+        trade = make_trade(
+            symbol='USDJPY', direction='SELL',
+            entry_price=Decimal('150.000'), exit_price=Decimal('149.700'),
+            stop_loss=Decimal('150.300'), take_profit=Decimal('149.400'),
+        )
+        slow, fast = both_outputs([trade])
+
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast[0]['pips_gained'], 30.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+MikroBot idempotenssi -yksikkötestit
+Testaa sormenjäljen, kaksoistoimitusten vastaukset ja hylättyjen avainten palautuksen
+"""
+
+import json
+import os
+from datetime import timedelta
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase
+from django.urls import path
+from django.utils import timezone
+
+from signals.idempotency import compute_fingerprint, idempotent, idempotent_urlpatterns, response_cache
+from signals.ingest_models import SignalIdempotencyRecord
+
+SIGNAL = {
+    'symbol': 'EURUSD', 'direction': 'BUY', 'trigger_price': 1.085,
+    'stop_loss': 1.08, 'timestamp': '2025-01-22T17:15:00Z',
+}
+
+
+class TestComputeFingerprint(TestCase):
+    """compute_fingerprint funktion testit"""
+
+    def test_equal_values_match(self):
+        """Testaa että 1.085 ja "1.08500" tuottavat saman sormenjäljen"""
+        self.assertEqual(compute_fingerprint(SIGNAL), compute_fingerprint(dict(SIGNAL, trigger_price='1.08500')))
+
+    def test_signal_without_timestamp_not_deduplicated(self):
+        """Testaa ettei aikaleimatonta signaalia tunnisteta kaksoiskappaleeksi"""
+        signal = {key: value for key, value in SIGNAL.items() if key != 'timestamp'}
+
+        self.assertIsNone(compute_fingerprint(signal))
+        self.assertIsNone(compute_fingerprint({'signals': [SIGNAL, signal]}))
+
+    def test_discord_message_needs_id(self):
+        """Testaa että Discord-viesti tunnistetaan vain viestin tunnisteella"""
+        self.assertIsNone(compute_fingerprint({'content': 'BUY EURUSD 1.0850'}))
+        self.assertNotEqual(
+            compute_fingerprint({'content': 'BUY EURUSD 1.0850', 'id': '1'}),
+            compute_fingerprint({'content': 'BUY EURUSD 1.0850', 'id': '2'}),
+        )
+
+
+class TestIdempotentView(TestCase):
+    """idempotent dekoraattorin testit"""
+
+    def setUp(self):
+        response_cache.clear()
+        self.calls = 0
+
+        @idempotent
+        def view(request):
+            self.calls += 1
+            return JsonResponse({'call': self.calls})
+
+        self.view = view
+
+    def post(self, payload=SIGNAL):
+        request = RequestFactory().post('/api/v1/pure-signal/', data=json.dumps(payload),
+                                        content_type='application/json')
+        return self.view(request)
+
+    def test_duplicate_replayed(self):
+        """Testaa että toistettu toimitus saa alkuperäisen vastauksen"""
+        first = self.post()
+        response_cache.clear()
+        second = self.post()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+
+    def test_in_flight_duplicate_conflicts(self):
+        """Testaa että käsittelyssä oleva avain palauttaa 409"""
+        self.post()
+        response_cache.clear()
+        SignalIdempotencyRecord.objects.update(status='in_flight')
+
+        self.assertEqual(self.post().status_code, 409)
+        self.assertEqual(self.calls, 1)
+
+    def test_abandoned_in_flight_key_reclaimed(self):
+        """Testaa että kaatuneen käsittelyn avain vapautuu aikakatkaisun jälkeen"""
+        self.post()
+        response_cache.clear()
+        SignalIdempotencyRecord.objects.update(
+            status='in_flight', created_at=timezone.now() - timedelta(minutes=10)
+        )
+
+        response = self.post()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(SignalIdempotencyRecord.objects.get().status, 'completed')
+
+    def test_repeat_without_timestamp_processed(self):
+        """Testaa että aikaleimaton toistuva signaali käsitellään joka kerta"""
+        signal = {key: value for key, value in SIGNAL.items() if key != 'timestamp'}
+        self.post(signal)
+        self.post(signal)
+
+        self.assertEqual(self.calls, 2)
+        self.assertFalse(SignalIdempotencyRecord.objects.exists())
+
+
+class TestIdempotentUrlpatterns(TestCase):
+    """idempotent_urlpatterns funktion testit"""
+
+    def test_only_named_routes_wrapped(self):
+        """Testaa että vain signaalien vastaanottoreitit kääritään"""
+        def view(request):
+            return JsonResponse({})
+
+        patterns = idempotent_urlpatterns(
+            [path('ingest/', view, name='ingest'), path('approve/', view, name='approve')],
+            {'ingest'}
+        )
+
+        self.assertTrue(getattr(patterns[0].callback, '_idempotent', False))
+        self.assertIs(patterns[1].callback, view)
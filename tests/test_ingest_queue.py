@@ -0,0 +1,162 @@
+"""
+MikroBot signaalijonon -yksikkötestit
+Testaa jonoon lisäyksen, työn varaamisen, uudelleenyritykset, kuolleen workerin kohteiden palautuksen
+ja ettei hidas worker ylikirjoita uudelleen varattua kohdetta
+"""
+
+import os
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from signals.ingest_models import SignalIngestItem
+from signals import ingest_queue
+from signals.ingest_queue import SignalIngestWorkerPool, enqueue_payload, ingest_worker_pool
+
+QUEUE_SETTINGS = {'max_attempts': 3, 'retry_backoff_seconds': 5, 'visibility_timeout': 60}
+
+
+@override_settings(SIGNAL_INGEST_CONFIG=QUEUE_SETTINGS)
+class TestSignalIngestQueue(TestCase):
+    """enqueue_payload ja SignalIngestWorkerPool.claim_next testit"""
+
+    def setUp(self):
+        self.pool = SignalIngestWorkerPool()
+
+    def make_item(self, **fields):
+        return SignalIngestItem.objects.create(source='pure', path='/api/v1/pure-signal/', payload='{}', **fields)
+
+    def test_enqueue_stores_payload_and_wakes_workers(self):
+        """Testaa että webhookin raakadata tallennetaan jonoon"""
+        request = RequestFactory().post('/api/v1/pure-signal/?debug=1', data='{"symbol": "EURUSD"}',
+                                        content_type='application/json')
+
+        with patch.object(ingest_worker_pool, 'ensure_started') as ensure_started, \
+                patch.object(ingest_worker_pool, 'notify') as notify:
+            item = enqueue_payload('pure', request, request.body)
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, 'pending')
+        self.assertEqual(item.payload, '{"symbol": "EURUSD"}')
+        self.assertEqual(item.query_string, 'debug=1')
+        ensure_started.assert_called_once()
+        notify.assert_called_once()
+
+    def test_claim_oldest_and_lease(self):
+        """Testaa että vanhin kohde varataan ja sille asetetaan näkyvyysaikakatkaisu"""
+        now = timezone.now()
+        oldest = self.make_item(received_at=now - timedelta(minutes=2))
+        self.make_item(received_at=now - timedelta(minutes=1))
+
+        item = self.pool.claim_next()
+
+        self.assertEqual(item.pk, oldest.pk)
+        self.assertEqual(item.status, 'processing')
+        self.assertEqual(item.attempts, 1)
+        self.assertGreater(item.available_at, now + timedelta(seconds=50))
+
+    def test_item_claimed_once(self):
+        """Testaa ettei käsittelyssä olevaa kohdetta varata uudelleen ennen aikakatkaisua"""
+        self.make_item()
+
+        self.assertIsNotNone(self.pool.claim_next())
+        self.assertIsNone(self.pool.claim_next())
+
+    def test_backoff_delays_retry(self):
+        """Testaa että epäonnistunut kohde odottaa viiveen ennen uutta yritystä"""
+        self.make_item()
+        item = self.pool.claim_next()
+
+        self.pool._mark_failed(item, 'MT5 down')
+
+        item.refresh_from_db()
+        self.assertEqual((item.status, item.last_error), ('pending', 'MT5 down'))
+        self.assertIsNone(self.pool.claim_next())
+
+        SignalIngestItem.objects.filter(pk=item.pk).update(available_at=timezone.now())
+        self.assertEqual(self.pool.claim_next().attempts, 2)
+
+    def test_fails_after_max_attempts(self):
+        """Testaa pysyvä epäonnistuminen viimeisen yrityksen jälkeen"""
+        self.make_item(status='processing', attempts=3)
+        item = SignalIngestItem.objects.get()
+
+        self.pool._mark_failed(item, 'MT5 down')
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, 'failed')
+        self.assertIsNotNone(item.processed_at)
+
+    def test_stale_processing_item_reclaimed(self):
+        """Testaa että kuolleen workerin kohde varataan uudelleen aikakatkaisun jälkeen"""
+        stale = self.make_item(status='processing', attempts=1,
+                               available_at=timezone.now() - timedelta(seconds=1))
+
+        item = self.pool.claim_next()
+
+        self.assertEqual(item.pk, stale.pk)
+        self.assertEqual((item.status, item.attempts), ('processing', 2))
+
+    def test_stale_item_on_last_attempt_fails(self):
+        """Testaa että viimeisellä yrityksellä kuollut kohde merkitään epäonnistuneeksi"""
+        stale = self.make_item(status='processing', attempts=3,
+                               available_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertIsNone(self.pool.claim_next())
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, 'failed')
+        self.assertIn('visibility timeout', stale.last_error)
+
+    def test_reclaimed_item_not_overwritten(self):
+        """Testaa ettei uudelleen varatun kohteen tulosta ylikirjoiteta"""
+        self.make_item()
+        item = self.pool.claim_next()
+        # Toinen worker varasi kohteen aikakatkaisun jälkeen
+        SignalIngestItem.objects.filter(pk=item.pk).update(attempts=2)
+
+        handler = MagicMock(return_value=JsonResponse({'status': 'success'}))
+        with patch.object(ingest_queue, 'get_ingest_handler', return_value=handler):
+            self.pool.process_item(item)
+
+        handler.assert_called_once()
+        item.refresh_from_db()
+        self.assertEqual((item.status, item.attempts), ('processing', 2))
+
+    def test_claimed_item_finished(self):
+        """Testaa että varauksen haltija tallentaa tuloksen"""
+        self.make_item()
+        item = self.pool.claim_next()
+
+        handler = MagicMock(return_value=JsonResponse({'status': 'success'}))
+        with patch.object(ingest_queue, 'get_ingest_handler', return_value=handler):
+            self.pool.process_item(item)
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, 'done')
+        self.assertEqual(item.response_data, {'status': 'success'})
+
+    def test_lease_renewed_while_processing(self):
+        """Testaa että elossa oleva worker jatkaa varaustaan käsittelyn ajan"""
+        owned = MagicMock()
+        owned.update.return_value = 1
+
+        with override_settings(SIGNAL_INGEST_CONFIG={'visibility_timeout': 0.03}), \
+                patch.object(self.pool, '_owned', return_value=owned):
+            with self.pool._hold_lease(SignalIngestItem(attempts=1)):
+                time.sleep(0.1)
+            renewals = owned.update.call_count
+            time.sleep(0.05)
+
+        self.assertGreaterEqual(renewals, 1)
+        self.assertLessEqual(owned.update.call_count, renewals + 1)
@@ -0,0 +1,152 @@
+"""
+MikroBot live stream -yksikkötestit
+Testaa muutosten laskennan, tilannekuvat ja tilaajien uudelleensynkronoinnin
+"""
+
+import unittest
+import os
+import json
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import RequestFactory, override_settings
+
+from dashboard.api_views import live_stream_api
+from dashboard.live_stream import LiveStreamHub, LiveStreamSubscription, diff_state, format_event
+
+
+def make_state(profit=10.0, equity=10010.0, trades=None):
+    return {
+        'trades': trades if trades is not None else [
+            {'id': 1, 'symbol': 'EURUSD', 'current_price': 1.085, 'profit': profit},
+        ],
+        'account': {'balance': 10000.0, 'equity': equity, 'profit': profit},
+        'sts_signals': [],
+    }
+
+
+class StateReader:
+    """Palauttaa annetut tilat järjestyksessä"""
+
+    def __init__(self, *states):
+        self.states = list(states)
+
+    def __call__(self):
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+class TestDiffState(unittest.TestCase):
+    """diff_state funktion testit"""
+
+    def test_unchanged_state(self):
+        """Testaa että muuttumaton tila ei tuota muutosta"""
+        self.assertIsNone(diff_state(make_state(), make_state()))
+
+    def test_only_changed_fields(self):
+        """Testaa että vain muuttuneet kentät lähetetään"""
+        diff = diff_state(make_state(), make_state(profit=12.5, equity=10012.5))
+
+        self.assertEqual(diff['account'], {'equity': 10012.5, 'profit': 12.5})
+        self.assertEqual(diff['trades'], {'upsert': [{'id': 1, 'profit': 12.5}], 'removed': []})
+        self.assertNotIn('sts_signals', diff)
+
+    def test_opened_and_closed_trades(self):
+        """Testaa uusi kauppa kokonaisena ja suljettu tunnisteena"""
+        new_trade = {'id': 2, 'symbol': 'GBPUSD', 'current_price': 1.27, 'profit': -3.0}
+        diff = diff_state(make_state(), make_state(trades=[new_trade]))
+
+        self.assertEqual(diff['trades'], {'upsert': [new_trade], 'removed': [1]})
+
+
+class TestLiveStreamHub(unittest.TestCase):
+    """LiveStreamHub luokan testit (ilman tuottajasäiettä)"""
+
+    def setUp(self):
+        self.subscription = LiveStreamSubscription(maxsize=4)
+
+    def make_hub(self, reader):
+        hub = LiveStreamHub(reader)
+        hub._subscribers.add(self.subscription)
+        return hub
+
+    def test_first_tick_is_snapshot_then_diffs(self):
+        """Testaa ensimmäinen tilannekuva ja sitä seuraava muutos"""
+        hub = self.make_hub(StateReader(make_state(), make_state(profit=11.0)))
+
+        self.assertEqual(hub.tick()['type'], 'snapshot')
+        event = hub.tick()
+
+        self.assertEqual(event['type'], 'diff')
+        self.assertEqual(event['seq'], 2)
+        self.assertEqual(self.subscription.get(timeout=0)['type'], 'snapshot')
+        self.assertEqual(self.subscription.get(timeout=0), event)
+
+    def test_unchanged_tick_publishes_nothing(self):
+        """Testaa ettei muuttumattomasta tilasta lähetetä tapahtumaa"""
+        hub = self.make_hub(StateReader(make_state()))
+        hub.tick()
+        self.subscription.get(timeout=0)
+
+        self.assertIsNone(hub.tick())
+        self.assertIsNone(self.subscription.get(timeout=0))
+
+    def test_overflow_resyncs_with_snapshot(self):
+        """Testaa että täysi jono korvataan tuoreella tilannekuvalla"""
+        states = [make_state(profit=float(profit)) for profit in range(5)]
+        hub = self.make_hub(StateReader(*states))
+        for _ in states:
+            hub.tick()
+
+        event = self.subscription.get(timeout=0)
+        self.assertEqual(event['type'], 'snapshot')
+        self.assertEqual(event['account']['profit'], 4.0)
+        self.assertIsNone(self.subscription.get(timeout=0))
+
+    def test_subscribers_capped_per_process(self):
+        """Testaa että tilaajamäärän ylittävä asiakas ohjataan pollaukseen"""
+        hub = LiveStreamHub(StateReader(make_state()))
+        hub._thread = object()  # ei käynnistetä tuottajasäiettä
+
+        with override_settings(LIVE_STREAM_CONFIG={'max_subscribers': 2}):
+            first, second = hub.subscribe(), hub.subscribe()
+            self.assertIsNotNone(first)
+            self.assertIsNotNone(second)
+            self.assertIsNone(hub.subscribe())
+
+            hub.unsubscribe(first)
+            self.assertIsNotNone(hub.subscribe())
+
+    def test_unstarted_stream_releases_slot(self):
+        """Testaa että ennen ensimmäistä kehystä katkaistu yhteys vapauttaa paikan"""
+        hub = LiveStreamHub(StateReader(make_state()))
+        hub._thread = object()  # ei käynnistetä tuottajasäiettä
+
+        with override_settings(LIVE_STREAM_CONFIG={'max_subscribers': 1}):
+            frames = hub.stream(hub.subscribe())
+            frames.close()
+
+            self.assertEqual(hub.subscriber_count, 0)
+            self.assertIsNotNone(hub.subscribe())
+
+    def test_stream_only_for_get(self):
+        """Testaa että stream-näkymä hyväksyy vain GET-pyynnöt"""
+        response = live_stream_api(RequestFactory().post('/dashboard/api/live-stream/'))
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_format_event(self):
+        """Testaa SSE-kehyksen muoto"""
+        frame = format_event({'type': 'diff', 'seq': 3, 'account': {'profit': 1.5}})
+        lines = frame.split('\n')
+
+        self.assertEqual(lines[:2], ['id: 3', 'event: diff'])
+        self.assertEqual(json.loads(lines[2][len('data: '):])['account'], {'profit': 1.5})
+        self.assertTrue(frame.endswith('\n\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,6 +25,8 @@ from trading.mt5_executor import (
     close_trade_by_ticket,
     update_trade_from_mt5
 )
+from trading.symbol_specs import symbol_spec_registry
+from trading.tick_cache import tick_cache
 from signals.models import MQL5Signal
 from trading.models import Trade
 
@@ -34,6 +36,8 @@ class TestMT5Executor(unittest.TestCase):
     
     def setUp(self):
         """Alusta testit"""
+        symbol_spec_registry.clear()
+        tick_cache.clear()
         self.valid_config = MT5ConnectionConfig(
             login=123456,
             password="test_password",
@@ -331,8 +335,8 @@ class TestMT5HelperFunctions(unittest.TestCase):
     """Testit helper-funktioille"""
     
     @patch('trading.mt5_executor.MQL5Signal.objects.get')
-    @patch('trading.mt5_executor.MT5Executor')
-    def test_execute_approved_signal_success(self, mock_executor_class, mock_signal_get):
+    @patch('trading.mt5_executor.mt5_session')
+    def test_execute_approved_signal_success(self, mock_session, mock_signal_get):
         """Testaa execute_approved_signal onnistunut suoritus"""
         # Mock signal
         mock_signal = MagicMock(spec=MQL5Signal)
@@ -341,7 +345,7 @@ class TestMT5HelperFunctions(unittest.TestCase):
         
         # Mock executor
         mock_executor = MagicMock()
-        mock_executor_class.return_value.__enter__.return_value = mock_executor
+        mock_session.return_value.__enter__.return_value = mock_executor
         
         # Mock successful execution
         mock_result = MT5ExecutionResult(
@@ -363,12 +367,12 @@ class TestMT5HelperFunctions(unittest.TestCase):
         self.assertEqual(mock_signal.status, 'executed')
         mock_signal.save.assert_called_once()
         
-    @patch('trading.mt5_executor.MT5Executor')
-    def test_close_trade_by_ticket_success(self, mock_executor_class):
+    @patch('trading.mt5_executor.mt5_session')
+    def test_close_trade_by_ticket_success(self, mock_session):
         """Testaa close_trade_by_ticket onnistunut suoritus"""
         # Mock executor
         mock_executor = MagicMock()
-        mock_executor_class.return_value.__enter__.return_value = mock_executor
+        mock_session.return_value.__enter__.return_value = mock_executor
         
         # Mock successful close
         mock_result = MT5ExecutionResult(
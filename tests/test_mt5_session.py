@@ -0,0 +1,112 @@
+"""
+MikroBot MT5SessionManager Yksikkötestit
+Testaa jaetun MT5-yhteyden uudelleenkäytön, terveystarkistuksen ja backoffin
+Käyttää mock-objekteja, joten ei vaadi oikeaa MT5-yhteyttä
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from trading.mt5_session import MT5SessionManager, MT5SessionUnavailable
+
+
+class FakeExecutor:
+    """Yksinkertainen executor joka laskee connect/disconnect kutsut"""
+
+    def __init__(self, connect_results=None):
+        self.connected = False
+        self.connect_calls = 0
+        self.disconnect_calls = 0
+        self.connect_results = list(connect_results or [True])
+        self.terminal = MagicMock()
+
+    def connect(self):
+        self.connect_calls += 1
+        result = self.connect_results.pop(0) if self.connect_results else True
+        self.connected = result
+        return result
+
+    def disconnect(self):
+        self.disconnect_calls += 1
+        self.connected = False
+
+
+class TestMT5SessionManager(unittest.TestCase):
+    """MT5SessionManager luokan testit"""
+
+    def test_connection_is_reused_between_borrows(self):
+        """Testaa että yhteys avataan vain kerran"""
+        executor = FakeExecutor()
+        manager = MT5SessionManager(executor_factory=lambda: executor)
+
+        with manager.session() as first:
+            pass
+        with manager.session() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(executor.connect_calls, 1)
+        self.assertEqual(executor.disconnect_calls, 0)
+
+    def test_unhealthy_session_reconnects(self):
+        """Testaa uudelleenyhdistäminen kun terminaali ei vastaa"""
+        executor = FakeExecutor()
+        manager = MT5SessionManager(executor_factory=lambda: executor)
+
+        with manager.session():
+            pass
+
+        executor.terminal.terminal_info.return_value = None
+        manager.invalidate()
+
+        with manager.session():
+            pass
+
+        self.assertEqual(executor.connect_calls, 2)
+        self.assertEqual(executor.disconnect_calls, 1)
+
+    @patch('trading.mt5_session.time.monotonic')
+    def test_failed_connect_backs_off(self, mock_monotonic):
+        """Testaa että epäonnistuneen yhteyden jälkeen odotetaan"""
+        mock_monotonic.return_value = 1000.0
+        executor = FakeExecutor(connect_results=[False, True])
+        manager = MT5SessionManager(executor_factory=lambda: executor)
+
+        with self.assertRaises(MT5SessionUnavailable):
+            with manager.session():
+                pass
+
+        # Backoff-ikkunan sisällä ei yritetä uudelleen
+        with self.assertRaises(MT5SessionUnavailable):
+            with manager.session():
+                pass
+        self.assertEqual(executor.connect_calls, 1)
+
+        # Backoffin jälkeen yhteys onnistuu
+        mock_monotonic.return_value = 1002.0
+        with manager.session() as borrowed:
+            self.assertTrue(borrowed.connected)
+        self.assertEqual(executor.connect_calls, 2)
+
+    def test_shutdown_disconnects(self):
+        """Testaa että shutdown sulkee jaetun yhteyden"""
+        executor = FakeExecutor()
+        manager = MT5SessionManager(executor_factory=lambda: executor)
+
+        with manager.session():
+            pass
+        manager.shutdown()
+
+        self.assertEqual(executor.disconnect_calls, 1)
+        self.assertFalse(manager.connected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+MikroBot notification -yksikkötestit
+Testaa puskuroidut ilmoitukset, suljettujen kauppojen tunnistuksen
+ja käyttäjäkohtaiset luetuksi merkinnät
+"""
+
+import unittest
+import os
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from core import change_versions
+from core.change_versions import NOTIFICATIONS
+from notifications import services
+from notifications.models import Notification, NotificationRead
+from notifications.services import NotificationBuffer, get_notification_summary, mark_read
+from trading.models import Trade
+
+
+class TestNotificationBuffer(unittest.TestCase):
+    """NotificationBuffer luokan testit"""
+
+    def setUp(self):
+        cache.clear()
+        self.settings = override_settings(NOTIFICATION_CONFIG={'flush_interval': 60.0, 'max_buffer': 3})
+        self.settings.enable()
+        self.buffer = NotificationBuffer()
+
+    def tearDown(self):
+        with patch.object(Notification.objects, 'bulk_create'):
+            self.buffer.flush()
+        self.settings.disable()
+
+    def test_buffered_until_max_buffer(self):
+        """Testaa että ilmoitukset kirjoitetaan yhdellä bulk_creatella"""
+        with patch.object(Notification.objects, 'bulk_create') as bulk_create:
+            self.buffer.add(Notification(title='1'))
+            self.buffer.add(Notification(title='2'))
+            bulk_create.assert_not_called()
+
+            self.buffer.add(Notification(title='3'))
+
+        bulk_create.assert_called_once()
+        self.assertEqual([n.title for n in bulk_create.call_args[0][0]], ['1', '2', '3'])
+        self.assertEqual(self.buffer.pending_count, 0)
+
+    def test_flush_bumps_version(self):
+        """Testaa että kirjoitus vanhentaa välimuistissa olevat yhteenvedot"""
+        version = change_versions.get_versions(NOTIFICATIONS)[NOTIFICATIONS]
+        self.buffer.add(Notification(title='1'))
+
+        with patch.object(Notification.objects, 'bulk_create'):
+            self.assertEqual(self.buffer.flush(), 1)
+
+        self.assertGreater(change_versions.get_versions(NOTIFICATIONS)[NOTIFICATIONS], version)
+
+    def test_empty_flush(self):
+        """Testaa tyhjän puskurin kirjoitus"""
+        with patch.object(Notification.objects, 'bulk_create') as bulk_create:
+            self.assertEqual(self.buffer.flush(), 0)
+        bulk_create.assert_not_called()
+
+
+class TestTradeClosedNotifications(unittest.TestCase):
+    """handle_trades_changed funktion testit"""
+
+    def state(self, status):
+        return {'symbol': 'EURUSD', 'direction': 'BUY', 'status': status, 'net_profit_loss': Decimal('12.50')}
+
+    def test_notifies_only_on_close(self):
+        """Testaa ilmoitus vain kun kauppa siirtyy suljetuksi"""
+        trade = Trade(symbol='EURUSD', direction='BUY', status='closed_profit')
+        changes = [
+            (trade, self.state('opened'), self.state('closed_profit')),
+            (trade, self.state('closed_profit'), self.state('closed_profit')),
+            (trade, None, self.state('opened')),
+        ]
+
+        with patch.object(services, 'notify') as notify:
+            services.handle_trades_changed(Trade, changes=changes)
+
+        notify.assert_called_once()
+        self.assertEqual(notify.call_args[0][0], 'trade_closed')
+        self.assertIn('+12.50', notify.call_args[0][2])
+
+
+class TestMarkRead(TestCase):
+    """mark_read funktion ja notifications_api POSTin testit"""
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user('alice', password='secret')
+        self.bob = User.objects.create_user('bob', password='secret')
+        self.broadcast = Notification.objects.create(title='Everyone')
+        self.own = Notification.objects.create(title='Alice only', user=self.alice)
+
+    def mark(self, user, ids=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return mark_read(user, ids)
+
+    def test_broadcast_read_per_user(self):
+        """Testaa ettei yhden käyttäjän lukeminen merkitse yleisilmoitusta muille"""
+        self.assertEqual(self.mark(self.alice), 2)
+
+        self.broadcast.refresh_from_db()
+        self.assertFalse(self.broadcast.read)
+        self.assertTrue(NotificationRead.objects.filter(user=self.alice, notification=self.broadcast).exists())
+        self.assertEqual(get_notification_summary(self.alice)['unread_count'], 0)
+        self.assertEqual(get_notification_summary(self.bob)['unread_count'], 1)
+        self.assertEqual(get_notification_summary(None)['unread_count'], 1)
+
+    def test_summary_read_flags(self):
+        """Testaa yhteenvedon read-kenttä käyttäjäkohtaisesti"""
+        self.mark(self.bob, [self.broadcast.id])
+
+        alice = {item['id']: item['read'] for item in get_notification_summary(self.alice)['notifications']}
+        bob = {item['id']: item['read'] for item in get_notification_summary(self.bob)['notifications']}
+
+        self.assertEqual(alice, {self.broadcast.id: False, self.own.id: False})
+        self.assertEqual(bob, {self.broadcast.id: True})
+
+    def test_repeat_mark_is_noop(self):
+        """Testaa että uudelleenmerkintä ei luo rivejä"""
+        self.mark(self.alice, [self.broadcast.id])
+
+        self.assertEqual(self.mark(self.alice, [self.broadcast.id]), 0)
+        self.assertEqual(NotificationRead.objects.count(), 1)
+
+    def test_summary_not_cached_on_process_local_cache(self):
+        """Testaa ettei yhteenvetoa välimuisteta kun versiolaskurit eivät ole jaettuja"""
+        with patch.object(change_versions, 'etags_enabled', return_value=False):
+            self.assertEqual(get_notification_summary(self.bob)['unread_count'], 1)
+            # Toisen workerin kirjoitus ei kasvata tämän prosessin versiota
+            Notification.objects.create(title='Everyone again')
+            self.assertEqual(get_notification_summary(self.bob)['unread_count'], 2)
+
+    def test_summary_cached_on_shared_cache(self):
+        """Testaa että jaetulla välimuistilla yhteenveto luetaan versioavaimella"""
+        with patch.object(change_versions, 'etags_enabled', return_value=True):
+            self.assertEqual(get_notification_summary(self.bob)['unread_count'], 1)
+            Notification.objects.create(title='Everyone again')
+            self.assertEqual(get_notification_summary(self.bob)['unread_count'], 1)
+
+    def test_anonymous_cannot_mark(self):
+        """Testaa ettei kirjautumaton käyttäjä merkitse mitään"""
+        self.assertEqual(mark_read(None), 0)
+
+        response = Client(enforce_csrf_checks=True).post(
+            '/dashboard/api/notifications/', json.dumps({}), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(NotificationRead.objects.exists())
+
+    def test_post_requires_csrf_token(self):
+        """Testaa että POST vaatii CSRF-tunnisteen"""
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.alice)
+
+        response = client.post('/dashboard/api/notifications/', json.dumps({}), content_type='application/json')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(NotificationRead.objects.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
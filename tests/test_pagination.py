@@ -0,0 +1,98 @@
+"""
+MikroBot cursor-sivutuksen yksikkötestit
+Testaa että kursori käy läpi kaikki kaupat, myös suorittamattomat (execution_time NULL)
+"""
+
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import TestCase
+from rest_framework.filters import OrderingFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.pagination import TradeCursorPagination
+from signals.models import MQL5Signal
+from trading.models import Trade
+
+START = datetime(2025, 1, 20, 10, 0, tzinfo=dt_timezone.utc)
+
+
+class FakeTradeView:
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['django_decision_time']
+    ordering = ['-django_decision_time']
+
+
+class TestTradeCursorPagination(TestCase):
+    """TradeCursorPagination luokan testit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(7):
+            signal = MQL5Signal.objects.create(
+                source_name='PURE_EA', symbol='EURUSD', direction='BUY',
+                entry_price=Decimal('1.08500'), stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09500'),
+                signal_timestamp=START,
+            )
+            trade = Trade.objects.create(
+                mql5_signal=signal, mt5_ticket=1000 + i, mt5_order_type='ORDER_TYPE_BUY',
+                symbol='EURUSD', direction='BUY', entry_price=Decimal('1.08500'),
+                stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09500'), volume=Decimal('0.10'),
+                signal_time=START,
+                # Joka toinen kauppa on suorittamaton
+                execution_time=START + timedelta(minutes=i) if i % 2 == 0 else None,
+                status='opened' if i % 2 == 0 else 'pending',
+            )
+            # Kaksi kauppaa samalla päätösajalla testaa tasapelin katkaisun
+            decided_at = START + timedelta(minutes=min(i, 5))
+            Trade.objects.filter(pk=trade.pk).update(django_decision_time=decided_at)
+
+    def walk(self, query='', queryset=None):
+        """Kaikkien sivujen rivit next-linkkejä seuraten"""
+        url = '/api/v1/trades/?page_size=2' + query
+        tickets = []
+        while url:
+            paginator = TradeCursorPagination()
+            request = Request(APIRequestFactory().get(url))
+            page = paginator.paginate_queryset(
+                Trade.objects.all() if queryset is None else queryset, request, FakeTradeView()
+            )
+            tickets.extend(trade.mt5_ticket for trade in page)
+            url = paginator.get_next_link()
+        return tickets
+
+    def test_every_page_walked_including_null_execution_time(self):
+        """Testaa että kursori palauttaa jokaisen kaupan täsmälleen kerran"""
+        tickets = self.walk()
+
+        self.assertEqual(sorted(tickets), [1000 + i for i in range(7)])
+        self.assertIn(tickets[0], (1005, 1006))
+
+    def test_ascending_walk(self):
+        """Testaa nouseva järjestys"""
+        tickets = self.walk('&ordering=django_decision_time')
+
+        self.assertEqual(sorted(tickets), [1000 + i for i in range(7)])
+        self.assertEqual(tickets[:5], [1000, 1001, 1002, 1003, 1004])
+
+    def test_status_filtered_walk(self):
+        """Testaa tilalla suodatetun listauksen sivutus päätösajan järjestyksessä"""
+        tickets = self.walk(queryset=Trade.objects.filter(status='opened'))
+
+        self.assertEqual(tickets, [1006, 1004, 1002, 1000])
+
+    def test_execution_time_ordering_falls_back(self):
+        """Testaa että nollattava execution_time ei kelpaa kursoriksi"""
+        request = Request(APIRequestFactory().get('/api/v1/trades/?ordering=execution_time'))
+        ordering = TradeCursorPagination().get_ordering(request, None, FakeTradeView())
+
+        self.assertEqual(ordering, ('-django_decision_time', '-id'))
+        self.assertEqual(len(self.walk('&ordering=execution_time')), 7)
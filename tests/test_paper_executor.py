@@ -0,0 +1,214 @@
+"""
+MikroBot PaperExecutor Yksikkötestit
+Testaa paperikaupankäynnin täytöt, slippagen, positiokirjan ja tilitiedot
+Ei käytä mock-objekteja MT5:lle, vaan simuloitua PaperTerminal-terminaalia
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import os
+from decimal import Decimal
+import uuid
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from trading.paper_executor import (
+    PaperExecutor,
+    PaperTerminal,
+    RecordedTickSource,
+    SyntheticTickSource,
+    SlippageModel,
+    LatencyModel,
+)
+from trading.symbol_specs import symbol_spec_registry
+from trading.tick_cache import tick_cache
+from signals.models import MQL5Signal
+
+
+def make_signal(direction='BUY', symbol='EURUSD', stop_loss='1.0800', take_profit='1.0900'):
+    signal = MagicMock(spec=MQL5Signal)
+    signal.id = uuid.uuid4()
+    signal.status = 'approved'
+    signal.symbol = symbol
+    signal.direction = direction
+    signal.stop_loss = Decimal(stop_loss)
+    signal.take_profit = Decimal(take_profit)
+    return signal
+
+
+class TestPaperExecutor(unittest.TestCase):
+    """PaperExecutor luokan testit"""
+
+    def setUp(self):
+        """Alusta testit: kiinteät hinnat ilman satunnaisuutta"""
+        symbol_spec_registry.clear()
+        tick_cache.clear()
+        self.terminal = PaperTerminal(
+            tick_source=SyntheticTickSource(
+                {'EURUSD': 1.0850, 'USDJPY': 150.00},
+                spread_points=10,
+                volatility_points=0,
+            ),
+            account={'balance': 10000.0, 'currency': 'USD'},
+        )
+        self.executor = PaperExecutor(terminal=self.terminal)
+        self.assertTrue(self.executor.connect())
+
+    def test_buy_fills_at_ask(self):
+        """Testaa että osto täyttyy ask-hintaan"""
+        result = self.executor.execute_trade_from_signal(make_signal('BUY'), Decimal('0.10'))
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.actual_entry_price, Decimal('1.08505'))
+        self.assertEqual(result.actual_volume, Decimal('0.1'))
+        self.assertEqual(self.terminal.positions_total(), 1)
+
+    def test_sell_fills_at_bid(self):
+        """Testaa että myynti täyttyy bid-hintaan"""
+        result = self.executor.execute_trade_from_signal(
+            make_signal('SELL', stop_loss='1.0900', take_profit='1.0800'), Decimal('0.10')
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.actual_entry_price, Decimal('1.08495'))
+
+    def test_slippage_is_adverse(self):
+        """Testaa että slippage siirtää täyttöä kauppaa vastaan"""
+        self.terminal.slippage = SlippageModel('fixed', points=3)
+
+        buy = self.executor.execute_trade_from_signal(make_signal('BUY'), Decimal('0.10'))
+        sell = self.executor.execute_trade_from_signal(
+            make_signal('SELL', stop_loss='1.0900', take_profit='1.0800'), Decimal('0.10')
+        )
+
+        self.assertEqual(buy.actual_entry_price, Decimal('1.08508'))
+        self.assertEqual(sell.actual_entry_price, Decimal('1.08492'))
+
+    def test_slippage_above_deviation_requotes(self):
+        """Testaa että sallitun poikkeaman ylittävä slippage hylätään"""
+        self.terminal.slippage = SlippageModel('fixed', points=self.executor.deviation + 1)
+
+        result = self.executor.execute_trade_from_signal(make_signal('BUY'), Decimal('0.10'))
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error_code, PaperTerminal.TRADE_RETCODE_REQUOTE)
+        self.assertEqual(self.terminal.positions_total(), 0)
+
+    def test_close_trade_realizes_profit(self):
+        """Testaa että sulkeminen siirtää tuloksen saldoon ja poistaa position"""
+        opened = self.executor.execute_trade_from_signal(make_signal('BUY'), Decimal('1.00'))
+
+        result = self.executor.close_trade(opened.ticket)
+
+        self.assertTrue(result.success)
+        self.assertEqual(self.terminal.positions_total(), 0)
+        # Spread 10 pistettä * 1 lotti EURUSD = -10 USD
+        self.assertAlmostEqual(self.terminal.balance, 9990.0, places=2)
+        self.assertEqual(len(self.terminal._deals), 2)
+
+    def test_close_trades_in_bulk(self):
+        """Testaa usean position sulkeminen yhdellä kertaa"""
+        tickets = [
+            self.executor.execute_trade_from_signal(make_signal('BUY'), Decimal('0.10')).ticket
+            for _ in range(3)
+        ]
+
+        results = self.executor.close_trades(tickets + [999])
+
+        self.assertEqual(self.terminal.positions_total(), 0)
+        self.assertTrue(all(results[ticket].success for ticket in tickets))
+        self.assertEqual(results[tickets[0]].actual_entry_price, Decimal('1.08495'))
+        self.assertEqual(results[tickets[0]].profit, Decimal('-1.0'))
+        self.assertFalse(results[999].success)
+        self.assertIn('not found', results[999].error_message)
+
+    def test_close_unknown_ticket(self):
+        """Testaa tuntemattoman tiketin sulkeminen"""
+        result = self.executor.close_trade(999)
+
+        self.assertFalse(result.success)
+        self.assertIn('not found', result.error_message)
+
+    def test_position_info(self):
+        """Testaa positiotiedot positiokirjasta"""
+        opened = self.executor.execute_trade_from_signal(make_signal('BUY'), Decimal('0.10'))
+
+        info = self.executor.get_position_info(opened.ticket)
+
+        self.assertEqual(info['symbol'], 'EURUSD')
+        self.assertEqual(info['type'], 'BUY')
+        self.assertEqual(info['volume'], 0.1)
+        self.assertEqual(info['sl'], 1.08)
+        self.assertEqual(info['current_price'], 1.08495)
+
+    def test_account_info_includes_floating_profit(self):
+        """Testaa että equity sisältää avoimien positioiden tuloksen"""
+        self.executor.execute_trade_from_signal(make_signal('BUY'), Decimal('1.00'))
+
+        info = self.executor.get_account_info()
+
+        self.assertEqual(info['currency'], 'USD')
+        self.assertEqual(info['balance'], 10000.0)
+        self.assertAlmostEqual(info['profit'], -10.0, places=2)
+        self.assertAlmostEqual(info['equity'], 9990.0, places=2)
+        self.assertGreater(info['margin'], 0)
+
+    def test_jpy_profit_converted_to_account_currency(self):
+        """Testaa JPY-tuloksen muunnos tilin valuuttaan"""
+        opened = self.executor.execute_trade_from_signal(
+            make_signal('BUY', symbol='USDJPY', stop_loss='149.00', take_profit='151.00'), Decimal('1.00')
+        )
+        self.executor.close_trade(opened.ticket)
+
+        # Spread 10 pistettä = 0.010 JPY * 100000 = 1000 JPY ~ 6.67 USD
+        self.assertAlmostEqual(self.terminal.balance, 10000.0 - 1000 / 150.005, places=1)
+
+    def test_unknown_symbol(self):
+        """Testaa tuntematon symboli"""
+        result = self.executor.execute_trade_from_signal(make_signal('BUY', symbol='FOOBAR'), Decimal('0.10'))
+
+        self.assertFalse(result.success)
+        self.assertIn('not found', result.error_message)
+
+
+class TestPaperTickSources(unittest.TestCase):
+    """Tick-lähteiden ja mallien testit"""
+
+    def test_recorded_ticks_replay_and_hold_last(self):
+        """Testaa tallennettujen tickien toisto"""
+        source = RecordedTickSource({'EURUSD': [(1.1, 1.1002, 1000), (1.2, 1.2002, 2000)]})
+
+        first = source.next_tick('EURUSD', 0.00001)
+        second = source.next_tick('EURUSD', 0.00001)
+        third = source.next_tick('EURUSD', 0.00001)
+
+        self.assertEqual(first.bid, 1.1)
+        self.assertEqual(second.bid, 1.2)
+        self.assertIs(third, second)
+        self.assertIsNone(source.next_tick('GBPUSD', 0.00001))
+
+    def test_synthetic_walk_is_reproducible(self):
+        """Testaa että sama siemen tuottaa samat tickit"""
+        first = SyntheticTickSource({'EURUSD': 1.0850}, seed=42)
+        second = SyntheticTickSource({'EURUSD': 1.0850}, seed=42)
+
+        for _ in range(5):
+            a = first.next_tick('EURUSD', 0.00001)
+            b = second.next_tick('EURUSD', 0.00001)
+            self.assertEqual((a.bid, a.ask), (b.bid, b.ask))
+            self.assertGreater(a.ask, a.bid)
+
+    def test_latency_models(self):
+        """Testaa viivemallit"""
+        self.assertEqual(LatencyModel().delay(), 0.0)
+        self.assertEqual(LatencyModel('fixed', ms=5).delay(), 0.005)
+        delay = LatencyModel('uniform', min_ms=1, max_ms=3, seed=1).delay()
+        self.assertTrue(0.001 <= delay <= 0.003)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+MikroBot pip value -eräkoneen yksikkötestit
+Testaa NumPy-eräkoneen tulokset PipValueCalculatoria vasten
+"""
+
+import unittest
+import os
+from types import SimpleNamespace
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import override_settings
+
+from trading.pip_value_batch import UniverseSnapshot, np
+from trading.pip_value_calculator import PipValueCalculator, conversion_graph, pip_value_cache
+from trading.symbol_specs import SymbolSpec, symbol_spec_registry
+from trading.tick_cache import tick_cache
+
+# symbol -> (base, quote, digits, bid)
+QUOTES = {
+    'EURUSD': ('EUR', 'USD', 5, 1.10000),
+    'GBPUSD': ('GBP', 'USD', 5, 1.25000),
+    'USDJPY': ('USD', 'JPY', 3, 150.000),
+    'EURGBP': ('EUR', 'GBP', 5, 0.88000),
+    'GBPJPY': ('GBP', 'JPY', 3, 187.500),
+}
+
+
+class FakeTerminal:
+    """MT5-terminaalin symbol_info / symbol_info_tick -korvike, laskee kutsut"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def symbol_info(self, symbol):
+        self.calls += 1
+        if symbol not in QUOTES:
+            return None
+        base, quote, digits, _ = QUOTES[symbol]
+        point = 10 ** -digits
+        return SimpleNamespace(
+            name=symbol, digits=digits, point=point, volume_min=0.01, volume_max=100.0, volume_step=0.01,
+            trade_contract_size=100000.0, filling_mode=1, currency_base=base, currency_profit=quote,
+            currency_margin=base, trade_tick_value=1.0, trade_tick_size=point, visible=True,
+        )
+
+    def symbol_info_tick(self, symbol):
+        self.calls += 1
+        bid = QUOTES[symbol][3]
+        return SimpleNamespace(bid=bid, ask=bid, last=0.0, time=0, time_msc=0)
+
+
+def reset_caches():
+    pip_value_cache.clear()
+    conversion_graph.clear()
+    symbol_spec_registry.clear()
+    tick_cache.clear()
+
+
+@override_settings(TICK_CACHE_CONFIG={'enabled': False})
+class TestBatchMatchesCalculator(unittest.TestCase):
+    """UniverseSnapshot vs. PipValueCalculator"""
+
+    def setUp(self):
+        reset_caches()
+        self.terminal = FakeTerminal()
+        self.executor = SimpleNamespace(terminal=self.terminal, connected=True,
+                                        get_account_info=lambda: {'currency': 'USD'})
+
+    def tearDown(self):
+        reset_caches()
+
+    def scalar(self, symbol, lot_size=1.0):
+        pip_value_cache.clear()
+        return PipValueCalculator(self.executor).calculate_pip_value(symbol, lot_size, 'USD')
+
+    @unittest.skipIf(np is None, 'NumPy not installed')
+    def test_direct_inverse_and_cross_pairs(self):
+        """Testaa suora (EURUSD), käänteinen (USDJPY) ja ristikurssi (EURGBP, GBPJPY)"""
+        specs = [SymbolSpec.from_symbol_info(self.terminal.symbol_info(symbol)) for symbol in QUOTES]
+        ticks = [self.terminal.symbol_info_tick(symbol) for symbol in QUOTES]
+        snapshot = UniverseSnapshot(specs, ticks, 'USD', self.terminal)
+
+        for lot_size in (1.0, 0.25):
+            batch = snapshot.pip_values(lot_size)
+            for symbol in QUOTES:
+                with self.subTest(symbol=symbol, lot_size=lot_size):
+                    self.assertAlmostEqual(batch[symbol], self.scalar(symbol, lot_size), places=9)
+
+        self.assertAlmostEqual(batch['EURUSD'], 2.5)
+        self.assertAlmostEqual(batch['EURGBP'], 0.25 * 12.5)
+
+    @unittest.skipIf(np is None, 'NumPy not installed')
+    def test_cross_outside_universe_uses_conversion_graph(self):
+        """Testaa että universumin ulkopuolinen muunnos haetaan muunnosgraafista"""
+        symbols = ['EURGBP']
+        specs = [SymbolSpec.from_symbol_info(self.terminal.symbol_info(symbol)) for symbol in symbols]
+        ticks = [self.terminal.symbol_info_tick(symbol) for symbol in symbols]
+
+        snapshot = UniverseSnapshot(specs, ticks, 'USD', self.terminal)
+
+        self.assertAlmostEqual(snapshot.pip_values()['EURGBP'], self.scalar('EURGBP'), places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
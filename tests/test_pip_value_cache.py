@@ -0,0 +1,121 @@
+"""
+MikroBot pip value -välimuistin yksikkötestit
+Testaa prosessinlaajuisen pip value -välimuistin TTL:n ja kurssiliikkeiden mitätöinnin
+"""
+
+import unittest
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import override_settings
+
+from trading import pip_value_calculator
+from trading.pip_value_calculator import PipValueCalculator, conversion_graph, pip_value_cache
+from trading.symbol_specs import symbol_spec_registry
+from trading.tick_cache import tick_cache
+
+# symbol -> (base, quote, digits, bid)
+QUOTES = {
+    'EURUSD': ('EUR', 'USD', 5, 1.10000),
+    'GBPUSD': ('GBP', 'USD', 5, 1.25000),
+    'USDJPY': ('USD', 'JPY', 3, 150.000),
+    'EURGBP': ('EUR', 'GBP', 5, 0.88000),
+    'GBPJPY': ('GBP', 'JPY', 3, 187.500),
+}
+
+
+class FakeTerminal:
+    """MT5-terminaalin symbol_info / symbol_info_tick -korvike, laskee kutsut"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def symbol_info(self, symbol):
+        self.calls += 1
+        if symbol not in QUOTES:
+            return None
+        base, quote, digits, _ = QUOTES[symbol]
+        point = 10 ** -digits
+        return SimpleNamespace(
+            name=symbol, digits=digits, point=point, volume_min=0.01, volume_max=100.0, volume_step=0.01,
+            trade_contract_size=100000.0, filling_mode=1, currency_base=base, currency_profit=quote,
+            currency_margin=base, trade_tick_value=1.0, trade_tick_size=point, visible=True,
+        )
+
+    def symbol_info_tick(self, symbol):
+        self.calls += 1
+        bid = QUOTES[symbol][3]
+        return SimpleNamespace(bid=bid, ask=bid, last=0.0, time=0, time_msc=0)
+
+
+def reset_caches():
+    pip_value_cache.clear()
+    conversion_graph.clear()
+    symbol_spec_registry.clear()
+    tick_cache.clear()
+
+
+class TestPipValueCache(unittest.TestCase):
+    """PipValueCache luokan testit"""
+
+    def setUp(self):
+        reset_caches()
+        self.settings = override_settings(PIP_VALUE_CACHE_CONFIG={'ttl_seconds': 60, 'quote_move_threshold': 0.002})
+        self.settings.enable()
+        tick_cache.update('GBPUSD', SimpleNamespace(bid=1.25, ask=1.25, time_msc=1))
+        pip_value_cache.put('EURGBP', 1.0, 'USD', 12.5, ['GBPUSD'])
+
+    def tearDown(self):
+        self.settings.disable()
+        reset_caches()
+
+    def test_hit_within_ttl(self):
+        """Testaa välimuistiosuma TTL:n sisällä"""
+        self.assertEqual(pip_value_cache.get('EURGBP', 1.0, 'USD'), 12.5)
+        self.assertIsNone(pip_value_cache.get('EURGBP', 1.0, 'EUR'))
+
+    def test_expires_after_ttl(self):
+        """Testaa että arvo vanhenee TTL:n jälkeen"""
+        now = pip_value_calculator.time.monotonic()
+        with patch.object(pip_value_calculator.time, 'monotonic', return_value=now + 61):
+            self.assertIsNone(pip_value_cache.get('EURGBP', 1.0, 'USD'))
+        self.assertEqual(len(pip_value_cache), 0)
+
+    def test_small_quote_move_keeps_value(self):
+        """Testaa ettei kynnystä pienempi kurssiliike mitätöi arvoa"""
+        tick_cache.update('GBPUSD', SimpleNamespace(bid=1.2510, ask=1.2510, time_msc=2))
+
+        self.assertEqual(pip_value_cache.get('EURGBP', 1.0, 'USD'), 12.5)
+
+    def test_quote_move_invalidates(self):
+        """Testaa että viitekurssin liike yli kynnyksen mitätöi arvon"""
+        tick_cache.update('GBPUSD', SimpleNamespace(bid=1.26, ask=1.26, time_msc=2))
+
+        self.assertIsNone(pip_value_cache.get('EURGBP', 1.0, 'USD'))
+        self.assertEqual(len(pip_value_cache), 0)
+
+    @override_settings(TICK_CACHE_CONFIG={'enabled': False})
+    def test_calculator_hit_needs_no_mt5_call(self):
+        """Testaa että välimuistiosuma ei kutsu MT5:tä"""
+        terminal = FakeTerminal()
+        executor = SimpleNamespace(terminal=terminal, connected=True, get_account_info=lambda: {'currency': 'USD'})
+        calculator = PipValueCalculator(executor)
+
+        first = calculator.calculate_pip_value('EURUSD', 1.0, 'USD')
+        calls = terminal.calls
+        second = PipValueCalculator(executor).calculate_pip_value('EURUSD', 1.0, 'USD')
+
+        self.assertAlmostEqual(first, 10.0)
+        self.assertEqual(second, first)
+        self.assertEqual(terminal.calls, calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+MikroBot pip-koon yksikkötestit
+Testaa deterministisen pip-koon ja kaupan pip-laskennan
+"""
+
+import unittest
+import os
+from decimal import Decimal
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import override_settings
+
+from trading.models import Trade
+from trading.pips import default_pip_size, get_pip_size
+from trading.symbol_specs import SymbolSpec, symbol_spec_registry
+
+
+class TestPipSize(unittest.TestCase):
+    """Pip-koon testit"""
+
+    def setUp(self):
+        symbol_spec_registry.clear()
+
+    def test_default_pip_sizes(self):
+        """Testaa nimeämiskäytäntöön perustuvat pip-koot"""
+        self.assertEqual(default_pip_size('EURUSD'), Decimal('0.0001'))
+        self.assertEqual(default_pip_size('USDJPY'), Decimal('0.01'))
+        self.assertEqual(default_pip_size('XAUUSD'), Decimal('0.01'))
+        self.assertEqual(default_pip_size('US30'), Decimal('0.01'))
+        # JPY perusvaluuttana ei ole JPY-noteerattu pari
+        self.assertEqual(default_pip_size('JPYUSD'), Decimal('0.0001'))
+
+    def test_loaded_spec_does_not_change_pip_size(self):
+        """Testaa ettei prosessin lataama symbolispesifikaatio muuta tallennettavaa pip-kokoa"""
+        symbol_spec_registry._specs['US30'] = SymbolSpec(
+            symbol='US30', digits=1, point=0.1, volume_min=0.01, volume_max=100,
+            volume_step=0.01, contract_size=1, filling_mode=1, currency_base='USD',
+            currency_profit='USD', currency_margin='USD', tick_value=0.1, tick_size=0.1,
+            visible=True,
+        )
+
+        self.assertEqual(get_pip_size('US30'), Decimal('0.01'))
+
+    def test_configured_override(self):
+        """Testaa asetuksissa määritelty pip-koko"""
+        with override_settings(PIP_SIZE_CONFIG={'overrides': {'US30': '1'}}):
+            self.assertEqual(get_pip_size('us30'), Decimal('1'))
+
+    def test_trade_pips_stored_on_derive(self):
+        """Testaa että pipit lasketaan kaupan johdettuihin kenttiin"""
+        trade = Trade(
+            symbol='USDJPY', direction='SELL',
+            entry_price=Decimal('150.000'), exit_price=Decimal('149.750'),
+            commission=Decimal('0'), swap=Decimal('0'),
+        )
+        trade.calculate_derived_fields()
+
+        self.assertEqual(trade.pips, Decimal('25.0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+MikroBot position sync -yksikkötestit
+Testaa MT5-position arvojen vertailun kauppaan, synkronoinnin lukujärjestyksen
+ja ettei synkronointi ylikirjoita sen aikana suljettua kauppaa
+"""
+
+import unittest
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import TestCase
+
+from signals.models import MQL5Signal
+from trading import position_sync
+from trading.models import Trade
+from trading.position_sync import _apply_position, sync_open_trades
+
+
+START = datetime(2025, 1, 20, 10, 0, tzinfo=dt_timezone.utc)
+
+
+def make_position(**overrides):
+    values = dict(ticket=1, price_open=1.085, sl=1.08, tp=1.09, profit=12.5, swap=0.0, commission=0.0)
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestApplyPosition(unittest.TestCase):
+    """_apply_position funktion testit"""
+
+    def setUp(self):
+        self.trade = Trade(
+            mt5_ticket=1,
+            entry_price=Decimal('1.08500'),
+            stop_loss=Decimal('1.08000'),
+            take_profit=Decimal('1.09000'),
+            gross_profit_loss=Decimal('12.50'),
+            swap=Decimal('0.00'),
+            commission=Decimal('0.00'),
+        )
+
+    def test_unchanged_position(self):
+        """Testaa että samat arvot eivät aiheuta päivitystä"""
+        self.assertFalse(_apply_position(self.trade, make_position()))
+
+    def test_changed_profit_and_sl(self):
+        """Testaa P&L:n ja SL:n päivitys"""
+        changed = _apply_position(self.trade, make_position(profit=-3.2, sl=1.0825))
+
+        self.assertTrue(changed)
+        self.assertEqual(self.trade.gross_profit_loss, Decimal('-3.2'))
+        self.assertEqual(self.trade.stop_loss, Decimal('1.0825'))
+
+    def test_zero_sl_keeps_trade_value(self):
+        """Testaa että SL=0 (ei asetettu) ei nollaa kaupan stop lossia"""
+        _apply_position(self.trade, make_position(sl=0.0))
+
+        self.assertEqual(self.trade.stop_loss, Decimal('1.08000'))
+
+
+class TestSyncOpenTrades(TestCase):
+    """sync_open_trades funktion testit"""
+
+    def make_trade(self, ticket, status='opened'):
+        signal = MQL5Signal.objects.create(
+            source_name='PURE_EA', symbol='EURUSD', direction='BUY',
+            entry_price=Decimal('1.08500'), stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09000'),
+            signal_timestamp=START,
+        )
+        return Trade.objects.create(
+            mql5_signal=signal, mt5_ticket=ticket, mt5_order_type='ORDER_TYPE_BUY',
+            symbol='EURUSD', direction='BUY', entry_price=Decimal('1.08500'),
+            stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09000'), volume=Decimal('0.10'),
+            gross_profit_loss=Decimal('12.50'), swap=Decimal('0.00'), commission=Decimal('0.00'),
+            signal_time=START, execution_time=START, status=status,
+        )
+
+    def sync(self, positions, during_snapshot=lambda: None):
+        def positions_get():
+            during_snapshot()
+            return positions
+
+        @contextmanager
+        def session():
+            yield SimpleNamespace(terminal=SimpleNamespace(positions_get=positions_get))
+
+        with patch.object(position_sync, 'mt5_session', session):
+            return sync_open_trades()
+
+    def test_trade_opened_during_snapshot_not_vanished(self):
+        """Testaa että snapshotin aikana avattu kauppa ei näy kadonneena"""
+        self.make_trade(1)
+
+        result = self.sync([make_position(ticket=1), make_position(ticket=2)],
+                           during_snapshot=lambda: self.make_trade(3))
+
+        self.assertEqual((result.unchanged, result.vanished, result.untracked), ([1], [], [2]))
+        self.assertEqual(result.to_dict()['untracked_count'], 1)
+        self.assertEqual(Trade.objects.get(mt5_ticket=3).status, 'opened')
+
+    def test_vanished_position_closes_trade(self):
+        """Testaa että MT5:stä kadonnut positio merkitsee kaupan closed_unknown"""
+        self.make_trade(1)
+
+        result = self.sync([])
+
+        self.assertEqual(result.vanished, [1])
+        self.assertEqual(Trade.objects.get(mt5_ticket=1).status, 'closed_unknown')
+
+    def test_trade_closed_during_snapshot_not_overwritten(self):
+        """Testaa ettei snapshotin aikana suljettua kauppaa ylikirjoiteta"""
+        trade = self.make_trade(1)
+        closed_at = datetime(2025, 1, 20, 11, 0, tzinfo=dt_timezone.utc)
+
+        def close():
+            Trade.objects.filter(pk=trade.pk).update(status='closed_profit', close_time=closed_at)
+
+        result = self.sync([], during_snapshot=close)
+
+        trade.refresh_from_db()
+        self.assertEqual(result.vanished, [])
+        self.assertEqual((trade.status, trade.close_time), ('closed_profit', closed_at))
+
+
+if __name__ == '__main__':
+    unittest.main()
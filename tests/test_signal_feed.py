@@ -0,0 +1,140 @@
+"""
+MikroBot signal feed -yksikkötestit
+Testaa esimuotoiltujen signaalirenkaiden päivityksen ilman tietokantaa
+ja että prosessikohtaisella välimuistilla syöte luetaan aina kannasta
+"""
+
+import unittest
+import os
+import threading
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from core import change_versions
+from dashboard.signal_feed import RECENT_SIGNALS, STS_SIGNALS, SignalFeed, push_signals
+
+
+def make_signal(status='pending', source_name='PURE_EA', raw_signal_data=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(), symbol='EURUSD', direction='BUY', entry_price=Decimal('1.08500'),
+        stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09500'), status=status,
+        timeframe_combination='H1/M15', signal_strength='medium', source_name=source_name,
+        raw_signal_data=raw_signal_data,
+    )
+
+
+class TestSignalFeed(unittest.TestCase):
+    """SignalFeed luokan testit"""
+
+    def setUp(self):
+        # Testit ajetaan yhdessä prosessissa, joten rengas on jaettu
+        shared = patch.object(change_versions, 'etags_enabled', return_value=True)
+        shared.start()
+        self.addCleanup(shared.stop)
+        cache.clear()
+        cache.set(RECENT_SIGNALS.cache_key, [], 300)
+        cache.set(STS_SIGNALS.cache_key, [], 300)
+
+    def test_new_signals_newest_first(self):
+        """Testaa että uusin signaali on ensimmäisenä"""
+        first, second = make_signal(), make_signal(raw_signal_data='{"reasoning": "BOS retest"}')
+        push_signals([first])
+        push_signals([second])
+
+        entries = RECENT_SIGNALS.read()
+
+        self.assertEqual([entry['id'] for entry in entries], [second.id, first.id])
+        self.assertEqual(entries[0]['llm_analysis']['reasoning'], 'BOS retest')
+        self.assertEqual(entries[0]['strength'], 0.75)
+
+    def test_status_change_replaced_in_place(self):
+        """Testaa tilamuutos päivittää rivin paikallaan"""
+        signal, newer = make_signal(), make_signal()
+        push_signals([signal, newer])
+
+        signal.status = 'approved'
+        push_signals([signal], created=False)
+
+        entries = RECENT_SIGNALS.read()
+        self.assertEqual([entry['id'] for entry in entries], [newer.id, signal.id])
+        self.assertEqual(entries[1]['status'], 'approved')
+
+    def test_ring_is_bounded(self):
+        """Testaa että rengas pysyy koossaan"""
+        push_signals([make_signal() for _ in range(RECENT_SIGNALS.size + 5)])
+
+        self.assertEqual(len(RECENT_SIGNALS.read()), RECENT_SIGNALS.size)
+
+    def test_sts_feed_filters_source(self):
+        """Testaa että STS-paneeliin päätyvät vain STS-signaalit"""
+        sts = make_signal(source_name='STS_SIGNALS')
+        push_signals([make_signal(), sts])
+
+        entries = STS_SIGNALS.read()
+
+        self.assertEqual([entry['id'] for entry in entries], [sts.id])
+        self.assertEqual(entries[0]['source'], 'STS_SIGNALS')
+
+    def test_missing_feed_not_created_by_push(self):
+        """Testaa ettei puuttuvaa rengasta luoda osittaisena"""
+        cache.delete(RECENT_SIGNALS.cache_key)
+
+        push_signals([make_signal()])
+
+        self.assertIsNone(cache.get(RECENT_SIGNALS.cache_key))
+
+    def test_concurrent_pushes_not_lost(self):
+        """Testaa että samanaikaiset kirjoittajat eivät ylikirjoita toistensa rivejä"""
+        signals = [make_signal() for _ in range(RECENT_SIGNALS.size)]
+        threads = [threading.Thread(target=push_signals, args=([signal],)) for signal in signals]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({entry['id'] for entry in RECENT_SIGNALS.read()}, {signal.id for signal in signals})
+
+    def test_lock_timeout_drops_ring(self):
+        """Testaa että lukkoa odottanut kirjoittaja pudottaa renkaan uudelleenrakennettavaksi"""
+        cache.add(RECENT_SIGNALS.lock_key, True, timeout=60)
+
+        with override_settings(SIGNAL_FEED_CONFIG={'lock_timeout': 0.05}):
+            push_signals([make_signal()])
+
+        self.assertIsNone(cache.get(RECENT_SIGNALS.cache_key))
+        self.assertEqual(cache.get(STS_SIGNALS.cache_key), [])
+
+
+class TestProcessLocalSignalFeed(unittest.TestCase):
+    """SignalFeed prosessikohtaisella välimuistilla"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_read_from_database_without_ring(self):
+        """Testaa että syöte luetaan kannasta eikä toisen prosessin ohittamasta renkaasta"""
+        cache.set(RECENT_SIGNALS.cache_key, [{'id': 'stale'}], 300)
+
+        with patch.object(change_versions, 'etags_enabled', return_value=False), \
+                patch.object(SignalFeed, 'load', return_value=[{'id': 'fresh'}]) as load:
+            push_signals([make_signal()])
+            entries = RECENT_SIGNALS.read()
+
+        load.assert_called_once()
+        self.assertEqual(entries, [{'id': 'fresh'}])
+        self.assertEqual(cache.get(RECENT_SIGNALS.cache_key), [{'id': 'stale'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
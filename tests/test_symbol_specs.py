@@ -0,0 +1,113 @@
+"""
+MikroBot symbolimäärittelyjen yksikkötestit
+Testaa lotin ja hinnan normalisoinnin, täyttötyypin valinnan ja rekisterin päivityksen
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import os
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import override_settings
+
+from trading import symbol_specs
+from trading.symbol_specs import SymbolSpec, SymbolSpecRegistry
+
+TERMINAL = SimpleNamespace(ORDER_FILLING_FOK=0, ORDER_FILLING_IOC=1, ORDER_FILLING_RETURN=2)
+
+
+def make_symbol_info(filling_mode=1, volume_step=0.01):
+    return SimpleNamespace(
+        name='EURUSD', point=0.00001, digits=5,
+        volume_min=0.01, volume_max=100.0, volume_step=volume_step,
+        trade_contract_size=100000.0, filling_mode=filling_mode,
+        currency_base='EUR', currency_profit='USD', currency_margin='EUR',
+        trade_tick_value=1.0, trade_tick_size=0.00001, visible=True,
+    )
+
+
+class TestSymbolSpec(unittest.TestCase):
+    """SymbolSpec luokan testit"""
+
+    def test_normalize_volume(self):
+        """Testaa lotin rajaus min/max väliin ja pyöristys askeleeseen"""
+        spec = SymbolSpec.from_symbol_info(make_symbol_info())
+
+        self.assertEqual(spec.normalize_volume(0.123), 0.12)
+        self.assertEqual(spec.normalize_volume(0.001), 0.01)
+        self.assertEqual(spec.normalize_volume(500.0), 100.0)
+
+    def test_normalize_volume_coarse_step(self):
+        """Testaa pyöristys 0.1 lotin askeleeseen"""
+        spec = SymbolSpec.from_symbol_info(make_symbol_info(volume_step=0.1))
+
+        self.assertEqual(spec.normalize_volume(0.26), 0.3)
+        self.assertEqual(spec.normalize_volume(0.24), 0.2)
+
+    def test_normalize_price(self):
+        """Testaa hinnan pyöristys symbolin desimaaleihin"""
+        spec = SymbolSpec.from_symbol_info(make_symbol_info())
+
+        self.assertEqual(spec.normalize_price(1.0850049), 1.085)
+        self.assertEqual(spec.normalize_price(1.0850051), 1.08501)
+
+    def test_order_filling_type(self):
+        """Testaa täyttötyyppi symbolin filling_mode lipuista"""
+        cases = [(1, TERMINAL.ORDER_FILLING_FOK), (3, TERMINAL.ORDER_FILLING_FOK),
+                 (2, TERMINAL.ORDER_FILLING_IOC), (0, TERMINAL.ORDER_FILLING_RETURN)]
+        for filling_mode, expected in cases:
+            spec = SymbolSpec.from_symbol_info(make_symbol_info(filling_mode=filling_mode))
+            self.assertEqual(spec.order_filling_type(TERMINAL), expected)
+
+
+class TestSymbolSpecRegistry(unittest.TestCase):
+    """SymbolSpecRegistry luokan testit"""
+
+    def setUp(self):
+        self.registry = SymbolSpecRegistry()
+        self.loader = MagicMock(return_value=make_symbol_info())
+
+    def test_cached_until_stale(self):
+        """Testaa että tuore määrittely luetaan välimuistista"""
+        first = self.registry.get('EURUSD', loader=self.loader)
+
+        self.assertIs(self.registry.get('EURUSD', loader=self.loader), first)
+        self.loader.assert_called_once_with('EURUSD')
+
+    def test_refresh_on_ttl_expiry(self):
+        """Testaa uudelleenlataus kun TTL on umpeutunut"""
+        with override_settings(SYMBOL_SPEC_CONFIG={'ttl_seconds': 60}):
+            first = self.registry.get('EURUSD', loader=self.loader)
+            first.loaded_at -= 61
+
+            second = self.registry.get('EURUSD', loader=self.loader)
+
+        self.assertIsNot(second, first)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_refresh_on_trading_day_rollover(self):
+        """Testaa uudelleenlataus kun palvelimen kauppapäivä vaihtuu"""
+        first = self.registry.get('EURUSD', loader=self.loader)
+
+        with patch.object(symbol_specs, '_trading_day', return_value='2099-01-01'):
+            second = self.registry.get('EURUSD', loader=self.loader)
+
+        self.assertIsNot(second, first)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_unknown_symbol(self):
+        """Testaa ettei tuntematonta symbolia tallenneta"""
+        self.loader.return_value = None
+
+        self.assertIsNone(self.registry.get('XXXYYY', loader=self.loader))
+        self.assertIsNone(self.registry.peek('XXXYYY'))
+
+
+if __name__ == '__main__':
+    unittest.main()
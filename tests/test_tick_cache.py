@@ -0,0 +1,113 @@
+"""
+MikroBot tick-välimuistin yksikkötestit
+Testaa vanhentuneen tickin ohituksen suoraan hakuun ja pollerin välimuistipäivitykset
+"""
+
+import unittest
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import os
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import override_settings
+
+from trading import tick_cache as tick_cache_module
+from trading.tick_cache import TickCache, TickPoller, get_tick, tick_cache
+
+LOCAL_ONLY = {'enabled': True, 'mirror_to_cache': False, 'max_age': 2.0}
+
+
+def make_tick(bid, ask, time_msc=1):
+    return SimpleNamespace(bid=bid, ask=ask, last=0.0, time=time_msc // 1000, time_msc=time_msc)
+
+
+@override_settings(TICK_CACHE_CONFIG=LOCAL_ONLY)
+class TestGetTick(unittest.TestCase):
+    """get_tick funktion testit"""
+
+    def setUp(self):
+        tick_cache.clear()
+        self.loader = MagicMock(return_value=make_tick(1.0851, 1.0852, time_msc=2000))
+        patcher = patch.object(tick_cache_module.tick_poller, 'ensure_started')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(tick_cache.clear)
+
+    def test_fresh_tick_from_cache(self):
+        """Testaa että tuore tick luetaan välimuistista ilman suoraa hakua"""
+        cached = tick_cache.update('EURUSD', make_tick(1.0850, 1.0851))
+
+        self.assertIs(get_tick('EURUSD', loader=self.loader), cached)
+        self.loader.assert_not_called()
+
+    def test_stale_tick_falls_back_to_loader(self):
+        """Testaa että max_age ylittävä tick haetaan suoraan ja tallennetaan"""
+        tick_cache.update('EURUSD', make_tick(1.0850, 1.0851)).fetched_at -= 5
+
+        snapshot = get_tick('EURUSD', max_age=1.0, loader=self.loader)
+
+        self.loader.assert_called_once_with('EURUSD')
+        self.assertEqual((snapshot.bid, snapshot.ask), (1.0851, 1.0852))
+        self.assertIs(tick_cache.get('EURUSD'), snapshot)
+        self.assertIn('EURUSD', tick_cache_module.tick_poller.watchlist)
+
+    def test_missing_tick(self):
+        """Testaa ettei puuttuvaa tickiä tallenneta"""
+        self.loader.return_value = None
+
+        self.assertIsNone(get_tick('XXXYYY', loader=self.loader))
+        self.assertIsNone(tick_cache.get('XXXYYY'))
+
+
+@override_settings(TICK_CACHE_CONFIG=LOCAL_ONLY)
+class TestTickPoller(unittest.TestCase):
+    """TickPoller luokan testit (ilman taustasäiettä)"""
+
+    def setUp(self):
+        self.cache = TickCache()
+        self.poller = TickPoller(self.cache)
+        self.ticks = {'EURUSD': make_tick(1.0850, 1.0851), 'GBPUSD': make_tick(1.2650, 1.2652)}
+
+        terminal = SimpleNamespace(symbol_info_tick=lambda symbol: self.ticks.get(symbol))
+
+        @contextmanager
+        def session():
+            yield SimpleNamespace(terminal=terminal)
+
+        patcher = patch.object(tick_cache_module, 'mt5_session', session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_poll_updates_cache(self):
+        """Testaa että pollaus tallentaa seurattujen symbolien tickit"""
+        self.poller.watch(['EURUSD', 'GBPUSD', 'XXXYYY'])
+        self.poller.poll_once()
+
+        self.assertEqual(self.cache.get('EURUSD').bid, 1.0850)
+        self.assertEqual(self.cache.get('GBPUSD').ask, 1.2652)
+        self.assertIsNone(self.cache.get('XXXYYY'))
+        self.assertEqual(self.cache.version, 2)
+
+    def test_version_moves_only_on_quote_change(self):
+        """Testaa että versio kasvaa vain kun noteeraus muuttuu"""
+        self.poller.watch(['EURUSD'])
+        self.poller.poll_once()
+        self.poller.poll_once()
+        self.assertEqual(self.cache.version, 1)
+
+        self.ticks['EURUSD'] = make_tick(1.0853, 1.0854, time_msc=2000)
+        self.poller.poll_once()
+
+        self.assertEqual(self.cache.version, 2)
+        self.assertEqual(self.cache.get('EURUSD').version, 2)
+        self.assertEqual(self.cache.get('EURUSD').bid, 1.0853)
+
+
+if __name__ == '__main__':
+    unittest.main()
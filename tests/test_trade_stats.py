@@ -0,0 +1,88 @@
+"""
+MikroBot kaupankäyntitilastojen yksikkötestit
+Testaa rollup-rivien yhteenvedon ja rollup-muutosten laskennan ilman tietokantaa
+"""
+
+import unittest
+import os
+from decimal import Decimal
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from trading.models import Trade
+from trading.trade_stats import summarize_trade_stats
+
+
+def row(symbol, direction, status, count, pnl, wins=0, win_pnl='0', losses=0, loss_pnl='0'):
+    return {
+        'symbol': symbol, 'direction': direction, 'status': status,
+        'trade_count': count, 'pnl_total': Decimal(pnl),
+        'win_count': wins, 'win_pnl_total': Decimal(win_pnl),
+        'loss_count': losses, 'loss_pnl_total': Decimal(loss_pnl),
+    }
+
+
+class TestSummarizeTradeStats(unittest.TestCase):
+    """summarize_trade_stats funktion testit"""
+
+    def test_summary_from_rollup_rows(self):
+        """Testaa yhteenveto usean bucketin riveistä"""
+        stats = summarize_trade_stats([
+            row('EURUSD', 'BUY', 'closed_profit', 3, '90.00', wins=3, win_pnl='90.00'),
+            row('EURUSD', 'SELL', 'closed_loss', 1, '-20.00', losses=1, loss_pnl='-20.00'),
+            row('GBPUSD', 'BUY', 'opened', 2, '15.00', wins=1, win_pnl='15.00'),
+        ])
+
+        self.assertEqual(stats['total_trades'], 6)
+        self.assertEqual(stats['active_trades'], 2)
+        self.assertEqual(stats['closed_trades'], 4)
+        self.assertEqual(stats['total_pnl'], 85.0)
+        # Avoimet voitolliset positiot eivät ole voittoja
+        self.assertEqual(stats['profitable_trades'], 3)
+        self.assertEqual(stats['losing_trades'], 1)
+        self.assertEqual(stats['win_rate'], 75.0)
+        self.assertEqual(stats['average_profit'], 30.0)
+        self.assertEqual(stats['average_loss'], -20.0)
+        self.assertEqual(stats['symbol_breakdown'][0], {'symbol': 'EURUSD', 'count': 4, 'pnl': Decimal('70.00')})
+        self.assertEqual(
+            {entry['direction']: entry['count'] for entry in stats['direction_breakdown']},
+            {'BUY': 5, 'SELL': 1}
+        )
+
+    def test_empty_rollup(self):
+        """Testaa tyhjä rollup"""
+        stats = summarize_trade_stats([])
+
+        self.assertEqual(stats['total_trades'], 0)
+        self.assertEqual(stats['win_rate'], 0)
+
+
+class TestWrittenState(unittest.TestCase):
+    """Trade.written_state metodin testit"""
+
+    def setUp(self):
+        self.trade = Trade(symbol='EURUSD', direction='BUY', status='opened', net_profit_loss=Decimal('0'))
+        self.previous = self.trade.tracked_state()
+        self.trade.status = 'closed_profit'
+        self.trade.net_profit_loss = Decimal('25.00')
+
+    def test_only_written_fields_change(self):
+        """Testaa että update_fields ulkopuoliset arvot pysyvät tallennetuissa arvoissa"""
+        state = self.trade.written_state(self.previous, ['status'])
+
+        self.assertEqual(state['status'], 'closed_profit')
+        self.assertEqual(state['net_profit_loss'], Decimal('0'))
+
+    def test_full_save_writes_everything(self):
+        """Testaa että ilman update_fields-listaa kaikki arvot kirjoitetaan"""
+        self.assertEqual(self.trade.written_state(self.previous), self.trade.tracked_state())
+        self.assertEqual(self.trade.written_state(None, ['status']), self.trade.tracked_state())
+        self.assertEqual(stats['symbol_breakdown'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
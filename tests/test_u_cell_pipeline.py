@@ -0,0 +1,130 @@
+"""
+MikroBot U-Cell pipeline -yksikkötestit
+Testaa ettei toistettu pipeline-pyyntö lähetä samasta signaalista toista toimeksiantoa
+"""
+
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Aseta Django settings ennen importteja
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mikrobot_mcp.settings')
+
+import django
+django.setup()
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from signals import u_cell_pipeline, u_cell_views
+from signals.models import MQL5Signal
+from signals.u_cell_models import UCellExecution
+from trading.models import Trade
+from trading.mt5_executor import MT5ExecutionResult
+
+FORMATTER_RESULT = SimpleNamespace(
+    success=True, errors=[], signal={'confidence': 0.85}, processing_time_ms=1.0, correlation_id='test'
+)
+
+RISK_RESULT = {
+    'approved': True, 'position_size': 0.1, 'risk_amount': 50.0, 'risk_percentage': 0.5,
+    'daily_risk_used': 0.5, 'weekly_risk_used': 0.5, 'drawdown_impact': 0.0,
+    'calculation_accuracy': 100.0, 'processing_time_ms': 1.0,
+    'approval_reason': 'Within limits', 'rejection_reasons': [],
+}
+
+FILLED = MT5ExecutionResult(success=True, ticket=1001, actual_entry_price=Decimal('1.08500'),
+                            actual_volume=Decimal('0.10'))
+
+
+class TestPipelineExecution(TestCase):
+    """run_pipeline funktion ja pipeline-näkymän testit"""
+
+    def setUp(self):
+        self.executor = MagicMock()
+        self.executor.execute_trade_from_signal.return_value = FILLED
+
+        @contextmanager
+        def session():
+            yield self.executor
+
+        for target, value in [
+            (patch.object(u_cell_pipeline, 'format_signal'), FORMATTER_RESULT),
+            (patch.object(u_cell_pipeline, 'calculate_risk'), RISK_RESULT),
+        ]:
+            mock = target.start()
+            mock.return_value = value
+            self.addCleanup(target.stop)
+
+        session_patch = patch('trading.mt5_session.mt5_session', session)
+        session_patch.start()
+        self.addCleanup(session_patch.stop)
+
+    def make_signal(self, status='pending'):
+        return MQL5Signal.objects.create(
+            source_name='PURE_EA', symbol='EURUSD', direction='BUY',
+            entry_price=Decimal('1.08500'), stop_loss=Decimal('1.08000'), take_profit=Decimal('1.09500'),
+            signal_timestamp=datetime.now(dt_timezone.utc), status=status,
+        )
+
+    def post(self, signal):
+        view = u_cell_views.UCellPipelineViewSet.as_view({'post': 'run'})
+        request = APIRequestFactory().post('/api/v1/u-cell/pipeline/run/', {'signal_id': str(signal.pk)}, format='json')
+        with patch.object(u_cell_views, 'SignalFormatter', object), patch.object(u_cell_views, 'RiskCalculator', object):
+            return view(request)
+
+    def test_repeated_post_sends_one_order(self):
+        """Testaa että toinen POST samalle signaalille ei lähetä uutta toimeksiantoa"""
+        signal = self.make_signal()
+
+        first = self.post(signal)
+        second = self.post(signal)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 409)
+        self.assertEqual(second.data['stopped_at'], 'status')
+        self.executor.execute_trade_from_signal.assert_called_once()
+        self.assertEqual(Trade.objects.filter(mql5_signal=signal).count(), 1)
+        self.assertEqual(UCellExecution.objects.get(mql5_signal=signal).execution_status, 'FILLED')
+        signal.refresh_from_db()
+        self.assertEqual(signal.status, 'executed')
+
+    def test_rejected_signal_not_executed(self):
+        """Testaa ettei hylättyä signaalia suoriteta"""
+        response = self.post(self.make_signal(status='rejected'))
+
+        self.assertEqual(response.status_code, 409)
+        self.executor.execute_trade_from_signal.assert_not_called()
+
+    def test_concurrent_claim_wins_once(self):
+        """Testaa että signaalin ehtinyt varata toinen pyyntö estää toimeksiannon"""
+        signal = self.make_signal()
+        MQL5Signal.objects.filter(pk=signal.pk).update(status='executed')
+
+        summary = u_cell_pipeline.run_pipeline(signal)
+
+        self.assertEqual(summary['stopped_at'], 'status')
+        self.executor.execute_trade_from_signal.assert_not_called()
+
+    def test_unfilled_order_releases_claim(self):
+        """Testaa että täyttymätön toimeksianto palauttaa signaalin suoritettavaksi"""
+        self.executor.execute_trade_from_signal.return_value = MT5ExecutionResult(
+            success=False, error_code=10019, error_message='No money'
+        )
+        signal = self.make_signal(status='approved')
+
+        summary = u_cell_pipeline.run_pipeline(signal)
+
+        signal.refresh_from_db()
+        self.assertEqual(signal.status, 'approved')
+        self.assertEqual(summary['execution']['execution_status'], 'REJECTED')
+        self.assertFalse(Trade.objects.filter(mql5_signal=signal).exists())
+
+        self.executor.execute_trade_from_signal.return_value = FILLED
+        u_cell_pipeline.run_pipeline(signal)
+
+        self.assertEqual(self.executor.execute_trade_from_signal.call_count, 2)
+        self.assertEqual(UCellExecution.objects.get(mql5_signal=signal).execution_status, 'FILLED')
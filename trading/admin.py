@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Trade, TradingSession
+from .models import MT5Deal, Trade, TradingSession
 
 @admin.register(Trade)
 class TradeAdmin(admin.ModelAdmin):
@@ -217,3 +217,21 @@ class TradingSessionAdmin(admin.ModelAdmin):
             obj.total_pnl
         )
     total_pnl_display.short_description = "Total P&L"
+
+
+@admin.register(MT5Deal)
+class MT5DealAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the local MT5 deal cache
+    """
+    
+    list_display = ['ticket', 'position_id', 'symbol', 'type', 'entry', 'volume', 'price', 'profit', 'time']
+    list_filter = ['symbol', 'entry']
+    search_fields = ['ticket', 'position_id']
+    date_hierarchy = 'time'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
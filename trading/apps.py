@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class TradingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'trading'
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+        from .models import Trade
+        from .trade_stats import handle_trade_deleted
+
+        post_delete.connect(handle_trade_deleted, sender=Trade, dispatch_uid='trade_stats_rollup_delete')
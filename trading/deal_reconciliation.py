@@ -0,0 +1,298 @@
+"""
+MT5 Deal Reconciliation
+Incremental deal-history sync that closes Trades from their exit deals
+
+A watermark (last deal ticket and time) is kept in DealSyncWatermark, so
+each run asks MT5 only for deals from the watermark time onwards (with a
+small overlap for deals stamped in the same second) and keeps the ones
+with a newer ticket. New deals are stored in the MT5Deal cache with one
+bulk_create. Positions that received an exit deal are then grouped once,
+using every cached deal of those positions. Fully closed positions give
+their Trade its exit price (volume-weighted), close time, exit reason and
+realized P&L, and the trades are written with one bulk_update.
+
+The dashboard's closed-trades view reads the MT5Deal cache instead of
+pulling and regrouping days of history on every load.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import change_versions
+from core.config import get_config
+
+from .models import DealSyncWatermark, MT5Deal, Trade
+from .mt5_session import mt5_session
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DEAL_RECONCILIATION_CONFIG = {
+    'initial_lookback_days': 7,   # history fetched when there is no watermark yet
+    'overlap_seconds': 60,        # re-read this much before the watermark time
+    'max_age': 30.0,              # closed-trades readers reconcile when older than this (seconds)
+}
+
+WATERMARK_NAME = 'mt5_deals'
+
+# MT5 DEAL_REASON_* -> Trade.exit_reason
+DEAL_REASON_EXIT = {
+    0: 'manual',            # DEAL_REASON_CLIENT
+    1: 'manual',            # DEAL_REASON_MOBILE
+    2: 'manual',            # DEAL_REASON_WEB
+    4: 'stop_loss',         # DEAL_REASON_SL
+    5: 'take_profit',       # DEAL_REASON_TP
+    6: 'risk_management',   # DEAL_REASON_SO (stop out)
+}
+
+RECONCILED_FIELDS = [
+    'status', 'exit_price', 'exit_reason', 'close_time',
+    'gross_profit_loss', 'swap', 'commission', 'net_profit_loss',
+    'pips', 'duration_minutes',
+]
+
+VOLUME_TOLERANCE = Decimal('0.001')
+
+
+def get_deal_reconciliation_config():
+    return get_config('DEAL_RECONCILIATION_CONFIG', DEFAULT_DEAL_RECONCILIATION_CONFIG)
+
+
+@dataclass
+class DealReconciliationResult:
+    """Outcome of one reconciliation run"""
+    fetched: int = 0
+    new_deals: int = 0
+    closed: List[int] = field(default_factory=list)
+    partially_closed: List[int] = field(default_factory=list)
+    untracked: List[int] = field(default_factory=list)
+    watermark: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'fetched': self.fetched,
+            'new_deals': self.new_deals,
+            'closed': self.closed,
+            'partially_closed': self.partially_closed,
+            'untracked': self.untracked,
+            'closed_count': len(self.closed),
+            'watermark': self.watermark,
+        }
+
+
+def _decimal(value, places: int) -> Decimal:
+    return Decimal(str(round(float(value or 0), places)))
+
+
+def _deal_from_mt5(deal) -> MT5Deal:
+    time_msc = getattr(deal, 'time_msc', 0) or deal.time * 1000
+    return MT5Deal(
+        ticket=deal.ticket,
+        order=getattr(deal, 'order', 0),
+        position_id=deal.position_id,
+        symbol=deal.symbol,
+        type=deal.type,
+        entry=deal.entry,
+        reason=getattr(deal, 'reason', 0),
+        volume=_decimal(deal.volume, 2),
+        price=_decimal(deal.price, 5),
+        profit=_decimal(deal.profit, 2),
+        swap=_decimal(getattr(deal, 'swap', 0), 2),
+        commission=_decimal(getattr(deal, 'commission', 0), 2),
+        magic=getattr(deal, 'magic', 0),
+        comment=(getattr(deal, 'comment', '') or '')[:64],
+        time=datetime.fromtimestamp(time_msc / 1000, tz=dt_timezone.utc),
+        time_msc=time_msc,
+    )
+
+
+def exit_reason_for(deal: MT5Deal) -> Optional[str]:
+    """Trade exit reason of a closing deal"""
+    reason = DEAL_REASON_EXIT.get(deal.reason)
+    if reason in (None, 'manual'):
+        # Expert closes and brokers that leave the reason unset mark SL/TP in the comment
+        comment = deal.comment.lower()
+        if comment.startswith('[sl') or comment.startswith('sl'):
+            return 'stop_loss'
+        if comment.startswith('[tp') or comment.startswith('tp'):
+            return 'take_profit'
+    return reason or 'manual'
+
+
+def close_position(trade: Trade, deals: List[MT5Deal]) -> Optional[bool]:
+    """
+    Apply a position's deals to its trade
+
+    Returns True if the position is fully closed (trade moved to its closed
+    state), False if only partially closed, None if it has no exit deal.
+    """
+    exits = sorted((deal for deal in deals if deal.entry in MT5Deal.EXIT_ENTRIES), key=lambda d: d.time_msc)
+    if not exits:
+        return None
+
+    entry_volume = sum((deal.volume for deal in deals if deal.entry == MT5Deal.ENTRY_IN), Decimal('0'))
+    exit_volume = sum((deal.volume for deal in exits), Decimal('0'))
+    if exit_volume + VOLUME_TOLERANCE < (entry_volume or trade.volume):
+        return False
+
+    trade.exit_price = (
+        sum((deal.price * deal.volume for deal in exits), Decimal('0')) / exit_volume
+    ).quantize(Decimal('0.00001'), ROUND_HALF_UP)
+    trade.close_time = exits[-1].time
+    trade.exit_reason = exit_reason_for(exits[-1])
+    trade.gross_profit_loss = sum((deal.profit for deal in deals), Decimal('0'))
+    trade.swap = sum((deal.swap for deal in deals), Decimal('0'))
+    trade.commission = sum((deal.commission for deal in deals), Decimal('0'))
+
+    net = trade.gross_profit_loss - trade.commission - trade.swap
+    if net > 0:
+        trade.status = 'closed_profit'
+    elif net < 0:
+        trade.status = 'closed_loss'
+    else:
+        trade.status = 'closed_breakeven'
+    return True
+
+
+def reconcile_deals() -> DealReconciliationResult:
+    """
+    Fetch deals newer than the watermark, cache them and close their trades
+
+    Raises MT5SessionUnavailable if MT5 cannot be reached.
+    """
+    config = get_deal_reconciliation_config()
+    watermark, _ = DealSyncWatermark.objects.get_or_create(name=WATERMARK_NAME)
+
+    if watermark.last_time_msc:
+        date_from = watermark.last_time_msc // 1000 - config['overlap_seconds']
+    else:
+        date_from = int((timezone.now() - timedelta(days=config['initial_lookback_days'])).timestamp())
+    # Trade server time can run ahead of UTC
+    date_to = int((timezone.now() + timedelta(days=1)).timestamp())
+
+    with mt5_session() as executor:
+        deals = executor.terminal.history_deals_get(date_from, date_to)
+
+    if deals is None:
+        raise RuntimeError("MT5 history_deals_get() failed")
+
+    result = DealReconciliationResult(fetched=len(deals))
+
+    with transaction.atomic():
+        # Serialize concurrent runs on the watermark row
+        watermark = DealSyncWatermark.objects.select_for_update().get(pk=watermark.pk)
+        new_deals = [
+            _deal_from_mt5(deal) for deal in sorted(deals, key=lambda d: d.ticket)
+            if deal.ticket > watermark.last_ticket
+        ]
+        MT5Deal.objects.bulk_create(new_deals, batch_size=500, ignore_conflicts=True)
+        result.new_deals = len(new_deals)
+
+        closed_positions = {deal.position_id for deal in new_deals if deal.entry in MT5Deal.EXIT_ENTRIES}
+        if closed_positions:
+            # Every cached deal of the affected positions, grouped once
+            deals_by_position = defaultdict(list)
+            for deal in MT5Deal.objects.filter(position_id__in=closed_positions):
+                deals_by_position[deal.position_id].append(deal)
+
+            trades = list(
+                Trade.objects.filter(mt5_ticket__in=closed_positions).exclude(status__in=['cancelled', 'error'])
+            )
+            changed_trades = []
+            for trade in trades:
+                closed = close_position(trade, deals_by_position[trade.mt5_ticket])
+                if closed:
+                    changed_trades.append(trade)
+                    result.closed.append(trade.mt5_ticket)
+                elif closed is False:
+                    result.partially_closed.append(trade.mt5_ticket)
+
+            result.untracked = sorted(closed_positions - {trade.mt5_ticket for trade in trades})
+            if changed_trades:
+                Trade.bulk_update_tracked(changed_trades, RECONCILED_FIELDS)
+
+        if new_deals:
+            watermark.last_ticket = new_deals[-1].ticket
+            watermark.last_time_msc = max(deal.time_msc for deal in new_deals)
+        watermark.save()
+        result.watermark = watermark.last_ticket
+
+    if new_deals:
+        change_versions.bump(change_versions.ACCOUNT)
+
+    logger.info(
+        f"MT5 deal reconciliation: {result.new_deals} new deals, {len(result.closed)} trades closed, "
+        f"{len(result.untracked)} untracked positions"
+    )
+    return result
+
+
+def reconcile_if_stale(max_age: Optional[float] = None) -> Optional[DealReconciliationResult]:
+    """
+    Reconcile if the last run is older than max_age seconds (config default)
+
+    Errors are logged, not raised: readers fall back to the cached deals.
+    """
+    if max_age is None:
+        max_age = get_deal_reconciliation_config()['max_age']
+
+    last_run = DealSyncWatermark.objects.filter(name=WATERMARK_NAME).values_list('updated_at', flat=True).first()
+    if last_run is not None and (timezone.now() - last_run).total_seconds() < max_age:
+        return None
+
+    try:
+        return reconcile_deals()
+    except Exception as e:
+        logger.error(f"MT5 deal reconciliation failed: {e}")
+        return None
+
+
+def get_closed_positions(days: int = 7, limit: int = 20) -> List[Dict]:
+    """
+    Most recently closed positions from the deal cache, newest first
+    (the dashboard closed-trades format)
+    """
+    since = timezone.now() - timedelta(days=days)
+
+    position_ids = []
+    for position_id in MT5Deal.objects.filter(
+        entry__in=MT5Deal.EXIT_ENTRIES, time__gte=since
+    ).order_by('-time').values_list('position_id', flat=True).iterator():
+        if position_id not in position_ids:
+            position_ids.append(position_id)
+            if len(position_ids) == limit:
+                break
+
+    deals_by_position = defaultdict(list)
+    for deal in MT5Deal.objects.filter(position_id__in=position_ids).order_by('time_msc'):
+        deals_by_position[deal.position_id].append(deal)
+
+    closed_trades = []
+    for position_id in position_ids:
+        deals = deals_by_position[position_id]
+        if len(deals) < 2:  # Opening deal outside the cached history
+            continue
+        open_deal, close_deal = deals[0], deals[-1]
+        closed_trades.append({
+            'id': position_id,
+            'symbol': open_deal.symbol,
+            'type': 'BUY' if open_deal.type == 0 else 'SELL',
+            'volume': float(open_deal.volume),
+            'open_price': float(open_deal.price),
+            'close_price': float(close_deal.price),
+            'profit': float(sum((deal.profit for deal in deals), Decimal('0'))),
+            'open_time': timezone.localtime(open_deal.time).strftime('%Y-%m-%d %H:%M:%S'),
+            'close_time': timezone.localtime(close_deal.time).strftime('%Y-%m-%d %H:%M:%S'),
+            'duration_minutes': int((close_deal.time - open_deal.time).total_seconds() / 60),
+            'comment': close_deal.comment,
+            'reason': {'stop_loss': 'SL', 'take_profit': 'TP'}.get(exit_reason_for(close_deal), 'Manual'),
+            'source': 'MT5_HISTORY'
+        })
+    return closed_trades
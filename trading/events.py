@@ -0,0 +1,12 @@
+"""
+Trade lifecycle events
+
+trades_changed is sent inside the saving transaction of Trade.save() and
+Trade.bulk_update_tracked(). changes is a list of (trade, previous, current)
+tuples of the trades' TRACKED_FIELDS before and after the write (previous
+is None for new trades), so rollups in other apps can update incrementally.
+"""
+
+from django.dispatch import Signal
+
+trades_changed = Signal()
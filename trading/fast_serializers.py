@@ -0,0 +1,160 @@
+"""
+Fast Trade Serialization
+Read-only JSON for hot trade listings without model instances
+
+TradeSerializer builds a Trade instance per row, then runs a field object
+and three SerializerMethodFields per value. For read-only listings the same
+output is produced here from values_list() tuples: decimal exponents and
+the output timezone are resolved once per call, derived fields are
+computed inline, and the list is encoded straight to JSON bytes. The
+output schema (keys, order and value formats) matches TradeSerializer.
+"""
+
+import json
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.utils import timezone
+
+from .models import Trade
+from .pips import get_pip_size
+
+
+# Output keys in TradeSerializer order, with the values_list() path for each
+# stored field (derived fields are appended after them)
+TRADE_LIST_FIELDS = [
+    ('id', 'id'),
+    ('mql5_signal', 'mql5_signal_id'),
+    ('mt5_ticket', 'mt5_ticket'),
+    ('mt5_order_type', 'mt5_order_type'),
+    ('symbol', 'symbol'),
+    ('direction', 'direction'),
+    ('entry_price', 'entry_price'),
+    ('exit_price', 'exit_price'),
+    ('stop_loss', 'stop_loss'),
+    ('take_profit', 'take_profit'),
+    ('volume', 'volume'),
+    ('status', 'status'),
+    ('gross_profit_loss', 'gross_profit_loss'),
+    ('commission', 'commission'),
+    ('swap', 'swap'),
+    ('net_profit_loss', 'net_profit_loss'),
+    ('signal_time', 'signal_time'),
+    ('execution_time', 'execution_time'),
+    ('close_time', 'close_time'),
+    ('duration_minutes', 'duration_minutes'),
+    ('max_drawdown', 'max_drawdown'),
+    ('max_profit', 'max_profit'),
+    ('exit_reason', 'exit_reason'),
+    ('django_decision_time', 'django_decision_time'),
+    ('execution_delay_seconds', 'execution_delay_seconds'),
+    ('notes', 'notes'),
+]
+
+# Stored pips, used for pips_gained
+EXTRA_FIELDS = ['pips']
+
+KEYS = [key for key, _ in TRADE_LIST_FIELDS]
+VALUE_PATHS = [path for _, path in TRADE_LIST_FIELDS] + EXTRA_FIELDS
+
+
+def _build_formatters():
+    """Per-column value formatter matching the DRF field for that column"""
+    formatters = []
+    for key, _ in TRADE_LIST_FIELDS:
+        field = Trade._meta.get_field(key)
+        if field.is_relation:
+            # Related primary key (PrimaryKeyRelatedField)
+            field = field.target_field
+        internal_type = field.get_internal_type()
+        if internal_type == 'DecimalField':
+            formatters.append(('decimal', Decimal(1).scaleb(-field.decimal_places)))
+        elif internal_type == 'DateTimeField':
+            formatters.append(('datetime', None))
+        elif internal_type == 'UUIDField':
+            formatters.append(('str', None))
+        else:
+            formatters.append((None, None))
+    return formatters
+
+
+FORMATTERS = _build_formatters()
+
+
+def _format_datetime(value, tz) -> str:
+    """DRF DateTimeField ISO 8601 output (current timezone, Z for UTC)"""
+    if tz is not None and timezone.is_aware(value):
+        value = value.astimezone(tz)
+    text = value.isoformat()
+    if text.endswith('+00:00'):
+        text = text[:-6] + 'Z'
+    return text
+
+
+def _pips_gained(symbol: str, direction: str, entry_price, exit_price, pips,
+                 pip_sizes: Dict[str, float]) -> Optional[float]:
+    """Trade.calculate_pips, preferring the stored value"""
+    if pips is not None:
+        return float(pips)
+    if not exit_price:
+        return None
+    if symbol not in pip_sizes:
+        pip_sizes[symbol] = float(get_pip_size(symbol))
+    move = float(exit_price) - float(entry_price)
+    if direction != 'BUY':
+        move = -move
+    return round(move / pip_sizes[symbol], 1)
+
+
+def trade_rows(queryset: QuerySet):
+    """values_list() tuples in VALUE_PATHS order"""
+    return queryset.values_list(*VALUE_PATHS)
+
+
+def serialize_trade_rows(rows: Iterable[Sequence]) -> List[Dict]:
+    """TradeSerializer(many=True).data equivalent for value tuples"""
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    pip_sizes: Dict[str, float] = {}
+
+    index = {key: i for i, key in enumerate(KEYS)}
+    i_symbol, i_direction = index['symbol'], index['direction']
+    i_entry, i_exit = index['entry_price'], index['exit_price']
+    i_net, i_duration = index['net_profit_loss'], index['duration_minutes']
+    i_pips = len(KEYS)
+
+    data = []
+    for row in rows:
+        item = {}
+        for key, (kind, exponent), value in zip(KEYS, FORMATTERS, row):
+            if value is not None:
+                if kind == 'decimal':
+                    value = '{:f}'.format(value.quantize(exponent))
+                elif kind == 'datetime':
+                    value = _format_datetime(value, tz)
+                elif kind == 'str':
+                    value = str(value)
+            item[key] = value
+
+        net = row[i_net]
+        duration = row[i_duration]
+        item['pips_gained'] = _pips_gained(
+            row[i_symbol], row[i_direction], row[i_entry], row[i_exit], row[i_pips], pip_sizes
+        )
+        item['is_profitable'] = None if net is None else net > 0
+        item['duration_hours'] = round(duration / 60.0, 2) if duration else None
+        data.append(item)
+    return data
+
+
+def render_trade_list(queryset: QuerySet) -> bytes:
+    """UTF-8 JSON for a trade listing (compact, as DRF's JSONRenderer)"""
+    data = serialize_trade_rows(trade_rows(queryset))
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def trade_list_response(queryset: QuerySet) -> HttpResponse:
+    """application/json response for a trade listing"""
+    return HttpResponse(render_trade_list(queryset), content_type='application/json')
@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def build_rollup(apps, schema_editor):
+    Trade = apps.get_model('trading', 'Trade')
+    TradeStatsRollup = apps.get_model('trading', 'TradeStatsRollup')
+
+    zero = Value(Decimal('0'), output_field=DecimalField(max_digits=14, decimal_places=2))
+    win = Q(net_profit_loss__gt=0)
+    loss = Q(net_profit_loss__lt=0)
+    rows = Trade.objects.order_by().values('symbol', 'direction', 'status').annotate(
+        trade_count=Count('id'),
+        pnl_total=Coalesce(Sum('net_profit_loss'), zero),
+        win_count=Count('id', filter=win),
+        win_pnl_total=Coalesce(Sum('net_profit_loss', filter=win), zero),
+        loss_count=Count('id', filter=loss),
+        loss_pnl_total=Coalesce(Sum('net_profit_loss', filter=loss), zero),
+    )
+    TradeStatsRollup.objects.bulk_create([TradeStatsRollup(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TradeStatsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20)),
+                ('direction', models.CharField(max_length=4)),
+                ('status', models.CharField(max_length=20)),
+                ('trade_count', models.IntegerField(default=0)),
+                ('pnl_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('win_count', models.IntegerField(default=0)),
+                ('win_pnl_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('loss_count', models.IntegerField(default=0)),
+                ('loss_pnl_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Trade Stats Rollup',
+                'verbose_name_plural': 'Trade Stats Rollups',
+                'unique_together': {('symbol', 'direction', 'status')},
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_pips(apps, schema_editor):
+    from trading.pips import default_pip_size
+
+    Trade = apps.get_model('trading', 'Trade')
+    trades = []
+    for trade in Trade.objects.filter(exit_price__isnull=False).only(
+        'id', 'symbol', 'direction', 'entry_price', 'exit_price'
+    ).iterator():
+        move = trade.exit_price - trade.entry_price
+        if trade.direction != 'BUY':
+            move = -move
+        trade.pips = (move / default_pip_size(trade.symbol)).quantize(Decimal('0.1'))
+        trades.append(trade)
+
+    Trade.objects.bulk_update(trades, ['pips'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0002_tradestatsrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trade',
+            name='pips',
+            field=models.DecimalField(blank=True, decimal_places=1, help_text='Pips gained/lost (set when the trade has an exit price)', max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_pips, migrations.RunPython.noop),
+    ]
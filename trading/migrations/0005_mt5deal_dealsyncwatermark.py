@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0004_trade_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MT5Deal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket', models.BigIntegerField(help_text='MT5 deal ticket', unique=True)),
+                ('order', models.BigIntegerField(default=0)),
+                ('position_id', models.BigIntegerField(db_index=True, help_text='MT5 position (= Trade.mt5_ticket)')),
+                ('symbol', models.CharField(max_length=20)),
+                ('type', models.IntegerField(help_text='DEAL_TYPE_* (0 = buy, 1 = sell)')),
+                ('entry', models.IntegerField(help_text='DEAL_ENTRY_* (0 = in, 1 = out)')),
+                ('reason', models.IntegerField(default=0, help_text='DEAL_REASON_* (4 = SL, 5 = TP)')),
+                ('volume', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('price', models.DecimalField(decimal_places=5, max_digits=10)),
+                ('profit', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('swap', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('commission', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('magic', models.BigIntegerField(default=0)),
+                ('comment', models.CharField(blank=True, max_length=64)),
+                ('time', models.DateTimeField()),
+                ('time_msc', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'MT5 Deal',
+                'verbose_name_plural': 'MT5 Deals',
+                'ordering': ['-time'],
+                'indexes': [models.Index(fields=['entry', '-time'], name='mt5deal_entry_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DealSyncWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_ticket', models.BigIntegerField(default=0)),
+                ('last_time_msc', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Deal Sync Watermark',
+                'verbose_name_plural': 'Deal Sync Watermarks',
+            },
+        ),
+    ]
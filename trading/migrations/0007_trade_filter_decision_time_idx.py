@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0006_trade_decision_time_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='trade',
+            name='trade_status_exec_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='trade',
+            name='trade_symbol_exec_idx',
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['status', '-django_decision_time', '-id'], name='trade_status_decision_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['symbol', '-django_decision_time', '-id'], name='trade_symbol_decision_idx'),
+        ),
+    ]
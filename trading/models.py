@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
+from decimal import Decimal
 from signals.models import MQL5Signal
 import uuid
 
@@ -118,6 +119,13 @@ class Trade(models.Model):
     )
     
     # Performance metrics
+    pips = models.DecimalField(
+        max_digits=10,
+        decimal_places=1,
+        null=True,
+        blank=True,
+        help_text="Pips gained/lost (set when the trade has an exit price)"
+    )
     duration_minutes = models.IntegerField(
         null=True, 
         blank=True,
@@ -177,6 +185,15 @@ class Trade(models.Model):
         ordering = ['-execution_time']
         verbose_name = "Trade"
         verbose_name_plural = "Trades"
+        indexes = [
+            # Keyset pagination (execution_time is null until a trade is
+            # executed, so the cursor runs on the decision time)
+            models.Index(fields=['-django_decision_time', '-id'], name='trade_decision_time_idx'),
+            models.Index(fields=['-execution_time', '-id'], name='trade_exec_time_idx'),
+            # ?status= and ?symbol= listings in cursor order
+            models.Index(fields=['status', '-django_decision_time', '-id'], name='trade_status_decision_idx'),
+            models.Index(fields=['symbol', '-django_decision_time', '-id'], name='trade_symbol_decision_idx'),
+        ]
         
     def __str__(self):
         return f"Trade #{self.mt5_ticket}: {self.direction} {self.symbol} @ {self.entry_price}"
@@ -185,8 +202,9 @@ class Trade(models.Model):
         """Calculate pips gained/lost"""
         if not self.exit_price:
             return None
-            
-        pip_value = 0.0001 if 'JPY' not in self.symbol else 0.01
+        
+        from .pips import get_pip_size
+        pip_value = float(get_pip_size(self.symbol))
         
         if self.direction == 'BUY':
             pips = (float(self.exit_price) - float(self.entry_price)) / pip_value
@@ -209,12 +227,48 @@ class Trade(models.Model):
             return round(actual_result / signal_risk_reward, 2)
         return None
     
-    def save(self, *args, **kwargs):
-        """Override save to calculate derived fields"""
+    # Fields rollups (trade stats, analytics P&L) are derived from
+    TRACKED_FIELDS = (
+        'symbol', 'direction', 'status', 'net_profit_loss',
+        'entry_price', 'exit_price', 'stop_loss', 'close_time', 'pips',
+    )
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded state (skipped for deferred loads)
+        if all(name in field_names for name in cls.TRACKED_FIELDS):
+            instance._tracked_state = instance.tracked_state()
+        return instance
+    
+    def tracked_state(self):
+        """Current values of TRACKED_FIELDS"""
+        return {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+    
+    def written_state(self, previous_state, fields=None):
+        """
+        TRACKED_FIELDS as stored after writing only `fields` (all if None)
+        Fields that were not written keep their previous stored value.
+        """
+        current = self.tracked_state()
+        if fields is None or previous_state is None:
+            return current
+        fields = set(fields)
+        return {
+            name: current[name] if name in fields else previous_state[name]
+            for name in self.TRACKED_FIELDS
+        }
+    
+    def calculate_derived_fields(self):
+        """Net P&L, pips, duration and execution delay from the stored values"""
         # Calculate net P&L
         if self.gross_profit_loss is not None:
             self.net_profit_loss = self.gross_profit_loss - self.commission - self.swap
         
+        # Calculate pips
+        pips = self.calculate_pips()
+        self.pips = Decimal(str(pips)) if pips is not None else None
+        
         # Calculate duration
         if self.execution_time and self.close_time:
             duration = self.close_time - self.execution_time
@@ -224,8 +278,141 @@ class Trade(models.Model):
         if self.signal_time and self.execution_time:
             delay = self.execution_time - self.signal_time
             self.execution_delay_seconds = int(delay.total_seconds())
+    
+    @classmethod
+    def record_changes(cls, changes):
+        """
+        Update rollups for saved trades and notify other apps
+        changes: (trade, previous_state, current_state) tuples
+        """
+        from .events import trades_changed
+        from .trade_stats import apply_rollup_changes
+        
+        apply_rollup_changes((previous, current) for _, previous, current in changes)
+        trades_changed.send(sender=cls, changes=changes)
+        for trade, _, current in changes:
+            trade._tracked_state = current
+    
+    def save(self, *args, **kwargs):
+        """Override save to calculate derived fields"""
+        self.calculate_derived_fields()
+        
+        with transaction.atomic():
+            previous_state = getattr(self, '_tracked_state', None)
+            if previous_state is None and not self._state.adding:
+                previous_state = Trade.objects.filter(pk=self.pk).values(*self.TRACKED_FIELDS).first()
+            
+            super().save(*args, **kwargs)
+            
+            # Move this trade's contribution between rollup buckets (only
+            # what update_fields actually wrote)
+            written = self.written_state(previous_state, kwargs.get('update_fields'))
+            Trade.record_changes([(self, previous_state, written)])
+    
+    @classmethod
+    def bulk_update_tracked(cls, trades, fields, batch_size=None):
+        """
+        bulk_update() that keeps the rollups in sync
+        Trades must have been loaded from the database with all TRACKED_FIELDS.
+        """
+        with transaction.atomic():
+            previous_states = [trade._tracked_state for trade in trades]
+            for trade in trades:
+                trade.calculate_derived_fields()
             
-        super().save(*args, **kwargs)
+            cls.objects.bulk_update(trades, fields, batch_size=batch_size)
+            cls.record_changes([
+                (trade, previous, trade.written_state(previous, fields))
+                for trade, previous in zip(trades, previous_states)
+            ])
+
+
+class TradeStatsRollup(models.Model):
+    """
+    Incrementally maintained trade counts and P&L per symbol, direction and status
+    Updated by Trade.save() and trade deletes, read by trade statistics
+    """
+    
+    symbol = models.CharField(max_length=20)
+    direction = models.CharField(max_length=4)
+    status = models.CharField(max_length=20)
+    
+    trade_count = models.IntegerField(default=0)
+    pnl_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    win_count = models.IntegerField(default=0)
+    win_pnl_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    loss_count = models.IntegerField(default=0)
+    loss_pnl_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['symbol', 'direction', 'status']
+        verbose_name = "Trade Stats Rollup"
+        verbose_name_plural = "Trade Stats Rollups"
+    
+    def __str__(self):
+        return f"{self.symbol} {self.direction} {self.status}: {self.trade_count}"
+
+
+class MT5Deal(models.Model):
+    """
+    Local copy of MT5 deal history, filled incrementally by deal reconciliation
+    Read by the closed-trades views instead of history_deals_get()
+    """
+    
+    # MT5 deal entry (DEAL_ENTRY_*)
+    ENTRY_IN = 0
+    ENTRY_OUT = 1
+    ENTRY_INOUT = 2
+    ENTRY_OUT_BY = 3
+    EXIT_ENTRIES = (ENTRY_OUT, ENTRY_INOUT, ENTRY_OUT_BY)
+    
+    ticket = models.BigIntegerField(unique=True, help_text="MT5 deal ticket")
+    order = models.BigIntegerField(default=0)
+    position_id = models.BigIntegerField(db_index=True, help_text="MT5 position (= Trade.mt5_ticket)")
+    symbol = models.CharField(max_length=20)
+    type = models.IntegerField(help_text="DEAL_TYPE_* (0 = buy, 1 = sell)")
+    entry = models.IntegerField(help_text="DEAL_ENTRY_* (0 = in, 1 = out)")
+    reason = models.IntegerField(default=0, help_text="DEAL_REASON_* (4 = SL, 5 = TP)")
+    volume = models.DecimalField(max_digits=10, decimal_places=2)
+    price = models.DecimalField(max_digits=10, decimal_places=5)
+    profit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    swap = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    commission = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    magic = models.BigIntegerField(default=0)
+    comment = models.CharField(max_length=64, blank=True)
+    time = models.DateTimeField()
+    time_msc = models.BigIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-time']
+        verbose_name = "MT5 Deal"
+        verbose_name_plural = "MT5 Deals"
+        indexes = [
+            models.Index(fields=['entry', '-time'], name='mt5deal_entry_time_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Deal #{self.ticket}: position {self.position_id} {self.symbol} @ {self.price}"
+
+
+class DealSyncWatermark(models.Model):
+    """
+    Newest MT5 deal already reconciled (one row per history source)
+    """
+    
+    name = models.CharField(max_length=50, unique=True)
+    last_ticket = models.BigIntegerField(default=0)
+    last_time_msc = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Deal Sync Watermark"
+        verbose_name_plural = "Deal Sync Watermarks"
+    
+    def __str__(self):
+        return f"{self.name}: deal #{self.last_ticket}"
 
 
 class TradingSession(models.Model):
@@ -1,4 +1,7 @@
-import MetaTrader5 as mt5
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
 import logging
 import time
 from decimal import Decimal
@@ -10,11 +13,21 @@ from django.conf import settings
 from django.utils import timezone as django_timezone
 
 from .models import Trade
+from .mt5_session import mt5_session
+from .symbol_specs import SymbolSpec, symbol_spec_registry
+from .tick_cache import get_tick, get_tick_cache_config
 from signals.models import MQL5Signal
 
 logger = logging.getLogger(__name__)
 
 
+def _to_decimal(value) -> Optional[Decimal]:
+    """Decimal of a numeric MT5 field, None if missing"""
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    return None
+
+
 @dataclass
 class MT5ExecutionResult:
     """Result of MT5 trade execution"""
@@ -25,6 +38,11 @@ class MT5ExecutionResult:
     actual_entry_price: Optional[Decimal] = None
     actual_volume: Optional[Decimal] = None
     execution_time: Optional[datetime] = None
+    # Closes: realized P&L, swap and commission from the position's deals
+    # (None when the close deal is not in the history yet)
+    profit: Optional[Decimal] = None
+    swap: Optional[Decimal] = None
+    commission: Optional[Decimal] = None
 
 
 @dataclass
@@ -48,6 +66,16 @@ class MT5Executor:
         self.deviation = 20  # Price deviation in points
         self.magic_number = 20250117  # Unique magic number for MikroBot
         
+    @property
+    def terminal(self):
+        """
+        MetaTrader5 API used by this executor
+
+        Resolved at call time so tests can patch trading.mt5_executor.mt5;
+        PaperExecutor returns its simulated terminal instead.
+        """
+        return mt5
+    
     def _get_default_config(self) -> MT5ConnectionConfig:
         """Get default MT5 configuration from settings"""
         mt5_config = getattr(settings, 'MT5_CONFIG', {})
@@ -61,24 +89,28 @@ class MT5Executor:
     
     def connect(self) -> bool:
         """Connect to MetaTrader 5"""
+        if self.terminal is None:
+            logger.error("MetaTrader5 package is not installed")
+            return False
+        
         try:
             # Initialize MT5 connection
-            if not mt5.initialize(
+            if not self.terminal.initialize(
                 login=self.config.login,
                 password=self.config.password,
                 server=self.config.server,
                 timeout=self.config.timeout,
                 portable=self.config.portable
             ):
-                error_code = mt5.last_error()
+                error_code = self.terminal.last_error()
                 logger.error(f"MT5 initialization failed: {error_code}")
                 return False
             
             # Check connection
-            account_info = mt5.account_info()
+            account_info = self.terminal.account_info()
             if account_info is None:
                 logger.error("Failed to get account info")
-                mt5.shutdown()
+                self.terminal.shutdown()
                 return False
             
             self.connected = True
@@ -92,7 +124,7 @@ class MT5Executor:
     def disconnect(self):
         """Disconnect from MetaTrader 5"""
         if self.connected:
-            mt5.shutdown()
+            self.terminal.shutdown()
             self.connected = False
             logger.info("MT5 disconnected")
     
@@ -113,27 +145,28 @@ class MT5Executor:
                     error_message=f"Signal status is {signal.status}, not approved"
                 )
             
-            # Get symbol info
-            symbol_info = mt5.symbol_info(signal.symbol)
-            if symbol_info is None:
+            # Get symbol spec (cached, one symbol_info call per symbol and session)
+            spec = self.get_symbol_spec(signal.symbol)
+            if spec is None:
                 return MT5ExecutionResult(
                     success=False,
                     error_message=f"Symbol {signal.symbol} not found"
                 )
             
             # Enable symbol if not active
-            if not symbol_info.visible:
-                if not mt5.symbol_select(signal.symbol, True):
+            if not spec.visible:
+                if not self.terminal.symbol_select(signal.symbol, True):
                     return MT5ExecutionResult(
                         success=False,
                         error_message=f"Failed to enable symbol {signal.symbol}"
                     )
+                symbol_spec_registry.mark_visible(signal.symbol)
             
             # Determine order type
-            order_type = mt5.ORDER_TYPE_BUY if signal.direction == 'BUY' else mt5.ORDER_TYPE_SELL
+            order_type = self.terminal.ORDER_TYPE_BUY if signal.direction == 'BUY' else self.terminal.ORDER_TYPE_SELL
             
-            # Get current price
-            tick = mt5.symbol_info_tick(signal.symbol)
+            # Get current price (shared tick cache, direct call if not fresh enough)
+            tick = get_tick(signal.symbol, max_age=get_tick_cache_config()['order_max_age'], loader=self.terminal.symbol_info_tick)
             if tick is None:
                 return MT5ExecutionResult(
                     success=False,
@@ -143,16 +176,14 @@ class MT5Executor:
             # Use current market price for execution
             price = tick.ask if signal.direction == 'BUY' else tick.bid
             
-            # Normalize volume
-            normalized_volume = self._normalize_volume(signal.symbol, float(volume))
-            
-            # Normalize prices
-            normalized_sl = self._normalize_price(signal.symbol, float(signal.stop_loss))
-            normalized_tp = self._normalize_price(signal.symbol, float(signal.take_profit))
+            # Normalize volume and prices with the precomputed spec
+            normalized_volume = spec.normalize_volume(float(volume))
+            normalized_sl = spec.normalize_price(float(signal.stop_loss))
+            normalized_tp = spec.normalize_price(float(signal.take_profit))
             
             # Create order request
             request = {
-                "action": mt5.TRADE_ACTION_DEAL,
+                "action": self.terminal.TRADE_ACTION_DEAL,
                 "symbol": signal.symbol,
                 "volume": normalized_volume,
                 "type": order_type,
@@ -162,12 +193,12 @@ class MT5Executor:
                 "deviation": self.deviation,
                 "magic": self.magic_number,
                 "comment": f"MikroBot Signal {str(signal.id)[:8]}",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_FOK,
+                "type_time": self.terminal.ORDER_TIME_GTC,
+                "type_filling": spec.order_filling_type(self.terminal),
             }
             
             # Send order
-            result = mt5.order_send(request)
+            result = self.terminal.order_send(request)
             
             if result is None:
                 return MT5ExecutionResult(
@@ -176,7 +207,7 @@ class MT5Executor:
                 )
             
             # Check execution result
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
+            if result.retcode != self.terminal.TRADE_RETCODE_DONE:
                 return MT5ExecutionResult(
                     success=False,
                     error_code=result.retcode,
@@ -210,75 +241,142 @@ class MT5Executor:
         
         try:
             # Get position info
-            position = mt5.positions_get(ticket=ticket)
+            position = self.terminal.positions_get(ticket=ticket)
             if not position:
                 return MT5ExecutionResult(
                     success=False,
                     error_message=f"Position {ticket} not found"
                 )
             
-            position = position[0]
-            
-            # Get current price
-            tick = mt5.symbol_info_tick(position.symbol)
-            if tick is None:
-                return MT5ExecutionResult(
-                    success=False,
-                    error_message=f"Failed to get tick data for {position.symbol}"
-                )
-            
-            # Determine close price and order type
-            if position.type == mt5.POSITION_TYPE_BUY:
-                price = tick.bid
-                order_type = mt5.ORDER_TYPE_SELL
-            else:
-                price = tick.ask
-                order_type = mt5.ORDER_TYPE_BUY
+            return self._close_position(position[0])
             
-            # Create close request
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": position.symbol,
-                "volume": position.volume,
-                "type": order_type,
-                "position": ticket,
-                "price": price,
-                "deviation": self.deviation,
-                "magic": self.magic_number,
-                "comment": f"MikroBot Close {ticket}",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_FOK,
-            }
-            
-            # Send close order
-            result = mt5.order_send(request)
-            
-            if result is None:
-                return MT5ExecutionResult(
-                    success=False,
-                    error_message="Close order failed - no result"
-                )
-            
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
-                return MT5ExecutionResult(
+        except Exception as e:
+            logger.error(f"MT5 close error: {e}")
+            return MT5ExecutionResult(
+                success=False,
+                error_message=str(e)
+            )
+    
+    def close_trades(self, tickets: List[int]) -> Dict[int, MT5ExecutionResult]:
+        """
+        Close many open trades back-to-back over this connection
+        
+        Open positions are read with one positions_get() call and quotes come
+        from the shared tick cache, so each ticket costs a single order_send.
+        """
+        if not self.connected:
+            if not self.connect():
+                return {
+                    ticket: MT5ExecutionResult(success=False, error_message="Failed to connect to MT5")
+                    for ticket in tickets
+                }
+        
+        try:
+            positions = {position.ticket: position for position in (self.terminal.positions_get() or ())}
+        except Exception as e:
+            logger.error(f"MT5 positions error: {e}")
+            return {ticket: MT5ExecutionResult(success=False, error_message=str(e)) for ticket in tickets}
+        
+        results = {}
+        for ticket in tickets:
+            position = positions.get(ticket)
+            if position is None:
+                results[ticket] = MT5ExecutionResult(
                     success=False,
-                    error_code=result.retcode,
-                    error_message=f"Close failed: {result.retcode} - {result.comment}"
+                    error_message=f"Position {ticket} not found"
                 )
+                continue
             
+            try:
+                results[ticket] = self._close_position(position)
+            except Exception as e:
+                logger.error(f"MT5 close error for {ticket}: {e}")
+                results[ticket] = MT5ExecutionResult(success=False, error_message=str(e))
+        
+        return results
+    
+    def _close_position(self, position) -> MT5ExecutionResult:
+        """Send the opposite market order for an open position"""
+        ticket = position.ticket
+        
+        # Get current price (shared tick cache, direct call if not fresh enough)
+        tick = get_tick(position.symbol, max_age=get_tick_cache_config()['order_max_age'], loader=self.terminal.symbol_info_tick)
+        if tick is None:
             return MT5ExecutionResult(
-                success=True,
-                ticket=result.order,
-                actual_entry_price=Decimal(str(result.price)),
-                execution_time=django_timezone.now()
+                success=False,
+                error_message=f"Failed to get tick data for {position.symbol}"
             )
-            
-        except Exception as e:
-            logger.error(f"MT5 close error: {e}")
+        
+        # Determine close price and order type
+        if position.type == self.terminal.POSITION_TYPE_BUY:
+            price = tick.bid
+            order_type = self.terminal.ORDER_TYPE_SELL
+        else:
+            price = tick.ask
+            order_type = self.terminal.ORDER_TYPE_BUY
+        
+        # Create close request
+        request = {
+            "action": self.terminal.TRADE_ACTION_DEAL,
+            "symbol": position.symbol,
+            "volume": position.volume,
+            "type": order_type,
+            "position": ticket,
+            "price": price,
+            "deviation": self.deviation,
+            "magic": self.magic_number,
+            "comment": f"MikroBot Close {ticket}",
+            "type_time": self.terminal.ORDER_TIME_GTC,
+            "type_filling": self._filling_type(position.symbol),
+        }
+        
+        # Send close order
+        result = self.terminal.order_send(request)
+        
+        if result is None:
             return MT5ExecutionResult(
                 success=False,
-                error_message=str(e)
+                error_message="Close order failed - no result"
+            )
+        
+        if result.retcode != self.terminal.TRADE_RETCODE_DONE:
+            return MT5ExecutionResult(
+                success=False,
+                error_code=result.retcode,
+                error_message=f"Close failed: {result.retcode} - {result.comment}"
             )
+        
+        # Realized figures come from the deals, so close slippage is included
+        try:
+            deals = self.terminal.history_deals_get(position=ticket) or ()
+        except Exception as e:
+            # The position is closed either way; reconciliation fills in the P&L
+            logger.warning(f"MT5 deal history for closed position {ticket} unavailable: {e}")
+            deals = ()
+        realized = {}
+        if deals:
+            realized = {
+                name: sum((Decimal(str(getattr(deal, name, 0) or 0)) for deal in deals), Decimal('0'))
+                for name in ('profit', 'swap', 'commission')
+            }
+        
+        return MT5ExecutionResult(
+            success=True,
+            ticket=result.order,
+            actual_entry_price=Decimal(str(result.price)),
+            actual_volume=_to_decimal(getattr(result, 'volume', None)),
+            execution_time=django_timezone.now(),
+            profit=realized.get('profit'),
+            swap=realized.get('swap'),
+            commission=realized.get('commission'),
+        )
+    
+    def _filling_type(self, symbol: str) -> int:
+        """Filling mode the symbol accepts (FOK if its spec is unavailable)"""
+        spec = self.get_symbol_spec(symbol)
+        if spec is None:
+            return self.terminal.ORDER_FILLING_FOK
+        return spec.order_filling_type(self.terminal)
     
     def get_position_info(self, ticket: int) -> Optional[Dict]:
         """Get current position information"""
@@ -287,7 +385,7 @@ class MT5Executor:
                 return None
         
         try:
-            position = mt5.positions_get(ticket=ticket)
+            position = self.terminal.positions_get(ticket=ticket)
             if not position:
                 return None
             
@@ -295,7 +393,7 @@ class MT5Executor:
             return {
                 'ticket': pos.ticket,
                 'symbol': pos.symbol,
-                'type': 'BUY' if pos.type == mt5.POSITION_TYPE_BUY else 'SELL',
+                'type': 'BUY' if pos.type == self.terminal.POSITION_TYPE_BUY else 'SELL',
                 'volume': pos.volume,
                 'open_price': pos.price_open,
                 'current_price': pos.price_current,
@@ -318,7 +416,7 @@ class MT5Executor:
                 return None
         
         try:
-            account = mt5.account_info()
+            account = self.terminal.account_info()
             if account is None:
                 return None
             
@@ -339,27 +437,18 @@ class MT5Executor:
             logger.error(f"Error getting account info: {e}")
             return None
     
+    def get_symbol_spec(self, symbol: str) -> Optional[SymbolSpec]:
+        """Get cached symbol specification (loaded via symbol_info once)"""
+        return symbol_spec_registry.get(symbol, loader=self.terminal.symbol_info)
+    
     def _normalize_volume(self, symbol: str, volume: float) -> float:
         """Normalize volume according to symbol requirements"""
         try:
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
+            spec = self.get_symbol_spec(symbol)
+            if spec is None:
                 return volume
             
-            # Check minimum volume
-            if volume < symbol_info.volume_min:
-                volume = symbol_info.volume_min
-            
-            # Check maximum volume
-            if volume > symbol_info.volume_max:
-                volume = symbol_info.volume_max
-            
-            # Round to volume step
-            volume_step = symbol_info.volume_step
-            if volume_step > 0:
-                volume = round(volume / volume_step) * volume_step
-            
-            return volume
+            return spec.normalize_volume(volume)
             
         except Exception as e:
             logger.error(f"Error normalizing volume: {e}")
@@ -368,17 +457,11 @@ class MT5Executor:
     def _normalize_price(self, symbol: str, price: float) -> float:
         """Normalize price according to symbol requirements"""
         try:
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
+            spec = self.get_symbol_spec(symbol)
+            if spec is None:
                 return price
             
-            # Round to tick size
-            tick_size = symbol_info.point
-            if tick_size > 0:
-                digits = len(str(tick_size).split('.')[-1])
-                price = round(price, digits)
-            
-            return price
+            return spec.normalize_price(price)
             
         except Exception as e:
             logger.error(f"Error normalizing price: {e}")
@@ -402,7 +485,7 @@ def execute_approved_signal(signal_id: str, volume: Decimal) -> Tuple[bool, str,
     try:
         signal = MQL5Signal.objects.get(id=signal_id)
         
-        with MT5Executor() as executor:
+        with mt5_session() as executor:
             result = executor.execute_trade_from_signal(signal, volume)
             
             if result.success:
@@ -427,7 +510,7 @@ def close_trade_by_ticket(ticket: int) -> Tuple[bool, str]:
     Returns: (success, message)
     """
     try:
-        with MT5Executor() as executor:
+        with mt5_session() as executor:
             result = executor.close_trade(ticket)
             
             if result.success:
@@ -445,7 +528,7 @@ def update_trade_from_mt5(trade: Trade) -> bool:
     Update trade object with current MT5 position data
     """
     try:
-        with MT5Executor() as executor:
+        with mt5_session() as executor:
             position_info = executor.get_position_info(trade.mt5_ticket)
             
             if position_info:
@@ -0,0 +1,181 @@
+"""
+Persistent MT5 Session Manager
+One long-lived MetaTrader 5 connection shared by the whole process
+
+The MetaTrader5 module keeps a single global terminal connection and is not
+thread-safe: every initialize()/shutdown() pair tears down the connection of
+whoever else is using it. Instead of connecting per call, code borrows the
+shared connection:
+
+    from trading.mt5_session import mt5_session
+
+    with mt5_session() as executor:
+        account_info = executor.get_account_info()
+
+Borrowing holds a process-wide lock, so MT5 calls are serialized. The
+connection is health-checked before use and re-established with exponential
+backoff when the terminal goes away.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from core.config import get_config
+
+from .symbol_specs import symbol_spec_registry
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SESSION_CONFIG = {
+    'health_check_interval': 30,   # seconds between terminal health checks
+    'reconnect_backoff_base': 1,   # first retry delay in seconds
+    'reconnect_backoff_max': 60,   # upper bound for retry delay
+    'lock_timeout': 30,            # seconds to wait for the session lock
+}
+
+
+def get_session_config():
+    return get_config('MT5_SESSION_CONFIG', DEFAULT_SESSION_CONFIG)
+
+
+class MT5SessionUnavailable(ConnectionError):
+    """Raised when the shared MT5 session cannot be used right now"""
+
+
+class MT5SessionManager:
+    """
+    Owns the process-wide MT5 connection and serializes access to it
+    """
+
+    def __init__(self, executor_factory=None):
+        self._executor_factory = executor_factory
+        self._executor = None
+        self._lock = threading.RLock()
+        self._last_health_check = 0.0
+        self._failures = 0
+        self._next_attempt_at = 0.0
+
+    @property
+    def connected(self):
+        return self._executor is not None and self._executor.connected
+
+    def _create_executor(self):
+        if self._executor_factory is not None:
+            return self._executor_factory()
+
+        if getattr(settings, 'EXECUTION_BACKEND', 'mt5') == 'paper':
+            from .paper_executor import PaperExecutor
+            return PaperExecutor()
+
+        from .mt5_executor import MT5Executor
+        return MT5Executor()
+
+    def _is_healthy(self):
+        """Check that the terminal is still attached and connected"""
+        try:
+            terminal_info = self._executor.terminal.terminal_info()
+        except Exception as e:
+            logger.warning(f"MT5 health check failed: {e}")
+            return False
+        return terminal_info is not None and getattr(terminal_info, 'connected', True)
+
+    def _connect(self):
+        """Connect (or reconnect) respecting the backoff window"""
+        now = time.monotonic()
+        if now < self._next_attempt_at:
+            raise MT5SessionUnavailable(
+                f"MT5 reconnect backoff active for {self._next_attempt_at - now:.1f}s"
+            )
+
+        if self._executor is None:
+            self._executor = self._create_executor()
+
+        if self._executor.connect():
+            # Symbol specs may differ in a new terminal session
+            symbol_spec_registry.clear()
+
+            self._failures = 0
+            self._next_attempt_at = 0.0
+            self._last_health_check = time.monotonic()
+            return
+
+        config = get_session_config()
+        self._failures += 1
+        delay = min(
+            config['reconnect_backoff_base'] * (2 ** (self._failures - 1)),
+            config['reconnect_backoff_max']
+        )
+        self._next_attempt_at = time.monotonic() + delay
+        logger.error(f"MT5 session connect failed (attempt {self._failures}), next retry in {delay}s")
+        raise MT5SessionUnavailable("Failed to connect to MT5")
+
+    def _ensure_connected(self):
+        """Connect if needed and health-check an existing connection"""
+        if not self.connected:
+            self._connect()
+            return
+
+        config = get_session_config()
+        if time.monotonic() - self._last_health_check < config['health_check_interval']:
+            return
+
+        if self._is_healthy():
+            self._last_health_check = time.monotonic()
+            return
+
+        logger.warning("MT5 session unhealthy, reconnecting")
+        self._drop_connection()
+        self._connect()
+
+    def _drop_connection(self):
+        if self._executor is not None:
+            try:
+                self._executor.disconnect()
+            except Exception as e:
+                logger.warning(f"MT5 disconnect error: {e}")
+
+    @contextmanager
+    def session(self):
+        """
+        Borrow the shared executor for the duration of the block
+
+        Callers must not disconnect the borrowed executor.
+        Raises MT5SessionUnavailable if MT5 cannot be reached.
+        """
+        if not self._lock.acquire(timeout=get_session_config()['lock_timeout']):
+            raise MT5SessionUnavailable("Timed out waiting for the MT5 session lock")
+
+        try:
+            self._ensure_connected()
+            yield self._executor
+        finally:
+            self._lock.release()
+
+    def invalidate(self):
+        """Force a health check on the next borrow (e.g. after an MT5 error)"""
+        with self._lock:
+            self._last_health_check = 0.0
+
+    def shutdown(self):
+        """Close the shared connection"""
+        with self._lock:
+            self._drop_connection()
+            self._executor = None
+            self._failures = 0
+            self._next_attempt_at = 0.0
+
+
+# Global session manager instance
+session_manager = MT5SessionManager()
+atexit.register(session_manager.shutdown)
+
+
+def mt5_session():
+    """Borrow the process-wide MT5 executor (context manager)"""
+    return session_manager.session()
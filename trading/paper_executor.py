@@ -0,0 +1,666 @@
+"""
+Paper Trading Execution Backend
+Simulated MetaTrader 5 terminal behind the MT5Executor interface
+
+PaperTerminal emulates the subset of the MetaTrader5 module the trading code
+uses (account, symbols, ticks, order_send, positions, deal history). Orders
+fill at the current bid/ask of recorded or synthetic ticks, after a
+configurable latency and with configurable adverse slippage, into an
+in-memory position book. It runs anywhere, including Linux hosts without
+the MetaTrader5 package.
+
+PaperExecutor is an MT5Executor whose terminal is a PaperTerminal, so
+execute_trade_from_signal, close_trade, get_position_info and
+get_account_info behave exactly as against a live terminal. Select it for
+the whole process with EXECUTION_BACKEND = 'paper':
+
+    from trading.mt5_session import mt5_session
+
+    with mt5_session() as executor:        # PaperExecutor
+        result = executor.execute_trade_from_signal(signal, Decimal('0.10'))
+"""
+
+import csv
+import itertools
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from core.config import get_config
+
+from .mt5_executor import MT5Executor, MT5ConnectionConfig
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PAPER_TRADING_CONFIG = {
+    'account': {
+        'login': 1000000,
+        'server': 'Paper-Trading',
+        'company': 'MikroBot Paper',
+        'currency': 'USD',
+        'balance': 100000.0,
+        'leverage': 100,
+    },
+    'tick_source': 'synthetic',       # 'synthetic' or 'recorded'
+    'recorded_ticks_path': '',        # CSV with symbol,bid,ask[,time_msc]
+    'synthetic': {
+        'prices': {
+            'EURUSD': 1.0850, 'GBPUSD': 1.2700, 'USDJPY': 150.00,
+            'USDCHF': 0.8800, 'AUDUSD': 0.6600, 'USDCAD': 1.3500,
+            'NZDUSD': 0.6100, 'EURJPY': 162.80, 'GBPJPY': 190.50,
+            'EURGBP': 0.8550, 'XAUUSD': 2000.00,
+        },
+        'spread_points': 10,          # bid/ask spread
+        'volatility_points': 5,       # max random walk step per tick
+        'seed': None,
+    },
+    'latency': {
+        'model': 'none',              # 'none', 'fixed' or 'uniform'
+        'ms': 0,                      # fixed latency
+        'min_ms': 0,                  # uniform latency bounds
+        'max_ms': 0,
+    },
+    'slippage': {
+        'model': 'none',              # 'none', 'fixed' or 'uniform'
+        'points': 0,                  # fixed adverse slippage
+        'max_points': 0,              # uniform adverse slippage upper bound
+    },
+    'symbols': {},                    # per-symbol spec overrides
+}
+
+# Spec overrides for non-FX symbols (everything else is a 6-letter FX pair)
+SYMBOL_DEFAULTS = {
+    'XAUUSD': {'digits': 2, 'trade_contract_size': 100.0},
+    'XAGUSD': {'digits': 3, 'trade_contract_size': 5000.0},
+}
+
+
+def get_paper_trading_config():
+    return get_config('PAPER_TRADING_CONFIG', DEFAULT_PAPER_TRADING_CONFIG)
+
+
+# MetaTrader5-compatible result records
+
+@dataclass
+class PaperTick:
+    bid: float
+    ask: float
+    last: float = 0.0
+    time: int = 0
+    time_msc: int = 0
+
+
+@dataclass
+class PaperSymbolInfo:
+    name: str
+    digits: int
+    point: float
+    volume_min: float = 0.01
+    volume_max: float = 100.0
+    volume_step: float = 0.01
+    trade_contract_size: float = 100000.0
+    filling_mode: int = 3
+    currency_base: str = ''
+    currency_profit: str = ''
+    currency_margin: str = ''
+    trade_tick_value: float = 1.0
+    trade_tick_size: float = 0.0
+    visible: bool = True
+
+
+@dataclass
+class PaperAccountInfo:
+    login: int
+    server: str
+    company: str
+    currency: str
+    leverage: int
+    balance: float
+    equity: float
+    margin: float
+    margin_free: float
+    margin_level: float
+    profit: float
+
+
+@dataclass
+class PaperTerminalInfo:
+    connected: bool
+    trade_allowed: bool = True
+    name: str = 'Paper Terminal'
+
+
+@dataclass
+class PaperPosition:
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price_open: float
+    sl: float
+    tp: float
+    time: int
+    magic: int
+    comment: str
+    price_current: float = 0.0
+    profit: float = 0.0
+    swap: float = 0.0
+    commission: float = 0.0
+    identifier: int = 0
+
+
+@dataclass
+class PaperDeal:
+    ticket: int
+    order: int
+    position_id: int
+    symbol: str
+    type: int
+    entry: int
+    volume: float
+    price: float
+    profit: float
+    time: int
+    magic: int
+    comment: str
+    commission: float = 0.0
+    swap: float = 0.0
+
+
+@dataclass
+class PaperOrderResult:
+    retcode: int
+    deal: int = 0
+    order: int = 0
+    volume: float = 0.0
+    price: float = 0.0
+    bid: float = 0.0
+    ask: float = 0.0
+    comment: str = ''
+    request: Dict = field(default_factory=dict)
+
+
+# Tick sources
+
+class SyntheticTickSource:
+    """
+    Random walk around configured start prices; every read advances the walk
+    """
+
+    def __init__(self, prices: Dict[str, float], spread_points: float = 10,
+                 volatility_points: float = 5, seed: Optional[int] = None):
+        self._mid = dict(prices)
+        self.spread_points = spread_points
+        self.volatility_points = volatility_points
+        self._random = random.Random(seed)
+
+    def symbols(self) -> List[str]:
+        return list(self._mid)
+
+    def next_tick(self, symbol: str, point: float) -> Optional[PaperTick]:
+        mid = self._mid.get(symbol)
+        if mid is None:
+            return None
+
+        step = self._random.uniform(-self.volatility_points, self.volatility_points) * point
+        mid = max(mid + step, point)
+        self._mid[symbol] = mid
+
+        half_spread = self.spread_points * point / 2
+        return PaperTick(bid=mid - half_spread, ask=mid + half_spread, last=mid)
+
+
+class RecordedTickSource:
+    """
+    Replays recorded (bid, ask[, time_msc]) ticks per symbol; the last tick
+    is held once a symbol's recording is exhausted
+    """
+
+    def __init__(self, ticks: Dict[str, Iterable]):
+        self._ticks = {symbol: iter(list(rows)) for symbol, rows in ticks.items()}
+        self._last: Dict[str, PaperTick] = {}
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'RecordedTickSource':
+        """Load ticks from a CSV file with symbol,bid,ask[,time_msc] columns"""
+        ticks: Dict[str, List] = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                ticks.setdefault(row['symbol'], []).append(
+                    (float(row['bid']), float(row['ask']), int(row.get('time_msc') or 0))
+                )
+        return cls(ticks)
+
+    def symbols(self) -> List[str]:
+        return list(self._ticks)
+
+    def next_tick(self, symbol: str, point: float) -> Optional[PaperTick]:
+        rows = self._ticks.get(symbol)
+        if rows is None:
+            return None
+
+        row = next(rows, None)
+        if row is None:
+            return self._last.get(symbol)
+
+        bid, ask = float(row[0]), float(row[1])
+        time_msc = int(row[2]) if len(row) > 2 and row[2] else 0
+        tick = PaperTick(bid=bid, ask=ask, last=(bid + ask) / 2,
+                         time=time_msc // 1000, time_msc=time_msc)
+        self._last[symbol] = tick
+        return tick
+
+
+# Execution models
+
+class LatencyModel:
+    """Order round-trip delay: none, fixed or uniform random (milliseconds)"""
+
+    def __init__(self, model: str = 'none', ms: float = 0, min_ms: float = 0,
+                 max_ms: float = 0, seed: Optional[int] = None):
+        self.model = model
+        self.ms = ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self._random = random.Random(seed)
+
+    def delay(self) -> float:
+        """Delay of the next order in seconds"""
+        if self.model == 'fixed':
+            return self.ms / 1000
+        if self.model == 'uniform':
+            return self._random.uniform(self.min_ms, self.max_ms) / 1000
+        return 0.0
+
+
+class SlippageModel:
+    """Adverse fill slippage: none, fixed or uniform random (points)"""
+
+    def __init__(self, model: str = 'none', points: float = 0, max_points: float = 0,
+                 seed: Optional[int] = None):
+        self.model = model
+        self.points = points
+        self.max_points = max_points
+        self._random = random.Random(seed)
+
+    def slippage_points(self) -> float:
+        if self.model == 'fixed':
+            return self.points
+        if self.model == 'uniform':
+            return self._random.uniform(0, self.max_points)
+        return 0.0
+
+
+class PaperTerminal:
+    """
+    In-memory stand-in for the MetaTrader5 module
+    """
+
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    POSITION_TYPE_BUY = 0
+    POSITION_TYPE_SELL = 1
+    DEAL_ENTRY_IN = 0
+    DEAL_ENTRY_OUT = 1
+    TRADE_ACTION_DEAL = 1
+    ORDER_FILLING_FOK = 0
+    ORDER_FILLING_IOC = 1
+    ORDER_FILLING_RETURN = 2
+    ORDER_TIME_GTC = 0
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_POSITION_CLOSED = 10036
+
+    def __init__(self, tick_source=None, latency: Optional[LatencyModel] = None,
+                 slippage: Optional[SlippageModel] = None, account: Optional[Dict] = None,
+                 symbols: Optional[Dict[str, Dict]] = None):
+        config = get_paper_trading_config()
+        account = {**config['account'], **(account or {})}
+
+        self.tick_source = tick_source or SyntheticTickSource(
+            config['synthetic']['prices'],
+            spread_points=config['synthetic']['spread_points'],
+            volatility_points=config['synthetic']['volatility_points'],
+            seed=config['synthetic']['seed'],
+        )
+        self.latency = latency or LatencyModel()
+        self.slippage = slippage or SlippageModel()
+
+        self.login = account['login']
+        self.server = account['server']
+        self.company = account['company']
+        self.currency = account['currency']
+        self.leverage = account['leverage']
+        self.balance = float(account['balance'])
+
+        self._symbol_overrides = {**config['symbols'], **(symbols or {})}
+        self._symbol_info: Dict[str, PaperSymbolInfo] = {}
+        self._last_tick: Dict[str, PaperTick] = {}
+        self._positions: Dict[int, PaperPosition] = {}
+        self._deals: List[PaperDeal] = []
+        self._tickets = itertools.count(1)
+        self._lock = threading.RLock()
+        self.initialized = False
+
+    @classmethod
+    def from_settings(cls) -> 'PaperTerminal':
+        """Terminal built from PAPER_TRADING_CONFIG"""
+        config = get_paper_trading_config()
+
+        tick_source = None
+        if config['tick_source'] == 'recorded':
+            tick_source = RecordedTickSource.from_csv(config['recorded_ticks_path'])
+
+        return cls(
+            tick_source=tick_source,
+            latency=LatencyModel(**config['latency']),
+            slippage=SlippageModel(**config['slippage']),
+        )
+
+    # Connection
+
+    def initialize(self, **kwargs) -> bool:
+        self.initialized = True
+        return True
+
+    def shutdown(self):
+        self.initialized = False
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def terminal_info(self) -> PaperTerminalInfo:
+        return PaperTerminalInfo(connected=self.initialized)
+
+    # Symbols and quotes
+
+    def symbol_info(self, symbol: str) -> Optional[PaperSymbolInfo]:
+        with self._lock:
+            info = self._symbol_info.get(symbol)
+            if info is None and symbol in self.tick_source.symbols():
+                info = self._build_symbol_info(symbol)
+                self._symbol_info[symbol] = info
+            return info
+
+    def _build_symbol_info(self, symbol: str) -> PaperSymbolInfo:
+        spec = {
+            'digits': 3 if symbol.endswith('JPY') else 5,
+            'currency_base': symbol[:3],
+            'currency_profit': symbol[3:6],
+            'currency_margin': symbol[:3],
+        }
+        spec.update(SYMBOL_DEFAULTS.get(symbol, {}))
+        spec.update(self._symbol_overrides.get(symbol, {}))
+        spec.setdefault('point', 10 ** -spec['digits'])
+        spec.setdefault('trade_tick_size', spec['point'])
+        spec.setdefault('trade_tick_value', spec['trade_tick_size'] * spec.get('trade_contract_size', 100000.0))
+        return PaperSymbolInfo(name=symbol, **spec)
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        info = self.symbol_info(symbol)
+        if info is None:
+            return False
+        info.visible = enable
+        return True
+
+    def symbols_get(self):
+        return tuple(
+            info for info in (self.symbol_info(symbol) for symbol in self.tick_source.symbols())
+            if info is not None
+        )
+
+    def symbol_info_tick(self, symbol: str) -> Optional[PaperTick]:
+        """Next tick from the tick source"""
+        info = self.symbol_info(symbol)
+        if info is None:
+            return None
+
+        with self._lock:
+            tick = self.tick_source.next_tick(symbol, info.point)
+            if tick is None:
+                return None
+            if not tick.time_msc:
+                now_msc = int(time.time() * 1000)
+                tick.time, tick.time_msc = now_msc // 1000, now_msc
+            self._last_tick[symbol] = tick
+            return tick
+
+    def _current_tick(self, symbol: str) -> Optional[PaperTick]:
+        return self._last_tick.get(symbol) or self.symbol_info_tick(symbol)
+
+    # Account
+
+    def _to_account_currency(self, amount: float, currency: str) -> float:
+        """Convert an amount using the latest paper quotes"""
+        if currency == self.currency:
+            return amount
+
+        direct = self._current_tick(f"{currency}{self.currency}")
+        if direct is not None:
+            return amount * direct.bid
+
+        inverse = self._current_tick(f"{self.currency}{currency}")
+        if inverse is not None and inverse.ask > 0:
+            return amount / inverse.ask
+
+        logger.warning(f"No paper quote to convert {currency} to {self.currency}")
+        return amount
+
+    def _refresh_position(self, position: PaperPosition):
+        info = self.symbol_info(position.symbol)
+        tick = self._current_tick(position.symbol)
+        if info is None or tick is None:
+            return
+
+        if position.type == self.POSITION_TYPE_BUY:
+            position.price_current = tick.bid
+            move = tick.bid - position.price_open
+        else:
+            position.price_current = tick.ask
+            move = position.price_open - tick.ask
+
+        profit = move * position.volume * info.trade_contract_size
+        position.profit = round(self._to_account_currency(profit, info.currency_profit), 2)
+
+    def account_info(self) -> Optional[PaperAccountInfo]:
+        if not self.initialized:
+            return None
+
+        with self._lock:
+            profit = 0.0
+            margin = 0.0
+            for position in self._positions.values():
+                self._refresh_position(position)
+                profit += position.profit
+                info = self.symbol_info(position.symbol)
+                notional = position.volume * info.trade_contract_size
+                margin += self._to_account_currency(notional, info.currency_base) / self.leverage
+
+            equity = self.balance + profit
+            return PaperAccountInfo(
+                login=self.login,
+                server=self.server,
+                company=self.company,
+                currency=self.currency,
+                leverage=self.leverage,
+                balance=round(self.balance, 2),
+                equity=round(equity, 2),
+                margin=round(margin, 2),
+                margin_free=round(equity - margin, 2),
+                margin_level=round(equity / margin * 100, 2) if margin else 0.0,
+                profit=round(profit, 2),
+            )
+
+    # Positions and history
+
+    def positions_get(self, symbol: Optional[str] = None, ticket: Optional[int] = None):
+        with self._lock:
+            positions = [
+                position for position in self._positions.values()
+                if (ticket is None or position.ticket == ticket)
+                and (symbol is None or position.symbol == symbol)
+            ]
+            for position in positions:
+                self._refresh_position(position)
+            return tuple(positions)
+
+    def positions_total(self) -> int:
+        with self._lock:
+            return len(self._positions)
+
+    def history_deals_get(self, date_from=None, date_to=None, position=None, **kwargs):
+        with self._lock:
+            if position is not None:
+                return tuple(deal for deal in self._deals if deal.position_id == position)
+            start = date_from.timestamp() if isinstance(date_from, datetime) else date_from
+            end = date_to.timestamp() if isinstance(date_to, datetime) else date_to
+            return tuple(deal for deal in self._deals if start <= deal.time <= end)
+
+    # Orders
+
+    def order_send(self, request: Dict) -> PaperOrderResult:
+        """Fill a market order (TRADE_ACTION_DEAL) against the next tick"""
+        delay = self.latency.delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        symbol = request.get('symbol')
+        info = self.symbol_info(symbol)
+        if info is None or request.get('action') != self.TRADE_ACTION_DEAL:
+            return PaperOrderResult(retcode=self.TRADE_RETCODE_INVALID, comment='Invalid request', request=request)
+
+        volume = float(request.get('volume', 0))
+        if not info.volume_min <= volume <= info.volume_max:
+            return PaperOrderResult(retcode=self.TRADE_RETCODE_INVALID_VOLUME, comment='Invalid volume', request=request)
+
+        with self._lock:
+            tick = self.symbol_info_tick(symbol)
+            if tick is None:
+                return PaperOrderResult(retcode=self.TRADE_RETCODE_INVALID, comment='No prices', request=request)
+
+            slippage_points = self.slippage.slippage_points()
+            deviation = request.get('deviation')
+            if deviation is not None and slippage_points > deviation:
+                return PaperOrderResult(retcode=self.TRADE_RETCODE_REQUOTE, bid=tick.bid, ask=tick.ask,
+                                        comment='Requote', request=request)
+
+            # Slippage always moves the fill against the trader
+            is_buy = request.get('type') == self.ORDER_TYPE_BUY
+            price = tick.ask if is_buy else tick.bid
+            price += slippage_points * info.point if is_buy else -slippage_points * info.point
+            price = round(price, info.digits)
+
+            if request.get('position'):
+                return self._close_position(request, info, tick, price)
+            return self._open_position(request, tick, price, volume)
+
+    def _open_position(self, request: Dict, tick: PaperTick, price: float, volume: float) -> PaperOrderResult:
+        ticket = next(self._tickets)
+        now = int(time.time())
+        position_type = self.POSITION_TYPE_BUY if request.get('type') == self.ORDER_TYPE_BUY else self.POSITION_TYPE_SELL
+
+        self._positions[ticket] = PaperPosition(
+            ticket=ticket,
+            identifier=ticket,
+            symbol=request['symbol'],
+            type=position_type,
+            volume=volume,
+            price_open=price,
+            price_current=price,
+            sl=float(request.get('sl') or 0),
+            tp=float(request.get('tp') or 0),
+            time=now,
+            magic=request.get('magic', 0),
+            comment=request.get('comment', ''),
+        )
+        self._record_deal(ticket, request, self.DEAL_ENTRY_IN, volume, price, 0.0, now)
+
+        return PaperOrderResult(retcode=self.TRADE_RETCODE_DONE, deal=ticket, order=ticket, volume=volume,
+                                price=price, bid=tick.bid, ask=tick.ask, comment='Request executed',
+                                request=request)
+
+    def _close_position(self, request: Dict, info: PaperSymbolInfo, tick: PaperTick,
+                        price: float) -> PaperOrderResult:
+        position = self._positions.get(request['position'])
+        if position is None:
+            return PaperOrderResult(retcode=self.TRADE_RETCODE_POSITION_CLOSED, comment='Position not found',
+                                    request=request)
+
+        volume = min(float(request['volume']), position.volume)
+        move = price - position.price_open if position.type == self.POSITION_TYPE_BUY else position.price_open - price
+        profit = round(self._to_account_currency(move * volume * info.trade_contract_size, info.currency_profit), 2)
+
+        self.balance += profit
+        position.volume = round(position.volume - volume, 8)
+        if position.volume <= 0:
+            del self._positions[position.ticket]
+
+        order = next(self._tickets)
+        self._record_deal(position.ticket, request, self.DEAL_ENTRY_OUT, volume, price, profit, int(time.time()),
+                          ticket=order)
+
+        return PaperOrderResult(retcode=self.TRADE_RETCODE_DONE, deal=order, order=order, volume=volume,
+                                price=price, bid=tick.bid, ask=tick.ask, comment='Request executed',
+                                request=request)
+
+    def _record_deal(self, position_id: int, request: Dict, entry: int, volume: float,
+                     price: float, profit: float, timestamp: int, ticket: Optional[int] = None):
+        ticket = ticket or position_id
+        self._deals.append(PaperDeal(
+            ticket=ticket,
+            order=ticket,
+            position_id=position_id,
+            symbol=request['symbol'],
+            type=request.get('type', 0),
+            entry=entry,
+            volume=volume,
+            price=price,
+            profit=profit,
+            time=timestamp,
+            magic=request.get('magic', 0),
+            comment=request.get('comment', ''),
+        ))
+
+    def reset(self, balance: Optional[float] = None):
+        """Drop all positions and deal history"""
+        with self._lock:
+            self._positions.clear()
+            self._deals.clear()
+            self._last_tick.clear()
+            if balance is not None:
+                self.balance = float(balance)
+
+
+_paper_terminal = None
+_paper_terminal_lock = threading.Lock()
+
+
+def get_paper_terminal() -> PaperTerminal:
+    """Process-wide paper terminal (the position book survives reconnects)"""
+    global _paper_terminal
+    with _paper_terminal_lock:
+        if _paper_terminal is None:
+            _paper_terminal = PaperTerminal.from_settings()
+        return _paper_terminal
+
+
+class PaperExecutor(MT5Executor):
+    """
+    MT5Executor that trades against a PaperTerminal
+    """
+
+    def __init__(self, config: Optional[MT5ConnectionConfig] = None,
+                 terminal: Optional[PaperTerminal] = None):
+        super().__init__(config)
+        self._terminal = terminal or get_paper_terminal()
+
+    @property
+    def terminal(self):
+        return self._terminal
@@ -0,0 +1,236 @@
+"""
+Batch Pip Value Engine
+Pip values, tick values and risk-based lot sizes for a whole symbol universe
+
+Loads the symbol specs and current quotes of every symbol once into NumPy
+arrays and computes all values with vectorized math. Conversion to the
+account currency goes through a currency rate matrix built from the
+universe's own quotes (direct, inverse and one-hop cross rates), so no
+per-symbol conversion probing is needed.
+
+Usage:
+    from trading.pip_value_batch import build_universe_snapshot
+
+    snapshot = build_universe_snapshot(['EURUSD', 'GBPJPY', 'XAUUSD'])
+    snapshot.pip_values(lot_size=1.0)          # {'EURUSD': 10.0, ...}
+    snapshot.lot_sizes(risk_amount=100.0, stop_distances={'EURUSD': 0.0020})
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .mt5_session import mt5_session
+from .pip_value_calculator import PipValueCalculator, conversion_graph, pip_value_cache
+from .symbol_specs import symbol_spec_registry
+from .tick_cache import get_tick
+
+logger = logging.getLogger(__name__)
+
+
+class BatchEngineUnavailable(RuntimeError):
+    """Raised when NumPy is not installed"""
+
+
+def get_default_universe(terminal) -> List[str]:
+    """Configured symbol universe, or all symbols visible in Market Watch"""
+    universe = getattr(settings, 'PIP_VALUE_BATCH_CONFIG', {}).get('universe')
+    if universe:
+        return list(universe)
+
+    symbols = terminal.symbols_get()
+    return [symbol.name for symbol in symbols if symbol.visible] if symbols else []
+
+
+class UniverseSnapshot:
+    """
+    Specs and quotes of a symbol universe as aligned NumPy arrays
+    """
+
+    def __init__(self, specs, ticks, account_currency: str, terminal=None):
+        self.terminal = terminal
+        self.account_currency = account_currency
+        self.symbols = [spec.symbol for spec in specs]
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.pip_size = np.array([spec.pip_size for spec in specs], dtype=float)
+        self.tick_size = np.array([spec.tick_size or spec.point for spec in specs], dtype=float)
+        self.contract_size = np.array([spec.contract_size for spec in specs], dtype=float)
+        self.volume_min = np.array([spec.volume_min for spec in specs], dtype=float)
+        self.volume_max = np.array([spec.volume_max for spec in specs], dtype=float)
+        self.volume_step = np.array([spec.volume_step for spec in specs], dtype=float)
+        self.bid = np.array([tick.bid for tick in ticks], dtype=float)
+        self.ask = np.array([tick.ask for tick in ticks], dtype=float)
+
+        self.currencies = sorted(
+            {spec.currency_base for spec in specs}
+            | {spec.currency_profit for spec in specs}
+            | {account_currency}
+        )
+        currency_index = {currency: i for i, currency in enumerate(self.currencies)}
+        self.base_idx = np.array([currency_index[spec.currency_base] for spec in specs], dtype=int)
+        self.quote_idx = np.array([currency_index[spec.currency_profit] for spec in specs], dtype=int)
+        self.account_idx = currency_index[account_currency]
+
+        self.to_account = self._build_conversion_vector()
+
+    def _build_conversion_vector(self):
+        """
+        Rate from every currency to the account currency
+
+        rates[i, j] converts currency i to currency j using a universe quote
+        (bid for base->quote, 1/bid for quote->base). Missing direct rates
+        are filled with one-hop crosses rates[i, k] * rates[k, account].
+        """
+        n = len(self.currencies)
+        rates = np.zeros((n, n), dtype=float)
+        np.fill_diagonal(rates, 1.0)
+
+        valid = self.bid > 0
+        rates[self.base_idx[valid], self.quote_idx[valid]] = self.bid[valid]
+        rates[self.quote_idx[valid], self.base_idx[valid]] = 1.0 / self.bid[valid]
+
+        direct = rates[:, self.account_idx]
+        one_hop = (rates * direct[np.newaxis, :]).max(axis=1)
+        to_account = np.where(direct > 0, direct, one_hop)
+
+        # Currencies the universe cannot convert: fall back to the conversion graph
+        for i in np.flatnonzero(to_account <= 0):
+            rate = conversion_graph.rate(self.currencies[i], self.account_currency, self.terminal)
+            if rate:
+                to_account[i] = rate
+
+        return to_account
+
+    @property
+    def quote_to_account(self):
+        """Conversion rate of each symbol's quote currency"""
+        return self.to_account[self.quote_idx]
+
+    def pip_value_array(self, lot_size: float = 1.0):
+        """Pip value per symbol in account currency (NaN if not convertible)"""
+        values = self.pip_size * self.contract_size * lot_size * self.quote_to_account
+        return np.where(self.quote_to_account > 0, values, np.nan)
+
+    def tick_value_array(self, lot_size: float = 1.0):
+        """Value of one tick move per symbol in account currency"""
+        values = self.tick_size * self.contract_size * lot_size * self.quote_to_account
+        return np.where(self.quote_to_account > 0, values, np.nan)
+
+    def lot_size_array(self, risk_amount: float, stop_distances):
+        """
+        Lot size per symbol risking risk_amount over the given stop distance
+        (price units), floored to the volume step and clamped to min/max
+        """
+        stop_distances = np.asarray(stop_distances, dtype=float)
+        loss_per_lot = stop_distances / self.tick_size * self.tick_value_array(1.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw = np.where(loss_per_lot > 0, risk_amount / loss_per_lot, np.nan)
+            steps = np.where(self.volume_step > 0, np.floor(raw / self.volume_step) * self.volume_step, raw)
+
+        lots = np.clip(steps, self.volume_min, self.volume_max)
+        return np.where(np.isfinite(raw), np.round(lots, 8), np.nan)
+
+    def _to_dict(self, values, symbols: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        selected = self.symbols if symbols is None else [s for s in symbols if s in self._index]
+        result = {}
+        for symbol in selected:
+            value = values[self._index[symbol]]
+            if np.isfinite(value):
+                result[symbol] = float(value)
+        return result
+
+    def pip_values(self, lot_size: float = 1.0) -> Dict[str, float]:
+        return self._to_dict(self.pip_value_array(lot_size))
+
+    def tick_values(self, lot_size: float = 1.0) -> Dict[str, float]:
+        return self._to_dict(self.tick_value_array(lot_size))
+
+    def lot_sizes(self, risk_amount: float, stop_distances: Dict[str, float]) -> Dict[str, float]:
+        """Lot sizes for the symbols in stop_distances"""
+        distances = np.full(len(self.symbols), np.nan)
+        for symbol, distance in stop_distances.items():
+            if symbol in self._index:
+                distances[self._index[symbol]] = distance
+        return self._to_dict(self.lot_size_array(risk_amount, distances), stop_distances.keys())
+
+    def warm_pip_value_cache(self, lot_size: float = 1.0):
+        """Store computed pip values in the process-wide pip value cache"""
+        for symbol, pip_value in self.pip_values(lot_size).items():
+            quote_currency = self.currencies[self.quote_idx[self._index[symbol]]]
+            references = [] if quote_currency == self.account_currency else [symbol]
+            pip_value_cache.put(symbol, lot_size, self.account_currency, pip_value, references)
+
+
+def build_universe_snapshot(symbols: Optional[Iterable[str]] = None,
+                            account_currency: Optional[str] = None) -> UniverseSnapshot:
+    """
+    Load specs and quotes for a symbol universe over one MT5 session borrow
+
+    Symbols without a spec or tick are left out of the snapshot.
+    """
+    if np is None:
+        raise BatchEngineUnavailable('NumPy is required for batch pip value computation')
+
+    with mt5_session() as executor:
+        terminal = executor.terminal
+        if symbols is None:
+            symbols = get_default_universe(terminal)
+
+        if not account_currency:
+            account_info = executor.get_account_info()
+            account_currency = account_info['currency'] if account_info else 'USD'
+
+        specs, ticks = [], []
+        for symbol in dict.fromkeys(symbols):
+            spec = symbol_spec_registry.get(symbol, loader=terminal.symbol_info)
+            tick = get_tick(symbol, loader=terminal.symbol_info_tick) if spec else None
+            if spec is None or tick is None:
+                logger.warning(f"Skipping {symbol} in pip value batch: no spec or tick")
+                continue
+            specs.append(spec)
+            ticks.append(tick)
+
+    return UniverseSnapshot(specs, ticks, account_currency, terminal)
+
+
+def get_bulk_pip_data(symbols: Optional[Iterable[str]] = None, lot_size: float = 1.0,
+                      risk_amount: Optional[float] = None,
+                      stop_distances: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    Pip values, tick values and (optionally) lot sizes for many symbols
+
+    Falls back to the scalar PipValueCalculator when NumPy is missing.
+    """
+    if np is None:
+        symbols = list(symbols or [])
+        logger.warning("NumPy not installed, using scalar pip value calculation")
+        return {
+            'account_currency': pip_value_cache.account_currency,
+            'pip_values': PipValueCalculator().get_pip_values_for_symbols(symbols, lot_size),
+            'tick_values': {},
+            'lot_sizes': {},
+            'engine': 'scalar',
+        }
+
+    snapshot = build_universe_snapshot(symbols)
+    snapshot.warm_pip_value_cache(lot_size)
+
+    lot_sizes = {}
+    if risk_amount is not None and stop_distances:
+        lot_sizes = snapshot.lot_sizes(risk_amount, stop_distances)
+
+    return {
+        'account_currency': snapshot.account_currency,
+        'pip_values': snapshot.pip_values(lot_size),
+        'tick_values': snapshot.tick_values(lot_size),
+        'lot_sizes': lot_sizes,
+        'engine': 'numpy',
+    }
@@ -4,14 +4,193 @@ Above Robust™ implementation - accurate pip value calculation
 Created: 2025-07-23
 """
 
-import MetaTrader5 as mt5
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
 import logging
+import threading
+import time
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from core.config import get_config
+
+from .mt5_session import mt5_session
+from .symbol_specs import get_symbol_spec_config, symbol_spec_registry
+from .tick_cache import get_tick, tick_cache
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_PIP_VALUE_CACHE_CONFIG = {
+    'ttl_seconds': 300,
+    'quote_move_threshold': 0.002,  # relative move of a reference quote (0.2%)
+}
+
+
+def get_pip_value_cache_config():
+    return get_config('PIP_VALUE_CACHE_CONFIG', DEFAULT_PIP_VALUE_CACHE_CONFIG)
+
+
+@dataclass
+class PipValueEntry:
+    """Cached pip value and the quotes it was derived from"""
+    pip_value: float
+    reference_quotes: Dict[str, float]  # symbol -> bid at calculation time
+    computed_at: float = field(default_factory=time.monotonic)
+
+
+class PipValueCache:
+    """
+    Process-wide pip value cache keyed by (symbol, lot size, account currency)
+
+    Entries expire after a TTL, or earlier when one of the quotes the value
+    was derived from has moved beyond the configured threshold. Quotes are
+    read from the shared tick cache, so a cache hit needs no MT5 call.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, float, str], PipValueEntry] = {}
+        self._lock = threading.Lock()
+        self.account_currency: Optional[str] = None  # last currency seen from MT5
+
+    def get(self, symbol: str, lot_size: float, account_currency: str) -> Optional[float]:
+        config = get_pip_value_cache_config()
+        key = (symbol, float(lot_size), account_currency)
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if time.monotonic() - entry.computed_at > config['ttl_seconds']:
+            self.invalidate(key)
+            return None
+
+        for reference_symbol, reference_bid in entry.reference_quotes.items():
+            snapshot = tick_cache.get(reference_symbol)
+            if snapshot is None or reference_bid <= 0:
+                continue
+            if abs(snapshot.bid - reference_bid) / reference_bid > config['quote_move_threshold']:
+                self.invalidate(key)
+                return None
+
+        return entry.pip_value
+
+    def put(self, symbol: str, lot_size: float, account_currency: str,
+            pip_value: float, reference_symbols):
+        reference_quotes = {}
+        for reference_symbol in reference_symbols:
+            snapshot = tick_cache.get(reference_symbol)
+            if snapshot is not None:
+                reference_quotes[reference_symbol] = snapshot.bid
+
+        with self._lock:
+            self._entries[(symbol, float(lot_size), account_currency)] = PipValueEntry(
+                pip_value=pip_value,
+                reference_quotes=reference_quotes
+            )
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CurrencyConversionGraph:
+    """
+    Memoized currency conversion paths
+
+    Each (from, to) pair is resolved once to a path of symbol edges -
+    direct, inverse, or a USD cross of those - and remembered (including
+    "no path"). Rates are then computed from current ticks along the path
+    without probing symbols again.
+    """
+
+    def __init__(self):
+        self._paths: Dict[Tuple[str, str], Tuple[Optional[List[Tuple[str, bool]]], float]] = {}
+        self._lock = threading.Lock()
+
+    def _symbol_exists(self, symbol: str, terminal) -> bool:
+        return symbol_spec_registry.get(symbol, loader=terminal.symbol_info) is not None
+
+    def _direct_edge(self, from_currency: str, to_currency: str, terminal) -> Optional[List[Tuple[str, bool]]]:
+        """Single-symbol path: (symbol, inverse)"""
+        direct_symbol = f"{from_currency}{to_currency}"
+        if self._symbol_exists(direct_symbol, terminal):
+            return [(direct_symbol, False)]
+
+        inverse_symbol = f"{to_currency}{from_currency}"
+        if self._symbol_exists(inverse_symbol, terminal):
+            return [(inverse_symbol, True)]
+
+        return None
+
+    def find_path(self, from_currency: str, to_currency: str,
+                  terminal=None) -> Optional[List[Tuple[str, bool]]]:
+        """Conversion path from one currency to another, or None"""
+        key = (from_currency, to_currency)
+        ttl_seconds = get_symbol_spec_config()['ttl_seconds']
+
+        with self._lock:
+            memo = self._paths.get(key)
+        if memo is not None and time.monotonic() - memo[1] <= ttl_seconds:
+            return memo[0]
+
+        terminal = terminal or mt5
+        path = self._direct_edge(from_currency, to_currency, terminal)
+
+        # USD cross rate
+        if path is None and from_currency != 'USD' and to_currency != 'USD':
+            first = self._direct_edge(from_currency, 'USD', terminal)
+            second = self._direct_edge('USD', to_currency, terminal)
+            if first and second:
+                path = first + second
+
+        with self._lock:
+            self._paths[key] = (path, time.monotonic())
+        return path
+
+    def path_symbols(self, from_currency: str, to_currency: str, terminal=None) -> List[str]:
+        path = self.find_path(from_currency, to_currency, terminal)
+        return [symbol for symbol, _ in path] if path else []
+
+    def rate(self, from_currency: str, to_currency: str, terminal=None) -> Optional[float]:
+        """Current conversion rate along the memoized path"""
+        if from_currency == to_currency:
+            return 1.0
+
+        terminal = terminal or mt5
+        path = self.find_path(from_currency, to_currency, terminal)
+        if not path:
+            return None
+
+        rate = 1.0
+        for symbol, inverse in path:
+            tick = get_tick(symbol, loader=terminal.symbol_info_tick)
+            if tick is None or tick.bid <= 0:
+                return None
+            rate = rate / tick.bid if inverse else rate * tick.bid
+        return rate
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+
+
+# Process-wide instances shared by all calculators
+pip_value_cache = PipValueCache()
+conversion_graph = CurrencyConversionGraph()
+
+
 class PipValueCalculator:
     """
     Calculate accurate pip values based on MT5 data
@@ -23,7 +202,7 @@ class PipValueCalculator:
         Initialize with optional MT5Executor instance
         """
         self.executor = executor
-        self._pip_cache = {}  # Cache pip values for performance
+        self._pip_cache = pip_value_cache  # Shared across calculators and requests
         
     def calculate_pip_value(self, symbol: str, lot_size: float = 1.0, 
                           account_currency: str = None) -> Optional[float]:
@@ -39,14 +218,20 @@ class PipValueCalculator:
             Pip value in account currency, or None if calculation fails
         """
         try:
-            # Use provided executor or create new connection
+            # Cache hit needs no MT5 call at all
+            cached = self._pip_cache.get(
+                symbol, lot_size, account_currency or self._pip_cache.account_currency
+            )
+            if cached is not None:
+                return cached
+            
+            # Use provided executor or borrow the shared MT5 session
             if self.executor and self.executor.connected:
                 return self._calculate_with_executor(
                     self.executor, symbol, lot_size, account_currency
                 )
             else:
-                from .mt5_executor import MT5Executor
-                with MT5Executor() as executor:
+                with mt5_session() as executor:
                     return self._calculate_with_executor(
                         executor, symbol, lot_size, account_currency
                     )
@@ -61,9 +246,10 @@ class PipValueCalculator:
         Calculate pip value using active MT5 connection
         """
         try:
-            # Get symbol info
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
+            # Get symbol spec (cached per symbol)
+            terminal = executor.terminal
+            spec = symbol_spec_registry.get(symbol, loader=terminal.symbol_info)
+            if spec is None:
                 logger.error(f"Symbol {symbol} not found")
                 return None
             
@@ -72,25 +258,28 @@ class PipValueCalculator:
                 account_info = executor.get_account_info()
                 if account_info:
                     account_currency = account_info['currency']
+                    self._pip_cache.account_currency = account_currency
                 else:
                     logger.error("Could not get account currency")
                     return None
             
-            # Get current tick
-            tick = mt5.symbol_info_tick(symbol)
+            # Get current tick (shared tick cache)
+            tick = get_tick(symbol, loader=terminal.symbol_info_tick)
             if tick is None:
                 logger.error(f"No tick data for {symbol}")
                 return None
             
             # Calculate based on symbol type
             pip_value = self._calculate_pip_value_internal(
-                symbol_info, tick, lot_size, account_currency
+                spec, tick, lot_size, account_currency, terminal
             )
             
             if pip_value:
-                # Cache the result
-                cache_key = f"{symbol}_{lot_size}_{account_currency}"
-                self._pip_cache[cache_key] = pip_value
+                # Cache the result together with the quotes it depends on
+                self._pip_cache.put(
+                    symbol, lot_size, account_currency, pip_value,
+                    self._reference_symbols(spec, account_currency, terminal)
+                )
                 logger.debug(f"Pip value for {symbol}: {pip_value} {account_currency}")
             
             return pip_value
@@ -99,25 +288,30 @@ class PipValueCalculator:
             logger.error(f"Error in pip calculation: {e}")
             return None
     
-    def _calculate_pip_value_internal(self, symbol_info, tick, 
-                                    lot_size: float, account_currency: str) -> Optional[float]:
+    def _reference_symbols(self, spec, account_currency: str, terminal=None):
+        """
+        Symbols whose quotes the pip value depends on
+        """
+        if account_currency == spec.currency_profit:
+            return []
+        if account_currency == spec.currency_base:
+            return [spec.symbol]
+        return conversion_graph.path_symbols(spec.currency_profit, account_currency, terminal) or [spec.symbol]
+    
+    def _calculate_pip_value_internal(self, spec, tick, 
+                                    lot_size: float, account_currency: str,
+                                    terminal=None) -> Optional[float]:
         """
         Internal pip value calculation logic
         """
         try:
-            # Get contract size and point value
-            contract_size = symbol_info.trade_contract_size
-            point = symbol_info.point
-            
-            # Determine pip size (usually point * 10 for forex)
-            if symbol_info.digits == 5 or symbol_info.digits == 3:
-                pip_size = point * 10
-            else:
-                pip_size = point
+            # Get contract size and pip size (point * 10 for 5/3 digit forex)
+            contract_size = spec.contract_size
+            pip_size = spec.pip_size
             
             # Base and quote currencies
-            base_currency = symbol_info.currency_base
-            quote_currency = symbol_info.currency_profit
+            base_currency = spec.currency_base
+            quote_currency = spec.currency_profit
             
             # Case 1: Account currency is quote currency
             if account_currency == quote_currency:
@@ -136,7 +330,7 @@ class PipValueCalculator:
             else:
                 # Try to find conversion rate
                 conversion_rate = self._get_conversion_rate(
-                    quote_currency, account_currency
+                    quote_currency, account_currency, terminal
                 )
                 if conversion_rate:
                     pip_value = (pip_size * contract_size * lot_size) * conversion_rate
@@ -144,7 +338,7 @@ class PipValueCalculator:
                 else:
                     # Fallback to tick value method
                     return self._calculate_using_tick_value(
-                        symbol_info.name, lot_size
+                        spec.symbol, lot_size, terminal
                     )
             
             return None
@@ -153,47 +347,26 @@ class PipValueCalculator:
             logger.error(f"Internal calculation error: {e}")
             return None
     
-    def _get_conversion_rate(self, from_currency: str, to_currency: str) -> Optional[float]:
+    def _get_conversion_rate(self, from_currency: str, to_currency: str,
+                             terminal=None) -> Optional[float]:
         """
-        Get conversion rate between currencies
+        Get conversion rate between currencies (memoized conversion graph)
         """
         try:
-            # Direct rate
-            direct_symbol = f"{from_currency}{to_currency}"
-            symbol_info = mt5.symbol_info(direct_symbol)
-            if symbol_info:
-                tick = mt5.symbol_info_tick(direct_symbol)
-                if tick:
-                    return tick.bid
-            
-            # Inverse rate
-            inverse_symbol = f"{to_currency}{from_currency}"
-            symbol_info = mt5.symbol_info(inverse_symbol)
-            if symbol_info:
-                tick = mt5.symbol_info_tick(inverse_symbol)
-                if tick and tick.bid > 0:
-                    return 1.0 / tick.bid
-            
-            # USD cross rate
-            if from_currency != 'USD' and to_currency != 'USD':
-                rate1 = self._get_conversion_rate(from_currency, 'USD')
-                rate2 = self._get_conversion_rate('USD', to_currency)
-                if rate1 and rate2:
-                    return rate1 * rate2
-            
-            return None
+            return conversion_graph.rate(from_currency, to_currency, terminal)
             
         except Exception as e:
             logger.error(f"Conversion rate error: {e}")
             return None
     
-    def _calculate_using_tick_value(self, symbol: str, lot_size: float) -> Optional[float]:
+    def _calculate_using_tick_value(self, symbol: str, lot_size: float,
+                                    terminal=None) -> Optional[float]:
         """
         Fallback method using MT5 tick value
         """
         try:
-            # Get symbol tick value
-            symbol_info = mt5.symbol_info(symbol)
+            # Get symbol tick value (live, changes with the conversion rate)
+            symbol_info = (terminal or mt5).symbol_info(symbol)
             if symbol_info:
                 # tick_value is profit for 1 lot when price changes by 1 tick
                 tick_value = symbol_info.trade_tick_value
@@ -218,15 +391,16 @@ class PipValueCalculator:
         """
         pip_values = {}
         
-        from .mt5_executor import MT5Executor
-        with MT5Executor() as executor:
+        with mt5_session() as executor:
             account_info = executor.get_account_info()
             account_currency = account_info['currency'] if account_info else 'USD'
             
             for symbol in symbols:
-                pip_value = self._calculate_with_executor(
-                    executor, symbol, lot_size, account_currency
-                )
+                pip_value = self._pip_cache.get(symbol, lot_size, account_currency)
+                if pip_value is None:
+                    pip_value = self._calculate_with_executor(
+                        executor, symbol, lot_size, account_currency
+                    )
                 if pip_value:
                     pip_values[symbol] = pip_value
         
@@ -234,9 +408,10 @@ class PipValueCalculator:
     
     def clear_cache(self):
         """
-        Clear pip value cache
+        Clear pip value cache and memoized conversion paths
         """
         self._pip_cache.clear()
+        conversion_graph.clear()
 
 
 # Helper functions for quick access
@@ -250,7 +425,7 @@ def get_pip_value(symbol: str, lot_size: float = 1.0) -> Optional[float]:
 
 def get_pip_values_batch(symbols: list, lot_size: float = 1.0) -> Dict[str, float]:
     """
-    Get pip values for multiple symbols in one MT5 connection
+    Get pip values for multiple symbols (vectorized batch engine)
     """
-    calculator = PipValueCalculator()
-    return calculator.get_pip_values_for_symbols(symbols, lot_size)
\ No newline at end of file
+    from .pip_value_batch import get_bulk_pip_data
+    return get_bulk_pip_data(symbols, lot_size)['pip_values']
\ No newline at end of file
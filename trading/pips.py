@@ -0,0 +1,44 @@
+"""
+Pip Size Lookup
+Symbol-aware pip size without an MT5 round trip
+
+The pip size feeds stored values (Trade.pips, analytics rollups, execution
+slippage), so it must not depend on process state: it comes from the
+configured PIP_SIZE_CONFIG overrides, otherwise from broker naming
+conventions - 0.01 for JPY-quoted pairs, metals and other non-FX CFDs,
+0.0001 for other currency pairs. Loaded MT5 symbol specs are deliberately
+not consulted; list symbols whose spec disagrees in the overrides.
+"""
+
+from decimal import Decimal
+
+from core.config import get_config
+
+
+METAL_PREFIXES = ('XAU', 'XAG', 'XPT', 'XPD')
+
+DEFAULT_PIP_SIZE_CONFIG = {
+    'overrides': {},  # symbol -> pip size (e.g. {'US30': '1'})
+}
+
+
+def get_pip_size_config():
+    return get_config('PIP_SIZE_CONFIG', DEFAULT_PIP_SIZE_CONFIG)
+
+
+def default_pip_size(symbol: str) -> Decimal:
+    """Pip size by naming convention (no spec needed)"""
+    symbol = symbol.upper()
+    if symbol.startswith(METAL_PREFIXES):
+        return Decimal('0.01')
+    if len(symbol) >= 6 and symbol[:6].isalpha():
+        return Decimal('0.01') if symbol[3:6] == 'JPY' else Decimal('0.0001')
+    return Decimal('0.01')
+
+
+def get_pip_size(symbol: str) -> Decimal:
+    """Pip size of a symbol: configured override or naming convention"""
+    override = get_pip_size_config()['overrides'].get(symbol.upper())
+    if override is not None:
+        return Decimal(str(override))
+    return default_pip_size(symbol)
@@ -0,0 +1,148 @@
+"""
+MT5 Position Sync
+Diff open trades against one MT5 positions snapshot
+
+One positions_get() call returns every open position. Open trades are
+matched to positions by ticket in memory and only trades whose values
+changed are written, in one bulk_update. Trades whose position is gone
+from MT5 are marked closed_unknown (deal reconciliation fills in the final
+result). The sync costs one MT5 round trip however many trades are open.
+
+Open trades are read before the snapshot is taken, so a trade opened while
+the sync runs is never mistaken for a vanished one. They are then locked and
+read again (select_for_update, status still 'opened') before anything is
+written, so a trade closed while the snapshot was taken - bulk close, deal
+reconciliation - is left as its closer wrote it.
+
+MT5 positions without a Trade row (opened outside Django) are reported as
+untracked and not imported: a Trade needs the MQL5Signal that created it.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import change_versions
+
+from .models import Trade
+from .mt5_session import mt5_session
+
+logger = logging.getLogger(__name__)
+
+
+SYNC_FIELDS = [
+    'entry_price', 'stop_loss', 'take_profit',
+    'gross_profit_loss', 'swap', 'commission', 'net_profit_loss',
+    'status', 'close_time', 'duration_minutes',
+]
+
+
+@dataclass
+class PositionSyncResult:
+    """Outcome of one sync run"""
+    updated: List[int] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+    vanished: List[int] = field(default_factory=list)
+    untracked: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'vanished': self.vanished,
+            'untracked': self.untracked,
+            'updated_count': len(self.updated),
+            'vanished_count': len(self.vanished),
+            'untracked_count': len(self.untracked),
+            'untracked_note': 'MT5 positions without a Trade row are reported, not imported',
+        }
+
+
+def _decimal(value, places: int) -> Decimal:
+    return Decimal(str(round(float(value), places)))
+
+
+def _apply_position(trade: Trade, position) -> bool:
+    """Copy position values onto the trade; True if anything changed"""
+    values = {
+        'entry_price': _decimal(position.price_open, 5),
+        'gross_profit_loss': _decimal(position.profit, 2),
+        'swap': _decimal(position.swap, 2),
+        'commission': _decimal(position.commission, 2),
+    }
+    if position.sl > 0:
+        values['stop_loss'] = _decimal(position.sl, 5)
+    if position.tp > 0:
+        values['take_profit'] = _decimal(position.tp, 5)
+
+    changed = False
+    for name, value in values.items():
+        current = getattr(trade, name)
+        if current is None or Decimal(str(current)) != value:
+            setattr(trade, name, value)
+            changed = True
+    return changed
+
+
+def sync_open_trades() -> PositionSyncResult:
+    """
+    Bring all opened trades in line with one MT5 positions snapshot
+
+    Raises MT5SessionUnavailable if MT5 cannot be reached.
+    """
+    # Read before the snapshot: a trade opened after this read is simply not
+    # synced this time, instead of missing from the snapshot and "vanishing"
+    open_tickets = dict(Trade.objects.filter(status='opened').values_list('pk', 'mt5_ticket'))
+
+    with mt5_session() as executor:
+        positions = executor.terminal.positions_get()
+
+    if positions is None:
+        # None is an MT5 error, not "no positions": do not close anything
+        raise RuntimeError("MT5 positions_get() failed")
+
+    # Account pollers' ETags change only if the positions did
+    change_versions.record_snapshot('position_sync', sorted(
+        (position.ticket, position.price_open, position.sl, position.tp,
+         position.profit, position.swap, position.commission)
+        for position in positions
+    ))
+
+    positions_by_ticket = {position.ticket: position for position in positions}
+    now = timezone.now()
+
+    result = PositionSyncResult()
+    # Positions without a Trade row (opened outside Django)
+    result.untracked = sorted(set(positions_by_ticket) - set(open_tickets.values()))
+
+    with transaction.atomic():
+        # Trades closed since the first read are no longer 'opened' and are not touched
+        open_trades = Trade.objects.select_for_update().filter(pk__in=list(open_tickets), status='opened')
+
+        changed_trades = []
+        for trade in open_trades:
+            position = positions_by_ticket.get(trade.mt5_ticket)
+
+            if position is None:
+                trade.status = 'closed_unknown'
+                trade.close_time = now
+                changed_trades.append(trade)
+                result.vanished.append(trade.mt5_ticket)
+            elif _apply_position(trade, position):
+                changed_trades.append(trade)
+                result.updated.append(trade.mt5_ticket)
+            else:
+                result.unchanged.append(trade.mt5_ticket)
+
+        if changed_trades:
+            Trade.bulk_update_tracked(changed_trades, SYNC_FIELDS)
+
+    logger.info(
+        f"MT5 position sync: {len(result.updated)} updated, {len(result.vanished)} vanished, "
+        f"{len(result.unchanged)} unchanged, {len(result.untracked)} untracked"
+    )
+    return result
@@ -52,7 +52,9 @@ class TradeSerializer(serializers.ModelSerializer):
         ]
     
     def get_pips_gained(self, obj):
-        """Calculate pips gained/lost"""
+        """Pips gained/lost (stored on save)"""
+        if obj.pips is not None:
+            return float(obj.pips)
         return obj.calculate_pips()
     
     def get_is_profitable(self, obj):
@@ -187,22 +189,29 @@ class TradingSessionSerializer(serializers.ModelSerializer):
         """Calculate win rate"""
         return obj.win_rate()
     
+    def _trade_aggregates(self, obj):
+        """
+        Total pips and average duration, annotated by
+        TradingSessionViewSet.get_queryset (one query if not annotated)
+        """
+        if not hasattr(obj, 'pips_total'):
+            aggregates = obj.trades.aggregate(
+                pips_total=models.Sum('pips'),
+                avg_duration_minutes=models.Avg('duration_minutes')
+            )
+            obj.pips_total = aggregates['pips_total']
+            obj.avg_duration_minutes = aggregates['avg_duration_minutes']
+        return obj.pips_total, obj.avg_duration_minutes
+    
     def get_total_pips(self, obj):
         """Calculate total pips from all trades"""
-        total_pips = 0
-        for trade in obj.trades.all():
-            pips = trade.calculate_pips()
-            if pips is not None:
-                total_pips += pips
-        return total_pips
+        total_pips, _ = self._trade_aggregates(obj)
+        return round(float(total_pips), 1) if total_pips is not None else 0
     
     def get_average_trade_duration(self, obj):
         """Calculate average trade duration in hours"""
-        trades = obj.trades.filter(duration_minutes__isnull=False)
-        if trades.exists():
-            avg_minutes = trades.aggregate(avg=models.Avg('duration_minutes'))['avg']
-            return round(avg_minutes / 60.0, 2) if avg_minutes else 0
-        return 0
+        _, avg_minutes = self._trade_aggregates(obj)
+        return round(avg_minutes / 60.0, 2) if avg_minutes else 0
 
 
 class SignalToTradeSerializer(serializers.Serializer):
@@ -0,0 +1,185 @@
+"""
+Symbol Specification Registry
+Static MT5 symbol properties loaded once per symbol and reused per order
+
+symbol_info() is an IPC round trip to the terminal. Volume limits, digits,
+contract size, filling modes and currencies only change between trading
+sessions, so they are cached here and refreshed on a TTL, when the server
+trading day rolls over, or when the MT5 session reconnects.
+"""
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Optional
+
+from core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SYMBOL_SPEC_CONFIG = {
+    'ttl_seconds': 3600,
+}
+
+# symbol_info.filling_mode flags (SYMBOL_FILLING_FOK / SYMBOL_FILLING_IOC)
+SYMBOL_FILLING_FOK = 1
+SYMBOL_FILLING_IOC = 2
+
+
+def get_symbol_spec_config():
+    return get_config('SYMBOL_SPEC_CONFIG', DEFAULT_SYMBOL_SPEC_CONFIG)
+
+
+def _digits_from_point(point: float) -> int:
+    exponent = Decimal(str(point)).normalize().as_tuple().exponent
+    return max(0, -exponent)
+
+
+def _trading_day() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+@dataclass
+class SymbolSpec:
+    """Static trading properties of one MT5 symbol"""
+    symbol: str
+    digits: int
+    point: float
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    contract_size: float
+    filling_mode: int
+    currency_base: str
+    currency_profit: str
+    currency_margin: str
+    tick_value: float
+    tick_size: float
+    visible: bool
+    loaded_at: float = field(default_factory=time.monotonic)
+    trading_day: str = field(default_factory=_trading_day)
+
+    @classmethod
+    def from_symbol_info(cls, symbol_info) -> 'SymbolSpec':
+        """Build a spec from an mt5.symbol_info() result"""
+        point = float(symbol_info.point)
+        digits = symbol_info.digits if isinstance(symbol_info.digits, int) else _digits_from_point(point)
+
+        return cls(
+            symbol=str(symbol_info.name),
+            digits=digits,
+            point=point,
+            volume_min=float(symbol_info.volume_min),
+            volume_max=float(symbol_info.volume_max),
+            volume_step=float(symbol_info.volume_step),
+            contract_size=float(symbol_info.trade_contract_size),
+            filling_mode=int(symbol_info.filling_mode),
+            currency_base=str(symbol_info.currency_base),
+            currency_profit=str(symbol_info.currency_profit),
+            currency_margin=str(symbol_info.currency_margin),
+            tick_value=float(symbol_info.trade_tick_value),
+            tick_size=float(symbol_info.trade_tick_size),
+            visible=bool(symbol_info.visible),
+        )
+
+    @property
+    def pip_size(self) -> float:
+        """Pip size (point * 10 for 5/3 digit quotes)"""
+        return self.point * 10 if self.digits in (3, 5) else self.point
+
+    @property
+    def volume_step_digits(self) -> int:
+        return _digits_from_point(self.volume_step) if self.volume_step > 0 else 2
+
+    def normalize_volume(self, volume: float) -> float:
+        """Clamp to min/max and round to the volume step"""
+        volume = min(max(volume, self.volume_min), self.volume_max)
+        if self.volume_step > 0:
+            volume = round(round(volume / self.volume_step) * self.volume_step, self.volume_step_digits)
+        return volume
+
+    def normalize_price(self, price: float) -> float:
+        """Round to the symbol's quote digits"""
+        return round(price, self.digits)
+
+    def order_filling_type(self, terminal=None):
+        """Best supported ORDER_FILLING_* constant for market orders"""
+        terminal = terminal or mt5
+        if self.filling_mode & SYMBOL_FILLING_FOK:
+            return terminal.ORDER_FILLING_FOK
+        if self.filling_mode & SYMBOL_FILLING_IOC:
+            return terminal.ORDER_FILLING_IOC
+        return terminal.ORDER_FILLING_RETURN
+
+    def is_stale(self, ttl_seconds: float) -> bool:
+        return (
+            time.monotonic() - self.loaded_at > ttl_seconds
+            or self.trading_day != _trading_day()
+        )
+
+
+class SymbolSpecRegistry:
+    """
+    Thread-safe cache of SymbolSpec per symbol
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, SymbolSpec] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, loader: Optional[Callable] = None) -> Optional[SymbolSpec]:
+        """
+        Get the spec of a symbol, loading it on first use or when stale
+
+        loader defaults to mt5.symbol_info; callers pass the symbol_info of
+        their executor's terminal (real, paper, or a mock in tests).
+        """
+        ttl_seconds = get_symbol_spec_config()['ttl_seconds']
+
+        with self._lock:
+            spec = self._specs.get(symbol)
+            if spec is not None and not spec.is_stale(ttl_seconds):
+                return spec
+
+        symbol_info = (loader or mt5.symbol_info)(symbol)
+        if symbol_info is None:
+            return None
+
+        spec = SymbolSpec.from_symbol_info(symbol_info)
+        with self._lock:
+            self._specs[symbol] = spec
+        logger.debug(f"Loaded symbol spec for {symbol}")
+        return spec
+
+    def peek(self, symbol: str) -> Optional[SymbolSpec]:
+        """Cached spec without loading (None if not loaded yet)"""
+        with self._lock:
+            return self._specs.get(symbol)
+
+    def mark_visible(self, symbol: str):
+        """Record that a symbol was enabled in Market Watch"""
+        with self._lock:
+            spec = self._specs.get(symbol)
+            if spec is not None:
+                spec.visible = True
+
+    def invalidate(self, symbol: str):
+        with self._lock:
+            self._specs.pop(symbol, None)
+
+    def clear(self):
+        """Drop all specs (e.g. after an MT5 reconnect)"""
+        with self._lock:
+            self._specs.clear()
+
+
+# Global registry instance
+symbol_spec_registry = SymbolSpecRegistry()
@@ -0,0 +1,274 @@
+"""
+Live Tick Cache
+Latest bid/ask per symbol, fed by one background poller
+
+Order execution, pip value calculation and the dashboard all need current
+quotes. Instead of each of them calling mt5.symbol_info_tick(), a poller
+thread pulls ticks for a watchlist at a fixed cadence (over the shared MT5
+session) into a versioned in-process cache. The cache can be mirrored to
+the Django cache backend (Redis in production) so other worker processes
+read the same quotes.
+
+Readers call get_tick(); a tick older than the allowed age falls back to a
+direct symbol_info_tick() call, which also adds the symbol to the watchlist.
+"""
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+from core.config import get_config
+
+from .mt5_session import mt5_session, MT5SessionUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TICK_CACHE_CONFIG = {
+    'enabled': True,
+    'poll_interval': 0.25,        # seconds between poller cycles
+    'max_age': 2.0,               # default staleness guard for readers (seconds)
+    'order_max_age': 0.25,        # staleness guard for order prices (seconds)
+    'watchlist': ['EURUSD', 'GBPUSD', 'USDJPY'],  # symbols polled from startup
+    'mirror_to_cache': False,     # also write ticks to the Django cache (Redis)
+    'mirror_timeout': 10,         # cache timeout for mirrored ticks (seconds)
+}
+
+CACHE_KEY_PREFIX = 'mt5_tick:'
+
+
+def get_tick_cache_config():
+    return get_config('TICK_CACHE_CONFIG', DEFAULT_TICK_CACHE_CONFIG)
+
+
+@dataclass
+class TickSnapshot:
+    """Latest quote of a symbol (attribute-compatible with mt5 ticks)"""
+    symbol: str
+    bid: float
+    ask: float
+    last: float
+    time: int
+    time_msc: int
+    version: int = 0
+    fetched_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_tick(cls, symbol: str, tick, version: int = 0) -> 'TickSnapshot':
+        return cls(
+            symbol=symbol,
+            bid=float(tick.bid),
+            ask=float(tick.ask),
+            last=float(getattr(tick, 'last', 0) or 0),
+            time=int(getattr(tick, 'time', 0) or 0),
+            time_msc=int(getattr(tick, 'time_msc', 0) or 0),
+            version=version,
+        )
+
+    @property
+    def age(self) -> float:
+        """Seconds since the tick was fetched from MT5"""
+        return time.time() - self.fetched_at
+
+    def to_dict(self) -> Dict:
+        return {
+            'symbol': self.symbol,
+            'bid': self.bid,
+            'ask': self.ask,
+            'last': self.last,
+            'time': self.time,
+            'time_msc': self.time_msc,
+            'version': self.version,
+            'fetched_at': self.fetched_at,
+        }
+
+
+class TickCache:
+    """
+    Thread-safe versioned store of the latest tick per symbol
+    """
+
+    def __init__(self):
+        self._ticks: Dict[str, TickSnapshot] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Increases whenever any symbol's quote changes"""
+        return self._version
+
+    def update(self, symbol: str, tick) -> TickSnapshot:
+        """Store a fresh MT5 tick; the version only moves if the quote changed"""
+        with self._lock:
+            previous = self._ticks.get(symbol)
+            snapshot = TickSnapshot.from_tick(symbol, tick, self._version)
+
+            changed = (
+                previous is None
+                or previous.bid != snapshot.bid
+                or previous.ask != snapshot.ask
+                or previous.time_msc != snapshot.time_msc
+            )
+            if changed:
+                self._version += 1
+            snapshot.version = self._version if changed else previous.version
+
+            self._ticks[symbol] = snapshot
+            return snapshot
+
+    def put_snapshot(self, snapshot: TickSnapshot):
+        """Store a snapshot read from the shared cache mirror"""
+        with self._lock:
+            current = self._ticks.get(snapshot.symbol)
+            if current is None or current.fetched_at < snapshot.fetched_at:
+                self._ticks[snapshot.symbol] = snapshot
+
+    def get(self, symbol: str) -> Optional[TickSnapshot]:
+        with self._lock:
+            return self._ticks.get(symbol)
+
+    def snapshot(self) -> Dict[str, TickSnapshot]:
+        """Copy of all cached ticks"""
+        with self._lock:
+            return dict(self._ticks)
+
+    def clear(self):
+        with self._lock:
+            self._ticks.clear()
+
+
+class TickPoller:
+    """
+    Background thread that refreshes the tick cache for a watchlist
+    """
+
+    def __init__(self, tick_cache: TickCache):
+        self.tick_cache = tick_cache
+        self.is_running = False
+        self.thread = None
+        self._watchlist = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    @property
+    def watchlist(self):
+        with self._lock:
+            return sorted(self._watchlist)
+
+    def watch(self, symbols: Iterable[str]):
+        """Add symbols to the polled watchlist"""
+        with self._lock:
+            self._watchlist.update(symbols)
+
+    def ensure_started(self):
+        """Start the poller on first use"""
+        if not self.is_running and get_tick_cache_config()['enabled']:
+            self.start()
+
+    def start(self):
+        with self._lock:
+            if self.is_running:
+                return
+
+            self._watchlist.update(get_tick_cache_config()['watchlist'])
+            self.is_running = True
+            self._stop_event.clear()
+            self.thread = threading.Thread(target=self._poll_loop, name='mt5-tick-poller', daemon=True)
+            self.thread.start()
+            logger.info("MT5 tick poller started")
+
+    def stop(self):
+        self.is_running = False
+        self._stop_event.set()
+        logger.info("MT5 tick poller stopped")
+
+    def _poll_loop(self):
+        while self.is_running:
+            config = get_tick_cache_config()
+            try:
+                self.poll_once()
+            except MT5SessionUnavailable as e:
+                logger.debug(f"MT5 tick poll skipped: {e}")
+            except Exception as e:
+                logger.warning(f"MT5 tick poll failed: {e}")
+            self._stop_event.wait(config['poll_interval'])
+
+    def poll_once(self):
+        """Fetch ticks for every watched symbol over one session borrow"""
+        symbols = self.watchlist
+        if not symbols:
+            return
+
+        updated = []
+        with mt5_session() as executor:
+            for symbol in symbols:
+                tick = executor.terminal.symbol_info_tick(symbol)
+                if tick is not None:
+                    updated.append(self.tick_cache.update(symbol, tick))
+
+        config = get_tick_cache_config()
+        if config['mirror_to_cache'] and updated:
+            cache.set_many(
+                {f"{CACHE_KEY_PREFIX}{snap.symbol}": snap.to_dict() for snap in updated},
+                timeout=config['mirror_timeout']
+            )
+
+
+# Global cache and poller instances
+tick_cache = TickCache()
+tick_poller = TickPoller(tick_cache)
+
+
+def _read_mirror(symbol: str) -> Optional[TickSnapshot]:
+    data = cache.get(f"{CACHE_KEY_PREFIX}{symbol}")
+    if not data:
+        return None
+    snapshot = TickSnapshot(**data)
+    tick_cache.put_snapshot(snapshot)
+    return snapshot
+
+
+def get_tick(symbol: str, max_age: Optional[float] = None,
+             loader: Optional[Callable] = None):
+    """
+    Latest tick of a symbol with a staleness guard
+
+    Returns a cached TickSnapshot younger than max_age seconds, otherwise the
+    result of a direct loader call (default mt5.symbol_info_tick; callers
+    pass the symbol_info_tick of their executor's terminal). The
+    direct result is cached and the symbol joins the poller watchlist.
+    Returns None if MT5 has no tick for the symbol.
+    """
+    config = get_tick_cache_config()
+    if max_age is None:
+        max_age = config['max_age']
+
+    if config['enabled']:
+        snapshot = tick_cache.get(symbol)
+        if snapshot is not None and snapshot.age <= max_age:
+            return snapshot
+
+        if config['mirror_to_cache']:
+            snapshot = _read_mirror(symbol)
+            if snapshot is not None and snapshot.age <= max_age:
+                return snapshot
+
+    tick = (loader or mt5.symbol_info_tick)(symbol)
+    if tick is None:
+        return None
+
+    if not config['enabled']:
+        return tick
+
+    tick_poller.watch([symbol])
+    tick_poller.ensure_started()
+    return tick_cache.update(symbol, tick)
@@ -0,0 +1,194 @@
+"""
+Trade Statistics Rollup
+Trade counts and P&L per (symbol, direction, status) bucket
+
+Every Trade.save() moves the trade's contribution from its previous bucket
+to its current one with F() updates, and deleting a trade removes it, so
+TradeStatsRollup always mirrors the trades table. Statistics are then
+computed from a few dozen rollup rows instead of scanning all trades.
+
+Code that changes trades without Trade.save() (queryset.update(),
+bulk_update(), bulk_create()) must call rebuild_trade_stats() afterwards.
+"""
+
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Trade, TradeStatsRollup
+
+logger = logging.getLogger(__name__)
+
+
+ROLLUP_KEY_FIELDS = ('symbol', 'direction', 'status', 'net_profit_loss')
+
+ROLLUP_COUNTERS = (
+    'trade_count', 'pnl_total',
+    'win_count', 'win_pnl_total',
+    'loss_count', 'loss_pnl_total',
+)
+
+
+def _contribution(net_profit_loss) -> Dict[str, Decimal]:
+    """Counter values one trade adds to its bucket"""
+    pnl = Decimal(str(net_profit_loss)) if net_profit_loss is not None else Decimal('0')
+    return {
+        'trade_count': 1,
+        'pnl_total': pnl,
+        'win_count': 1 if pnl > 0 else 0,
+        'win_pnl_total': pnl if pnl > 0 else Decimal('0'),
+        'loss_count': 1 if pnl < 0 else 0,
+        'loss_pnl_total': pnl if pnl < 0 else Decimal('0'),
+    }
+
+
+def _bucket_state(state: Optional[Dict]) -> Optional[Tuple]:
+    if state is None:
+        return None
+    return tuple(state[name] for name in ROLLUP_KEY_FIELDS)
+
+
+def apply_rollup_changes(changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]]):
+    """
+    Move trades between rollup buckets
+
+    changes are (previous, current) Trade.tracked_state() dicts; None means
+    the trade did not exist before (create) or does not exist anymore
+    (delete). Deltas are summed per bucket first, so a bulk change costs
+    one update per touched bucket.
+    """
+    deltas: Dict[Tuple, Dict] = defaultdict(lambda: defaultdict(Decimal))
+    for previous, current in changes:
+        old_state, new_state = _bucket_state(previous), _bucket_state(current)
+        if old_state == new_state:
+            continue
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if state is not None:
+                for name, value in _contribution(state[3]).items():
+                    deltas[state[:3]][name] += sign * value
+
+    with transaction.atomic():
+        for (symbol, direction, status), values in deltas.items():
+            updates = {name: F(name) + value for name, value in values.items() if value}
+            if not updates:
+                continue
+            bucket, _ = TradeStatsRollup.objects.get_or_create(
+                symbol=symbol, direction=direction, status=status
+            )
+            TradeStatsRollup.objects.filter(pk=bucket.pk).update(updated_at=timezone.now(), **updates)
+
+
+def apply_rollup_change(old_state: Optional[Dict], new_state: Optional[Dict]):
+    """Move one trade between rollup buckets"""
+    apply_rollup_changes([(old_state, new_state)])
+
+
+def handle_trade_deleted(sender, instance, **kwargs):
+    """post_delete receiver: remove the trade from its bucket"""
+    apply_rollup_change(getattr(instance, '_tracked_state', None) or instance.tracked_state(), None)
+
+
+def aggregate_trade_stats(queryset=None) -> List[Dict]:
+    """
+    Rollup rows computed from trades with one conditional-aggregate query
+    """
+    queryset = Trade.objects.all() if queryset is None else queryset
+    zero = Value(Decimal('0'), output_field=DecimalField(max_digits=14, decimal_places=2))
+    win = Q(net_profit_loss__gt=0)
+    loss = Q(net_profit_loss__lt=0)
+
+    return list(
+        queryset.order_by().values('symbol', 'direction', 'status').annotate(
+            trade_count=Count('id'),
+            pnl_total=Coalesce(Sum('net_profit_loss'), zero),
+            win_count=Count('id', filter=win),
+            win_pnl_total=Coalesce(Sum('net_profit_loss', filter=win), zero),
+            loss_count=Count('id', filter=loss),
+            loss_pnl_total=Coalesce(Sum('net_profit_loss', filter=loss), zero),
+        )
+    )
+
+
+def rebuild_trade_stats() -> int:
+    """
+    Recompute the whole rollup from the trades table
+
+    Needed after bulk writes that bypass Trade.save(). Returns the number of
+    buckets written.
+    """
+    rows = aggregate_trade_stats()
+    with transaction.atomic():
+        TradeStatsRollup.objects.all().delete()
+        TradeStatsRollup.objects.bulk_create([TradeStatsRollup(**row) for row in rows])
+    logger.info(f"Rebuilt trade stats rollup: {len(rows)} buckets")
+    return len(rows)
+
+
+def _rollup_rows() -> List[Dict]:
+    return list(TradeStatsRollup.objects.filter(trade_count__gt=0).values(
+        'symbol', 'direction', 'status', *ROLLUP_COUNTERS
+    ))
+
+
+def summarize_trade_stats(rows: Iterable[Dict]) -> Dict:
+    """
+    Trading statistics from rollup rows
+
+    Wins and losses only count closed trades, matching the per-trade
+    definition (status closed_*, net P&L above / below zero).
+    """
+    total_trades = active_trades = closed_trades = 0
+    total_pnl = Decimal('0')
+    win_count = loss_count = 0
+    win_pnl = loss_pnl = Decimal('0')
+    symbols: Dict[str, Dict] = {}
+    directions: Dict[str, Dict] = {}
+
+    for row in rows:
+        count = row['trade_count']
+        pnl = row['pnl_total']
+        total_trades += count
+        total_pnl += pnl
+
+        if row['status'] == 'opened':
+            active_trades += count
+        elif row['status'].startswith('closed_'):
+            closed_trades += count
+            win_count += row['win_count']
+            win_pnl += row['win_pnl_total']
+            loss_count += row['loss_count']
+            loss_pnl += row['loss_pnl_total']
+
+        for breakdown, key, name in ((symbols, 'symbol', row['symbol']), (directions, 'direction', row['direction'])):
+            entry = breakdown.setdefault(name, {key: name, 'count': 0, 'pnl': Decimal('0')})
+            entry['count'] += count
+            entry['pnl'] += pnl
+
+    return {
+        'total_trades': total_trades,
+        'active_trades': active_trades,
+        'closed_trades': closed_trades,
+        'total_pnl': float(total_pnl),
+        'win_rate': round(win_count / closed_trades * 100, 2) if closed_trades else 0,
+        'profitable_trades': win_count,
+        'losing_trades': loss_count,
+        'average_profit': float(win_pnl / win_count) if win_count else 0.0,
+        'average_loss': float(loss_pnl / loss_count) if loss_count else 0.0,
+        'symbol_breakdown': sorted(symbols.values(), key=lambda entry: -entry['count']),
+        'direction_breakdown': list(directions.values()),
+    }
+
+
+def get_trade_statistics(source: str = 'rollup') -> Dict:
+    """
+    Trading statistics from the rollup table (one small query), or with
+    source='live' from one conditional-aggregate query over all trades
+    """
+    rows = aggregate_trade_stats() if source == 'live' else _rollup_rows()
+    return summarize_trade_stats(rows)
@@ -5,8 +5,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Q, Sum, Avg, Count
+from django.db.models import Q, Sum, Avg, Prefetch
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from decimal import Decimal
 from .models import Trade, TradingSession
 from .serializers import (
@@ -17,11 +19,35 @@ from .serializers import (
     SignalToTradeSerializer
 )
 from .mt5_executor import (
-    MT5Executor, 
     execute_approved_signal, 
     close_trade_by_ticket,
     update_trade_from_mt5
 )
+from .mt5_session import mt5_session, MT5SessionUnavailable
+from .pip_value_batch import get_bulk_pip_data
+from .position_sync import sync_open_trades
+from .deal_reconciliation import reconcile_deals
+from .trade_stats import get_trade_statistics
+from .fast_serializers import trade_list_response
+from core import change_versions
+from core.exports import ExportSpec, streaming_export
+from core.pagination import TradeCursorPagination
+
+TRADE_EXPORT = ExportSpec(
+    queryset=Trade.objects.all(),
+    fields=[
+        'id', 'mt5_ticket', 'mql5_signal_id', 'symbol', 'direction', 'status',
+        'volume', 'entry_price', 'exit_price', 'stop_loss', 'take_profit',
+        'gross_profit_loss', 'commission', 'swap', 'net_profit_loss', 'pips',
+        'signal_time', 'execution_time', 'close_time', 'duration_minutes', 'exit_reason',
+    ],
+    date_field='execution_time',
+    symbol_field='symbol',
+    filename='trades',
+)
+
+# Trade listings are answered with 304 while the trade version is unchanged
+trades_etag = method_decorator(condition(etag_func=change_versions.etag_func(change_versions.TRADES)))
 
 class TradeViewSet(viewsets.ModelViewSet):
     """
@@ -37,8 +63,20 @@ class TradeViewSet(viewsets.ModelViewSet):
     # filterset_fields = ['status', 'direction', 'symbol', 'exit_reason']
     filter_backends = [SearchFilter, OrderingFilter]  # Only basic filters
     search_fields = ['symbol', 'mt5_ticket', 'notes']
-    ordering_fields = ['execution_time', 'close_time', 'net_profit_loss']
-    ordering = ['-execution_time']
+    ordering_fields = ['django_decision_time']
+    ordering = ['-django_decision_time']
+    pagination_class = TradeCursorPagination
+    
+    def get_queryset(self):
+        """Apply ?status= and ?symbol= filters (served by the Trade indexes)"""
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        symbol = self.request.query_params.get('symbol')
+        if symbol:
+            queryset = queryset.filter(symbol=symbol.upper())
+        return queryset
     
     def get_serializer_class(self):
         """Use different serializers for different actions"""
@@ -50,39 +88,55 @@ class TradeViewSet(viewsets.ModelViewSet):
             return SignalToTradeSerializer
         return TradeSerializer
     
+    @trades_etag
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
     @action(detail=False, methods=['get'])
+    @trades_etag
     def active_trades(self, request):
         """Get all active (opened) trades"""
         active_trades = self.get_queryset().filter(status='opened')
-        serializer = self.get_serializer(active_trades, many=True)
-        return Response(serializer.data)
+        return trade_list_response(active_trades)
     
     @action(detail=False, methods=['get'])
+    @trades_etag
     def recent_trades(self, request):
         """Get recent trades (last 50)"""
         recent_trades = self.get_queryset()[:50]
-        serializer = self.get_serializer(recent_trades, many=True)
-        return Response(serializer.data)
+        return trade_list_response(recent_trades)
     
     @action(detail=False, methods=['get'])
+    @trades_etag
     def profitable_trades(self, request):
         """Get all profitable trades"""
         profitable_trades = self.get_queryset().filter(
             status__in=['closed_profit', 'closed_breakeven'],
             net_profit_loss__gt=0
         )
-        serializer = self.get_serializer(profitable_trades, many=True)
-        return Response(serializer.data)
+        return trade_list_response(profitable_trades)
     
     @action(detail=False, methods=['get'])
+    @trades_etag
     def losing_trades(self, request):
         """Get all losing trades"""
         losing_trades = self.get_queryset().filter(
             status='closed_loss',
             net_profit_loss__lt=0
         )
-        serializer = self.get_serializer(losing_trades, many=True)
-        return Response(serializer.data)
+        return trade_list_response(losing_trades)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream trades as NDJSON or CSV
+        
+        Query params: export_format (ndjson|csv), from, to (execution_time), symbol
+        """
+        try:
+            return streaming_export(TRADE_EXPORT, request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['post'])
     def close_trade(self, request, pk=None):
@@ -155,71 +209,23 @@ class TradeViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
-        """Get comprehensive trading statistics"""
-        queryset = self.get_queryset()
-        
-        # Basic counts
-        total_trades = queryset.count()
-        active_trades = queryset.filter(status='opened').count()
-        closed_trades = queryset.filter(status__startswith='closed_').count()
-        
-        # P&L statistics
-        total_pnl = queryset.aggregate(
-            total=Sum('net_profit_loss')
-        )['total'] or 0
-        
-        profitable_trades = queryset.filter(
-            net_profit_loss__gt=0,
-            status__startswith='closed_'
-        )
-        losing_trades = queryset.filter(
-            net_profit_loss__lt=0,
-            status__startswith='closed_'
-        )
-        
-        # Performance metrics
-        win_rate = 0
-        if closed_trades > 0:
-            win_rate = (profitable_trades.count() / closed_trades) * 100
-        
-        # Average trade metrics
-        avg_profit = profitable_trades.aggregate(
-            avg=Avg('net_profit_loss')
-        )['avg'] or 0
-        
-        avg_loss = losing_trades.aggregate(
-            avg=Avg('net_profit_loss')
-        )['avg'] or 0
-        
-        # Symbol breakdown
-        symbol_stats = queryset.values('symbol').annotate(
-            count=Count('id'),
-            pnl=Sum('net_profit_loss')
-        ).order_by('-count')
-        
-        # Direction breakdown
-        direction_stats = queryset.values('direction').annotate(
-            count=Count('id'),
-            pnl=Sum('net_profit_loss')
-        )
-        
-        return Response({
-            'total_trades': total_trades,
-            'active_trades': active_trades,
-            'closed_trades': closed_trades,
-            'total_pnl': float(total_pnl),
-            'win_rate': round(win_rate, 2),
-            'profitable_trades': profitable_trades.count(),
-            'losing_trades': losing_trades.count(),
-            'average_profit': float(avg_profit),
-            'average_loss': float(avg_loss),
-            'symbol_breakdown': list(symbol_stats),
-            'direction_breakdown': list(direction_stats)
-        })
+        """
+        Get comprehensive trading statistics
+        
+        Served from the incrementally maintained TradeStatsRollup table;
+        ?source=live computes the same numbers with one aggregate query.
+        """
+        source = request.query_params.get('source', 'rollup')
+        return Response(get_trade_statistics(source))
     
     @action(detail=False, methods=['post'])
     def bulk_close(self, request):
-        """Bulk close multiple trades"""
+        """
+        Bulk close multiple trades
+        
+        Closes the MT5 positions back-to-back over one session borrow and
+        records all fills with a single bulk_update.
+        """
         trade_ids = request.data.get('trade_ids', [])
         exit_reason = request.data.get('exit_reason', 'bulk_close')
         
@@ -230,24 +236,82 @@ class TradeViewSet(viewsets.ModelViewSet):
             )
         
         # Get active trades
-        active_trades = self.get_queryset().filter(
+        active_trades = list(self.get_queryset().filter(
             id__in=trade_ids,
             status='opened'
-        )
+        ))
+        trades_by_ticket = {trade.mt5_ticket: trade for trade in active_trades}
+        found_ids = {str(trade.id) for trade in active_trades}
+        skipped = [str(trade_id) for trade_id in trade_ids if str(trade_id) not in found_ids]
         
-        closed_count = 0
-        for trade in active_trades:
-            # This would typically get current market price
-            # For now, we'll mark as cancelled
-            trade.status = 'cancelled'
+        try:
+            with mt5_session() as executor:
+                results = executor.close_trades(list(trades_by_ticket))
+        except MT5SessionUnavailable as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        closed, failed, closed_trades = [], [], []
+        for ticket, result in results.items():
+            trade = trades_by_ticket[ticket]
+            
+            if not result.success:
+                failed.append({
+                    'trade_id': str(trade.id),
+                    'ticket': ticket,
+                    'error_code': result.error_code,
+                    'error': result.error_message,
+                })
+                continue
+            
+            trade.exit_price = result.actual_entry_price
             trade.exit_reason = exit_reason
-            trade.close_time = timezone.now()
-            trade.save()
-            closed_count += 1
+            trade.close_time = result.execution_time
+            
+            if result.profit is None:
+                # Close deal not in the history yet: deal reconciliation sets the P&L
+                trade.status = 'closed_unknown'
+                pnl = None
+            else:
+                # Realized figures from the position's deals, close slippage included
+                trade.gross_profit_loss = result.profit
+                trade.swap = result.swap
+                trade.commission = result.commission
+                trade.calculate_derived_fields()
+                
+                pnl = trade.net_profit_loss or 0
+                if pnl > 0:
+                    trade.status = 'closed_profit'
+                elif pnl < 0:
+                    trade.status = 'closed_loss'
+                else:
+                    trade.status = 'closed_breakeven'
+            
+            closed_trades.append(trade)
+            closed.append({
+                'trade_id': str(trade.id),
+                'ticket': ticket,
+                'exit_price': float(trade.exit_price),
+                'pnl': float(pnl) if pnl is not None else None,
+                'status': trade.status,
+            })
+        
+        if closed_trades:
+            Trade.bulk_update_tracked(closed_trades, [
+                'status', 'exit_price', 'exit_reason', 'close_time',
+                'gross_profit_loss', 'swap', 'commission', 'net_profit_loss',
+                'pips', 'duration_minutes',
+            ])
         
         return Response({
-            'message': f'{closed_count} trades closed successfully',
-            'closed_count': closed_count
+            'message': f'{len(closed)} trades closed successfully',
+            'closed_count': len(closed),
+            'failed_count': len(failed),
+            'closed': closed,
+            'failed': failed,
+            'skipped': skipped,
         })
     
     @action(detail=False, methods=['post'])
@@ -373,7 +437,7 @@ class TradeViewSet(viewsets.ModelViewSet):
     def mt5_account_info(self, request):
         """Get MT5 account information"""
         try:
-            with MT5Executor() as executor:
+            with mt5_session() as executor:
                 account_info = executor.get_account_info()
                 
                 if account_info:
@@ -389,31 +453,101 @@ class TradeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['get', 'post'])
+    def pip_values(self, request):
+        """
+        Pip values, tick values and risk-based lot sizes for many symbols
+        
+        GET ?symbols=EURUSD,GBPJPY&lot_size=1.0
+        POST {"symbols": [...], "lot_size": 1.0, "risk_amount": 100.0,
+              "stop_distances": {"EURUSD": 0.0020}}
+        """
+        params = request.data if request.method == 'POST' else request.query_params
+        
+        symbols = params.get('symbols')
+        if isinstance(symbols, str):
+            symbols = [symbol.strip().upper() for symbol in symbols.split(',') if symbol.strip()]
+        
+        try:
+            lot_size = float(params.get('lot_size', 1.0))
+            risk_amount = params.get('risk_amount')
+            risk_amount = float(risk_amount) if risk_amount is not None else None
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'lot_size and risk_amount must be numbers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            data = get_bulk_pip_data(
+                symbols or None,
+                lot_size=lot_size,
+                risk_amount=risk_amount,
+                stop_distances=params.get('stop_distances') if request.method == 'POST' else None
+            )
+            return Response(data)
+        except MT5SessionUnavailable as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
     @action(detail=False, methods=['post'])
     def bulk_sync_mt5(self, request):
-        """Bulk sync all active trades with MT5"""
-        active_trades = self.get_queryset().filter(status='opened')
+        """
+        Bulk sync all active trades with MT5
         
-        results = []
-        for trade in active_trades:
-            try:
-                success = update_trade_from_mt5(trade)
-                results.append({
-                    'trade_id': str(trade.id),
-                    'mt5_ticket': trade.mt5_ticket,
-                    'success': success
-                })
-            except Exception as e:
-                results.append({
-                    'trade_id': str(trade.id),
-                    'mt5_ticket': trade.mt5_ticket,
-                    'success': False,
-                    'error': str(e)
-                })
+        Diffs open trades against one positions_get() snapshot and writes
+        the changes with a single bulk_update.
+        """
+        try:
+            result = sync_open_trades()
+        except MT5SessionUnavailable as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        synced = len(result.updated) + len(result.unchanged) + len(result.vanished)
+        return Response({
+            'message': f'Synced {synced} trades',
+            **result.to_dict()
+        })
+    
+    @action(detail=False, methods=['post'])
+    def reconcile_mt5_deals(self, request):
+        """
+        Reconcile closed positions from MT5 deal history
+        
+        Fetches only deals newer than the stored watermark and closes the
+        matching trades with one bulk_update.
+        """
+        try:
+            result = reconcile_deals()
+        except MT5SessionUnavailable as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
         
         return Response({
-            'message': f'Synced {len(results)} trades',
-            'results': results
+            'message': f'Reconciled {result.new_deals} new deals',
+            **result.to_dict()
         })
 
 
@@ -432,6 +566,15 @@ class TradingSessionViewSet(viewsets.ModelViewSet):
     ordering_fields = ['start_time', 'total_pnl']
     ordering = ['-start_time']
     
+    def get_queryset(self):
+        """Annotate trade totals and prefetch trade ids (constant query count)"""
+        return TradingSession.objects.annotate(
+            pips_total=Sum('trades__pips'),
+            avg_duration_minutes=Avg('trades__duration_minutes')
+        ).prefetch_related(
+            Prefetch('trades', queryset=Trade.objects.only('id'))
+        )
+    
     @action(detail=True, methods=['post'])
     def add_trades(self, request, pk=None):
         """Add trades to trading session"""